@@ -9,7 +9,6 @@ import concurrent.futures
 import logging
 import mimetypes
 import os
-import shutil
 import sys
 import uuid
 import uvicorn
@@ -33,11 +32,13 @@ except ImportError:
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from app.core.video_storage import VideoAnalysisStorage
+from app.core.analysis_cache import get_analysis_cache
+from app.core.upload_ingest import ingest_upload
 from app.core.job_queue import JobQueue
-from app.features.clearcast.clearcast_checker import ClearcastChecker
-from app.features.ai_breakdown.ai_video_breakdown import AIVideoBreakdown
-from app.features.analytics.reaction_processing import ReactionProcessingPipeline
-from app.core.video_processor import ClearcastVideoProcessor
+from app.core.process_pool import ProcessPoolBackend, set_default_backend
+from app.core.cpu_tasks import analyze_reaction_task
+from app.core.warmup import WarmupRegistry
+from app.features.reporting.report_cache import ReportCache
 from datetime import datetime
 
 # Configure logging
@@ -79,12 +80,21 @@ except ImportError as e:
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 STORAGE_DIR = PROJECT_ROOT / "video_analyses"
 storage = VideoAnalysisStorage(str(STORAGE_DIR))
-clearcast_checker = ClearcastChecker()
-ai_breakdown = AIVideoBreakdown()
-video_processor = ClearcastVideoProcessor()
-reaction_processor = ReactionProcessingPipeline()
+# Heavyweight components are loaded by the warm-up thread; use _component() to get them
+clearcast_checker = None
+ai_breakdown = None
+reaction_processor = None
+video_processor = None
 REACTION_PROCESSING_TIMEOUT_SECONDS = int(os.environ.get("REACTION_PROCESSING_TIMEOUT_SECONDS", "180"))
-job_queue = JobQueue(storage)
+JOB_QUEUE_WORKERS = int(os.environ.get("JOB_QUEUE_WORKERS", "4"))
+# Opt-in: run CPU-bound handlers in worker processes (0 = threads, the default)
+JOB_QUEUE_PROCESS_WORKERS = int(os.environ.get("JOB_QUEUE_PROCESS_WORKERS", "0"))
+process_backend = ProcessPoolBackend(max_workers=JOB_QUEUE_PROCESS_WORKERS) if JOB_QUEUE_PROCESS_WORKERS > 0 else None
+# Visual physics and frame-based technical QC use the same workers
+set_default_backend(process_backend)
+job_queue = JobQueue(storage, num_workers=JOB_QUEUE_WORKERS, process_backend=process_backend)
+# PDF reports render off the event loop and are cached by content
+report_cache = ReportCache(process_backend=process_backend)
 _fallback_reaction_tasks: set[asyncio.Task] = set()
 DEBUG_LOG_PATH = Path(r"c:\Users\Jacques Y\Desktop\AI Gesture Password\V1\.cursor\debug.log")
 SUPPORTED_VIDEO_MEDIA_TYPES = {
@@ -95,6 +105,67 @@ SUPPORTED_VIDEO_MEDIA_TYPES = {
 ALLOWED_VIDEO_UPLOAD_EXTENSIONS = set(SUPPORTED_VIDEO_MEDIA_TYPES.keys())
 
 
+def _load_clearcast_checker():
+    from app.features.clearcast.clearcast_checker import ClearcastChecker
+    return ClearcastChecker()
+
+
+def _load_clearcast_knowledge_base():
+    from app.features.clearcast.clearcast_knowledge_base import get_knowledge_base
+    knowledge_base = get_knowledge_base()  # Reads the PDF and loads or encodes its embeddings
+    knowledge_base.warm_up()
+    return knowledge_base
+
+
+def _load_ai_breakdown():
+    from app.features.ai_breakdown.ai_video_breakdown import AIVideoBreakdown
+    return AIVideoBreakdown()
+
+
+def _load_video_processor():
+    from app.core.video_processor import ClearcastVideoProcessor
+    return ClearcastVideoProcessor()
+
+
+def _load_reaction_processor():
+    # Imports the emotion tracker stack (mediapipe, pygame, speech_recognition)
+    from app.features.analytics.reaction_processing import ReactionProcessingPipeline
+    return ReactionProcessingPipeline()
+
+
+warmup = WarmupRegistry()
+warmup.register("clearcast_checker", _load_clearcast_checker)
+warmup.register("clearcast_knowledge_base", _load_clearcast_knowledge_base)
+warmup.register("ai_breakdown", _load_ai_breakdown)
+warmup.register("video_processor", _load_video_processor)
+if process_backend is None:
+    # Otherwise reactions are analyzed in worker processes
+    warmup.register("reaction_processor", _load_reaction_processor)
+
+
+async def _component(name: str):
+    """Return a warmed-up module global (e.g. clearcast_checker), waiting for its load if needed."""
+    value = globals()[name]
+    if value is None:
+        value = globals()[name] = await warmup.wait_for(name)
+    return value
+
+
+def _component_sync(name: str):
+    """Blocking _component() for code running off the event loop."""
+    value = globals()[name]
+    if value is None:
+        value = globals()[name] = warmup.get(name)
+    return value
+
+
+@asynccontextmanager
+async def warmup_lifespan(app: FastAPI):
+    if warmup.start():
+        logger.info("Started background warm-up of %s", warmup.summary())
+    yield
+
+
 @asynccontextmanager
 async def job_queue_lifespan(app: FastAPI):
     try:
@@ -118,9 +189,18 @@ async def job_queue_lifespan(app: FastAPI):
             _fallback_reaction_tasks.clear()
         await job_queue.shutdown()
         logger.info("Job queue worker stopped on shutdown")
+        if process_backend is not None:
+            set_default_backend(None)
+            await asyncio.to_thread(process_backend.shutdown)
 
 
-app.router.lifespan_context = job_queue_lifespan
+@asynccontextmanager
+async def app_lifespan(app: FastAPI):
+    async with warmup_lifespan(app), job_queue_lifespan(app):
+        yield
+
+
+app.router.lifespan_context = app_lifespan
 
 
 def _media_type_for_path(video_path: Path) -> str:
@@ -297,6 +377,8 @@ class ReactionJob(BaseModel):
     error: Optional[str] = None
     queue_job_id: Optional[str] = None
     processing_mode: Optional[str] = "queue"
+    progress: Optional[float] = None
+    progress_message: Optional[str] = None
 
 class ReactionDetail(BaseModel):
     job: ReactionJob
@@ -320,13 +402,32 @@ class QueueJobModel(BaseModel):
     error_user_message: Optional[str] = None
     retry_count: int = 0
     max_retries: int = 0
+    priority: int = 0
+    progress: Optional[float] = None
+    progress_message: Optional[str] = None
     payload: Dict[str, Any] = {}
+    result: Optional[Any] = None
+
+
+class QueueWorkerState(BaseModel):
+    worker_id: int
+    state: Literal["idle", "busy"]
+    job_id: Optional[str] = None
+    job_type: Optional[str] = None
+    jobs_processed: int = 0
+    last_heartbeat: Optional[str] = None
 
 
 class WorkerHealth(BaseModel):
     running: bool
     last_heartbeat: Optional[str] = None
     last_exception: Optional[str] = None
+    num_workers: int = 1
+    queued: int = 0
+    active_by_type: Dict[str, int] = {}
+    concurrency_limits: Dict[str, int] = {}
+    process_pool: bool = False
+    workers: List[QueueWorkerState] = []
 
 
 class Settings(BaseModel):
@@ -413,12 +514,15 @@ async def root():
 async def health_check():
     """
     Health check endpoint for monitoring backend status.
-    Returns 200 if the server is running and responsive.
+    Returns 200 if the server is running and responsive; "components" reports
+    the warm-up state of each heavyweight component.
     """
     return {
         "status": "healthy",
         "service": "one-shot-api",
-        "version": "1.0.0"
+        "version": "1.0.0",
+        "ready": warmup.is_ready(),
+        "components": warmup.status(),
     }
 
 
@@ -456,22 +560,30 @@ async def analyze_video(
     try:
         _validate_upload_extension(file.filename)
 
-        temp_dir = Path("temp_uploads")
-        temp_dir.mkdir(exist_ok=True)
-        temp_path = temp_dir / f"{uuid.uuid4()}_{file.filename}"
-        
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        analysis_id = storage.create_analysis(str(temp_path), defer_transcription=True)
+        # Stream into storage's staging dir (hashing and probing on the way) so
+        # create_analysis adopts the file with a rename instead of a second copy
+        staged_path = storage.uploads_dir / f"{uuid.uuid4().hex}{Path(file.filename).suffix}"
+        upload = await ingest_upload(file, staged_path)
+
+        analysis_id = storage.create_analysis(
+            upload.path,
+            defer_transcription=True,
+            content_hash=upload.content_hash,
+            video_name=file.filename,
+            video_metadata=upload.media.to_dict() if upload.media else None,
+            move_source=True,
+        )
         
         if analysis_id.startswith("ERROR:"):
+            try:
+                os.remove(upload.path)
+            except OSError:
+                pass
             raise HTTPException(status_code=400, detail=analysis_id)
-            
-        try:
-            os.remove(temp_path)
-        except:
-            pass
+
+        stored_video_path = storage.get_video_path(analysis_id)
+        if stored_video_path:
+            get_analysis_cache().register_file_hash(stored_video_path, upload.content_hash)
 
         worker_restarted = False
         try:
@@ -521,21 +633,26 @@ async def upload_reaction_video(
     reaction_path = reaction_dir / f"{reaction_id}{suffix}"
 
     try:
-        with open(reaction_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        upload = await ingest_upload(file, reaction_path)
         REACTION_LOG.info(
             "reaction.upload.received",
             extra={
                 "analysis_id": analysis_id,
                 "reaction_filename": Path(reaction_path).name,
-                "size_bytes": Path(reaction_path).stat().st_size,
+                "size_bytes": upload.size_bytes,
+                "content_hash": upload.content_hash,
             },
         )
     except Exception as exc:
         logger.error(f"Failed to store reaction recording: {exc}")
         raise HTTPException(status_code=500, detail="Failed to store reaction recording")
 
-    job = storage.create_reaction_job(analysis_id, reaction_id, str(reaction_path))
+    job = storage.create_reaction_job(
+        analysis_id,
+        reaction_id,
+        str(reaction_path),
+        video_metadata=upload.media.to_dict() if upload.media else None,
+    )
     REACTION_LOG.info(
         "reaction.job.queued",
         extra={
@@ -772,6 +889,16 @@ async def reload_database():
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/admin/gemini/refresh-models")
+async def refresh_gemini_models(model_type: Optional[str] = None):
+    """Forget cached Gemini model resolutions (e.g. after an API key change)"""
+    from app.core.gemini_utils import get_model_registry
+
+    registry = get_model_registry()
+    registry.invalidate(model_type)
+    return {"status": "success", "registry": registry.snapshot()}
+
+
 @app.post("/admin/clearcast/update-rules")
 async def update_clearcast_rules(
     rules_file: Optional[UploadFile] = File(None),
@@ -927,7 +1054,8 @@ async def run_clearcast_check(request: ClearcastRequest):
             delivery_metadata = {"clock_number": request.clock_number}
         
         logger.info(f"Running full Clearcast check for {request.analysis_id} (mode={request.mode})")
-        results = clearcast_checker.check_video_compliance(
+        checker = await _component("clearcast_checker")
+        results = checker.check_video_compliance(
             video_path=video_path,
             script_excerpt=analysis.get("transcript"),
             delivery_metadata=delivery_metadata,
@@ -982,7 +1110,8 @@ async def run_pure_clearcast_check(request: PureClearcastRequest):
             delivery_metadata["product_name"] = request.product_name
 
         logger.info(f"Running PURE Clearcast check for {request.analysis_id} (clock: {request.clock_number})")
-        results = clearcast_checker.check_video_compliance(
+        checker = await _component("clearcast_checker")
+        results = checker.check_video_compliance(
             video_path=video_path,
             script_excerpt=analysis.get("transcript"),
             delivery_metadata=delivery_metadata,
@@ -1041,7 +1170,8 @@ async def run_quick_compliance_check(
             delivery_metadata["agency_code"] = agency_code
 
         # Run strict compliance check (pure mode)
-        results = clearcast_checker.check_video_compliance(
+        checker = await _component("clearcast_checker")
+        results = checker.check_video_compliance(
             video_path=temp_path,
             script_excerpt=None,  # No transcript for quick check
             delivery_metadata=delivery_metadata,
@@ -1162,7 +1292,8 @@ async def run_ai_breakdown(request: BreakdownRequest):
             logger.warning(f"Transcript not ready for {request.analysis_id}, AI breakdown may be less accurate")
         
         logger.info(f"Running full AI breakdown for {request.analysis_id} (transcript available: {bool(script_text)}, supers available: {bool(supers_texts)})")
-        results = await ai_breakdown.analyze_video(
+        breakdown = await _component("ai_breakdown")
+        results = await breakdown.analyze_video(
             video_path=video_path,
             detail_level=request.detail_level or "full",
             script_text=script_text,
@@ -1603,23 +1734,7 @@ async def download_ai_breakdown_pdf(analysis_id: str):
         raise HTTPException(status_code=404, detail="AI breakdown not available")
     
     try:
-        from app.features.reporting.pdf_generator import AIBreakdownPDFGenerator
-        
-        pdf_gen = AIBreakdownPDFGenerator()
-        pdf_dir = Path("temp_pdfs")
-        pdf_dir.mkdir(exist_ok=True)
-        pdf_path = pdf_dir / f"ai_breakdown_{analysis_id}.pdf"
-        
-        success = pdf_gen.generate_pdf(
-            results=ai_breakdown_data,
-            video_name=analysis["video_name"],
-            video_duration=analysis.get("video_duration", 0.0),
-            thumbnail_base64=analysis.get("thumbnail"),
-            output_path=str(pdf_path)
-        )
-        
-        if not success or not pdf_path.exists():
-            raise HTTPException(status_code=500, detail="Failed to generate PDF")
+        pdf_path = await report_cache.get_or_render(storage, "breakdown", analysis_id, analysis)
         
         return FileResponse(
             pdf_path,
@@ -1642,23 +1757,7 @@ async def download_clearcast_pdf(analysis_id: str):
         raise HTTPException(status_code=404, detail="Clearcast check not available")
     
     try:
-        from app.features.reporting.pdf_generator import ClearcastPDFGenerator
-        
-        pdf_gen = ClearcastPDFGenerator()
-        pdf_dir = Path("temp_pdfs")
-        pdf_dir.mkdir(exist_ok=True)
-        pdf_path = pdf_dir / f"clearcast_{analysis_id}.pdf"
-        
-        success = pdf_gen.generate_pdf(
-            results=clearcast_data,
-            video_name=analysis["video_name"],
-            video_duration=analysis.get("video_duration", 0.0),
-            thumbnail_base64=analysis.get("thumbnail"),
-            output_path=str(pdf_path)
-        )
-        
-        if not success or not pdf_path.exists():
-            raise HTTPException(status_code=500, detail="Failed to generate PDF")
+        pdf_path = await report_cache.get_or_render(storage, "clearcast", analysis_id, analysis)
         
         return FileResponse(
             pdf_path,
@@ -1697,7 +1796,8 @@ async def polish_video(request: PolishRequest):
         if slate_info:
             processing_options["slate_info"] = slate_info
 
-        results = video_processor.process_video(
+        processor = await _component("video_processor")
+        results = processor.process_video(
             input_path=video_path,
             output_path=str(output_path),
             options=processing_options
@@ -1799,11 +1899,15 @@ def process_reaction_video(analysis_id: str, reaction_id: str, reaction_path: st
             }
         )
 
-        def _run_analysis():
-            return reaction_processor.analyze(reaction_path)
+        if process_backend is not None:
+            def _on_progress(fraction: float, message: Optional[str] = None):
+                storage.update_reaction_job(reaction_id, progress=fraction, progress_message=message)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(_run_analysis)
+            future = process_backend.submit(
+                analyze_reaction_task,
+                {"analysis_id": analysis_id, "payload": {"reaction_path": reaction_path}},
+                on_progress=_on_progress,
+            )
             try:
                 reaction_results = future.result(timeout=REACTION_PROCESSING_TIMEOUT_SECONDS)
             except concurrent.futures.TimeoutError:
@@ -1811,6 +1915,19 @@ def process_reaction_video(analysis_id: str, reaction_id: str, reaction_path: st
                 raise TimeoutError(
                     f"Reaction processing exceeded {REACTION_PROCESSING_TIMEOUT_SECONDS} seconds"
                 )
+        else:
+            def _run_analysis():
+                return _component_sync("reaction_processor").analyze(reaction_path)
+
+            with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                future = executor.submit(_run_analysis)
+                try:
+                    reaction_results = future.result(timeout=REACTION_PROCESSING_TIMEOUT_SECONDS)
+                except concurrent.futures.TimeoutError:
+                    future.cancel()
+                    raise TimeoutError(
+                        f"Reaction processing exceeded {REACTION_PROCESSING_TIMEOUT_SECONDS} seconds"
+                    )
 
         reaction_results["video_path"] = reaction_path
 
@@ -1920,11 +2037,13 @@ def _schedule_transcode_job(analysis_id: str) -> Optional[str]:
             return job_id
 
     job_queue.ensure_worker()
+    # Playback copies unblock the video player, so start them ahead of other work
     new_job_id = job_queue.enqueue(
         job_type="video_transcode",
         analysis_id=analysis_id,
         payload={},
         max_retries=2,
+        priority=10,
     )
     storage.set_playback_job_id(analysis_id, new_job_id)
     return new_job_id
@@ -1943,7 +2062,19 @@ from app.features.ad_script_lab.types import (
     AdScriptGenerateRequest,
     AdScriptRunResponse,
 )
-from app.features.ad_script_lab.orchestrator import get_orchestrator, run_ad_script_protocol
+
+
+# The orchestrator pulls in every agent plus the Gemini and OpenAI clients;
+# import it on first use so API startup (and test collection) stays fast.
+def get_orchestrator():
+    from app.features.ad_script_lab.orchestrator import get_orchestrator as _get_orchestrator
+    return _get_orchestrator()
+
+
+async def run_ad_script_protocol(request: AdScriptGenerateRequest):
+    from app.features.ad_script_lab.orchestrator import run_ad_script_protocol as _run_ad_script_protocol
+    return await _run_ad_script_protocol(request)
+
 
 from app.features.storyboards.router import router as storyboard_router
 
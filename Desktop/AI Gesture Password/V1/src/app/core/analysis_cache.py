@@ -3,6 +3,12 @@ Analysis Result Caching
 
 Caches expensive AI analysis results to avoid redundant calls.
 Uses SQLite for persistence alongside existing storage.
+
+Videos are identified by a full SHA-256 content hash. Hashes are kept in a
+path -> (mtime, size, hash) index. Uploads are hashed while they stream to
+disk (upload_ingest) and registered with register_file_hash(), so lookups
+for them only need a stat() call; any other file is hashed once, on its
+first lookup, and indexed.
 """
 
 import hashlib
@@ -10,14 +16,36 @@ import json
 import logging
 import os
 import sqlite3
+import threading
 import time
+from collections import OrderedDict
 from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+
+def hash_file(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Full SHA-256 of a file, read in chunks."""
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy a decoded JSON value (dicts, lists and scalars) without deepcopy's memo bookkeeping."""
+    if isinstance(value, dict):
+        return {key: _copy_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(item) for item in value]
+    return value
+
 
 @dataclass
 class CacheConfig:
@@ -26,6 +54,11 @@ class CacheConfig:
     default_ttl_hours: int = 24
     max_entries: int = 1000
     enabled: bool = True
+    # Hash the whole file on an index miss; False uses the sampled size+head/tail hash
+    full_file_hash: bool = True
+    # In-process LRU of decoded results (bounded by serialized size and count)
+    memory_max_bytes: int = 32 * 1024 * 1024
+    memory_max_entries: int = 256
 
 
 class AnalysisCache:
@@ -33,11 +66,35 @@ class AnalysisCache:
     Cache for analysis results using SQLite.
     
     Stores results keyed by video file hash + analysis type + options.
+    Each thread keeps one open WAL-mode connection, and recently used results
+    are held decoded in an in-memory LRU in front of SQLite. get() returns a
+    copy of the held result, so callers may mutate it.
     """
     
     def __init__(self, config: Optional[CacheConfig] = None):
         self.config = config or CacheConfig()
         self.db_path = Path(self.config.db_path)
+        # abspath -> (mtime_ns, size, content_hash)
+        self._hash_index: Dict[str, Tuple[int, int, str]] = {}
+        self._hash_index_lock = threading.Lock()
+
+        # Per-thread persistent connections
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+
+        # cache_key -> (result, expires_at, size_bytes, video_path); size is the
+        # serialized length. Held results are never handed out, only copies.
+        self._memory: "OrderedDict[str, Tuple[Dict[str, Any], float, int, str]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._memory_lock = threading.Lock()
+        self._counters = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expired": 0,
+            "evictions": 0,
+        }
         
         # Initialize database
         if self.config.enabled:
@@ -68,44 +125,177 @@ class AnalysisCache:
                     CREATE INDEX IF NOT EXISTS idx_video_path 
                     ON analysis_cache(video_path)
                 """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS file_hashes (
+                        path TEXT PRIMARY KEY,
+                        mtime_ns INTEGER,
+                        file_size INTEGER,
+                        content_hash TEXT
+                    )
+                """)
                 conn.commit()
                 logger.info(f"Analysis cache initialized at {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to initialize cache database: {e}")
             self.config.enabled = False
     
+    def _open_connection(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-8000")  # ~8MB page cache
+        conn.execute("PRAGMA busy_timeout=5000")
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
     @contextmanager
     def _get_connection(self):
-        """Get a database connection with proper cleanup."""
-        conn = sqlite3.connect(str(self.db_path))
+        """Get this thread's persistent database connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            self._local.conn = conn
         try:
             yield conn
-        finally:
-            conn.close()
-    
+        except Exception:
+            conn.rollback()
+            raise
+
+    def close(self):
+        """Close all database connections opened by this cache."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        self._local = threading.local()
+
+    def _count(self, counter: str) -> None:
+        with self._memory_lock:
+            self._counters[counter] += 1
+
+    def _memory_get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self._memory_lock:
+            entry = self._memory.get(cache_key)
+            if entry is None:
+                return None
+            result, expires_at, size, _ = entry
+            if time.time() > expires_at:
+                del self._memory[cache_key]
+                self._memory_bytes -= size
+                return None
+            self._memory.move_to_end(cache_key)
+        return _copy_result(result)
+
+    def _memory_put(
+        self, cache_key: str, result: Dict[str, Any], expires_at: float, size: int, video_path: str
+    ) -> None:
+        """Hold a decoded result that no caller has a reference to."""
+        if size > self.config.memory_max_bytes or self.config.memory_max_entries <= 0:
+            return
+        with self._memory_lock:
+            old = self._memory.pop(cache_key, None)
+            if old is not None:
+                self._memory_bytes -= old[2]
+            self._memory[cache_key] = (result, expires_at, size, video_path)
+            self._memory_bytes += size
+            while (
+                self._memory_bytes > self.config.memory_max_bytes
+                or len(self._memory) > self.config.memory_max_entries
+            ):
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted[2]
+                self._counters["evictions"] += 1
+
+    def _memory_discard(self, predicate) -> None:
+        with self._memory_lock:
+            for key in [k for k, entry in self._memory.items() if predicate(k, entry)]:
+                self._memory_bytes -= self._memory.pop(key)[2]
+
+    def register_file_hash(self, video_path: str, content_hash: str) -> None:
+        """
+        Record the content hash of a file, e.g. one computed while uploading.
+
+        The entry stays valid while the file's mtime and size are unchanged.
+        """
+        try:
+            stat = os.stat(video_path)
+        except OSError as e:
+            logger.warning(f"Cannot index hash for {video_path}: {e}")
+            return
+
+        path = os.path.abspath(video_path)
+        entry = (stat.st_mtime_ns, stat.st_size, content_hash)
+        with self._hash_index_lock:
+            self._hash_index[path] = entry
+
+        if not self.config.enabled:
+            return
+        try:
+            with self._get_connection() as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO file_hashes (path, mtime_ns, file_size, content_hash)
+                    VALUES (?, ?, ?, ?)
+                """, (path, *entry))
+                conn.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist file hash: {e}")
+
+    def _lookup_file_hash(self, path: str, stat: os.stat_result) -> Optional[str]:
+        """Return the indexed hash if the file metadata still matches."""
+        with self._hash_index_lock:
+            entry = self._hash_index.get(path)
+        if entry is None and self.config.enabled:
+            try:
+                with self._get_connection() as conn:
+                    row = conn.execute(
+                        "SELECT mtime_ns, file_size, content_hash FROM file_hashes WHERE path = ?",
+                        (path,),
+                    ).fetchone()
+                if row:
+                    entry = (row[0], row[1], row[2])
+                    with self._hash_index_lock:
+                        self._hash_index[path] = entry
+            except Exception as e:
+                logger.debug(f"File hash lookup failed: {e}")
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+        return None
+
+    def _sampled_file_hash(self, video_path: str, file_size: int) -> str:
+        """Legacy hash: file size plus first/last 1MB."""
+        hasher = hashlib.sha256()
+        hasher.update(str(file_size).encode())
+        chunk_size = HASH_CHUNK_SIZE
+        with open(video_path, 'rb') as f:
+            hasher.update(f.read(chunk_size))
+            if file_size > chunk_size * 2:
+                f.seek(-chunk_size, 2)  # Seek from end
+                hasher.update(f.read(chunk_size))
+        return hasher.hexdigest()
+
     def _compute_file_hash(self, video_path: str) -> str:
         """
         Compute a hash of the video file for cache key.
-        Uses file size and first/last 1MB for speed.
+
+        Served from the hash index when the file is unchanged (a stat call);
+        otherwise the file is hashed once and the result indexed.
         """
         try:
-            file_size = os.path.getsize(video_path)
-            hasher = hashlib.sha256()
-            hasher.update(str(file_size).encode())
-            
-            # Hash first and last 1MB for uniqueness without reading entire file
-            chunk_size = 1024 * 1024  # 1MB
-            
-            with open(video_path, 'rb') as f:
-                # First chunk
-                hasher.update(f.read(chunk_size))
-                
-                # Last chunk (if file is large enough)
-                if file_size > chunk_size * 2:
-                    f.seek(-chunk_size, 2)  # Seek from end
-                    hasher.update(f.read(chunk_size))
-            
-            return hasher.hexdigest()[:16]  # Truncate for readability
+            stat = os.stat(video_path)
+            path = os.path.abspath(video_path)
+            content_hash = self._lookup_file_hash(path, stat)
+            if content_hash is None:
+                if self.config.full_file_hash:
+                    content_hash = hash_file(video_path)
+                else:
+                    content_hash = self._sampled_file_hash(video_path, stat.st_size)
+                self.register_file_hash(video_path, content_hash)
+            return content_hash[:16]  # Truncate for readability
             
         except Exception as e:
             logger.warning(f"Failed to compute file hash: {e}")
@@ -147,6 +337,12 @@ class AnalysisCache:
             return None
         
         cache_key = self._compute_cache_key(video_path, analysis_type, options)
+
+        cached = self._memory_get(cache_key)
+        if cached is not None:
+            self._count("memory_hits")
+            logger.debug(f"Memory cache hit for {analysis_type} analysis")
+            return cached
         
         try:
             with self._get_connection() as conn:
@@ -158,19 +354,24 @@ class AnalysisCache:
                 
                 row = cursor.fetchone()
                 
-                if row is None:
-                    return None
-                
-                result_json, expires_at = row
-                
-                # Check expiration
-                if time.time() > expires_at:
-                    logger.debug(f"Cache entry expired: {cache_key}")
-                    self._delete_entry(cache_key)
-                    return None
-                
-                logger.info(f"Cache hit for {analysis_type} analysis")
-                return json.loads(result_json)
+            if row is None:
+                self._count("misses")
+                return None
+            
+            result_json, expires_at = row
+            
+            # Check expiration
+            if time.time() > expires_at:
+                logger.debug(f"Cache entry expired: {cache_key}")
+                self._count("expired")
+                self._delete_entry(cache_key)
+                return None
+            
+            logger.info(f"Cache hit for {analysis_type} analysis")
+            self._count("disk_hits")
+            result = json.loads(result_json)
+            self._memory_put(cache_key, result, expires_at, len(result_json), video_path)
+            return _copy_result(result)
                 
         except Exception as e:
             logger.warning(f"Cache get failed: {e}")
@@ -201,8 +402,8 @@ class AnalysisCache:
         if result.get("error") or result.get("compliance_status") == "ERROR":
             return
         
-        cache_key = self._compute_cache_key(video_path, analysis_type, options)
         video_hash = self._compute_file_hash(video_path)
+        cache_key = self._compute_cache_key(video_path, analysis_type, options)
         options_hash = hashlib.md5(json.dumps(options or {}, sort_keys=True).encode()).hexdigest()[:8]
         
         ttl = (ttl_hours or self.config.default_ttl_hours) * 3600
@@ -224,7 +425,9 @@ class AnalysisCache:
                     created_at, expires_at, video_hash, file_size
                 ))
                 conn.commit()
-                
+
+            # Decoded from the stored JSON so the caller's dict is never shared
+            self._memory_put(cache_key, json.loads(result_json), expires_at, len(result_json), video_path)
             logger.info(f"Cached {analysis_type} result (expires in {ttl_hours or self.config.default_ttl_hours}h)")
             
             # Cleanup old entries periodically
@@ -261,12 +464,17 @@ class AnalysisCache:
                         WHERE video_path = ?
                     """, (video_path,))
                 conn.commit()
-                logger.info(f"Invalidated cache for {video_path}")
+            self._memory_discard(
+                lambda key, entry: entry[3] == video_path
+                and (analysis_type is None or f"_{analysis_type}_" in key)
+            )
+            logger.info(f"Invalidated cache for {video_path}")
         except Exception as e:
             logger.warning(f"Cache invalidate failed: {e}")
     
     def _delete_entry(self, cache_key: str):
         """Delete a specific cache entry."""
+        self._memory_discard(lambda key, entry: key == cache_key)
         try:
             with self._get_connection() as conn:
                 conn.execute("DELETE FROM analysis_cache WHERE cache_key = ?", (cache_key,))
@@ -315,6 +523,13 @@ class AnalysisCache:
                     GROUP BY analysis_type
                 """)
                 by_type = dict(cursor.fetchall())
+
+            with self._memory_lock:
+                counters = dict(self._counters)
+                memory_entries = len(self._memory)
+                memory_bytes = self._memory_bytes
+            hits = counters["memory_hits"] + counters["disk_hits"]
+            lookups = hits + counters["misses"] + counters["expired"]
                 
             return {
                 "enabled": True,
@@ -324,6 +539,16 @@ class AnalysisCache:
                 "by_type": by_type,
                 "max_entries": self.config.max_entries,
                 "default_ttl_hours": self.config.default_ttl_hours,
+                "hits": hits,
+                "memory_hits": counters["memory_hits"],
+                "disk_hits": counters["disk_hits"],
+                "misses": counters["misses"],
+                "expired": counters["expired"],
+                "evictions": counters["evictions"],
+                "hit_rate": (hits / lookups) if lookups else 0.0,
+                "memory_entries": memory_entries,
+                "memory_bytes": memory_bytes,
+                "memory_max_bytes": self.config.memory_max_bytes,
             }
         except Exception as e:
             return {"enabled": True, "error": str(e)}
@@ -337,6 +562,7 @@ class AnalysisCache:
             with self._get_connection() as conn:
                 conn.execute("DELETE FROM analysis_cache")
                 conn.commit()
+            self._memory_discard(lambda key, entry: True)
             logger.info("Cache cleared")
         except Exception as e:
             logger.warning(f"Cache clear failed: {e}")
@@ -358,6 +584,7 @@ __all__ = [
     "CacheConfig",
     "AnalysisCache",
     "get_analysis_cache",
+    "hash_file",
 ]
 
 
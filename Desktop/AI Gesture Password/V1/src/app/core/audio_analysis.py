@@ -0,0 +1,294 @@
+"""
+Audio Analysis
+
+One ffmpeg pass per file for every audio measurement the QC checks need.
+The audio is decoded once: the ebur128 filter reports integrated loudness,
+loudness range and true peak on stderr while the same stream is piped to
+stdout as native-rate float PCM and reduced to a peak envelope with NumPy
+(one peak per 480 interleaved samples, 5 ms for 48 kHz stereo). Head
+and tail silence and any windowed max volume are read off that envelope.
+
+Results are cached per file (path, mtime, size), so loudness, silence and
+physics checks on the same video share a single decode.
+"""
+
+import logging
+import math
+import os
+import re
+import subprocess
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Interleaved samples per envelope block. Blocks need not align with channel
+# frames: a peak is a peak whichever channel it came from.
+BLOCK_SAMPLES = 480
+DEFAULT_TIMEOUT = 120  # seconds
+# Level reported for digital silence instead of -inf
+SILENCE_FLOOR_DB = -144.0
+MAX_CACHED_ANALYSES = 16
+
+_READ_BYTES = BLOCK_SAMPLES * 4 * 256
+# Fallback stream layout if ffmpeg's output stream line cannot be parsed
+_DEFAULT_RATE = 48000
+_DEFAULT_CHANNELS = 2
+
+_OUTPUT_STREAM_PATTERN = re.compile(r"Audio: pcm_f32le, (\d+) Hz, [^,]*, flt, (\d+) kb/s")
+_INPUT_DURATION_PATTERN = re.compile(r"Duration: (\d+):(\d{2}):(\d{2}(?:\.\d+)?)")
+
+_SUMMARY_PATTERNS = {
+    "integrated_lufs": re.compile(r"I:\s+(-?[\d.]+|-?inf)\s+LUFS"),
+    "lra": re.compile(r"LRA:\s+(-?[\d.]+|-?inf)\s+LU\b"),
+    "true_peak": re.compile(r"Peak:\s+(-?[\d.]+|-?inf)\s+dBFS"),
+}
+
+
+@dataclass
+class AudioAnalysis:
+    """Loudness summary and peak envelope of a file's first audio stream."""
+    has_audio: bool = False
+    duration: float = 0.0  # seconds of decoded audio
+    container_duration: Optional[float] = None  # seconds, as ffmpeg reported the input file
+    integrated_lufs: Optional[float] = None
+    true_peak: Optional[float] = None  # dBTP
+    lra: Optional[float] = None  # LU
+    block_peaks: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float32))
+    block_seconds: float = 0.01
+
+    def max_volume_db(self, start: float = 0.0, end: Optional[float] = None) -> Optional[float]:
+        """
+        Peak sample level (dBFS) between start and end seconds, like volumedetect's max_volume.
+
+        Returns:
+            Level in dB, or None if the window holds no audio
+        """
+        first = max(0, int(math.floor(start / self.block_seconds + 1e-9)))
+        last = self.block_peaks.shape[0] if end is None else int(math.ceil(end / self.block_seconds - 1e-9))
+        window = self.block_peaks[first:max(first, last)]
+        if window.size == 0:
+            return None
+        return _to_db(float(window.max()))
+
+    def head_max_db(self, seconds: float) -> Optional[float]:
+        """Peak level over the first `seconds` of audio."""
+        return self.max_volume_db(0.0, seconds)
+
+    def tail_max_db(self, seconds: float, total_duration: Optional[float] = None) -> Optional[float]:
+        """
+        Peak level over the last `seconds` of the file.
+
+        Args:
+            seconds: Length of the tail window
+            total_duration: File duration the window ends at (defaults to
+                the container duration ffmpeg reported, else the decoded
+                audio duration). Any part of the window past the end of the
+                audio counts as silence.
+        """
+        end = total_duration or self.container_duration or self.duration
+        start = max(0.0, end - seconds)
+        if self.has_audio and start >= self.duration:
+            return SILENCE_FLOOR_DB
+        return self.max_volume_db(start, end)
+
+    def loudness(self) -> Dict[str, Optional[float]]:
+        """Loudness summary in the dict shape the loudnorm probes returned."""
+        if self.integrated_lufs is None:
+            return {}
+        return {
+            "integrated_lufs": self.integrated_lufs,
+            "true_peak": self.true_peak,
+            "lra": self.lra,
+        }
+
+
+def _to_db(amplitude: float) -> float:
+    if amplitude <= 0.0:
+        return SILENCE_FLOOR_DB
+    return max(SILENCE_FLOOR_DB, 20.0 * math.log10(amplitude))
+
+
+def _parse_stream_layout(stderr: str) -> Tuple[int, int]:
+    """(sample_rate, channels) of the piped PCM, from ffmpeg's output stream line."""
+    match = _OUTPUT_STREAM_PATTERN.search(stderr)
+    if not match:
+        return _DEFAULT_RATE, _DEFAULT_CHANNELS
+    rate = int(match.group(1))
+    # f32le bitrate is rate * 32 bits * channels
+    channels = max(1, round(int(match.group(2)) * 1000 / (rate * 32)))
+    return rate, channels
+
+
+def _parse_input_duration(stderr: str) -> Optional[float]:
+    """Container duration from ffmpeg's input description, if it knew one."""
+    match = _INPUT_DURATION_PATTERN.search(stderr)
+    if not match:
+        return None
+    hours, minutes, seconds = match.groups()
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _parse_summary(stderr: str) -> Dict[str, Optional[float]]:
+    """Read the ebur128 Summary block from ffmpeg's log output."""
+    summary_at = stderr.rfind("Summary:")
+    values: Dict[str, Optional[float]] = {}
+    if summary_at < 0:
+        return values
+    summary = stderr[summary_at:]
+    for key, pattern in _SUMMARY_PATTERNS.items():
+        match = pattern.search(summary)
+        if match:
+            values[key] = float(match.group(1))
+    return values
+
+
+def _decode(video_path: str, ffmpeg_path: str, timeout: float) -> AudioAnalysis:
+    cmd = [
+        ffmpeg_path, "-nostdin", "-hide_banner", "-nostats",
+        "-i", video_path,
+        "-map", "0:a:0?", "-vn",
+        # framelog=verbose keeps the per-100ms lines out of the default log level
+        "-af", "ebur128=peak=true:framelog=verbose",
+        "-f", "f32le", "pipe:1",
+    ]
+
+    block_peaks = []
+    pending = np.zeros(0, dtype=np.float32)
+    total_samples = 0
+
+    # stderr goes to a file so a chatty ffmpeg cannot block on a full pipe
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+        timed_out = threading.Event()
+
+        def _kill() -> None:
+            timed_out.set()
+            process.kill()
+
+        timer = threading.Timer(timeout, _kill)
+        timer.start()
+        try:
+            while True:
+                chunk = process.stdout.read(_READ_BYTES)
+                if not chunk:
+                    break
+                samples = np.frombuffer(chunk[: len(chunk) - len(chunk) % 4], dtype=np.float32)
+                total_samples += samples.shape[0]
+                if pending.size:
+                    samples = np.concatenate((pending, samples))
+                whole = samples.shape[0] - samples.shape[0] % BLOCK_SAMPLES
+                if whole:
+                    blocks = np.abs(samples[:whole]).reshape(-1, BLOCK_SAMPLES)
+                    block_peaks.append(blocks.max(axis=1))
+                pending = samples[whole:]
+            process.wait()
+        finally:
+            timer.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            process.stdout.close()
+        stderr_file.seek(0)
+        stderr = stderr_file.read().decode("utf-8", errors="replace")
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(cmd, timeout)
+
+    if pending.size:
+        block_peaks.append(np.abs(pending).max(keepdims=True))
+
+    rate, channels = _parse_stream_layout(stderr)
+    result = AudioAnalysis(
+        has_audio=total_samples > 0,
+        duration=total_samples / (rate * channels),
+        container_duration=_parse_input_duration(stderr),
+        block_peaks=np.concatenate(block_peaks) if block_peaks else np.zeros(0, dtype=np.float32),
+        block_seconds=BLOCK_SAMPLES / (rate * channels),
+    )
+    if result.has_audio:
+        summary = _parse_summary(stderr)
+        result.integrated_lufs = summary.get("integrated_lufs")
+        result.true_peak = summary.get("true_peak")
+        result.lra = summary.get("lra")
+    return result
+
+
+_analysis_cache: "OrderedDict[Tuple[str, int, int], AudioAnalysis]" = OrderedDict()
+_cache_lock = threading.Lock()
+_inflight: Dict[Tuple[str, int, int], threading.Lock] = {}
+
+
+def analyze_audio(
+    video_path: str,
+    ffmpeg_path: Optional[str] = "ffmpeg",
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Optional[AudioAnalysis]:
+    """
+    Get the audio analysis for a file, decoding it on first use.
+
+    Returns:
+        AudioAnalysis (has_audio=False if the file has no decodable audio),
+        or None if the file is missing or ffmpeg could not be run
+    """
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        logger.error(f"Audio file not found: {video_path}")
+        return None
+    if not ffmpeg_path:
+        return None
+
+    key = (os.path.abspath(video_path), stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+            return cached
+        key_lock = _inflight.setdefault(key, threading.Lock())
+
+    # One decode per file even when several checks ask at once
+    with key_lock:
+        with _cache_lock:
+            cached = _analysis_cache.get(key)
+        if cached is not None:
+            return cached
+
+        analysis = None
+        try:
+            analysis = _decode(video_path, ffmpeg_path, timeout)
+        except subprocess.TimeoutExpired:
+            logger.error(f"FFmpeg audio analysis timed out for {video_path}")
+        except FileNotFoundError:
+            logger.error(f"FFmpeg not found ({ffmpeg_path}) - cannot analyze audio")
+        except Exception as e:
+            logger.error(f"Audio analysis failed for {video_path}: {e}")
+
+        with _cache_lock:
+            _inflight.pop(key, None)
+            if analysis is None:
+                return None
+            _analysis_cache[key] = analysis
+            while len(_analysis_cache) > MAX_CACHED_ANALYSES:
+                _analysis_cache.popitem(last=False)
+
+    logger.info(
+        f"Audio analysis for {os.path.basename(video_path)}: "
+        f"{analysis.duration:.2f}s, I={analysis.integrated_lufs} LUFS, "
+        f"TP={analysis.true_peak} dBTP, LRA={analysis.lra} LU"
+    )
+    return analysis
+
+
+def clear_audio_cache() -> None:
+    """Drop all cached analyses."""
+    with _cache_lock:
+        _analysis_cache.clear()
+
+
+__all__ = ["AudioAnalysis", "analyze_audio", "clear_audio_cache"]
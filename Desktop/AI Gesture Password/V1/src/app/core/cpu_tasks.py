@@ -0,0 +1,93 @@
+"""
+CPU-bound Job Tasks
+
+Module-level task functions for ProcessPoolBackend / JobQueue process
+handlers. Each takes (job_context, report_progress) and returns a picklable
+result (JSON-serializable where it is stored as a queue job result). Heavy
+imports happen inside the task so a worker process only loads what it runs.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[float, Optional[str]], None]
+
+# Reaction pipeline is expensive to construct (model loading), keep one per process
+_reaction_pipeline = None
+_technical_verifier = None
+
+# TechnicalVerifier methods that decode frames; format checks just run ffprobe
+TECHNICAL_QC_CHECKS = ("check_safe_areas", "check_pse_risk")
+
+
+def _payload_path(job_context: Dict[str, Any], key: str) -> str:
+    path = (job_context.get("payload") or {}).get(key)
+    if not path:
+        raise RuntimeError(f"Missing {key} in job payload")
+    return path
+
+
+def analyze_reaction_task(job_context: Dict[str, Any], report_progress: ProgressCallback) -> Dict:
+    """Run the reaction analysis pipeline on payload['reaction_path']."""
+    global _reaction_pipeline
+    reaction_path = _payload_path(job_context, "reaction_path")
+    report_progress(0.0, "Loading reaction analyzer")
+    if _reaction_pipeline is None:
+        from app.features.analytics.reaction_processing import ReactionProcessingPipeline
+        _reaction_pipeline = ReactionProcessingPipeline()
+    report_progress(0.1, "Analyzing reaction video")
+    results = _reaction_pipeline.analyze(reaction_path)
+    report_progress(1.0, "Reaction analysis complete")
+    return results
+
+
+def visual_physics_task(job_context: Dict[str, Any], report_progress: ProgressCallback):
+    """Run visual physics analysis on payload['video_path']; returns a VisualPhysics."""
+    from app.core.physics_analyzer import analyze_visual_physics_sync
+
+    video_path = _payload_path(job_context, "video_path")
+    sample_rate = int((job_context.get("payload") or {}).get("sample_rate", 5))
+    report_progress(0.0, "Analyzing visual physics")
+    result = analyze_visual_physics_sync(video_path, sample_rate)
+    report_progress(1.0, "Visual physics complete")
+    return result
+
+
+def technical_qc_task(job_context: Dict[str, Any], report_progress: ProgressCallback) -> Dict:
+    """Run one frame-based TechnicalVerifier check (payload: video_path, check, options)."""
+    global _technical_verifier
+    payload = job_context.get("payload") or {}
+    video_path = _payload_path(job_context, "video_path")
+    check = payload.get("check")
+    if check not in TECHNICAL_QC_CHECKS:
+        raise RuntimeError(f"Unknown technical QC check: {check}")
+    if _technical_verifier is None:
+        from app.core.technical_qc import TechnicalVerifier
+        _technical_verifier = TechnicalVerifier()
+    report_progress(0.0, f"Running {check}")
+    result = getattr(_technical_verifier, check)(video_path, **(payload.get("options") or {}))
+    report_progress(1.0, f"{check} complete")
+    return result
+
+
+def render_report_task(job_context: Dict[str, Any], report_progress: ProgressCallback) -> str:
+    """Render a PDF report (payload: kind, inputs, output_path) with reportlab."""
+    from app.features.reporting.report_cache import render_report
+
+    payload = job_context.get("payload") or {}
+    output_path = _payload_path(job_context, "output_path")
+    report_progress(0.0, f"Rendering {payload.get('kind')} report")
+    render_report(payload["kind"], payload["inputs"], output_path)
+    report_progress(1.0, "Report rendered")
+    return output_path
+
+
+__all__ = [
+    "TECHNICAL_QC_CHECKS",
+    "analyze_reaction_task",
+    "render_report_task",
+    "technical_qc_task",
+    "visual_physics_task",
+]
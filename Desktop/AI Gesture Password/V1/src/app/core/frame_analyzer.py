@@ -101,6 +101,35 @@ class ExtractedFrame:
     base64_image: str  # Base64-encoded JPEG
 
 
+def metadata_from_capture(cap: cv2.VideoCapture) -> VideoMetadata:
+    """
+    Build VideoMetadata from an opened capture.
+    
+    Args:
+        cap: Opened cv2.VideoCapture
+        
+    Returns:
+        VideoMetadata
+    """
+    fps = cap.get(cv2.CAP_PROP_FPS) or 25
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
+    codec = "".join([chr((fourcc >> 8 * i) & 0xFF) for i in range(4)])
+    
+    duration = total_frames / fps if fps > 0 else 0.0
+    
+    return VideoMetadata(
+        duration=round(duration, 2),
+        fps=fps,
+        total_frames=total_frames,
+        width=width,
+        height=height,
+        codec=codec.strip()
+    )
+
+
 def get_video_metadata(video_path: str) -> Optional[VideoMetadata]:
     """
     Get metadata for a video file.
@@ -117,38 +146,22 @@ def get_video_metadata(video_path: str) -> Optional[VideoMetadata]:
             logger.error(f"Could not open video: {video_path}")
             return None
         
-        fps = cap.get(cv2.CAP_PROP_FPS) or 25
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        fourcc = int(cap.get(cv2.CAP_PROP_FOURCC))
-        codec = "".join([chr((fourcc >> 8 * i) & 0xFF) for i in range(4)])
-        
-        duration = total_frames / fps if fps > 0 else 0.0
-        
+        metadata = metadata_from_capture(cap)
         cap.release()
-        
-        return VideoMetadata(
-            duration=round(duration, 2),
-            fps=fps,
-            total_frames=total_frames,
-            width=width,
-            height=height,
-            codec=codec.strip()
-        )
+        return metadata
         
     except Exception as e:
         logger.error(f"Error getting video metadata: {e}")
         return None
 
 
-def encode_frame(frame: np.ndarray, max_width: int = 960, quality: int = 80) -> str:
+def encode_frame(frame: np.ndarray, max_width: Optional[int] = 960, quality: int = 80) -> str:
     """
     Resize (if needed) and encode a frame to base64 JPEG.
     
     Args:
         frame: OpenCV frame (BGR)
-        max_width: Maximum width to resize to
+        max_width: Maximum width to resize to (None keeps the source size)
         quality: JPEG quality (1-100)
         
     Returns:
@@ -160,7 +173,7 @@ def encode_frame(frame: np.ndarray, max_width: int = 960, quality: int = 80) ->
     height, width = frame.shape[:2]
     
     # Resize if too wide
-    if width > max_width:
+    if max_width and width > max_width:
         scale = max_width / width
         new_width = int(width * scale)
         new_height = int(height * scale)
@@ -295,162 +308,80 @@ def validate_frame_quality(
     )
 
 
-def _sequential_read_to_frame(cap: cv2.VideoCapture, target_frame: int, current_frame: int) -> Tuple[bool, Optional[np.ndarray], int]:
-    """
-    Read frames sequentially until reaching target frame.
-    Used as fallback when seeking fails.
-    
-    Returns:
-        Tuple of (success, frame, actual_frame_number)
-    """
-    while current_frame < target_frame:
-        ret, _ = cap.read()
-        if not ret:
-            return False, None, current_frame
-        current_frame += 1
-    
-    ret, frame = cap.read()
-    if ret:
-        return True, frame, current_frame + 1
-    return False, None, current_frame
-
-
 def extract_frames_with_timestamps(
     video_path: str,
     num_frames: int = 20,
-    max_width: int = 960,
+    max_width: Optional[int] = 960,
     quality: int = 80,
     validate_quality: bool = True
 ) -> List[ExtractedFrame]:
     """
     Extract key frames from video with timestamps.
 
-    Frames are extracted at regular intervals to cover the entire video duration.
-    Includes seek verification, fallback to sequential reading if seeking fails,
-    and optional quality validation (brightness, blur detection).
+    Frames are evenly distributed to cover the entire video duration and are
+    served from the shared frame store, so the video is decoded once no matter
+    how many analyzers ask for frames. Includes duplicate detection and
+    optional quality validation (brightness, blur detection).
 
     Args:
         video_path: Path to video file
         num_frames: Number of frames to extract (default 20)
-        max_width: Maximum frame width for encoding
+        max_width: Maximum frame width for encoding (None keeps the source size)
         quality: JPEG quality (1-100)
         validate_quality: If True, filter out black/overexposed/blurry frames
 
     Returns:
         List of ExtractedFrame objects
     """
+    from app.core.frame_store import SAMPLE_JPEG_QUALITY, get_frame_store
+
     frames: List[ExtractedFrame] = []
     frame_hashes: List[str] = []
-    seek_failures = 0
     duplicate_warnings = 0
     quality_rejections = {"black_frame": 0, "overexposed": 0, "blurry": 0}
     
     try:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            logger.error(f"Could not open video: {video_path}")
-            return frames
-        
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = cap.get(cv2.CAP_PROP_FPS) or 25
-        
-        if total_frames <= 0 or fps <= 0:
+        store = get_frame_store(video_path)
+        if store is None:
             logger.warning("Could not determine video properties for frame extraction")
-            cap.release()
             return frames
         
-        # Track current position for sequential fallback
-        last_read_frame = -1
+        # Stored samples are source-size JPEGs; reuse them when no re-encode is needed
+        reuse_jpeg = quality == SAMPLE_JPEG_QUALITY and (not max_width or store.metadata.width <= max_width)
         
-        # Calculate frame positions to extract (evenly distributed)
-        for i in range(num_frames):
-            if num_frames == 1:
-                frame_pos = 0
+        for sample in store.sampled_frames(num_frames):
+            # Quality validation (optional) - metrics were computed at full resolution
+            if validate_quality and not sample.quality.valid:
+                reason = sample.quality.reason
+                quality_rejections[reason] = quality_rejections.get(reason, 0) + 1
+                if quality_rejections[reason] <= 3:  # Limit log spam
+                    logger.debug(f"Frame at position {sample.index} rejected: {reason} "
+                               f"(brightness={sample.quality.brightness:.1f}, "
+                               f"sharpness={sample.quality.sharpness:.1f})")
+                continue  # Skip this frame, try next position
+
+            # Check for duplicates
+            if frame_hashes and sample.frame_hash == frame_hashes[-1]:
+                duplicate_warnings += 1
+                if duplicate_warnings <= 3:  # Limit log spam
+                    logger.warning(f"Possible duplicate frame detected at position {sample.index} (same hash as previous)")
+
+            frame_hashes.append(sample.frame_hash)
+
+            timestamp_sec = store.timestamp_for(sample.index)
+            if reuse_jpeg:
+                base64_img = base64.b64encode(sample.jpeg).decode('utf-8')
             else:
-                frame_pos = int((i / (num_frames - 1)) * (total_frames - 1))
-            
-            frame = None
-            actual_pos = frame_pos
-            
-            # Try to seek
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-            
-            # Verify seek position
-            reported_pos = cap.get(cv2.CAP_PROP_POS_FRAMES)
-            seek_delta = abs(reported_pos - frame_pos)
-            
-            if seek_delta > 5:
-                # Seek failed significantly - log warning
-                logger.warning(f"Seek to frame {frame_pos} landed at {reported_pos} (delta: {seek_delta:.0f})")
-                seek_failures += 1
-                
-                # If seek is way off and we need to go forward, try sequential
-                if reported_pos < frame_pos and (frame_pos - last_read_frame) < 100:
-                    # Only use sequential if target is reasonably close
-                    success, seq_frame, new_pos = _sequential_read_to_frame(cap, frame_pos, int(reported_pos))
-                    if success and seq_frame is not None:
-                        frame = seq_frame
-                        actual_pos = new_pos - 1
-                        last_read_frame = new_pos
-                        logger.debug(f"Sequential fallback succeeded for frame {frame_pos}")
-            
-            # If sequential didn't work or wasn't attempted, try normal read
-            if frame is None:
-                ret, frame = cap.read()
-                if ret:
-                    last_read_frame = int(cap.get(cv2.CAP_PROP_POS_FRAMES))
-                else:
-                    frame = None
-            
-            if frame is not None:
-                # Quality validation (optional)
-                if validate_quality:
-                    quality_result = validate_frame_quality(frame)
-                    if not quality_result.valid:
-                        reason = quality_result.reason
-                        quality_rejections[reason] = quality_rejections.get(reason, 0) + 1
-                        if quality_rejections[reason] <= 3:  # Limit log spam
-                            logger.debug(f"Frame at position {frame_pos} rejected: {reason} "
-                                       f"(brightness={quality_result.brightness:.1f}, "
-                                       f"sharpness={quality_result.sharpness:.1f})")
-                        continue  # Skip this frame, try next position
-
-                # Compute hash for duplicate detection
-                frame_hash = _compute_frame_hash(frame)
+                base64_img = encode_frame(sample.decode(), max_width=max_width, quality=quality)
 
-                # Check for duplicates
-                if frame_hashes and frame_hash == frame_hashes[-1]:
-                    duplicate_warnings += 1
-                    if duplicate_warnings <= 3:  # Limit log spam
-                        logger.warning(f"Possible duplicate frame detected at position {frame_pos} (same hash as previous)")
-
-                frame_hashes.append(frame_hash)
-
-                # Get actual timestamp if available
-                actual_timestamp_ms = cap.get(cv2.CAP_PROP_POS_MSEC)
-                if actual_timestamp_ms > 0:
-                    timestamp_sec = actual_timestamp_ms / 1000.0
-                else:
-                    # Fallback to calculated timestamp
-                    timestamp_sec = actual_pos / fps
-
-                timestamp_str = format_timestamp(timestamp_sec)
-                base64_img = encode_frame(frame, max_width=max_width, quality=quality)
-
-                frames.append(ExtractedFrame(
-                    index=actual_pos,
-                    timestamp=timestamp_str,
-                    timestamp_sec=round(timestamp_sec, 2),
-                    base64_image=base64_img
-                ))
-            else:
-                logger.warning(f"Failed to read frame at position {frame_pos}")
-
-        cap.release()
+            frames.append(ExtractedFrame(
+                index=sample.index,
+                timestamp=format_timestamp(timestamp_sec),
+                timestamp_sec=round(timestamp_sec, 2),
+                base64_image=base64_img
+            ))
 
         # Summary logging
-        if seek_failures > 0:
-            logger.warning(f"Frame extraction had {seek_failures} seek failures (fallback used)")
         if duplicate_warnings > 0:
             logger.warning(f"Frame extraction detected {duplicate_warnings} potential duplicates")
         total_rejected = sum(quality_rejections.values())
@@ -639,6 +570,7 @@ __all__ = [
     "FrameQualityResult",
     "generate_external_id",
     "get_video_metadata",
+    "metadata_from_capture",
     "encode_frame",
     "format_timestamp",
     "validate_frame_quality",
@@ -0,0 +1,357 @@
+"""
+Shared Frame Store
+
+Decodes a video once and serves the results to every per-video analyzer:
+- Evenly distributed sample frames (JPEG encoded at source resolution, with
+  quality/hash metadata); other counts are decoded on demand by seeking
+- Downscaled luma planes for every frame
+- Per-frame statistics (mean luminance, mean intensity, 256-bin histograms)
+- Medium resolution luma planes sampled once per second (safe-area checks)
+
+Consumers call get_frame_store(video_path) and receive a loaded store. Stores
+are cached per file (path + mtime + size) in a small LRU so the frame extractor,
+Clearcast checker, technical QC and physics analyzer share a single decode pass.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.frame_analyzer import (
+    FrameQualityResult,
+    VideoMetadata,
+    _compute_frame_hash,
+    metadata_from_capture,
+    validate_frame_quality,
+)
+
+logger = logging.getLogger(__name__)
+
+# Width of the per-frame luma planes (PSE, cuts, motion, brightness)
+LUMA_WIDTH = 160
+# Width of the once-per-second luma planes (safe-area checks)
+DETAIL_LUMA_WIDTH = 480
+# Sample frames keep the source resolution and OpenCV's default JPEG quality,
+# which is what the Clearcast compliance pass has always sent. Consumers that
+# want smaller frames (AI breakdown: 960px, q80) re-encode from these.
+SAMPLE_JPEG_QUALITY = 95
+# Evenly distributed frame counts requested by the analyzers
+# (Clearcast = 20, AI breakdown full = 15, AI breakdown quick = 8)
+DEFAULT_SAMPLE_COUNTS = (20, 15, 8)
+# Thumbnail is taken 10% into the video
+THUMBNAIL_POSITION = 0.1
+# Number of decoded videos kept in memory
+MAX_CACHED_STORES = 2
+
+
+def evenly_spaced_indices(total_frames: int, count: int) -> List[int]:
+    """Frame indices for `count` frames evenly distributed over the video."""
+    if total_frames <= 0 or count <= 0:
+        return []
+    if count == 1:
+        return [0]
+    return [int((i / (count - 1)) * (total_frames - 1)) for i in range(count)]
+
+
+def _scale_to_width(width: int, height: int, target_width: int) -> Tuple[int, int]:
+    """Return (w, h) scaled to target_width, never upscaling."""
+    if width <= target_width:
+        return width, height
+    scale = target_width / width
+    return target_width, max(1, int(round(height * scale)))
+
+
+class SampledFrame:
+    """A retained sample frame with metadata computed at full resolution."""
+
+    __slots__ = ("index", "jpeg", "quality", "frame_hash")
+
+    def __init__(self, index: int, jpeg: bytes, quality: FrameQualityResult, frame_hash: str):
+        self.index = index
+        self.jpeg = jpeg
+        self.quality = quality
+        self.frame_hash = frame_hash
+
+    def decode(self) -> Optional[np.ndarray]:
+        """Decode the stored JPEG back to a BGR frame."""
+        return cv2.imdecode(np.frombuffer(self.jpeg, np.uint8), cv2.IMREAD_COLOR)
+
+
+class VideoFrameStore:
+    """
+    Single-decode frame store for one video file.
+
+    Call load() (or use get_frame_store) before reading any attribute. load()
+    is idempotent and thread-safe, so concurrent analyzers block on the first
+    decode instead of starting their own.
+    """
+
+    def __init__(
+        self,
+        video_path: str,
+        luma_width: int = LUMA_WIDTH,
+        detail_width: int = DETAIL_LUMA_WIDTH,
+        sample_counts: Sequence[int] = DEFAULT_SAMPLE_COUNTS,
+    ):
+        self.video_path = video_path
+        self.luma_width = luma_width
+        self.detail_width = detail_width
+        self.sample_counts = tuple(sample_counts)
+
+        self.metadata: Optional[VideoMetadata] = None
+        self.frame_count = 0
+        self.luma: np.ndarray = np.zeros((0, 0, 0), dtype=np.uint8)
+        self.mean_luma: np.ndarray = np.zeros(0, dtype=np.float32)
+        self.mean_intensity: np.ndarray = np.zeros(0, dtype=np.float32)
+        self.histograms: np.ndarray = np.zeros((0, 256), dtype=np.float32)
+        self.detail_step = 1
+        self.detail_luma: Dict[int, np.ndarray] = {}
+        self.samples: Dict[int, SampledFrame] = {}
+        self._detail_stack: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._ok = False
+
+    @property
+    def fps(self) -> float:
+        return self.metadata.fps if self.metadata else 25.0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def sample_plan(self, total_frames: int) -> List[int]:
+        """All frame indices that are retained as sample frames."""
+        plan = set()
+        for count in self.sample_counts:
+            plan.update(evenly_spaced_indices(total_frames, count))
+        if total_frames > 0:
+            plan.add(int(total_frames * THUMBNAIL_POSITION))
+        return sorted(plan)
+
+    def load(self) -> bool:
+        """
+        Decode the video once, sequentially.
+
+        Returns:
+            True if at least one frame was decoded
+        """
+        with self._lock:
+            if self._loaded:
+                return self._ok
+            try:
+                self._ok = self._decode()
+            except Exception as e:
+                logger.error(f"Frame store decode failed for {self.video_path}: {e}")
+                self._ok = False
+            self._loaded = True
+            return self._ok
+
+    def _decode(self) -> bool:
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            logger.error(f"Could not open video: {self.video_path}")
+            return False
+
+        try:
+            self.metadata = metadata_from_capture(cap)
+            width, height = self.metadata.width, self.metadata.height
+            if width <= 0 or height <= 0:
+                logger.warning("Could not determine video dimensions for frame store")
+                return False
+
+            luma_size = _scale_to_width(width, height, self.luma_width)
+            detail_size = _scale_to_width(width, height, self.detail_width)
+            self.detail_step = max(1, int(self.fps))
+            keep = set(self.sample_plan(self.metadata.total_frames))
+
+            lumas: List[np.ndarray] = []
+            mean_luma: List[float] = []
+            mean_intensity: List[float] = []
+            histograms: List[np.ndarray] = []
+
+            index = 0
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+
+                small = cv2.resize(frame, luma_size, interpolation=cv2.INTER_AREA)
+                luma = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+                lumas.append(luma)
+                mean_luma.append(float(luma.mean()))
+                mean_intensity.append(float(small.mean()))
+                histograms.append(cv2.calcHist([luma], [0], None, [256], [0, 256]).ravel())
+
+                if index % self.detail_step == 0:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    self.detail_luma[index] = cv2.resize(gray, detail_size, interpolation=cv2.INTER_AREA)
+
+                if index in keep:
+                    self.samples[index] = self._make_sample(index, frame)
+
+                index += 1
+        finally:
+            cap.release()
+
+        self.frame_count = index
+        if index == 0:
+            logger.warning(f"No frames decoded from {self.video_path}")
+            return False
+
+        self.luma = np.stack(lumas)
+        self.mean_luma = np.asarray(mean_luma, dtype=np.float32)
+        self.mean_intensity = np.asarray(mean_intensity, dtype=np.float32)
+        self.histograms = np.stack(histograms).astype(np.float32)
+
+        logger.info(
+            f"Frame store decoded {index} frames from {os.path.basename(self.video_path)} "
+            f"({len(self.samples)} samples, {len(self.detail_luma)} detail planes)"
+        )
+        return True
+
+    def _make_sample(self, index: int, frame: np.ndarray) -> SampledFrame:
+        quality = validate_frame_quality(frame)
+        frame_hash = _compute_frame_hash(frame)
+        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, SAMPLE_JPEG_QUALITY])
+        return SampledFrame(index, buffer.tobytes(), quality, frame_hash)
+
+    def timestamp_for(self, index: int) -> float:
+        """Seconds from start for a frame index."""
+        return index / self.fps if self.fps > 0 else 0.0
+
+    def sampled_frames(self, count: int) -> List[SampledFrame]:
+        """
+        Evenly distributed sample frames.
+
+        Positions that were not retained during the decode (counts outside
+        sample_counts) are read on demand by seeking, and kept for later calls.
+        """
+        if not self._ok or not self.metadata:
+            return []
+        indices = evenly_spaced_indices(self.metadata.total_frames, count)
+        missing = [index for index in indices if index not in self.samples]
+        if missing:
+            self._read_samples(missing)
+        return [self.samples[index] for index in indices if index in self.samples]
+
+    def _read_samples(self, indices: Sequence[int]) -> None:
+        """Seek to and retain sample frames that the sequential decode skipped."""
+        with self._lock:
+            indices = [index for index in indices if index not in self.samples]
+            if not indices:
+                return
+            cap = cv2.VideoCapture(self.video_path)
+            try:
+                for index in indices:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+                    ret, frame = cap.read()
+                    if not ret:
+                        logger.warning(f"Could not read sample frame {index} from {self.video_path}")
+                        continue
+                    self.samples[index] = self._make_sample(index, frame)
+            finally:
+                cap.release()
+
+    def thumbnail_frame(self) -> Optional[SampledFrame]:
+        """Sample frame used for the video thumbnail (10% into the video)."""
+        if not self._ok or not self.metadata:
+            return None
+        index = int(self.metadata.total_frames * THUMBNAIL_POSITION)
+        sample = self.samples.get(index)
+        if sample is None and self.samples:
+            sample = self.samples[min(self.samples, key=lambda i: abs(i - index))]
+        return sample
+
+    def detail_planes(self) -> List[Tuple[int, np.ndarray]]:
+        """Once-per-second luma planes as (frame_index, plane), in order."""
+        return sorted(self.detail_luma.items())
+
+    def detail_stack(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Once-per-second luma planes stacked for batch processing.
+
+        Returns:
+            (frame_indices, planes) with shapes (n,) and (n, h, w)
+        """
+        if self._detail_stack is None:
+            planes = self.detail_planes()
+            if planes:
+                indices = np.fromiter((i for i, _ in planes), dtype=np.int64, count=len(planes))
+                self._detail_stack = (indices, np.stack([plane for _, plane in planes]))
+            else:
+                self._detail_stack = (np.zeros(0, dtype=np.int64), np.zeros((0, 0, 0), dtype=np.uint8))
+        return self._detail_stack
+
+
+_store_cache: "OrderedDict[Tuple[str, float, int], VideoFrameStore]" = OrderedDict()
+_store_cache_lock = threading.Lock()
+
+
+def _store_key(video_path: str) -> Optional[Tuple[str, float, int]]:
+    try:
+        stat = os.stat(video_path)
+    except OSError:
+        return None
+    return (os.path.abspath(video_path), stat.st_mtime, stat.st_size)
+
+
+def get_frame_store(video_path: str) -> Optional[VideoFrameStore]:
+    """
+    Get the loaded frame store for a video, decoding it on first use.
+
+    Returns:
+        VideoFrameStore, or None if the file is missing or cannot be decoded
+    """
+    key = _store_key(video_path)
+    if key is None:
+        logger.error(f"Could not open video: {video_path}")
+        return None
+
+    with _store_cache_lock:
+        store = _store_cache.get(key)
+        if store is None:
+            store = VideoFrameStore(video_path)
+            _store_cache[key] = store
+            while len(_store_cache) > MAX_CACHED_STORES:
+                _store_cache.popitem(last=False)
+        else:
+            _store_cache.move_to_end(key)
+
+    # Decode outside the cache lock so different videos load in parallel
+    return store if store.load() else None
+
+
+def peek_frame_store(video_path: str) -> Optional[VideoFrameStore]:
+    """Return an already decoded frame store without triggering a decode."""
+    key = _store_key(video_path)
+    if key is None:
+        return None
+    with _store_cache_lock:
+        store = _store_cache.get(key)
+    if store is not None and store.loaded and store.load():
+        return store
+    return None
+
+
+def release_frame_store(video_path: str) -> None:
+    """Drop any cached frame store for a video (e.g. when it is deleted)."""
+    with _store_cache_lock:
+        for key in [k for k in _store_cache if k[0] == os.path.abspath(video_path)]:
+            del _store_cache[key]
+
+
+__all__ = [
+    "SampledFrame",
+    "VideoFrameStore",
+    "evenly_spaced_indices",
+    "get_frame_store",
+    "peek_frame_store",
+    "release_frame_store",
+]
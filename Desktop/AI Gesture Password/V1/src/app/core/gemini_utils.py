@@ -1,12 +1,26 @@
 """Utility functions for Gemini API model management"""
 
 import asyncio
+import hashlib
 import logging
-import google.generativeai as genai
-from typing import Optional, Any
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional, Any, Callable, Dict, Tuple
 
 logger = logging.getLogger(__name__)
 
+# google.generativeai takes most of a second to import; _genai() loads it on first use
+genai = None
+
+
+def _genai():
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+    return genai
+
 
 def safe_get_response_text(response: Any) -> Optional[str]:
     """
@@ -65,25 +79,20 @@ MODEL_PREFERENCES = {
     'flash': ['gemini-3-flash-preview', 'gemini-2.5-flash', 'gemini-flash-latest', 'gemini-2.0-flash']
 }
 
-def get_available_model(model_type: str = 'pro', api_key: Optional[str] = None) -> Optional[str]:
-    """
-    Get an available Gemini model name, trying preferred models in order.
-    
-    Args:
-        model_type: 'pro' for high-quality models, 'flash' for faster models
-        api_key: Optional API key (if None, uses configured key)
-        
-    Returns:
-        Model name string if available, None otherwise
-    """
-    if api_key:
-        genai.configure(api_key=api_key)
-    
+# How long a resolved model name is trusted before it is re-checked against
+# list_models(). Stale entries are still served while a background refresh runs.
+MODEL_REGISTRY_TTL = 3600.0
+# Failed resolutions (e.g. network errors) are retried sooner
+MODEL_REGISTRY_NEGATIVE_TTL = 60.0
+
+
+def _resolve_model_name(model_type: str) -> Optional[str]:
+    """Resolve a model type to a model name (network: list_models)."""
     models_to_try = MODEL_PREFERENCES.get(model_type, MODEL_PREFERENCES['pro'])
     
     # First, try to get available models from API
     try:
-        available_models = genai.list_models()
+        available_models = _genai().list_models()
         available_model_names = {m.name.replace('models/', '') for m in available_models 
                                  if 'generateContent' in m.supported_generation_methods}
         
@@ -112,7 +121,7 @@ def get_available_model(model_type: str = 'pro', api_key: Optional[str] = None)
     # Fallback: try direct instantiation
     for model_name in models_to_try:
         try:
-            test_model = genai.GenerativeModel(model_name)
+            test_model = _genai().GenerativeModel(model_name)
             logger.info(f"Found available Gemini model: {model_name}")
             return model_name
         except Exception as e:
@@ -124,10 +133,218 @@ def get_available_model(model_type: str = 'pro', api_key: Optional[str] = None)
     logger.warning(f"No available {model_type} model found. Tried: {models_to_try}")
     return None
 
+
+class ModelRegistry:
+    """
+    Process-wide cache of resolved Gemini model names and model instances.
+
+    Model types ('pro', 'flash') are resolved once per API key and cached for
+    MODEL_REGISTRY_TTL seconds; after that the cached name keeps being served
+    while a background thread re-resolves it. GenerativeModel instances are
+    cached per (API key, model name).
+    """
+
+    def __init__(self, ttl: float = MODEL_REGISTRY_TTL, negative_ttl: float = MODEL_REGISTRY_NEGATIVE_TTL):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._lock = threading.RLock()
+        # (key fingerprint, model_type) -> (model name or None, resolved_at)
+        self._resolved: Dict[Tuple[str, str], Tuple[Optional[str], float]] = {}
+        # (key fingerprint, model name) -> GenerativeModel
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._refreshing: set = set()
+        self._configured_key: Optional[str] = None
+        # Optional factory(model_type) -> model that bypasses resolution entirely
+        self._override: Optional[Callable[[str], Any]] = None
+
+    def set_override(self, factory: Optional[Callable[[str], Any]]) -> None:
+        """
+        Serve models from `factory(model_type)` instead of Gemini (None restores).
+
+        Used by offline replay clients for tests and benchmarks.
+        """
+        with self._lock:
+            self._override = factory
+
+    @property
+    def override(self) -> Optional[Callable[[str], Any]]:
+        return self._override
+
+    @staticmethod
+    def _fingerprint(api_key: Optional[str]) -> str:
+        if not api_key:
+            return ""
+        return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+    def configure(self, api_key: Optional[str]) -> str:
+        """
+        Configure genai for api_key (only when it changes) and return its fingerprint.
+
+        The registry is the only place that calls genai.configure, so the key
+        it last configured is always the one genai is using.
+        """
+        fingerprint = self._fingerprint(api_key)
+        if api_key:
+            with self._lock:
+                if self._configured_key != fingerprint:
+                    _genai().configure(api_key=api_key)
+                    self._configured_key = fingerprint
+        return fingerprint
+
+    def _is_fresh(self, entry: Tuple[Optional[str], float]) -> bool:
+        model_name, resolved_at = entry
+        ttl = self.ttl if model_name else self.negative_ttl
+        return time.monotonic() - resolved_at < ttl
+
+    def _store(self, cache_key: Tuple[str, str], model_name: Optional[str]) -> None:
+        with self._lock:
+            previous = self._resolved.get(cache_key)
+            self._resolved[cache_key] = (model_name, time.monotonic())
+        if previous and previous[0] != model_name:
+            logger.info(f"Gemini {cache_key[1]} model changed: {previous[0]} -> {model_name}")
+
+    def _refresh_in_background(self, cache_key: Tuple[str, str]) -> None:
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh() -> None:
+            try:
+                self._store(cache_key, _resolve_model_name(cache_key[1]))
+            except Exception as e:
+                logger.warning(f"Background Gemini model refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        threading.Thread(target=refresh, name="gemini-model-refresh", daemon=True).start()
+
+    def resolve(self, model_type: str = 'pro', api_key: Optional[str] = None) -> Optional[str]:
+        """Model name for a model type, resolving it on first use."""
+        cache_key = (self.configure(api_key), model_type)
+        with self._lock:
+            entry = self._resolved.get(cache_key)
+
+        if entry is not None:
+            if not self._is_fresh(entry):
+                if entry[0]:
+                    # Serve the known-good name; re-check off the request path
+                    self._refresh_in_background(cache_key)
+                else:
+                    entry = None
+            if entry is not None:
+                return entry[0]
+
+        model_name = _resolve_model_name(model_type)
+        self._store(cache_key, model_name)
+        return model_name
+
+    def get_model(self, model_name: str, api_key: Optional[str] = None):
+        """Cached GenerativeModel instance for a model name."""
+        cache_key = (self.configure(api_key), model_name)
+        with self._lock:
+            model = self._models.get(cache_key)
+            if model is None:
+                model = _genai().GenerativeModel(model_name)
+                self._models[cache_key] = model
+        return model
+
+    def create_model(self, model_type: str = 'pro', api_key: Optional[str] = None, fallback_to_pro: bool = True):
+        """Live Gemini model for a model type, ignoring any override (see create_gemini_model)."""
+        model_name = self.resolve(model_type, api_key)
+
+        # Fallback logic
+        if not model_name and model_type == 'flash' and fallback_to_pro:
+            logger.info("Flash model not available, falling back to pro model")
+            model_name = self.resolve('pro', api_key)
+
+        if model_name:
+            try:
+                return self.get_model(model_name, api_key)
+            except Exception as e:
+                logger.error(f"Failed to create model {model_name}: {e}")
+                return None
+
+        return None
+
+    def invalidate(self, model_type: Optional[str] = None) -> None:
+        """
+        Forget resolved names (all, or one model type) so the next call re-resolves.
+
+        Use after an API key rotation or when a model starts returning 404s.
+        """
+        with self._lock:
+            if model_type is None:
+                self._resolved.clear()
+                self._models.clear()
+                self._configured_key = None
+            else:
+                names = {name for (_, kind), (name, _) in self._resolved.items() if kind == model_type}
+                self._resolved = {k: v for k, v in self._resolved.items() if k[1] != model_type}
+                self._models = {k: v for k, v in self._models.items() if k[1] not in names}
+        logger.info(f"Gemini model registry invalidated ({model_type or 'all'})")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Resolved names and their age, for diagnostics."""
+        now = time.monotonic()
+        with self._lock:
+            return {
+                "resolved": {
+                    model_type: {"model": name, "age_seconds": round(now - resolved_at, 1)}
+                    for (_, model_type), (name, resolved_at) in self._resolved.items()
+                },
+                "cached_models": len(self._models),
+                "ttl_seconds": self.ttl,
+            }
+
+
+_model_registry: Optional[ModelRegistry] = None
+_model_registry_lock = threading.Lock()
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get the process-wide model registry."""
+    global _model_registry
+    if _model_registry is None:
+        with _model_registry_lock:
+            if _model_registry is None:
+                _model_registry = ModelRegistry()
+    return _model_registry
+
+
+def invalidate_model_registry(model_type: Optional[str] = None) -> None:
+    """Drop cached model resolutions (see ModelRegistry.invalidate)."""
+    get_model_registry().invalidate(model_type)
+
+
+def configure_gemini(api_key: Optional[str]) -> None:
+    """Point google.generativeai at api_key; use this instead of calling genai.configure."""
+    get_model_registry().configure(api_key)
+
+
+def get_available_model(model_type: str = 'pro', api_key: Optional[str] = None) -> Optional[str]:
+    """
+    Get an available Gemini model name, trying preferred models in order.
+    
+    Resolved names are cached in the model registry, so list_models() is only
+    called on first use and when the cached entry expires.
+    
+    Args:
+        model_type: 'pro' for high-quality models, 'flash' for faster models
+        api_key: Optional API key (if None, uses configured key)
+        
+    Returns:
+        Model name string if available, None otherwise
+    """
+    return get_model_registry().resolve(model_type, api_key)
+
 def create_gemini_model(model_type: str = 'pro', api_key: Optional[str] = None, fallback_to_pro: bool = True):
     """
     Create a Gemini model instance with automatic fallback.
     
+    Instances are shared per (API key, model name) through the model registry.
+    
     Args:
         model_type: 'pro' for high-quality models, 'flash' for faster models
         api_key: Optional API key (if None, uses configured key)
@@ -136,24 +353,11 @@ def create_gemini_model(model_type: str = 'pro', api_key: Optional[str] = None,
     Returns:
         GenerativeModel instance or None if no models available
     """
-    if api_key:
-        genai.configure(api_key=api_key)
-    
-    model_name = get_available_model(model_type, api_key)
-    
-    # Fallback logic
-    if not model_name and model_type == 'flash' and fallback_to_pro:
-        logger.info("Flash model not available, falling back to pro model")
-        model_name = get_available_model('pro', api_key)
-    
-    if model_name:
-        try:
-            return genai.GenerativeModel(model_name)
-        except Exception as e:
-            logger.error(f"Failed to create model {model_name}: {e}")
-            return None
-    
-    return None
+    registry = get_model_registry()
+    override = registry.override
+    if override is not None:
+        return override(model_type)
+    return registry.create_model(model_type, api_key, fallback_to_pro)
 
 
 # Safety settings to reduce false positive blocks on advertising content
@@ -166,6 +370,12 @@ SAFETY_SETTINGS = [
 ]
 
 
+# Optional cap on concurrent generate_with_timeout() calls. Callers that fan
+# out many LLM calls (e.g. the Ad Script Lab stage graph) set a semaphore here;
+# it propagates into every task they spawn.
+llm_call_budget: ContextVar[Optional[asyncio.Semaphore]] = ContextVar("llm_call_budget", default=None)
+
+
 async def generate_with_timeout(
     model,
     prompt: str,
@@ -197,16 +407,24 @@ async def generate_with_timeout(
     if safety_settings is None:
         safety_settings = SAFETY_SETTINGS
 
+    budget = llm_call_budget.get()
     try:
-        response = await asyncio.wait_for(
-            asyncio.to_thread(
-                model.generate_content,
-                prompt,
-                generation_config=generation_config,
-                safety_settings=safety_settings
-            ),
-            timeout=timeout_seconds
-        )
+        # Waiting for a budget slot does not count against the call's timeout
+        if budget is not None:
+            await budget.acquire()
+        try:
+            response = await asyncio.wait_for(
+                asyncio.to_thread(
+                    model.generate_content,
+                    prompt,
+                    generation_config=generation_config,
+                    safety_settings=safety_settings
+                ),
+                timeout=timeout_seconds
+            )
+        finally:
+            if budget is not None:
+                budget.release()
         return safe_get_response_text(response)
     except asyncio.TimeoutError:
         logger.error(f"Gemini API call timed out after {timeout_seconds}s")
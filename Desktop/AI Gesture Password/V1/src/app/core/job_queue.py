@@ -1,36 +1,143 @@
 import asyncio
+import functools
+import heapq
+import itertools
 import logging
-from collections import deque
 from datetime import datetime
-from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from app.core.error_handler import classify_error
+from app.core.process_pool import ProcessPoolBackend, ProcessTask
 from app.core.video_storage import VideoAnalysisStorage
 
 JobHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+ResultHandler = Callable[[Dict[str, Any], Any], None]
+
+# Number of worker coroutines pulling from the queue
+DEFAULT_NUM_WORKERS = 4
+# Max jobs of each type running at once. Job types not listed here run one at
+# a time, which keeps the old sequential behaviour for new job types.
+DEFAULT_CONCURRENCY_LIMITS: Dict[str, int] = {
+    "video_transcode": 1,
+    "reaction": 4,
+    "video_analysis": 2,
+}
+DEFAULT_TYPE_LIMIT = 1
 
 
 class JobQueue:
-    """Simple sequential job queue backed by VideoAnalysisStorage."""
+    """
+    Bounded multi-worker job queue backed by VideoAnalysisStorage.
+
+    A pool of worker coroutines takes the highest-priority job whose job type
+    is below its concurrency limit; jobs with equal priority run in the order
+    they were scheduled.
+    """
 
-    def __init__(self, storage: VideoAnalysisStorage):
+    def __init__(
+        self,
+        storage: VideoAnalysisStorage,
+        *,
+        num_workers: int = DEFAULT_NUM_WORKERS,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        process_backend: Optional[ProcessPoolBackend] = None,
+    ):
         self.storage = storage
+        self.process_backend = process_backend
+        self.num_workers = max(1, int(num_workers))
+        self.concurrency_limits: Dict[str, int] = dict(DEFAULT_CONCURRENCY_LIMITS)
+        self.concurrency_limits.update(concurrency_limits or {})
         self._handlers: Dict[str, JobHandler] = {}
-        self._queue: Optional[asyncio.Queue[Optional[str]]] = None
+        # Heap of (-priority, sequence, job_id, job_type)
+        self._ready: List[Tuple[int, int, str, str]] = []
+        self._sequence = itertools.count()
         self._scheduled_jobs: set[str] = set()
-        self._pending_jobs: Deque[str] = deque()
+        self._active_by_type: Dict[str, int] = {}
         self._logger = logging.getLogger("app.job_queue")
         self._worker_task: Optional[asyncio.Task] = None
+        self._worker_states: Dict[int, Dict[str, Any]] = {}
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Event] = None
+        self._events_loop: Optional[asyncio.AbstractEventLoop] = None
         self._last_heartbeat: Optional[str] = None
         self._last_exception: Optional[str] = None
 
-    def _mark_heartbeat(self) -> None:
+    def _mark_heartbeat(self, worker_id: Optional[int] = None) -> None:
         self._last_heartbeat = datetime.now().isoformat()
+        if worker_id is not None and worker_id in self._worker_states:
+            self._worker_states[worker_id]["last_heartbeat"] = self._last_heartbeat
+
+    def _ensure_events(self) -> None:
+        """Create the wake-up/drained events for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._events_loop is loop:
+            return
+        self._events_loop = loop
+        self._wakeup = asyncio.Event()
+        self._drained = asyncio.Event()
+        self._update_drained()
+        if self._ready:
+            self._wakeup.set()
+
+    def _update_drained(self) -> None:
+        if self._drained is None:
+            return
+        if not self._ready and not any(self._active_by_type.values()):
+            self._drained.set()
+        else:
+            self._drained.clear()
 
     def register_handler(self, job_type: str, handler: JobHandler) -> None:
         """Register an async handler for a specific job type."""
         self._handlers[job_type] = handler
 
+    def register_process_handler(
+        self,
+        job_type: str,
+        task: ProcessTask,
+        *,
+        on_result: Optional[ResultHandler] = None,
+    ) -> None:
+        """Register a CPU-bound task for a job type.
+
+        The task runs in the process pool when one is configured, otherwise in
+        a thread. Progress reports are written to the queue job (from the event
+        loop) as `progress`/`progress_message`. The return value goes to
+        `on_result(job, result)` (run in a thread), or is stored on the queue
+        job as `result` when no callback is given.
+        """
+
+        async def handler(job: Dict[str, Any]) -> None:
+            job_id = job["job_id"]
+            loop = asyncio.get_running_loop()
+
+            def on_progress(fraction: float, message: Optional[str] = None) -> None:
+                # Called from the pool's reader thread (or the task thread): write from the loop
+                loop.call_soon_threadsafe(
+                    functools.partial(
+                        self.storage.update_queue_job, job_id, progress=fraction, progress_message=message
+                    )
+                )
+
+            if self.process_backend is not None:
+                result = await self.process_backend.run(task, job, on_progress)
+            else:
+                result = await asyncio.to_thread(task, job, on_progress)
+
+            if on_result is not None:
+                await asyncio.to_thread(on_result, job, result)
+            else:
+                self.storage.update_queue_job(job_id, result=result)
+
+        self.register_handler(job_type, handler)
+
+    def set_concurrency_limit(self, job_type: str, limit: int) -> None:
+        """Set how many jobs of `job_type` may run at once."""
+        self.concurrency_limits[job_type] = max(1, int(limit))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
     def worker_running(self) -> bool:
         if self._worker_task is None:
             return False
@@ -53,13 +160,23 @@ class JobQueue:
             "running": running,
             "last_heartbeat": self._last_heartbeat,
             "last_exception": self._last_exception,
+            "num_workers": self.num_workers,
+            "queued": len(self._ready),
+            "active_by_type": {k: v for k, v in self._active_by_type.items() if v},
+            "concurrency_limits": dict(self.concurrency_limits),
+            "process_pool": self.process_backend is not None,
+            "workers": [dict(state) for _, state in sorted(self._worker_states.items())] if running else [],
         }
 
     def ensure_worker(self) -> bool:
-        """Ensure the worker task is running; restart if needed."""
+        """Ensure the worker pool is running; restart if needed."""
         if self.worker_running():
             return False
         self._last_exception = None
+        self._stopping = False
+        self._ensure_events()
+        # Pick up persisted jobs now so wait_for_all() sees them immediately
+        self._resume_pending_jobs()
         loop = asyncio.get_running_loop()
         self._worker_task = loop.create_task(self.start_worker(), name="job-queue-worker")
         self._worker_task.add_done_callback(self._on_worker_exit)
@@ -73,40 +190,96 @@ class JobQueue:
         payload: Dict[str, Any],
         *,
         max_retries: int = 0,
+        priority: int = 0,
     ) -> str:
-        """Persist a job to storage and schedule it for processing."""
+        """Persist a job to storage and schedule it for processing.
+
+        Jobs with a higher `priority` are started first.
+        """
         job = self.storage.create_queue_job(
             job_type=job_type,
             analysis_id=analysis_id,
             payload=payload,
             max_retries=max_retries,
+            priority=priority,
         )
         job_id = job["job_id"]
-        self._schedule_job_id(job_id)
+        self._schedule_job_id(job_id, job_type, priority)
         return job_id
 
     async def start_worker(self) -> None:
-        """Run the worker loop until `shutdown()` is called. MUST be called via create_task."""
-        self._queue = asyncio.Queue()
-        while self._pending_jobs:
-            job_id = self._pending_jobs.popleft()
-            self._queue.put_nowait(job_id)
-        await self._resume_pending_jobs()
+        """Run the worker pool until `shutdown()` is called. MUST be called via create_task."""
+        if self._worker_task is None:
+            self._worker_task = asyncio.current_task()
+        self._ensure_events()
+        self._resume_pending_jobs()
+        self._worker_states = {
+            worker_id: {
+                "worker_id": worker_id,
+                "state": "idle",
+                "job_id": None,
+                "job_type": None,
+                "jobs_processed": 0,
+                "last_heartbeat": None,
+            }
+            for worker_id in range(self.num_workers)
+        }
         self._mark_heartbeat()
 
+        workers = [
+            asyncio.create_task(self._worker_loop(worker_id), name=f"job-queue-worker-{worker_id}")
+            for worker_id in range(self.num_workers)
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self._stopping = False
+            self._worker_states = {}
+            self._mark_heartbeat()
+
+    async def _worker_loop(self, worker_id: int) -> None:
+        state = self._worker_states[worker_id]
         while True:
-            job_id = await self._queue.get()  # type: ignore[arg-type]
-            if job_id is None:
-                self._queue.task_done()
-                self._mark_heartbeat()
-                break
+            entry = self._pop_runnable()
+            if entry is None:
+                if self._stopping and not self._ready:
+                    break
+                self._wakeup.clear()  # type: ignore[union-attr]
+                await self._wakeup.wait()  # type: ignore[union-attr]
+                continue
+
+            _, _, job_id, job_type = entry
+            self._active_by_type[job_type] = self._active_by_type.get(job_type, 0) + 1
+            state.update(state="busy", job_id=job_id, job_type=job_type)
+            self._mark_heartbeat(worker_id)
             try:
                 await self._process_job(job_id)
             finally:
-                self._queue.task_done()
-                self._mark_heartbeat()
+                self._active_by_type[job_type] -= 1
+                state.update(state="idle", job_id=None, job_type=None)
+                state["jobs_processed"] += 1
+                self._mark_heartbeat(worker_id)
+                self._update_drained()
+                # A slot for this job type is free again
+                self._wakeup.set()  # type: ignore[union-attr]
 
-        self._queue = None
+    def _pop_runnable(self) -> Optional[Tuple[int, int, str, str]]:
+        """Pop the highest-priority job whose type has spare capacity."""
+        blocked: List[Tuple[int, int, str, str]] = []
+        found = None
+        while self._ready:
+            entry = heapq.heappop(self._ready)
+            job_type = entry[3]
+            limit = self.concurrency_limits.get(job_type, DEFAULT_TYPE_LIMIT)
+            if self._active_by_type.get(job_type, 0) < limit:
+                found = entry
+                break
+            blocked.append(entry)
+        for entry in blocked:
+            heapq.heappush(self._ready, entry)
+        return found
 
     def _on_worker_exit(self, task: asyncio.Task) -> None:
         if task.cancelled():
@@ -121,17 +294,17 @@ class JobQueue:
             self._worker_task = None
 
     async def wait_for_all(self, timeout: Optional[float] = None) -> None:
-        """Wait until all queued jobs have been processed."""
-        if self._queue is None:
-            return
-        await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        """Wait until all scheduled jobs have been processed."""
+        self._ensure_events()
+        await asyncio.wait_for(self._drained.wait(), timeout=timeout)  # type: ignore[union-attr]
 
     async def shutdown(self) -> None:
-        """Signal the worker loop to exit and wait for completion."""
+        """Let the workers finish scheduled jobs, then stop them."""
         if self._worker_task is None:
             return
-        if self._queue is not None:
-            await self._queue.put(None)
+        self._stopping = True
+        if self._wakeup is not None:
+            self._wakeup.set()
         await self._worker_task
         self._worker_task = None
 
@@ -151,7 +324,7 @@ class JobQueue:
             retry_count=updated_retry_count,
         )
         if updated:
-            self._schedule_job_id(job_id)
+            self._schedule_job_id(job_id, updated.get("job_type", ""), updated.get("priority", 0))
         return updated
 
     def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
@@ -170,9 +343,11 @@ class JobQueue:
             status=status,
         )
 
-    async def _resume_pending_jobs(self) -> None:
+    def _resume_pending_jobs(self) -> None:
         pending = self.storage.list_queue_jobs()
         for job in pending:
+            if job["job_id"] in self._scheduled_jobs:
+                continue
             if job.get("status") in {"queued", "processing"}:
                 if job.get("status") == "processing":
                     self.storage.update_queue_job(
@@ -180,17 +355,18 @@ class JobQueue:
                         status="queued",
                         started_at=None,
                     )
-                self._schedule_job_id(job["job_id"])
+                self._schedule_job_id(job["job_id"], job.get("job_type", ""), job.get("priority", 0))
 
-    def _schedule_job_id(self, job_id: str) -> None:
+    def _schedule_job_id(self, job_id: str, job_type: str, priority: int = 0) -> None:
         if job_id in self._scheduled_jobs:
             return
         self._scheduled_jobs.add(job_id)
-        if self._queue is not None:
-            self._queue.put_nowait(job_id)
+        heapq.heappush(self._ready, (-int(priority or 0), next(self._sequence), job_id, job_type))
+        self._update_drained()
+        if self._wakeup is not None:
+            self._wakeup.set()
         else:
             self._logger.debug("Queue not ready; deferring job %s", job_id)
-            self._pending_jobs.append(job_id)
 
     async def _process_job(self, job_id: str) -> None:
         job = self.storage.get_queue_job(job_id)
@@ -10,9 +10,6 @@ Uses OpenCV for video analysis and FFmpeg for audio analysis.
 
 import asyncio
 import logging
-import subprocess
-import json
-import re
 from dataclasses import dataclass, asdict
 from typing import Optional, Tuple, List
 import numpy as np
@@ -75,6 +72,17 @@ def _compute_histogram_diff(frame1: np.ndarray, frame2: np.ndarray) -> float:
     hist1 = cv2.calcHist([gray1], [0], None, [256], [0, 256])
     hist2 = cv2.calcHist([gray2], [0], None, [256], [0, 256])
     
+    return _compare_histograms(hist1, hist2)
+
+
+def _compare_histograms(hist1: np.ndarray, hist2: np.ndarray) -> float:
+    """
+    Compare two 256-bin luminance histograms.
+    Returns a value between 0 (identical) and 1 (completely different).
+    """
+    hist1 = np.asarray(hist1, dtype=np.float32).reshape(-1, 1).copy()
+    hist2 = np.asarray(hist2, dtype=np.float32).reshape(-1, 1).copy()
+    
     # Normalize histograms
     cv2.normalize(hist1, hist1)
     cv2.normalize(hist2, hist2)
@@ -95,10 +103,22 @@ def _compute_frame_brightness(frame: np.ndarray) -> float:
     return float(np.mean(gray) / 255.0)
 
 
-def _compute_optical_flow_energy(prev_frame: np.ndarray, curr_frame: np.ndarray) -> float:
+def _compute_optical_flow_energy(
+    prev_frame: np.ndarray,
+    curr_frame: np.ndarray,
+    scale: float = 0.25,
+    magnitude_scale: float = 1.0,
+) -> float:
     """
     Compute optical flow magnitude between two frames.
     Returns energy score between 0 (static) and 1 (extreme motion).
+    
+    Args:
+        prev_frame: Previous frame (BGR or grayscale)
+        curr_frame: Current frame (BGR or grayscale)
+        scale: Resize factor applied before computing flow
+        magnitude_scale: Multiplier applied to flow magnitudes, for frames that
+            are already downscaled relative to the quarter-resolution reference
     """
     # Convert to grayscale
     if len(prev_frame.shape) == 3:
@@ -112,9 +132,11 @@ def _compute_optical_flow_energy(prev_frame: np.ndarray, curr_frame: np.ndarray)
         curr_gray = curr_frame
     
     # Resize for faster processing
-    scale = 0.25
-    prev_small = cv2.resize(prev_gray, None, fx=scale, fy=scale)
-    curr_small = cv2.resize(curr_gray, None, fx=scale, fy=scale)
+    if scale != 1.0:
+        prev_small = cv2.resize(prev_gray, None, fx=scale, fy=scale)
+        curr_small = cv2.resize(curr_gray, None, fx=scale, fy=scale)
+    else:
+        prev_small, curr_small = prev_gray, curr_gray
     
     # Compute dense optical flow
     flow = cv2.calcOpticalFlowFarneback(
@@ -124,7 +146,7 @@ def _compute_optical_flow_energy(prev_frame: np.ndarray, curr_frame: np.ndarray)
     )
     
     # Compute magnitude
-    magnitude = np.sqrt(flow[..., 0]**2 + flow[..., 1]**2)
+    magnitude = np.sqrt(flow[..., 0]**2 + flow[..., 1]**2) * magnitude_scale
     
     # Normalize to 0-1 scale (assuming max motion of ~50 pixels)
     avg_magnitude = float(np.mean(magnitude))
@@ -151,18 +173,19 @@ def analyze_visual_physics_sync(video_path: str, sample_rate: int = 5) -> Visual
     result = VisualPhysics()
     
     try:
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
+        from app.core.frame_store import get_frame_store
+        
+        store = get_frame_store(video_path)
+        if store is None:
             logger.error(f"Could not open video: {video_path}")
             return result
         
-        fps = cap.get(cv2.CAP_PROP_FPS) or 25.0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = store.fps
+        total_frames = store.metadata.total_frames
         duration_seconds = total_frames / fps if fps > 0 else 0.0
         
         if duration_seconds == 0:
             logger.warning("Video has zero duration")
-            cap.release()
             return result
         
         # Metrics accumulators
@@ -174,23 +197,17 @@ def analyze_visual_physics_sync(video_path: str, sample_rate: int = 5) -> Visual
         # Scene change threshold (histogram difference > 0.5 = likely cut)
         CUT_THRESHOLD = 0.5
         
-        prev_frame = None
-        frame_count = 0
+        # Optical flow runs on the store's luma planes; rescale magnitudes to
+        # the quarter-resolution reference the normalisation was tuned for
+        flow_scale = (store.metadata.width * 0.25) / store.luma.shape[2]
+        
+        prev_index = None
         prev_brightness = None
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            frame_count += 1
-            
-            # Only process every Nth frame
-            if frame_count % sample_rate != 0:
-                continue
-            
+        # Only process every Nth frame (1-based frame count, as before)
+        for index in range(sample_rate - 1, store.frame_count, sample_rate):
             # Compute brightness
-            brightness = _compute_frame_brightness(frame)
+            brightness = float(store.mean_luma[index] / 255.0)
             brightness_values.append(brightness)
             
             if prev_brightness is not None:
@@ -198,19 +215,19 @@ def analyze_visual_physics_sync(video_path: str, sample_rate: int = 5) -> Visual
                 brightness_changes.append(brightness_change)
             prev_brightness = brightness
             
-            if prev_frame is not None:
+            if prev_index is not None:
                 # Detect scene change (cut)
-                hist_diff = _compute_histogram_diff(prev_frame, frame)
+                hist_diff = _compare_histograms(store.histograms[prev_index], store.histograms[index])
                 if hist_diff > CUT_THRESHOLD:
                     cuts_detected += 1
                 
                 # Compute motion energy
-                motion_energy = _compute_optical_flow_energy(prev_frame, frame)
+                motion_energy = _compute_optical_flow_energy(
+                    store.luma[prev_index], store.luma[index], scale=1.0, magnitude_scale=flow_scale
+                )
                 motion_energies.append(motion_energy)
             
-            prev_frame = frame.copy()
-        
-        cap.release()
+            prev_index = index
         
         # Calculate final metrics
         duration_minutes = duration_seconds / 60.0
@@ -268,55 +285,26 @@ def analyze_audio_physics_sync(video_path: str) -> AudioPhysics:
     Returns:
         AudioPhysics dataclass with extracted metrics
     """
+    from app.core.audio_analysis import analyze_audio
+    
     result = AudioPhysics()
     
-    try:
-        # Use FFmpeg's loudnorm filter to analyze audio
-        # This gives us integrated loudness (LUFS), loudness range (LRA), and true peak
-        cmd = [
-            'ffmpeg',
-            '-i', video_path,
-            '-af', 'loudnorm=print_format=json',
-            '-f', 'null',
-            '-'
-        ]
+    # Integrated loudness (LUFS), loudness range (LRA) and true peak come from
+    # the shared single-pass audio analysis (ebur128), cached per file
+    analysis = analyze_audio(video_path, timeout=60)
+    
+    if analysis is not None and analysis.integrated_lufs is not None:
+        result.loudness_lu = analysis.integrated_lufs
+        result.loudness_range = analysis.lra if analysis.lra is not None else 0.0
+        result.true_peak = analysis.true_peak if analysis.true_peak is not None else 0.0
         
-        process = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=60  # 60 second timeout
+        logger.info(
+            f"Audio physics: loudness={result.loudness_lu:.1f} LUFS, "
+            f"range={result.loudness_range:.1f} LRA, "
+            f"peak={result.true_peak:.1f} dBTP"
         )
-        
-        # FFmpeg outputs to stderr
-        output = process.stderr
-        
-        # Find the JSON output from loudnorm
-        # It appears after "Parsed_loudnorm" line
-        json_match = re.search(r'\{[^}]+\"input_i\"[^}]+\}', output, re.DOTALL)
-        
-        if json_match:
-            loudness_data = json.loads(json_match.group())
-            
-            # Extract metrics
-            result.loudness_lu = float(loudness_data.get('input_i', -24.0))
-            result.loudness_range = float(loudness_data.get('input_lra', 0.0))
-            result.true_peak = float(loudness_data.get('input_tp', 0.0))
-            
-            logger.info(
-                f"Audio physics: loudness={result.loudness_lu:.1f} LUFS, "
-                f"range={result.loudness_range:.1f} LRA, "
-                f"peak={result.true_peak:.1f} dBTP"
-            )
-        else:
-            logger.warning("Could not parse FFmpeg loudnorm output, using defaults")
-            
-    except subprocess.TimeoutExpired:
-        logger.error("FFmpeg audio analysis timed out")
-    except FileNotFoundError:
-        logger.error("FFmpeg not found in PATH - cannot analyze audio loudness")
-    except Exception as e:
-        logger.error(f"Error analyzing audio physics: {e}")
+    else:
+        logger.warning("Could not measure audio loudness, using defaults")
     
     return result
 
@@ -324,8 +312,19 @@ def analyze_audio_physics_sync(video_path: str) -> AudioPhysics:
 async def analyze_visual_physics(video_path: str, sample_rate: int = 5) -> VisualPhysics:
     """
     Async wrapper for visual physics analysis.
-    Runs the CPU-intensive analysis in a thread pool.
+    Runs the CPU-intensive analysis in the process pool when one is configured,
+    otherwise in a thread pool.
     """
+    from app.core.process_pool import get_default_backend
+
+    backend = get_default_backend()
+    if backend is not None:
+        from app.core.cpu_tasks import visual_physics_task
+
+        return await backend.run(
+            visual_physics_task,
+            {"payload": {"video_path": video_path, "sample_rate": sample_rate}},
+        )
     return await asyncio.to_thread(analyze_visual_physics_sync, video_path, sample_rate)
 
 
@@ -0,0 +1,320 @@
+"""
+Polish Filtergraph Compiler
+
+Compiles the polish options (levels, broadcast-safe limiting, deinterlace,
+denoise, scaling, fps conversion, loudness normalization, head/tail muting,
+clock slate and black padding) into one ffmpeg invocation: a single decode
+of the master, a single filter_complex and one encode per output.
+
+When the Bright/web copy is requested the corrected picture and the source
+audio are split inside the graph, so the broadcast master and the Bright
+copy come from the same decode. No intermediate files are written and no
+output passes through an earlier lossy encode.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+SLATE_DURATION = 13  # 10s countdown + 3s black
+SLATE_TONE_SECONDS = 10
+AUDIO_SAMPLE_RATE = 48000
+
+
+@dataclass
+class PolishOutput:
+    """One encoded deliverable: the graph pads it maps and the standard it is encoded to."""
+    path: str
+    standard: Dict
+    video_label: str
+    audio_label: Optional[str] = None
+
+    def args(self) -> List[str]:
+        """ffmpeg output options for this deliverable."""
+        fmt = self.standard['format']
+        color_space = self.standard['video']['color_space']
+
+        args = ['-map', f'[{self.video_label}]']
+        if self.audio_label:
+            args.extend(['-map', f'[{self.audio_label}]'])
+
+        args.extend(['-c:v', fmt['video_codec']])
+        if fmt.get('video_profile'):
+            args.extend(['-profile:v', fmt['video_profile']])
+        if fmt.get('video_bitrate'):
+            args.extend(['-b:v', fmt['video_bitrate']])
+        if fmt.get('pixel_format'):
+            args.extend(['-pix_fmt', fmt['pixel_format']])
+        args.extend([
+            '-color_primaries', color_space,
+            '-color_trc', color_space,
+            '-colorspace', color_space,
+        ])
+
+        if self.audio_label:
+            args.extend(['-c:a', fmt['audio_codec'], '-ar', str(AUDIO_SAMPLE_RATE)])
+            if fmt.get('audio_bitrate'):
+                args.extend(['-b:a', fmt['audio_bitrate']])
+
+        args.extend(['-f', fmt['container']])
+        if fmt['container'] == 'mp4':
+            args.extend(['-movflags', '+faststart'])
+        args.append(self.path)
+        return args
+
+
+@dataclass
+class PolishPlan:
+    """A compiled polish job: one input, one filtergraph, one or more outputs."""
+    input_path: str
+    filters: List[str] = field(default_factory=list)
+    outputs: List[PolishOutput] = field(default_factory=list)
+    fixes_applied: List[str] = field(default_factory=list)
+    duration: float = 0.0  # seconds of the primary output, for progress reporting
+
+    @property
+    def filter_complex(self) -> str:
+        return ';'.join(self.filters)
+
+    def command(self, ffmpeg_path: str, progress: bool = False) -> List[str]:
+        """Full ffmpeg command line; progress=True writes key=value progress to stdout."""
+        cmd = [ffmpeg_path, '-hide_banner', '-v', 'error', '-y']
+        if progress:
+            cmd.extend(['-progress', 'pipe:1', '-nostats'])
+        cmd.extend(['-i', self.input_path, '-filter_complex', self.filter_complex])
+        for output in self.outputs:
+            cmd.extend(output.args())
+        return cmd
+
+
+def _programme_duration(video_info: Dict) -> float:
+    fps = video_info.get('fps') or 25
+    return video_info.get('frame_count', 0) / fps
+
+
+def _video_corrections(video_info: Dict, options: Dict, standard: Dict, fixes: List[str]) -> Tuple[List[str], Tuple[int, int]]:
+    """Picture fixes shared by every output, and the frame size they produce."""
+    filters = []
+
+    if options.get('auto_levels', True) and 'avg_brightness' in video_info:
+        brightness = video_info['avg_brightness']
+        if brightness < 50:
+            filters.append('eq=brightness=0.2:contrast=1.1')
+            fixes.append("Increased brightness")
+        elif brightness > 200:
+            filters.append('eq=brightness=-0.1:contrast=1.05')
+            fixes.append("Reduced brightness")
+
+    if options.get('broadcast_safe', True):
+        filters.append('limiter=min=16:max=235')
+        fixes.append("Applied broadcast safe colors")
+
+    if options.get('deinterlace', True):
+        filters.append('yadif=mode=1')
+        fixes.append("Deinterlaced video")
+
+    if options.get('denoise', False):
+        filters.append('hqdn3d=4:3:6:4.5')
+        fixes.append("Applied noise reduction")
+
+    target_res = tuple(standard['video']['resolution'])
+    frame_size = (video_info.get('width', 0), video_info.get('height', 0))
+    if options.get('scale_hd', True) and frame_size != target_res:
+        filters.append(f"scale={target_res[0]}:{target_res[1]}:flags=lanczos")
+        fixes.append(f"Scaled to {target_res[0]}x{target_res[1]}")
+        frame_size = target_res
+    if not all(frame_size):
+        frame_size = target_res
+
+    return filters, frame_size
+
+
+def _audio_corrections(analysis: Dict, options: Dict, standard: Dict, duration: float, fixes: List[str]) -> List[str]:
+    """Loudness normalization and head/tail muting for one output's programme audio."""
+    filters = []
+
+    if options.get('normalize_audio', True):
+        current_lufs = analysis.get('audio', {}).get('integrated_lufs', -99)
+        audio = standard['audio']
+        filters.append(f"loudnorm=I={audio['target_lufs']}:TP={audio['max_peak']}:LRA={audio['lra_target']}")
+        fixes.append(f"Normalized audio from {current_lufs:.1f} to {audio['target_lufs']} LUFS")
+
+    if standard['audio'].get('enforce_silence', False):
+        silence_duration = standard['audio'].get('silence_padding', 0)
+        if silence_duration > 0:
+            filters.append(f"volume=enable='between(t,0,{silence_duration})':volume=0")
+            if duration > 0:
+                filters.append(f"volume=enable='between(t,{duration - silence_duration},{duration})':volume=0")
+            fixes.append(f"Muted first/last {silence_duration}s")
+
+    # loudnorm works at 192kHz internally
+    filters.append(f"aresample={AUDIO_SAMPLE_RATE}")
+    return filters
+
+
+def slate_filters(slate_info: Dict, frame_size: Tuple[int, int], fps: float) -> List[str]:
+    """Source filters producing the clock slate on [slatev] and its line-up tone on [slatea]."""
+    width, height = frame_size
+    y_pos = 200
+    text_elements = [
+        f"drawtext=text='{slate_info.get('clock_number', 'ABC/PROD001/030')}':fontsize=48:fontcolor=white:x=(w-text_w)/2:y={y_pos}:enable='lt(t,10)'",
+        f"drawtext=text='Client\\: {slate_info.get('client_name', 'Client')}':fontsize=36:fontcolor=white:x=(w-text_w)/2:y={y_pos+100}:enable='lt(t,10)'",
+        f"drawtext=text='Agency\\: {slate_info.get('agency_name', 'Agency')}':fontsize=36:fontcolor=white:x=(w-text_w)/2:y={y_pos+150}:enable='lt(t,10)'",
+        f"drawtext=text='Product\\: {slate_info.get('product_name', 'Product')}':fontsize=36:fontcolor=white:x=(w-text_w)/2:y={y_pos+200}:enable='lt(t,10)'",
+        f"drawtext=text='Title\\: {slate_info.get('title', 'Advertisement')}':fontsize=36:fontcolor=white:x=(w-text_w)/2:y={y_pos+250}:enable='lt(t,10)'",
+        f"drawtext=text='Duration\\: {slate_info.get('duration', '030')}':fontsize=36:fontcolor=white:x=(w-text_w)/2:y={y_pos+300}:enable='lt(t,10)'",
+        f"drawtext=text='Ratio\\: {slate_info.get('ratio', 'HD')}':fontsize=36:fontcolor=white:x=(w-text_w)/2:y={y_pos+350}:enable='lt(t,10)'",
+    ]
+    # Countdown 10 to 3
+    for i in range(10, 2, -1):
+        text_elements.append(
+            f"drawtext=text='{i}':fontsize=120:fontcolor=white:x=(w-text_w)/2:y=(h-text_h)/2:enable='between(t,{10-i},{10-i+1})'"
+        )
+
+    # 1kHz tone at -18dBFS, or silence for a silent slate, then 3s of silence
+    if slate_info.get('silent_slate', False):
+        tone = f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo:d={SLATE_TONE_SECONDS}"
+    else:
+        tone = f"sine=frequency=1000:duration={SLATE_TONE_SECONDS}:sample_rate={AUDIO_SAMPLE_RATE},volume=-18dB"
+
+    return [
+        f"color=c=#1a1a1a:s={width}x{height}:r={fps}:d={SLATE_DURATION},{','.join(text_elements)},setsar=1[slatev]",
+        f"{tone},aformat=sample_rates={AUDIO_SAMPLE_RATE}:channel_layouts=stereo,apad=whole_dur={SLATE_DURATION}[slatea]",
+    ]
+
+
+def compile_polish_plan(
+    input_path: str,
+    output_path: str,
+    analysis: Dict,
+    options: Dict,
+    standard: Dict,
+    bright_output_path: Optional[str] = None,
+    bright_standard: Optional[Dict] = None,
+) -> PolishPlan:
+    """
+    Compile polish options into a single-pass ffmpeg plan.
+
+    Args:
+        input_path: Source master
+        output_path: Primary (broadcast) deliverable
+        analysis: ClearcastVideoProcessor._analyze_video() result
+        options: Processing options (see ClearcastVideoProcessor.process_video)
+        standard: BROADCAST_STANDARDS entry for the primary output
+        bright_output_path: Also encode the Bright/web copy here (from the same decode)
+        bright_standard: BROADCAST_STANDARDS entry for the Bright copy
+
+    Returns:
+        PolishPlan
+    """
+    plan = PolishPlan(input_path=input_path)
+    fixes = plan.fixes_applied
+    video_info = analysis.get('video', {})
+    duration = _programme_duration(video_info)
+    has_audio = analysis.get('audio', {}).get('has_audio', True)
+    with_bright = bright_output_path is not None and bright_standard is not None
+
+    # Picture corrections run once; the Bright copy branches off after them
+    video_filters, frame_size = _video_corrections(video_info, options, standard, fixes)
+    video_chain = ','.join(video_filters) or 'null'
+    if with_bright:
+        plan.filters.append(f"[0:v]{video_chain},split=2[vfixed][vbright]")
+    else:
+        plan.filters.append(f"[0:v]{video_chain}[vfixed]")
+
+    if has_audio:
+        source_audio = '[0:a]'
+        if with_bright:
+            plan.filters.append("[0:a]asplit=2[asrc][abright_src]")
+            source_audio = '[asrc]'
+    elif duration > 0:
+        # Broadcast masters need an audio track; give silent sources one
+        source_audio = '[asilent]'
+        plan.filters.append(f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo:d={duration:.3f}[asilent]")
+    else:
+        source_audio = None
+
+    # Primary output: fps conversion, programme audio, optional slate and padding
+    add_slate = options.get('add_slate', False)
+    fps = standard['video']['fps']
+    primary_video = ['null']
+    if options.get('convert_fps', True) and fps:
+        primary_video = [f"fps={fps}"]
+    if add_slate:
+        primary_video.append('setsar=1')
+    plan.filters.append(f"[vfixed]{','.join(primary_video)}[vprog]")
+
+    audio_label = None
+    if source_audio:
+        if has_audio:
+            audio_filters = _audio_corrections(analysis, options, standard, duration, fixes)
+        else:
+            # Nothing to normalize (loudnorm turns digital silence into NaNs)
+            audio_filters = [f"aresample={AUDIO_SAMPLE_RATE}"]
+        if add_slate:
+            audio_filters.append(f"aformat=sample_rates={AUDIO_SAMPLE_RATE}:channel_layouts=stereo")
+        plan.filters.append(f"{source_audio}{','.join(audio_filters)}[aprog]")
+        audio_label = 'aprog'
+
+    video_label = 'vprog'
+    total_duration = duration
+    if add_slate:
+        slate_info = dict(options.get('slate_info') or {})
+        if duration > 0:
+            slate_info['duration'] = f"{int(duration):03d}"
+        plan.filters.extend(slate_filters(slate_info, frame_size, fps or 25))
+        if audio_label:
+            plan.filters.append("[slatev][slatea][vprog][aprog]concat=n=2:v=1:a=1[vslated][aslated]")
+            audio_label = 'aslated'
+        else:
+            plan.filters.append("[slatev][vprog]concat=n=2:v=1:a=0[vslated]")
+        video_label = 'vslated'
+        total_duration += SLATE_DURATION
+        fixes.append("Added clock slate with countdown")
+
+    if options.get('convert_fps', True) and fps:
+        fixes.append(f"Converted to {fps}fps")
+    fixes.append(f"Converted to {standard['name']} format")
+
+    padding = standard['audio'].get('silence_padding', 0)
+    if options.get('add_padding', False) and padding > 0:
+        plan.filters.append(
+            f"[{video_label}]tpad=start_duration={padding}:stop_duration={padding}:color=black[vpadded]"
+        )
+        video_label = 'vpadded'
+        if audio_label:
+            plan.filters.append(
+                f"[{audio_label}]adelay=delays={int(round(padding * 1000))}:all=1,apad=pad_dur={padding}[apadded]"
+            )
+            audio_label = 'apadded'
+        total_duration += 2 * padding
+        fixes.append(f"Added black padding ({padding}s)")
+
+    plan.outputs.append(PolishOutput(output_path, standard, video_label, audio_label))
+    plan.duration = total_duration
+
+    # Bright copy: same corrected picture, its own loudness target, no slate or padding
+    if with_bright:
+        bright_fps = bright_standard['video']['fps']
+        bright_video = f"fps={bright_fps}" if options.get('convert_fps', True) and bright_fps else 'null'
+        plan.filters.append(f"[vbright]{bright_video}[vbright_out]")
+        bright_audio = None
+        if has_audio:
+            bright_filters = _audio_corrections(analysis, options, bright_standard, duration, [])
+            plan.filters.append(f"[abright_src]{','.join(bright_filters)}[abright_out]")
+            bright_audio = 'abright_out'
+        elif source_audio:
+            plan.filters.append(f"anullsrc=r={AUDIO_SAMPLE_RATE}:cl=stereo:d={duration:.3f}[abright_out]")
+            bright_audio = 'abright_out'
+        plan.outputs.append(PolishOutput(bright_output_path, bright_standard, 'vbright_out', bright_audio))
+        fixes.append("Created Bright/Web copy")
+
+    return plan
+
+
+__all__ = [
+    "PolishOutput",
+    "PolishPlan",
+    "compile_polish_plan",
+    "slate_filters",
+    "SLATE_DURATION",
+]
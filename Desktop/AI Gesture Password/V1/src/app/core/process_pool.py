@@ -0,0 +1,220 @@
+"""
+Process Pool Backend
+
+Runs CPU-bound job handlers (OpenCV/NumPy loops) in worker processes so they
+do not compete with the API event loop for the GIL.
+
+Task functions must be importable module-level callables with the signature
+
+    task(job_context: Dict, report_progress: Callable[[float, Optional[str]], None]) -> Any
+
+Their return value is pickled back to the parent. Progress reports are sent
+over a manager queue and delivered to the caller's on_progress callback on a
+reader thread in the parent process. The future returned by submit() resolves
+only after every progress report the task made has been delivered.
+"""
+
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import queue
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[float, Optional[str]], None]
+ProcessTask = Callable[[Dict[str, Any], ProgressCallback], Any]
+
+# spawn avoids forking a process that holds OpenCV/BLAS thread pools
+DEFAULT_MP_CONTEXT = "spawn"
+
+# Queued after a task finishes: everything ahead of it for that token has been read
+_FINISHED = "__finished__"
+
+
+def _run_task(task: ProcessTask, job_context: Dict[str, Any], token: str, progress_queue) -> Any:
+    """Child-process entry point: run `task` with a progress reporter."""
+
+    def report_progress(fraction: float, message: Optional[str] = None) -> None:
+        try:
+            progress_queue.put((token, max(0.0, min(1.0, float(fraction))), message))
+        except Exception:
+            pass  # Progress is best effort; never fail the task over it
+
+    return task(job_context, report_progress)
+
+
+class ProcessPoolBackend:
+    """
+    Lazily started process pool with progress marshalling.
+
+    Nothing is spawned until the first submit(), so constructing the backend
+    at import time is cheap.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, mp_context: str = DEFAULT_MP_CONTEXT):
+        self.max_workers = max_workers
+        self.mp_context = mp_context
+        self._lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        self._manager = None
+        self._progress_queue = None
+        self._reader: Optional[threading.Thread] = None
+        # token -> (on_progress, worker future, future handed to the caller)
+        self._pending: Dict[
+            str, Tuple[Optional[ProgressCallback], Optional[concurrent.futures.Future], concurrent.futures.Future]
+        ] = {}
+        self._closed = False
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("ProcessPoolBackend has been shut down")
+            if self._executor is not None:
+                return
+            context = multiprocessing.get_context(self.mp_context)
+            self._manager = context.Manager()
+            self._progress_queue = self._manager.Queue()
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=context,
+            )
+            self._reader = threading.Thread(
+                target=self._read_progress,
+                name="process-pool-progress",
+                daemon=True,
+            )
+            self._reader.start()
+            logger.info(f"Process pool started (max_workers={self.max_workers or 'cpu_count'})")
+
+    def _read_progress(self) -> None:
+        while True:
+            try:
+                item = self._progress_queue.get(timeout=0.5)
+            except queue.Empty:
+                if self._closed:
+                    break
+                continue
+            except (EOFError, OSError, BrokenPipeError):
+                break
+            if item is None:
+                break
+            token, fraction, message = item
+            if fraction == _FINISHED:
+                self._resolve(token)
+                continue
+            pending = self._pending.get(token)
+            if pending is None or pending[0] is None:
+                continue
+            try:
+                pending[0](fraction, message)
+            except Exception as e:
+                logger.warning(f"Progress callback failed: {e}")
+        # Reader is gone; hand over whatever has already finished
+        for token in list(self._pending):
+            self._resolve(token)
+
+    def _resolve(self, token: str) -> None:
+        """Copy a finished worker future's outcome to the caller's future."""
+        pending = self._pending.get(token)
+        if pending is None or pending[1] is None or not pending[1].done():
+            return
+        del self._pending[token]
+        _, inner, outer = pending
+        if outer.done():
+            return
+        if inner.cancelled():
+            outer.cancel()
+        elif inner.exception() is not None:
+            outer.set_exception(inner.exception())
+        else:
+            outer.set_result(inner.result())
+
+    def _task_finished(self, token: str) -> None:
+        # The worker's progress puts are synchronous, so all of them are queued by now
+        try:
+            self._progress_queue.put((token, _FINISHED, None))
+        except Exception:
+            self._resolve(token)
+
+    def submit(
+        self,
+        task: ProcessTask,
+        job_context: Dict[str, Any],
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> concurrent.futures.Future:
+        """Run `task(job_context, report_progress)` in a worker process."""
+        self._ensure_started()
+        token = uuid.uuid4().hex
+        outer: concurrent.futures.Future = concurrent.futures.Future()
+        # Registered before submitting so the task's first report has somewhere to go
+        self._pending[token] = (on_progress, None, outer)
+        inner = self._executor.submit(_run_task, task, job_context, token, self._progress_queue)
+        self._pending[token] = (on_progress, inner, outer)
+        inner.add_done_callback(lambda _: self._task_finished(token))
+        outer.add_done_callback(lambda f: inner.cancel() if f.cancelled() else None)
+        return outer
+
+    async def run(
+        self,
+        task: ProcessTask,
+        job_context: Dict[str, Any],
+        on_progress: Optional[ProgressCallback] = None,
+    ) -> Any:
+        """Async wrapper around submit()."""
+        return await asyncio.wrap_future(self.submit(task, job_context, on_progress))
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes and the progress reader."""
+        with self._lock:
+            self._closed = True
+            executor, manager = self._executor, self._manager
+            self._executor = None
+        if executor is None:
+            return
+        executor.shutdown(wait=wait, cancel_futures=not wait)
+        try:
+            self._progress_queue.put(None)
+        except Exception:
+            pass
+        if self._reader is not None:
+            self._reader.join(timeout=2)
+        try:
+            manager.shutdown()
+        except Exception:
+            pass
+        for token in list(self._pending):
+            self._resolve(token)
+        logger.info("Process pool stopped")
+
+
+# Backend used by CPU-bound stages called outside the job queue (visual physics,
+# technical QC); None keeps them in the API process
+_default_backend: Optional[ProcessPoolBackend] = None
+
+
+def set_default_backend(backend: Optional[ProcessPoolBackend]) -> None:
+    """Install (or clear, with None) the backend for CPU-bound stages outside the job queue."""
+    global _default_backend
+    _default_backend = backend
+
+
+def get_default_backend() -> Optional[ProcessPoolBackend]:
+    """The backend installed by set_default_backend(), if any."""
+    return _default_backend
+
+
+__all__ = [
+    "ProcessPoolBackend",
+    "ProcessTask",
+    "ProgressCallback",
+    "get_default_backend",
+    "set_default_backend",
+]
@@ -0,0 +1,81 @@
+"""
+PSE Flash Detector
+
+Vectorized photosensitive-epilepsy heuristic over a per-frame mean luminance
+series (e.g. VideoFrameStore.mean_luma). Transitions are frame-to-frame
+luminance jumps above a threshold; flash counts are the number of
+transitions in the trailing window, computed with a cumulative sum and
+a shifted index instead of rebuilding a list every frame.
+"""
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+
+from app.core.thresholds import ComplianceThresholds
+
+
+@dataclass
+class FlashSeries:
+    """Per-frame PSE analysis of a luminance series."""
+    timestamps: np.ndarray  # seconds, shape (n,)
+    transitions: np.ndarray  # bool, shape (n,)
+    flash_counts: np.ndarray  # transitions in the trailing window, shape (n,)
+    risk_curve: np.ndarray  # 0..1, reaches 1.0 when the flash limit is exceeded
+    max_flashes: int  # limit used for risk/at_risk
+
+    @property
+    def at_risk(self) -> np.ndarray:
+        """Bool mask of frames where the flash count exceeds the limit."""
+        return self.flash_counts > self.max_flashes
+
+    def risk_frames(self) -> List[int]:
+        return np.flatnonzero(self.at_risk).tolist()
+
+
+def analyze_flash_series(
+    luminance: Sequence[float],
+    fps: float,
+    transition_delta: float = ComplianceThresholds.PSE_TRANSITION_DELTA,
+    window_seconds: float = ComplianceThresholds.PSE_WINDOW_SECONDS,
+    max_flashes: int = ComplianceThresholds.PSE_MAX_FLASHES_PER_WINDOW,
+) -> FlashSeries:
+    """
+    Detect flash transitions and sliding-window flash counts.
+
+    Args:
+        luminance: Mean luminance per frame (0-255)
+        fps: Frame rate of the series
+        transition_delta: Minimum absolute change between frames for a transition
+        window_seconds: Length of the trailing window
+        max_flashes: Transitions allowed per window before a frame is at risk
+
+    Returns:
+        FlashSeries with per-frame transitions, counts and risk curve
+    """
+    values = np.asarray(luminance, dtype=np.float32)
+    n = values.shape[0]
+    fps = fps if fps and fps > 0 else 25.0
+    timestamps = np.arange(n, dtype=np.float64) / fps
+
+    if n == 0:
+        empty = np.zeros(0)
+        return FlashSeries(empty, empty.astype(bool), empty.astype(np.int32), empty, max_flashes)
+
+    # Change from the previous frame; the first frame is compared with black
+    deltas = np.abs(np.diff(values, prepend=np.float32(0.0)))
+    transitions = deltas > transition_delta
+
+    # counts[i] = transitions in frames j with i - j <= window (in frames). Working
+    # in frame units avoids float drift at the window boundary.
+    window_frames = int(round(window_seconds * fps))
+    cumulative = np.concatenate(([0], np.cumsum(transitions, dtype=np.int32)))
+    window_start = np.maximum(np.arange(n) - window_frames, 0)
+    flash_counts = cumulative[1:] - cumulative[window_start]
+
+    risk_curve = np.minimum(flash_counts / float(max_flashes + 1), 1.0)
+    return FlashSeries(timestamps, transitions, flash_counts, risk_curve, max_flashes)
+
+
+__all__ = ["FlashSeries", "analyze_flash_series"]
@@ -0,0 +1,87 @@
+"""
+SQLite Record Store
+
+Embedded key/value backend for VideoAnalysisStorage. Each analysis, reaction,
+reaction job and queue job is one row (JSON document) in a WAL-mode SQLite
+database, so a status change rewrites a single row instead of the whole
+analyses.json file.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteRecordStore:
+    """
+    One-row-per-record document store.
+
+    Records are addressed by (section, key), e.g. ("analyses", analysis_id).
+    A single connection is shared across threads and guarded by a lock;
+    WAL mode lets other processes read while this one writes.
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS records (
+                section TEXT NOT NULL,
+                record_key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                PRIMARY KEY (section, record_key)
+            )
+        """)
+        self._conn.commit()
+
+    def is_empty(self) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM records LIMIT 1").fetchone()
+        return row is None
+
+    def rows(self) -> List[Tuple[str, str, str]]:
+        """All stored (section, key, data) rows."""
+        with self._lock:
+            return self._conn.execute("SELECT section, record_key, data FROM records").fetchall()
+
+    def put(self, section: str, key: str, data: str) -> None:
+        """Insert or replace a single serialized record."""
+        self.put_many([(section, key, data)])
+
+    def put_many(self, rows: Iterable[Tuple[str, str, str]]) -> None:
+        """Insert or replace serialized (section, key, data) rows in one transaction."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records (section, record_key, data) VALUES (?, ?, ?)",
+                    rows,
+                )
+
+    def delete(self, section: str, keys: Iterable[str]) -> None:
+        """Delete records from a section."""
+        with self._lock:
+            with self._conn:
+                self._conn.executemany(
+                    "DELETE FROM records WHERE section = ? AND record_key = ?",
+                    [(section, key) for key in keys],
+                )
+
+    def data_version(self) -> int:
+        """Counter that changes when another connection commits to the database."""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+__all__ = ["SQLiteRecordStore"]
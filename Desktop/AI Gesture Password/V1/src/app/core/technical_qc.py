@@ -6,13 +6,50 @@ Verifies video format, safe areas, and PSE risks.
 import logging
 import subprocess
 import json
-import cv2
+from functools import lru_cache
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from pathlib import Path
 
+from app.core.frame_store import get_frame_store
+from app.core.pse_detector import analyze_flash_series
+from app.core.thresholds import ComplianceThresholds
+
 logger = logging.getLogger(__name__)
 
+@lru_cache(maxsize=16)
+def unsafe_area_mask(height: int, width: int, margin: float) -> np.ndarray:
+    """
+    Boolean mask of the region outside the centred safe area.
+
+    Cached per (resolution, margin); the returned array is read-only.
+    """
+    x_start = int(width * (1 - margin) / 2)
+    x_end = int(width * (1 + margin) / 2)
+    y_start = int(height * (1 - margin) / 2)
+    y_end = int(height * (1 + margin) / 2)
+    mask = np.ones((height, width), dtype=bool)
+    mask[y_start:y_end, x_start:x_end] = False
+    mask.setflags(write=False)
+    return mask
+
+
+def unsafe_violation_ratios(planes: np.ndarray, margin: float,
+                            content_luma: int = ComplianceThresholds.SAFE_AREA_CONTENT_LUMA) -> np.ndarray:
+    """
+    Fraction of the unsafe area holding content, for each plane in a (n, h, w) stack.
+    """
+    if planes.size == 0:
+        return np.zeros(planes.shape[0], dtype=np.float64)
+    mask = unsafe_area_mask(planes.shape[1], planes.shape[2], margin)
+    unsafe_pixels = int(np.count_nonzero(mask))
+    if unsafe_pixels == 0:
+        return np.zeros(planes.shape[0], dtype=np.float64)
+    # Only the unsafe pixels are gathered, so the reduction touches the border strips alone
+    violations = np.count_nonzero(planes[:, mask] > content_luma, axis=1)
+    return violations / unsafe_pixels
+
+
 class TechnicalVerifier:
     """
     Performs technical checks on video files against broadcast standards.
@@ -163,69 +200,43 @@ class TechnicalVerifier:
         }
         
         try:
-            cap = cv2.VideoCapture(video_path)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            store = get_frame_store(video_path)
+            if store is None:
+                return results
+            total_frames = store.metadata.total_frames
+            fps = store.fps
             
-            # Define unsafe regions (outside title safe)
-            # Title safe is usually center 90%
-            x_start = int(width * (1 - margin_title) / 2)
-            x_end = int(width * (1 + margin_title) / 2)
-            y_start = int(height * (1 - margin_title) / 2)
-            y_end = int(height * (1 + margin_title) / 2)
+            # Sampled frames (every 1 second) come from the shared frame store,
+            # scored as one batch against a mask built once per resolution
+            indices, planes = store.detail_stack()
+            ratios = unsafe_violation_ratios(planes, margin_title)
             
-            # Sample frames (every 1 second)
-            fps = cap.get(cv2.CAP_PROP_FPS) or 25
-            step = int(fps)
-            
-            for i in range(0, total_frames, step):
-                cap.set(cv2.CAP_PROP_POS_FRAMES, i)
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                    
-                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                
-                # Create mask for unsafe area
-                mask = np.ones_like(gray) * 255
-                mask[y_start:y_end, x_start:x_end] = 0
+            # If > 1% of unsafe area has content, flag it
+            flagged = np.flatnonzero(ratios > ComplianceThresholds.SAFE_AREA_MAX_VIOLATION_RATIO)
+            for pos in flagged:
+                i = int(indices[pos])
+                violation_ratio = float(ratios[pos])
+                timestamp = i / fps
+                timestamp_str = f"{int(timestamp // 60):02d}:{int(timestamp % 60):02d}"
                 
-                # Check for significant content in unsafe area
-                # Threshold: pixels brighter than 50 (to ignore black/dark noise)
-                unsafe_content = cv2.bitwise_and(gray, gray, mask=mask)
-                _, thresh = cv2.threshold(unsafe_content, 50, 255, cv2.THRESH_BINARY)
+                # Map to analysis frame index (approximate)
+                if total_frames > 0 and num_analysis_frames > 0:
+                    analysis_frame_idx = int((i / total_frames) * (num_analysis_frames - 1))
+                    if analysis_frame_idx not in results["frame_indices"]:
+                        results["frame_indices"].append(analysis_frame_idx)
+                        results["frame_timestamps"].append(timestamp_str)
                 
-                violation_pixels = cv2.countNonZero(thresh)
-                total_unsafe_pixels = (width * height) - ((x_end - x_start) * (y_end - y_start))
-                
-                violation_ratio = violation_pixels / total_unsafe_pixels if total_unsafe_pixels > 0 else 0
-                
-                # If > 1% of unsafe area has content, flag it
-                if violation_ratio > 0.01:
-                    timestamp = i / fps
-                    timestamp_str = f"{int(timestamp // 60):02d}:{int(timestamp % 60):02d}"
-                    
-                    # Map to analysis frame index (approximate)
-                    if total_frames > 0 and num_analysis_frames > 0:
-                        analysis_frame_idx = int((i / total_frames) * (num_analysis_frames - 1))
-                        if analysis_frame_idx not in results["frame_indices"]:
-                            results["frame_indices"].append(analysis_frame_idx)
-                            results["frame_timestamps"].append(timestamp_str)
-                    
-                    results["violations"].append({
-                        "timestamp": timestamp,
-                        "timestamp_str": timestamp_str,
-                        "frame_index": i,
-                        "score": violation_ratio,
-                        "message": f"Content detected in unsafe area at {timestamp:.1f}s"
-                    })
-                    results["max_violation_score"] = max(results["max_violation_score"], violation_ratio)
+                results["violations"].append({
+                    "timestamp": timestamp,
+                    "timestamp_str": timestamp_str,
+                    "frame_index": i,
+                    "score": violation_ratio,
+                    "message": f"Content detected in unsafe area at {timestamp:.1f}s"
+                })
+                results["max_violation_score"] = max(results["max_violation_score"], violation_ratio)
             
             if results["violations"]:
                 results["passed"] = False
-                
-            cap.release()
             
         except Exception as e:
             logger.error(f"Safe area check failed: {e}")
@@ -236,6 +247,7 @@ class TechnicalVerifier:
         """
         Heuristic check for Photosensitive Epilepsy (PSE) risks.
         Detects rapid luminance changes (flashes) > 3Hz.
+        Also returns a per-frame risk curve (0-1) in "risk_curve".
         
         Args:
             video_path: Path to video file
@@ -245,69 +257,44 @@ class TechnicalVerifier:
             "passed": True,
             "risk_level": "LOW",
             "flash_events": [],
+            "risk_curve": [],
             "frame_indices": [],  # 0-based indices matching the analyzed_frames array
             "frame_timestamps": []  # Human-readable timestamps
         }
         
         try:
-            cap = cv2.VideoCapture(video_path)
-            fps = cap.get(cv2.CAP_PROP_FPS) or 25
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            
-            prev_mean_lum = 0
-            flash_count = 0
-            window_start_time = 0
-            flash_timestamps = []
-            current_frame_idx = 0
+            store = get_frame_store(video_path)
+            if store is None:
+                return results
+            fps = store.fps
+            total_frames = store.metadata.total_frames
             
-            # Sliding window of 1 second
-            window_frames = int(fps)
-            frame_diffs = []
+            # Mean luminance per frame comes from the shared frame store
+            series = analyze_flash_series(store.mean_luma, fps)
+            results["risk_curve"] = np.round(series.risk_curve, 3).tolist()
+            results["risk_curve_fps"] = fps
+            results["max_flashes_per_second"] = int(series.flash_counts.max(initial=0))
             
-            while True:
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                    
-                # Calculate mean luminance
-                mean_lum = np.mean(frame)
+            for current_frame_idx in series.risk_frames():
+                current_time = float(series.timestamps[current_frame_idx])
+                timestamp_str = f"{int(current_time // 60):02d}:{int(current_time % 60):02d}"
                 
-                # Check for significant change (flash)
-                # Harding threshold is complex, we use a simple heuristic:
-                # > 20% change in luminance between frames is a "transition"
-                if abs(mean_lum - prev_mean_lum) > 40: # 40/255 approx 15%
-                    flash_timestamps.append(cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0)
+                # Map to analysis frame index (approximate)
+                if total_frames > 0 and num_analysis_frames > 0:
+                    analysis_frame_idx = int((current_frame_idx / total_frames) * (num_analysis_frames - 1))
+                    if analysis_frame_idx not in results["frame_indices"]:
+                        results["frame_indices"].append(analysis_frame_idx)
+                        results["frame_timestamps"].append(timestamp_str)
                 
-                prev_mean_lum = mean_lum
-                
-                # Clean up old timestamps (> 1s ago)
-                current_time = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
-                flash_timestamps = [t for t in flash_timestamps if current_time - t <= 1.0]
-                
-                # If > 3 flashes in last second, flag risk
-                if len(flash_timestamps) > 3:
-                    timestamp_str = f"{int(current_time // 60):02d}:{int(current_time % 60):02d}"
-                    
-                    # Map to analysis frame index (approximate)
-                    if total_frames > 0 and num_analysis_frames > 0:
-                        analysis_frame_idx = int((current_frame_idx / total_frames) * (num_analysis_frames - 1))
-                        if analysis_frame_idx not in results["frame_indices"]:
-                            results["frame_indices"].append(analysis_frame_idx)
-                            results["frame_timestamps"].append(timestamp_str)
-                    
-                    results["flash_events"].append({
-                        "timestamp": current_time,
-                        "timestamp_str": timestamp_str,
-                        "flashes_last_sec": len(flash_timestamps)
-                    })
-                
-                current_frame_idx += 1
+                results["flash_events"].append({
+                    "timestamp": current_time,
+                    "timestamp_str": timestamp_str,
+                    "flashes_last_sec": int(series.flash_counts[current_frame_idx])
+                })
             
             if results["flash_events"]:
                 results["passed"] = False
                 results["risk_level"] = "HIGH" if len(results["flash_events"]) > 5 else "MEDIUM"
-                
-            cap.release()
             
         except Exception as e:
             logger.error(f"PSE check failed: {e}")
@@ -68,6 +68,30 @@ class ToxicityThresholds:
     HEURISTIC_WEIGHT = 0.40  # Weight for rule-based analysis
     AI_WEIGHT = 0.60  # Weight for AI-based analysis
 
+    # === Physiological Pillar ===
+    # Metric thresholds and the points each adds to the pillar score
+    CUTS_PER_MINUTE = 80  # Above this = rapid cutting
+    LOUDNESS_LU = -10  # LUFS; louder (less negative) = extreme loudness
+    BRIGHTNESS_VARIANCE = 0.8  # Above this = flashing/strobing
+    MOTION_ENERGY = 0.9  # Above this = hyper-kinetic motion
+    POINTS_HIGH_CUTS = 20
+    POINTS_LOUD_AUDIO = 30
+    POINTS_PHOTOSENSITIVITY = 50
+    POINTS_BRIGHTNESS_VARIANCE = 25
+    POINTS_MOTION_ENERGY = 10
+
+    # === Psychological Pillar ===
+    CLAIM_DENSITY = 6  # Claims per minute; above this = claim overload
+    POINTS_CLAIM_OVERLOAD = 20
+    POINTS_AI_MANIPULATION = 15  # Max from AI analysis
+    POINTS_SUBTLE_PATTERN = 5  # Per subtle pattern
+
+    # === Regulatory Pillar ===
+    POINTS_GARM_HIGH_RISK = 50
+    POINTS_GARM_MEDIUM_RISK = 25
+    POINTS_MISSING_DISCLAIMER = 50
+    POINTS_CATEGORY_DISCLAIMER = 15
+
 
 class AudioThresholds:
     """Thresholds for audio analysis."""
@@ -139,6 +163,15 @@ class ComplianceThresholds:
     # === Price Claims ===
     PRICE_CLAIM_DURATION = 3.0  # Minimum seconds for price display
 
+    # === Photosensitive Epilepsy (heuristic, not a full Harding test) ===
+    PSE_TRANSITION_DELTA = 40.0  # Mean luma change (0-255) between frames that counts as a flash transition
+    PSE_WINDOW_SECONDS = 1.0  # Sliding window for counting transitions
+    PSE_MAX_FLASHES_PER_WINDOW = 3  # More transitions than this per window = risk (> 3Hz)
+
+    # === Safe Areas ===
+    SAFE_AREA_CONTENT_LUMA = 50  # Pixels brighter than this outside title safe count as content
+    SAFE_AREA_MAX_VIOLATION_RATIO = 0.01  # Fraction of the unsafe area allowed to contain content
+
 
 class IdentificationThresholds:
     """Thresholds for ad identification confidence."""
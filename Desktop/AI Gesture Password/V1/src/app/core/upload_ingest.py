@@ -0,0 +1,271 @@
+"""
+Streaming Upload Ingest
+
+Uploads are written straight to their destination in fixed-size chunks, so
+memory stays bounded by the chunk size however large the master is. While
+the bytes flow the SHA-256 content hash is updated and the first
+PROBE_HEADER_BYTES are handed to ffprobe on a background thread, so the
+analysis record (hash, duration, resolution, fps) is ready the moment the
+last chunk lands and nothing re-reads the file before analysis starts.
+
+Containers that describe themselves up front (MXF header partitions,
+faststart MP4/MOV, Matroska/WebM) are probed from the buffered header alone.
+Files whose index sits at the end (non-faststart MOV/MP4, the usual ProRes
+export) fall back to one ffprobe of the finished file, which seeks to the
+index rather than reading the media.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import asdict, dataclass
+from fractions import Fraction
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from app.core.analysis_cache import HASH_CHUNK_SIZE
+
+logger = logging.getLogger(__name__)
+
+PROBE_HEADER_BYTES = 4 * 1024 * 1024  # 4MB covers MXF header partitions and faststart moov atoms
+PROBE_TIMEOUT_S = 30
+
+_FFPROBE_FALLBACK_PATHS = (
+    r"C:\ffmpeg\bin\ffprobe.exe",
+    r"C:\Program Files\ffmpeg\bin\ffprobe.exe",
+    "/usr/bin/ffprobe",
+    "/usr/local/bin/ffprobe",
+)
+
+
+@dataclass
+class MediaInfo:
+    """Container-level facts about an uploaded video."""
+    duration: float  # seconds
+    fps: float
+    width: int
+    height: int
+    codec: str = "unknown"
+    total_frames: int = 0
+    container: str = "unknown"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class IngestResult:
+    """Outcome of streaming one upload to disk."""
+    path: str
+    content_hash: str
+    size_bytes: int
+    media: Optional[MediaInfo] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "content_hash": self.content_hash,
+            "size_bytes": self.size_bytes,
+            "media": self.media.to_dict() if self.media else None,
+        }
+
+
+def find_ffprobe() -> Optional[str]:
+    """Locate an ffprobe binary, or None if it is not installed."""
+    found = shutil.which("ffprobe")
+    if found:
+        return found
+    for path in _FFPROBE_FALLBACK_PATHS:
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _parse_rate(value: Optional[str]) -> float:
+    try:
+        rate = Fraction(value or "0")
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+    return float(rate)
+
+
+def parse_ffprobe_output(payload: Dict[str, Any]) -> Optional[MediaInfo]:
+    """Build MediaInfo from `ffprobe -of json` output; None if it has no usable video stream."""
+    streams = payload.get("streams") or []
+    video = next((s for s in streams if s.get("codec_type") == "video"), None)
+    if video is None:
+        return None
+
+    fmt = payload.get("format") or {}
+    try:
+        duration = float(fmt.get("duration") or video.get("duration") or 0)
+    except ValueError:
+        duration = 0.0
+    fps = _parse_rate(video.get("avg_frame_rate")) or _parse_rate(video.get("r_frame_rate"))
+    width = int(video.get("width") or 0)
+    height = int(video.get("height") or 0)
+    if duration <= 0 or width <= 0 or height <= 0:
+        return None
+
+    try:
+        total_frames = int(video.get("nb_frames") or 0)
+    except ValueError:
+        total_frames = 0
+    if not total_frames and fps:
+        total_frames = int(round(duration * fps))
+
+    return MediaInfo(
+        duration=round(duration, 2),
+        fps=fps,
+        width=width,
+        height=height,
+        codec=video.get("codec_name") or "unknown",
+        total_frames=total_frames,
+        container=(fmt.get("format_name") or "unknown").split(",")[0],
+    )
+
+
+def probe_media(source: Union[str, bytes], ffprobe: Optional[str] = None) -> Optional[MediaInfo]:
+    """
+    Probe a video file, or the leading bytes of one piped through stdin.
+
+    Returns:
+        MediaInfo, or None if ffprobe is unavailable or could not describe the input
+    """
+    ffprobe = ffprobe or find_ffprobe()
+    if not ffprobe:
+        logger.debug("ffprobe not found; skipping upload probe")
+        return None
+
+    from_bytes = isinstance(source, (bytes, bytearray))
+    cmd = [
+        ffprobe, "-v", "error",
+        "-show_entries",
+        "format=duration,format_name:stream=codec_type,codec_name,width,height,avg_frame_rate,r_frame_rate,nb_frames,duration",
+        "-of", "json",
+        "pipe:0" if from_bytes else str(source),
+    ]
+    try:
+        result = subprocess.run(
+            cmd,
+            input=bytes(source) if from_bytes else None,
+            capture_output=True,
+            timeout=PROBE_TIMEOUT_S,
+        )
+        return parse_ffprobe_output(json.loads(result.stdout or b"{}"))
+    except (OSError, subprocess.TimeoutExpired, ValueError) as e:
+        logger.warning(f"ffprobe failed on {'upload header' if from_bytes else source}: {e}")
+        return None
+
+
+class StreamingIngest:
+    """
+    Incremental writer: feed chunks with write(), then call finish().
+
+    Hashing happens inline; the header probe runs on its own thread as soon
+    as PROBE_HEADER_BYTES have arrived, overlapping with the rest of the upload.
+    """
+
+    def __init__(self, dest_path: Union[str, Path], *, probe: bool = True, header_bytes: int = PROBE_HEADER_BYTES):
+        self.dest_path = Path(dest_path)
+        self.dest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.dest_path, "wb")
+        self._hasher = hashlib.sha256()
+        self._size = 0
+        self._ffprobe = find_ffprobe() if probe else None
+        self._header_bytes = header_bytes
+        self._header: Optional[bytearray] = bytearray() if self._ffprobe else None
+        self._header_media: Optional[MediaInfo] = None
+        self._probe_thread: Optional[threading.Thread] = None
+
+    def write(self, chunk: bytes) -> None:
+        self._hasher.update(chunk)
+        self._file.write(chunk)
+        self._size += len(chunk)
+        if self._header is not None:
+            self._header += chunk[: self._header_bytes - len(self._header)]
+            if len(self._header) >= self._header_bytes:
+                self._start_header_probe(bytes(self._header))
+                self._header = None
+
+    def _start_header_probe(self, header: bytes) -> None:
+        def run():
+            self._header_media = probe_media(header, self._ffprobe)
+
+        self._probe_thread = threading.Thread(target=run, name="upload-probe", daemon=True)
+        self._probe_thread.start()
+
+    def finish(self) -> IngestResult:
+        """Close the file and return its hash, size and (when ffprobe is available) media info."""
+        self._file.close()
+        media = None
+        if self._probe_thread is not None:
+            self._probe_thread.join()
+            media = self._header_media
+        if media is None and self._ffprobe:
+            # Header was inconclusive (index at the end) or the file was smaller than the header window
+            media = probe_media(str(self.dest_path), self._ffprobe)
+        return IngestResult(
+            path=str(self.dest_path),
+            content_hash=self._hasher.hexdigest(),
+            size_bytes=self._size,
+            media=media,
+        )
+
+    def abort(self) -> None:
+        """Close and remove the partial file."""
+        self._file.close()
+        try:
+            self.dest_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+async def ingest_upload(
+    upload,
+    dest_path: Union[str, Path],
+    *,
+    chunk_size: int = HASH_CHUNK_SIZE,
+    probe: bool = True,
+) -> IngestResult:
+    """
+    Stream an UploadFile (anything with async read(n)) to dest_path.
+
+    Disk writes and the final probe run on worker threads so the event loop
+    keeps serving other requests during large uploads. A failed upload
+    leaves no partial file behind.
+    """
+    ingest = await asyncio.to_thread(StreamingIngest, dest_path, probe=probe)
+    try:
+        while True:
+            chunk = await upload.read(chunk_size)
+            if not chunk:
+                break
+            await asyncio.to_thread(ingest.write, chunk)
+        result = await asyncio.to_thread(ingest.finish)
+    except BaseException:
+        await asyncio.to_thread(ingest.abort)
+        raise
+    logger.info(
+        f"Ingested {Path(result.path).name}: {result.size_bytes} bytes, sha256 {result.content_hash[:12]}"
+        + (f", {result.media.width}x{result.media.height} @ {result.media.fps:.2f}fps, {result.media.duration}s"
+           if result.media else "")
+    )
+    return result
+
+
+__all__ = [
+    "IngestResult",
+    "MediaInfo",
+    "StreamingIngest",
+    "find_ffprobe",
+    "ingest_upload",
+    "parse_ffprobe_output",
+    "probe_media",
+    "PROBE_HEADER_BYTES",
+]
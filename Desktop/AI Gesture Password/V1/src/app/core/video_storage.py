@@ -1,20 +1,33 @@
 """Video Analysis Storage System"""
 
+import functools
 import json
 import os
 import shutil
 import subprocess
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import uuid
 import logging
-import cv2
 import base64
 from io import BytesIO
 
+from app.core.record_store import SQLiteRecordStore
+
 logger = logging.getLogger(__name__)
 
+
+def _locked(method):
+    """Run a storage method while holding the instance's record lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class VideoAnalysisStorage:
     """Storage system for video analysis data"""
 
@@ -39,6 +52,9 @@ class VideoAnalysisStorage:
         "affection": "love",
         "heart": "love",
     }
+    # Sections stored as one row per record; settings is a single row
+    RECORD_SECTIONS = ("analyses", "reactions", "reaction_jobs", "queue_jobs")
+    SETTINGS_KEY = "global"
     
     def __init__(self, storage_dir: str = "video_analyses"):
         """Initialize storage system"""
@@ -54,15 +70,31 @@ class VideoAnalysisStorage:
         
         self.thumbnails_dir = self.storage_dir / "thumbnails"
         self.thumbnails_dir.mkdir(exist_ok=True)
+
+        # Uploads stream here first; same filesystem as videos_dir so adopting one is a rename
+        self.uploads_dir = self.storage_dir / "uploads"
+        self.uploads_dir.mkdir(exist_ok=True)
+
+        # Rendered PDF reports, named {kind}_{analysis_id}_{content key}.pdf
+        self.reports_dir = self.storage_dir / "reports"
+        self.reports_dir.mkdir(exist_ok=True)
         
-        # Database file
-        self.db_file = self.storage_dir / "analyses.json"
+        # Database: one row per record in SQLite (WAL). The in-memory dict is
+        # the read cache; writes go through _save_record for the touched row.
+        self.db_file = self.storage_dir / "analyses.db"
+        self.legacy_db_file = self.storage_dir / "analyses.json"
+        self._persisted: Dict[Tuple[str, str], str] = {}
+        # Queue handlers write from worker threads: every change to self.db and
+        # every serialize/persist of it happens under this lock
+        self._lock = threading.RLock()
+        self._backend = SQLiteRecordStore(self.db_file)
+        self._migrate_legacy_json()
         self.db = self._load_database()
-        self._db_mtime = self.db_file.stat().st_mtime if self.db_file.exists() else 0
-        
-    def _load_database(self) -> Dict:
-        """Load database from file, with backup recovery on corruption"""
-        default_db = {
+        self._db_version = self._backend.data_version()
+
+    @staticmethod
+    def _default_database() -> Dict:
+        return {
             "analyses": {},
             "reactions": {},
             "reaction_jobs": {},
@@ -73,114 +105,171 @@ class VideoAnalysisStorage:
             }
         }
 
-        # Try loading from main file first
-        if self.db_file.exists():
+    def _load_legacy_json(self) -> Optional[Dict]:
+        """Read the pre-SQLite analyses.json, with backup recovery on corruption"""
+        default_db = self._default_database()
+        try:
+            with open(self.legacy_db_file, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            logger.error(f"Legacy database file corrupted: {e}")
+            backup_path = self.legacy_db_file.with_suffix('.json.bak')
+            if not backup_path.exists():
+                return None
+            logger.info("Attempting to recover from backup file...")
             try:
-                with open(self.db_file, 'r') as f:
+                with open(backup_path, 'r') as f:
                     data = json.load(f)
-                    for key in default_db.keys():
-                        if key == "settings" and key not in data:
-                            data[key] = default_db[key]
-                        else:
-                            data.setdefault(key, {})
-                    self._db_mtime = self.db_file.stat().st_mtime
-                    return data
-            except json.JSONDecodeError as e:
-                logger.error(f"Database file corrupted: {e}")
-                # Try to load from backup
-                backup_path = self.db_file.with_suffix('.json.bak')
-                if backup_path.exists():
-                    logger.info("Attempting to recover from backup file...")
-                    try:
-                        with open(backup_path, 'r') as f:
-                            data = json.load(f)
-                            for key in default_db.keys():
-                                data.setdefault(key, {})
-                            logger.info(f"Successfully recovered {len(data.get('analyses', {}))} analyses from backup")
-                            # Restore the backup as main file
-                            shutil.copy2(backup_path, self.db_file)
-                            self._db_mtime = self.db_file.stat().st_mtime
-                            return data
-                    except Exception as backup_err:
-                        logger.error(f"Failed to recover from backup: {backup_err}")
-                return default_db
-            except Exception as e:
-                logger.error(f"Failed to load database: {e}")
-                return default_db
-        else:
-            self._db_mtime = 0
-            return default_db
-            
-    def _save_database(self):
-        """Save database to file using atomic write to prevent corruption"""
-        import tempfile
+                logger.info(f"Successfully recovered {len(data.get('analyses', {}))} analyses from backup")
+            except Exception as backup_err:
+                logger.error(f"Failed to recover from backup: {backup_err}")
+                return None
+        except Exception as e:
+            logger.error(f"Failed to load legacy database: {e}")
+            return None
+
+        for key in default_db.keys():
+            if key == "settings" and key not in data:
+                data[key] = default_db[key]
+            else:
+                data.setdefault(key, {})
+        return data
+
+    def _migrate_legacy_json(self) -> None:
+        """One-shot import of analyses.json into the SQLite store."""
+        if not self.legacy_db_file.exists() or not self._backend.is_empty():
+            return
+
+        data = self._load_legacy_json()
+        if data is None:
+            return
+
         try:
-            # Create a deep copy to avoid modifying the original
-            db_copy = json.loads(json.dumps(self.db, default=self._json_encoder))
-
-            # Atomic write: write to temp file first, then rename
-            # This prevents corruption if multiple processes write simultaneously
-            temp_fd, temp_path = tempfile.mkstemp(
-                suffix='.json',
-                prefix='analyses_',
-                dir=self.storage_dir
+            rows = [
+                (section, key, self._serialize(record))
+                for section in self.RECORD_SECTIONS
+                for key, record in data.get(section, {}).items()
+            ]
+            rows.append(("settings", self.SETTINGS_KEY, self._serialize(data["settings"])))
+            self._backend.put_many(rows)
+            migrated_path = self.legacy_db_file.with_suffix('.json.migrated')
+            os.replace(self.legacy_db_file, migrated_path)
+            logger.info(
+                f"Migrated {len(data.get('analyses', {}))} analyses from {self.legacy_db_file.name} "
+                f"to {self.db_file.name} (original kept as {migrated_path.name})"
             )
+        except Exception as e:
+            logger.error(f"Failed to migrate legacy database: {e}")
+
+    def _load_database(self) -> Dict:
+        """Load all records from the SQLite store into the in-memory cache"""
+        db = self._default_database()
+        self._persisted = {}
+        try:
+            rows = self._backend.rows()
+        except Exception as e:
+            logger.error(f"Failed to load database: {e}")
+            return db
+
+        for section, key, data in rows:
             try:
-                with os.fdopen(temp_fd, 'w') as f:
-                    json.dump(db_copy, f, indent=2, default=self._json_encoder)
+                record = json.loads(data)
+            except json.JSONDecodeError as e:
+                logger.error(f"Skipping corrupt {section} record {key}: {e}")
+                continue
+            if section == "settings":
+                db["settings"] = record
+            elif section in db:
+                db[section][key] = record
+            else:
+                continue
+            self._persisted[(section, key)] = data
+        return db
 
-                # Atomic rename (on Windows, need to remove target first)
-                if os.name == 'nt' and self.db_file.exists():
-                    # Create backup before replacing
-                    backup_path = self.db_file.with_suffix('.json.bak')
-                    try:
-                        shutil.copy2(self.db_file, backup_path)
-                    except Exception:
-                        pass  # Best effort backup
-                    os.replace(temp_path, self.db_file)
-                else:
-                    os.replace(temp_path, self.db_file)
+    def _serialize(self, record) -> str:
+        return json.dumps(record, default=self._json_encoder)
 
-            except Exception:
-                # Clean up temp file on error
-                try:
-                    os.unlink(temp_path)
-                except Exception:
-                    pass
-                raise
+    def _current_record(self, section: str, key: str):
+        if section == "settings":
+            return self.db.get("settings")
+        return self.db.get(section, {}).get(key)
+
+    @_locked
+    def _save_record(self, section: str, key: str) -> None:
+        """Persist one record (or delete it if it is no longer in memory)."""
+        try:
+            record = self._current_record(section, key)
+            if record is None:
+                self._backend.delete(section, [key])
+                self._persisted.pop((section, key), None)
+                return
+            data = self._serialize(record)
+            if self._persisted.get((section, key)) == data:
+                return
+            self._backend.put(section, key, data)
+            self._persisted[(section, key)] = data
+        except Exception as e:
+            logger.error(f"Failed to save {section} record {key}: {e}")
+
+    @_locked
+    def _save_database(self):
+        """Persist every record that changed since it was last written.
+
+        Prefer _save_record when the touched record is known; this full
+        sync is for callers that mutate self.db directly.
+        """
+        try:
+            rows = []
+            current = set()
+            for section in self.RECORD_SECTIONS:
+                for key, record in list(self.db.get(section, {}).items()):
+                    data = self._serialize(record)
+                    current.add((section, key))
+                    if self._persisted.get((section, key)) != data:
+                        rows.append((section, key, data))
+            settings_data = self._serialize(self.db.get("settings", {}))
+            current.add(("settings", self.SETTINGS_KEY))
+            if self._persisted.get(("settings", self.SETTINGS_KEY)) != settings_data:
+                rows.append(("settings", self.SETTINGS_KEY, settings_data))
 
-            # Update modification time after saving
-            if self.db_file.exists():
-                self._db_mtime = self.db_file.stat().st_mtime
+            removed = [record_id for record_id in list(self._persisted) if record_id not in current]
+            if rows:
+                self._backend.put_many(rows)
+            for section, key in removed:
+                self._backend.delete(section, [key])
+                self._persisted.pop((section, key), None)
+            for section, key, data in rows:
+                self._persisted[(section, key)] = data
         except Exception as e:
             logger.error(f"Failed to save database: {e}")
     
+    @_locked
     def reload_database(self) -> None:
         """Force reload database from disk, discarding cached data."""
         logger.info("Reloading database from disk")
         old_count = len(self.db.get("analyses", {}))
         self.db = self._load_database()
+        self._db_version = self._backend.data_version()
         new_count = len(self.db.get("analyses", {}))
         logger.info(f"Database reloaded: {old_count} -> {new_count} analyses")
     
+    @_locked
     def _check_and_reload_if_stale(self) -> bool:
-        """Check if database file has been modified externally and reload if needed.
+        """Check if another connection has committed to the database and reload if needed.
         
         Returns:
             True if database was reloaded, False otherwise.
         """
-        if not self.db_file.exists():
-            return False
-        
         try:
-            current_mtime = self.db_file.stat().st_mtime
-            if current_mtime > self._db_mtime:
-                logger.info(f"Database file modified externally (mtime: {current_mtime} > cached: {self._db_mtime}), reloading")
-                self.reload_database()
-                return True
-        except OSError as e:
-            logger.warning(f"Failed to check database file mtime: {e}")
-        
+            current_version = self._backend.data_version()
+        except Exception as e:
+            logger.warning(f"Failed to check database version: {e}")
+            return False
+
+        if current_version != self._db_version:
+            logger.info("Database modified by another connection, reloading")
+            self.reload_database()
+            return True
         return False
             
     def _json_encoder(self, obj):
@@ -228,6 +317,7 @@ class VideoAnalysisStorage:
         normalized_entry.update(normalized_scores)
         return normalized_entry
             
+    @_locked
     def count_user_videos(self, user_id: str) -> int:
         """Count number of videos for a specific user"""
         if not user_id:
@@ -246,6 +336,10 @@ class VideoAnalysisStorage:
         is_admin: bool = False,
         *,
         defer_transcription: bool = False,
+        content_hash: Optional[str] = None,
+        video_name: Optional[str] = None,
+        video_metadata: Optional[Dict] = None,
+        move_source: bool = False,
     ) -> str:
         """Create a new analysis entry
         
@@ -253,6 +347,11 @@ class VideoAnalysisStorage:
             video_path: Path to the video file
             user_id: ID of the user creating the analysis
             is_admin: Whether the user is an admin (bypasses video limit)
+            content_hash: SHA-256 of the video if already computed (e.g. during upload)
+            video_name: Display name (defaults to the file name of video_path)
+            video_metadata: Duration/resolution/fps probed during upload, if available
+            move_source: Move video_path into storage instead of copying it
+                (for files staged in uploads_dir)
             
         Returns:
             analysis_id if successful, or error message starting with "ERROR:"
@@ -265,20 +364,23 @@ class VideoAnalysisStorage:
                 return "ERROR: You have reached the maximum limit of 3 videos. Please delete an existing video to upload a new one."
         
         analysis_id = str(uuid.uuid4())
-        video_name = os.path.basename(video_path)
+        video_name = video_name or os.path.basename(video_path)
         
-        # Copy video to storage
+        # Copy (or move) video to storage
         video_dest = self.videos_dir / f"{analysis_id}{Path(video_path).suffix}"
         try:
-            shutil.copy2(video_path, video_dest)
+            if move_source:
+                shutil.move(video_path, video_dest)
+            else:
+                shutil.copy2(video_path, video_dest)
         except Exception as e:
-            logger.error(f"Failed to copy video: {e}")
+            logger.error(f"Failed to {'move' if move_source else 'copy'} video: {e}")
             video_dest = Path(video_path)  # Use original path
         else:
             video_dest = Path(video_dest)
 
         # Generate video thumbnail
-        thumbnail = self._generate_video_thumbnail(video_path)
+        thumbnail = self._generate_video_thumbnail(str(video_dest))
             
         # Create analysis entry
         suffix = video_dest.suffix.lower()
@@ -306,18 +408,20 @@ class VideoAnalysisStorage:
             "playback_ready": bool(playback_ready),  # Ensure it's always True or False, never None
             "playback_video_path": playback_path,
             "playback_job_id": None,
+            "content_hash": content_hash,
+            "video_metadata": video_metadata,
         }
 
-        self.db["analyses"][analysis_id] = analysis_entry
-        
-        self._save_database()
+        with self._lock:
+            self.db["analyses"][analysis_id] = analysis_entry
+            self._save_record("analyses", analysis_id)
         
         if not defer_transcription:
             # Start transcription in background
             import threading
             threading.Thread(
                 target=self._transcribe_video, 
-                args=(analysis_id, video_path),
+                args=(analysis_id, str(video_dest)),
                 daemon=True
             ).start()
         
@@ -325,16 +429,27 @@ class VideoAnalysisStorage:
         
     def _generate_video_thumbnail(self, video_path: str) -> Optional[str]:
         """Generate thumbnail from video"""
+        # Deferred: OpenCV (and NumPy) would dominate this module's import time
+        import cv2
+        from app.core.frame_store import peek_frame_store
+
         try:
-            cap = cv2.VideoCapture(video_path)
-            
-            # Get frame from 10% into the video
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            target_frame = int(total_frames * 0.1)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
-            
-            ret, frame = cap.read()
-            cap.release()
+            # Reuse an already decoded frame store rather than opening the file again
+            store = peek_frame_store(video_path)
+            sample = store.thumbnail_frame() if store else None
+            if sample is not None:
+                frame = sample.decode()
+                ret = frame is not None
+            else:
+                cap = cv2.VideoCapture(video_path)
+                
+                # Get frame from 10% into the video
+                total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                target_frame = int(total_frames * 0.1)
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target_frame)
+                
+                ret, frame = cap.read()
+                cap.release()
             
             if ret:
                 # Resize to thumbnail size
@@ -352,14 +467,16 @@ class VideoAnalysisStorage:
             
         return None
 
+    @_locked
     def set_playback_job_id(self, analysis_id: str, job_id: Optional[str]) -> bool:
         analysis = self.db["analyses"].get(analysis_id)
         if not analysis:
             return False
         analysis["playback_job_id"] = job_id
-        self._save_database()
+        self._save_record("analyses", analysis_id)
         return True
 
+    @_locked
     def mark_playback_ready(self, analysis_id: str, playback_path: str) -> bool:
         analysis = self.db["analyses"].get(analysis_id)
         if not analysis:
@@ -367,7 +484,7 @@ class VideoAnalysisStorage:
         analysis["playback_ready"] = True
         analysis["playback_video_path"] = playback_path
         analysis["playback_job_id"] = None
-        self._save_database()
+        self._save_record("analyses", analysis_id)
         return True
 
     def generate_playback_copy(self, analysis_id: str) -> str:
@@ -442,6 +559,7 @@ class VideoAnalysisStorage:
             logger.warning("Failed to create playback copy for %s: %s", video_path, exc)
             return None
         
+    @_locked
     def save_reaction(self, analysis_id: str, reaction_data: Dict, reaction_id: Optional[str] = None) -> Optional[str]:
         """Save a reaction to existing analysis"""
         # Check if analysis exists in database
@@ -499,7 +617,8 @@ class VideoAnalysisStorage:
         # Re-analyze emotion triggers now that we have new reaction data
         self.analyze_emotion_triggers(analysis_id)
             
-        self._save_database()
+        self._save_record("reactions", reaction_id)
+        self._save_record("analyses", analysis_id)
         logger.info(f"Saved reaction {reaction_id} to analysis {analysis_id}")
         return reaction_id
         
@@ -621,6 +740,7 @@ class VideoAnalysisStorage:
         analysis = self.db["analyses"].get(analysis_id, {})
         return analysis.get("reactions", [])
         
+    @_locked
     def delete_analysis(self, analysis_id: str):
         """Delete an analysis and all its reactions"""
         if analysis_id not in self.db["analyses"]:
@@ -629,7 +749,11 @@ class VideoAnalysisStorage:
         analysis = self.db["analyses"][analysis_id]
         
         # Delete video file
+        from app.core.frame_store import release_frame_store
         video_path = Path(analysis["video_path"])
+        release_frame_store(str(video_path))
+        if analysis.get("playback_video_path"):
+            release_frame_store(analysis["playback_video_path"])
         if video_path.exists() and video_path.parent == self.videos_dir:
             try:
                 video_path.unlink()
@@ -640,12 +764,15 @@ class VideoAnalysisStorage:
         for reaction in analysis["reactions"]:
             if reaction["id"] in self.db["reactions"]:
                 del self.db["reactions"][reaction["id"]]
+                self._save_record("reactions", reaction["id"])
                 
         # Delete analysis
         del self.db["analyses"][analysis_id]
         
-        self._save_database()
+        self._save_record("analyses", analysis_id)
+        self.invalidate_reports(analysis_id)
         
+    @_locked
     def search_analyses(self, query: str) -> List[Dict]:
         """Search analyses by video name"""
         results = []
@@ -657,6 +784,7 @@ class VideoAnalysisStorage:
                 
         return results
         
+    @_locked
     def get_recent_analyses(self, limit: int = 10) -> List[Dict]:
         """Get recent analyses"""
         analyses = list(self.db["analyses"].values())
@@ -667,9 +795,7 @@ class VideoAnalysisStorage:
         """Transcribe video audio in background"""
         try:
             # Update transcription status
-            if analysis_id in self.db["analyses"]:
-                self.db["analyses"][analysis_id]["transcription_status"] = "processing"
-                self._save_database()
+            self._set_transcription(analysis_id, status="processing")
             
             # Import required modules
             import speech_recognition as sr
@@ -681,9 +807,7 @@ class VideoAnalysisStorage:
                 moviepy_available = True
             except ImportError:
                 logger.warning("MoviePy not available - skipping transcription")
-                if analysis_id in self.db["analyses"]:
-                    self.db["analyses"][analysis_id]["transcription_status"] = "unavailable"
-                    self._save_database()
+                self._set_transcription(analysis_id, status="unavailable")
                 return
                 
             # Extract audio from video
@@ -812,21 +936,19 @@ class VideoAnalysisStorage:
                             video_context=f"Video: {video_name}"
                         )
                         
-                        self.db["analyses"][analysis_id]["transcription"] = enhanced_transcript
+                        transcription = enhanced_transcript
                         logger.info(f"Transcription enhanced with AI for analysis {analysis_id}")
                     except Exception as e:
                         logger.warning(f"Failed to enhance transcript with AI: {e}")
                         # Fall back to raw transcript
-                        self.db["analyses"][analysis_id]["transcription"] = raw_transcript
+                        transcription = raw_transcript
                     
-                    self.db["analyses"][analysis_id]["transcription_status"] = "complete"
-                    self._save_database()
+                    self._set_transcription(analysis_id, status="complete", transcription=transcription)
                     
                     logger.info(f"Transcription complete for analysis {analysis_id}")
                 else:
                     logger.info("Video has no audio track")
-                    self.db["analyses"][analysis_id]["transcription_status"] = "no_audio"
-                    self._save_database()
+                    self._set_transcription(analysis_id, status="no_audio")
                     
             finally:
                 # Clean up temp file
@@ -838,10 +960,19 @@ class VideoAnalysisStorage:
                     
         except Exception as e:
             logger.error(f"Failed to transcribe video: {e}")
-            if analysis_id in self.db["analyses"]:
-                self.db["analyses"][analysis_id]["transcription_status"] = "failed"
-                self._save_database()
-            
+            self._set_transcription(analysis_id, status="failed")
+
+    @_locked
+    def _set_transcription(self, analysis_id: str, status: str, transcription: Optional[Dict] = None) -> None:
+        analysis = self.db["analyses"].get(analysis_id)
+        if analysis is None:
+            return
+        if transcription is not None:
+            analysis["transcription"] = transcription
+        analysis["transcription_status"] = status
+        self._save_record("analyses", analysis_id)
+
+    @_locked
     def analyze_emotion_triggers(self, analysis_id: str):
         """Map detected emotions to transcript segments based on timing"""
         analysis = self.get_analysis(analysis_id)
@@ -932,8 +1063,9 @@ class VideoAnalysisStorage:
                 
         # Update transcription with emotion mapping
         self.db["analyses"][analysis_id]["transcription"]['segments'] = segments
-        self._save_database()
+        self._save_record("analyses", analysis_id)
         
+    @_locked
     def save_clearcast_check(self, analysis_id: str, clearcast_results: Dict) -> bool:
         """
         Save Clearcast compliance check results
@@ -954,10 +1086,12 @@ class VideoAnalysisStorage:
         self.db["analyses"][analysis_id]["clearcast_checked"] = True
         self.db["analyses"][analysis_id]["clearcast_check_date"] = datetime.now().isoformat()
         
-        self._save_database()
+        self._save_record("analyses", analysis_id)
+        self.invalidate_reports(analysis_id, "clearcast")
         logger.info(f"Saved Clearcast check results for analysis {analysis_id}")
         return True
     
+    @_locked
     def save_ai_breakdown(self, analysis_id: str, breakdown_results: Dict) -> bool:
         """
         Save AI video breakdown results
@@ -978,10 +1112,66 @@ class VideoAnalysisStorage:
         self.db["analyses"][analysis_id]["ai_breakdown_checked"] = True
         self.db["analyses"][analysis_id]["ai_breakdown_date"] = datetime.now().isoformat()
         
-        self._save_database()
+        self._save_record("analyses", analysis_id)
+        self.invalidate_reports(analysis_id, "breakdown")
         logger.info(f"Saved AI breakdown results for analysis {analysis_id}")
         return True
-    
+
+    def report_path(self, kind: str, analysis_id: str, content_key: str) -> Path:
+        """Where the rendered `kind` report for this content key is cached."""
+        return self.reports_dir / f"{kind}_{analysis_id}_{content_key}.pdf"
+
+    def invalidate_reports(self, analysis_id: str, kind: Optional[str] = None) -> int:
+        """
+        Delete cached PDF renders of an analysis (all kinds, or just `kind`).
+
+        Returns:
+            Number of files removed
+        """
+        removed = 0
+        for path in self.reports_dir.glob(f"{kind or '*'}_{analysis_id}_*.pdf"):
+            try:
+                path.unlink()
+                removed += 1
+            except OSError as e:
+                logger.warning(f"Failed to remove cached report {path}: {e}")
+        return removed
+
+    @_locked
+    def save_toxicity_reports(self, reports: Dict[str, Dict]) -> int:
+        """
+        Replace the stored toxicity report of several analyses in one write.
+
+        Args:
+            reports: Mapping of analysis ID to ToxicityReport dict
+
+        Returns:
+            Number of analyses updated (unknown IDs or analyses without an
+            AI breakdown are skipped)
+        """
+        rescored_at = datetime.now().isoformat()
+        rows = []
+        for analysis_id, report in reports.items():
+            analysis = self.db["analyses"].get(analysis_id)
+            if not analysis or not isinstance(analysis.get("ai_breakdown"), dict):
+                logger.warning(f"Cannot save toxicity report: no AI breakdown for analysis {analysis_id}")
+                continue
+            analysis["ai_breakdown"]["toxicity"] = report
+            analysis["toxicity_rescored_at"] = rescored_at
+            rows.append(("analyses", analysis_id, self._serialize(analysis)))
+
+        if rows:
+            try:
+                self._backend.put_many(rows)
+            except Exception as e:
+                logger.error(f"Failed to save toxicity reports: {e}")
+                return 0
+            for section, key, data in rows:
+                self._persisted[(section, key)] = data
+                self.invalidate_reports(key, "breakdown")
+        return len(rows)
+
+    @_locked
     def set_ai_airing_country(self, analysis_id: str, country: str) -> bool:
         """Persist the preferred airing country for AI analysis context."""
         if analysis_id not in self.db["analyses"]:
@@ -989,7 +1179,7 @@ class VideoAnalysisStorage:
             return False
         normalized = (country or "").strip()
         self.db["analyses"][analysis_id]["ai_airing_country"] = normalized
-        self._save_database()
+        self._save_record("analyses", analysis_id)
         logger.info(f"Updated airing country for analysis {analysis_id} to '{normalized}'")
         return True
     
@@ -1007,6 +1197,7 @@ class VideoAnalysisStorage:
             logger.error(f"Failed to export analysis: {e}")
             return False
 
+    @_locked
     def save_enhanced_transcript(self, analysis_id: str, transcript_chunks: List[Dict]):
         """Save enhanced transcript with emotion mapping"""
         if analysis_id not in self.db["analyses"]:
@@ -1019,9 +1210,10 @@ class VideoAnalysisStorage:
             'analyzed_at': datetime.now().isoformat()
         }
         
-        self._save_database()
+        self._save_record("analyses", analysis_id)
         logger.info(f"Saved enhanced transcript for analysis {analysis_id}")
     
+    @_locked
     def update_reaction_snapshot(self, reaction_id: str, snapshot_index: int, enhanced_analysis: Dict):
         """Update a specific snapshot in a reaction with enhanced analysis data"""
         try:
@@ -1034,7 +1226,7 @@ class VideoAnalysisStorage:
                     reaction["reaction_snapshots"][snapshot_index]["enhanced_analysis"] = enhanced_analysis
                     
                     # Save to database
-                    self._save_database()
+                    self._save_record("reactions", reaction_id)
                     logger.info(f"Updated snapshot {snapshot_index} in reaction {reaction_id}")
                 else:
                     logger.warning(f"Invalid snapshot index {snapshot_index} for reaction {reaction_id}")
@@ -1043,6 +1235,7 @@ class VideoAnalysisStorage:
         except Exception as e:
             logger.error(f"Failed to update reaction snapshot: {e}")
     
+    @_locked
     def save_video_processing(self, analysis_id: str, processing_results: Dict) -> bool:
         """
         Save video processing results from Clearcast video processor
@@ -1068,7 +1261,7 @@ class VideoAnalysisStorage:
             'delivery_metadata': processing_results.get('delivery_metadata') or self._default_delivery_metadata(),
         }
         
-        self._save_database()
+        self._save_record("analyses", analysis_id)
         logger.info(f"Saved video processing results for analysis {analysis_id}")
         return True 
 
@@ -1098,7 +1291,14 @@ class VideoAnalysisStorage:
     # ------------------------------------------------------------------ #
     # Reaction job metadata
     # ------------------------------------------------------------------ #
-    def create_reaction_job(self, analysis_id: str, reaction_id: str, video_path: str) -> Dict:
+    @_locked
+    def create_reaction_job(
+        self,
+        analysis_id: str,
+        reaction_id: str,
+        video_path: str,
+        video_metadata: Optional[Dict] = None,
+    ) -> Dict:
         job = {
             "reaction_id": reaction_id,
             "analysis_id": analysis_id,
@@ -1110,11 +1310,13 @@ class VideoAnalysisStorage:
             "finished_at": None,
             "error": None,
             "queue_job_id": None,
+            "video_metadata": video_metadata,
         }
         self.db["reaction_jobs"][reaction_id] = job
-        self._save_database()
+        self._save_record("reaction_jobs", reaction_id)
         return job
 
+    @_locked
     def update_reaction_job(self, reaction_id: str, **updates) -> Optional[Dict]:
         job = self.db["reaction_jobs"].get(reaction_id)
         if not job:
@@ -1122,7 +1324,7 @@ class VideoAnalysisStorage:
         job.setdefault("processing_mode", "queue")
         for key, value in updates.items():
             job[key] = value
-        self._save_database()
+        self._save_record("reaction_jobs", reaction_id)
         return job
 
     def get_reaction_job(self, reaction_id: str) -> Optional[Dict]:
@@ -1131,6 +1333,7 @@ class VideoAnalysisStorage:
             job.setdefault("processing_mode", "queue")
         return job
 
+    @_locked
     def list_reaction_jobs(self, analysis_id: str) -> List[Dict]:
         jobs = [
             job for job in self.db["reaction_jobs"].values()
@@ -1143,6 +1346,7 @@ class VideoAnalysisStorage:
     # ------------------------------------------------------------------ #
     # Generalized queue jobs (video uploads, reactions, etc.)
     # ------------------------------------------------------------------ #
+    @_locked
     def create_queue_job(
         self,
         job_type: str,
@@ -1150,6 +1354,7 @@ class VideoAnalysisStorage:
         payload: Dict,
         *,
         max_retries: int = 0,
+        priority: int = 0,
     ) -> Dict:
         job_id = f"queue_{uuid.uuid4().hex[:12]}"
         job = {
@@ -1165,23 +1370,26 @@ class VideoAnalysisStorage:
             "error_user_message": None,
             "retry_count": 0,
             "max_retries": max(0, int(max_retries)),
+            "priority": int(priority),
         }
         self.db["queue_jobs"][job_id] = job
-        self._save_database()
+        self._save_record("queue_jobs", job_id)
         return job
 
+    @_locked
     def update_queue_job(self, job_id: str, **updates) -> Optional[Dict]:
         job = self.db["queue_jobs"].get(job_id)
         if not job:
             return None
         for key, value in updates.items():
             job[key] = value
-        self._save_database()
+        self._save_record("queue_jobs", job_id)
         return job
 
     def get_queue_job(self, job_id: str) -> Optional[Dict]:
         return self.db["queue_jobs"].get(job_id)
 
+    @_locked
     def list_queue_jobs(
         self,
         analysis_id: Optional[str] = None,
@@ -1204,10 +1412,11 @@ class VideoAnalysisStorage:
             "accent_color": "#3B82F6"
         })
 
+    @_locked
     def update_settings(self, settings: Dict) -> Dict:
         """Update global application settings"""
         current_settings = self.get_settings()
         current_settings.update(settings)
         self.db["settings"] = current_settings
-        self._save_database()
+        self._save_record("settings", self.SETTINGS_KEY)
         return current_settings
\ No newline at end of file
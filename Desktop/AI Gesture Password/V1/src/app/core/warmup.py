@@ -0,0 +1,143 @@
+"""
+Background Warm-up
+
+Heavyweight components (Gemini-backed checkers, the sentence-transformers
+knowledge base, the emotion-tracking stack) are registered here with a
+loader instead of being built at import time. start() loads them one after
+another on a daemon thread so the API can begin serving immediately; the
+first request that needs a component waits for its load to finish (or
+loads it itself if warm-up was never started, e.g. in tests) rather than
+initializing a second copy inline.
+
+Loaders should do their own imports so that importing the API module does
+not pull in the component's dependencies.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Any]
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class WarmupError(RuntimeError):
+    """A component failed to load or did not become ready in time."""
+
+
+@dataclass
+class _Component:
+    name: str
+    loader: Loader
+    state: str = PENDING
+    value: Any = None
+    error: Optional[str] = None
+    duration_s: Optional[float] = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class WarmupRegistry:
+    """Named components loaded once, in the background or on first use."""
+
+    def __init__(self):
+        self._components: Dict[str, _Component] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, loader: Loader) -> None:
+        """Register a component. Nothing is loaded until start() or first use."""
+        if name in self._components:
+            raise ValueError(f"Component '{name}' is already registered")
+        self._components[name] = _Component(name=name, loader=loader)
+
+    def start(self) -> bool:
+        """Load every pending component on a background thread. Returns False if already started."""
+        if self._thread is not None:
+            return False
+        self._thread = threading.Thread(target=self._warm_all, name="warmup", daemon=True)
+        self._thread.start()
+        return True
+
+    def _warm_all(self) -> None:
+        started = time.perf_counter()
+        for component in list(self._components.values()):
+            try:
+                self._load(component)
+            except WarmupError:
+                pass  # Recorded on the component; requests retry on demand
+        logger.info(f"Warm-up finished in {time.perf_counter() - started:.2f}s: {self.summary()}")
+
+    def _load(self, component: _Component, timeout: Optional[float] = None) -> Any:
+        # Whoever holds the lock is loading; everyone else waits for its result
+        if not component.lock.acquire(timeout=-1 if timeout is None else timeout):
+            raise WarmupError(f"Timed out waiting for '{component.name}' to load")
+        try:
+            if component.state == READY:
+                return component.value
+            component.state = LOADING
+            started = time.perf_counter()
+            try:
+                component.value = component.loader()
+            except Exception as e:
+                component.state = FAILED
+                component.error = str(e)
+                logger.error(f"Failed to load '{component.name}': {e}")
+                raise WarmupError(f"Component '{component.name}' failed to load: {e}") from e
+            finally:
+                component.duration_s = round(time.perf_counter() - started, 3)
+            component.state = READY
+            component.error = None
+            logger.info(f"Loaded '{component.name}' in {component.duration_s:.2f}s")
+            return component.value
+        finally:
+            component.lock.release()
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """
+        Return a component, blocking until it is loaded.
+
+        A component that is still pending (or failed earlier) is loaded in the
+        calling thread.
+        """
+        component = self._components.get(name)
+        if component is None:
+            raise KeyError(f"Unknown component '{name}'")
+        if component.state == READY:
+            return component.value
+        return self._load(component, timeout)
+
+    async def wait_for(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Async get(): waits on a worker thread so the event loop keeps serving."""
+        component = self._components.get(name)
+        if component is not None and component.state == READY:
+            return component.value
+        return await asyncio.to_thread(self.get, name, timeout)
+
+    def is_ready(self, name: Optional[str] = None) -> bool:
+        """Whether one component (or every component) has loaded."""
+        if name is not None:
+            component = self._components.get(name)
+            return component is not None and component.state == READY
+        return all(c.state == READY for c in self._components.values())
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-component state for health checks."""
+        return {
+            c.name: {"state": c.state, "duration_s": c.duration_s, "error": c.error}
+            for c in self._components.values()
+        }
+
+    def summary(self) -> str:
+        parts: List[str] = [f"{c.name}={c.state}" for c in self._components.values()]
+        return ", ".join(parts)
+
+
+__all__ = ["WarmupError", "WarmupRegistry", "PENDING", "LOADING", "READY", "FAILED"]
@@ -17,7 +17,6 @@ from .types import (
     ComplianceSolution,
     ComplianceResult,
 )
-from .orchestrator import run_ad_script_protocol
 
 __all__ = [
     "AdScriptBrief",
@@ -34,9 +33,9 @@ __all__ = [
 ]
 
 
-
-
-
-
-
-
+def __getattr__(name):
+    # The orchestrator imports every agent and LLM client; load it on first use
+    if name == "run_ad_script_protocol":
+        from .orchestrator import run_ad_script_protocol
+        return run_ad_script_protocol
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
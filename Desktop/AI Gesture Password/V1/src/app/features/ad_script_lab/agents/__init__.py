@@ -9,10 +9,10 @@ from .retriever import run_retriever
 from .amazon_start import run_amazon_start
 from .ideate import run_ideate
 from .selector import run_selector
-from .polish import run_polish
-from .braintrust import run_braintrust
-from .compliance import run_compliance
-from .compliance_fixer import fix_compliance_issues, fix_all_scripts
+from .polish import run_polish, polish_concept
+from .braintrust import run_braintrust, critique_script
+from .compliance import run_compliance, check_script
+from .compliance_fixer import fix_compliance_issues, fix_all_scripts, fix_script
 from .finalize import run_finalize, score_all_scripts, score_script
 
 __all__ = [
@@ -22,10 +22,14 @@ __all__ = [
     "run_ideate",
     "run_selector",
     "run_polish",
+    "polish_concept",
     "run_braintrust",
+    "critique_script",
     "run_compliance",
+    "check_script",
     "fix_compliance_issues",
     "fix_all_scripts",
+    "fix_script",
     "run_finalize",
     "score_all_scripts",
     "score_script",
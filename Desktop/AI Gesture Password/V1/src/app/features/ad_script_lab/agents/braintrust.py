@@ -4,6 +4,7 @@ Braintrust Agent - Simulates creative director feedback.
 Provides critique from multiple creative director personas.
 """
 
+import asyncio
 import logging
 import json
 import re
@@ -13,7 +14,7 @@ import google.generativeai as genai
 from app.core.gemini_utils import create_gemini_model, generate_with_timeout
 
 if TYPE_CHECKING:
-    from ..types import AdScriptRun, BraintrustCritique
+    from ..types import AdScriptRun, BraintrustCritique, PolishedScript
     from ..config import CreativeModeConfig
 
 from ..types import BraintrustCritique
@@ -85,53 +86,11 @@ async def run_braintrust(
         logger.warning("No polished scripts to review")
         return
 
-    personas = AGENT_CONFIGS["braintrust"]["personas"]
-    all_critiques = []  # For backward compatibility with run.artifacts
-
-    # ALWAYS review ALL scripts with ALL personas
-    for script in polished:
-        script_critiques = []
-
-        for persona in personas:
-            try:
-                critique = await _get_persona_critique(
-                    brief, script, persona, config
-                )
-                # Set additional fields
-                critique.critic_persona = persona["name"]
-                critique.script_id = script.id
-                script_critiques.append(critique)
-                all_critiques.append(critique)
-
-            except Exception as e:
-                logger.error(
-                    "Failed to get critique from %s for script %s: %s",
-                    persona["name"], script.id, str(e)
-                )
-                # Add placeholder critique
-                placeholder = BraintrustCritique(
-                    script_id=script.id,
-                    critic_persona=persona["name"],
-                    strengths=["Unable to review - API error"],
-                    weaknesses=[],
-                    suggestions=["Retry review"],
-                    overall_rating=5.0,
-                    would_approve=False,
-                    critique="Review failed due to API error"
-                )
-                script_critiques.append(placeholder)
-                all_critiques.append(placeholder)
-
-        # Store critiques on the script itself (per-script feedback)
-        script.braintrust_feedback = script_critiques
-
-        logger.info(
-            "Script '%s' received %d critiques. Avg rating: %.1f, Approvals: %d/3",
-            script.title,
-            len(script_critiques),
-            script.braintrust_average_rating or 0,
-            script.braintrust_approval_count
-        )
+    # Scripts are reviewed in parallel; critiques keep script order
+    per_script = await asyncio.gather(*[
+        critique_script(brief, script, config, loop_number) for script in polished
+    ])
+    all_critiques = [critique for critiques in per_script for critique in critiques]
 
     # Also store in artifacts for backward compatibility
     run.artifacts.braintrust_feedback = all_critiques
@@ -141,6 +100,60 @@ async def run_braintrust(
     )
 
 
+async def critique_script(
+    brief,
+    script: "PolishedScript",
+    config: "CreativeModeConfig",
+    loop_number: int = 1
+) -> List[BraintrustCritique]:
+    """
+    Review one script with ALL personas (in parallel).
+
+    Stores the critiques on script.braintrust_feedback and returns them.
+    Never raises: failed personas get a placeholder critique.
+    """
+    personas = AGENT_CONFIGS["braintrust"]["personas"]
+
+    async def _safe_critique(persona) -> BraintrustCritique:
+        try:
+            critique = await _get_persona_critique(brief, script, persona, config)
+            # Set additional fields
+            critique.critic_persona = persona["name"]
+            critique.script_id = script.id
+            return critique
+        except Exception as e:
+            logger.error(
+                "Failed to get critique from %s for script %s: %s",
+                persona["name"], script.id, str(e)
+            )
+            # Add placeholder critique
+            return BraintrustCritique(
+                script_id=script.id,
+                critic_persona=persona["name"],
+                strengths=["Unable to review - API error"],
+                weaknesses=[],
+                suggestions=["Retry review"],
+                overall_rating=5.0,
+                would_approve=False,
+                critique="Review failed due to API error"
+            )
+
+    script_critiques = list(await asyncio.gather(*[_safe_critique(p) for p in personas]))
+
+    # Store critiques on the script itself (per-script feedback)
+    script.braintrust_feedback = script_critiques
+
+    logger.info(
+        "Script '%s' received %d critiques (loop %d). Avg rating: %.1f, Approvals: %d/3",
+        script.title,
+        len(script_critiques),
+        loop_number,
+        script.braintrust_average_rating or 0,
+        script.braintrust_approval_count
+    )
+    return script_critiques
+
+
 async def _get_persona_critique(brief, script, persona, config) -> BraintrustCritique:
     """Get critique from a single persona."""
     
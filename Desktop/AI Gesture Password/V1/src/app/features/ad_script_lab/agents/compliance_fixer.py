@@ -288,32 +288,39 @@ async def fix_all_scripts(
 
     logger.info("Fixing compliance issues for %d scripts...", len(scripts))
 
-    # Pair scripts with their compliance checks
+    # Pair scripts with their compliance checks and fix them in parallel
     tasks = []
     for i, script in enumerate(scripts):
         check = compliance_checks[i] if i < len(compliance_checks) else ComplianceCheck()
-        tasks.append(fix_compliance_issues(script, check, market))
-
-    # Run all fixes in parallel
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-
-    # Extract fixed scripts
-    fixed_scripts = []
-    for i, result in enumerate(results):
-        if isinstance(result, Exception):
-            logger.error("Failed to fix script %d: %s", i, str(result))
-            # Return original script with error note
-            scripts[i].compliance_result = ComplianceResult(
-                all_clear=False,
-                solutions_applied=[],
-                categories_checked=[],
-                notes=f"Auto-fix failed: {str(result)}",
-                market=market
-            )
-            fixed_scripts.append(scripts[i])
-        else:
-            fixed_script, _ = result
-            fixed_scripts.append(fixed_script)
+        tasks.append(fix_script(script, check, market))
+    fixed_scripts = list(await asyncio.gather(*tasks))
 
     logger.info("Completed compliance fixes for %d scripts", len(fixed_scripts))
     return fixed_scripts
+
+
+async def fix_script(
+    script: PolishedScript,
+    compliance_check: ComplianceCheck,
+    market: str = "uk"
+) -> PolishedScript:
+    """
+    Fix compliance issues in one script.
+
+    Never raises: if fixing fails the original script is returned with a
+    compliance_result noting the failure.
+    """
+    try:
+        fixed_script, _ = await fix_compliance_issues(script, compliance_check, market)
+        return fixed_script
+    except Exception as e:
+        logger.error("Failed to fix script '%s': %s", script.title, str(e))
+        # Return original script with error note
+        script.compliance_result = ComplianceResult(
+            all_clear=False,
+            solutions_applied=[],
+            categories_checked=[],
+            notes=f"Auto-fix failed: {str(e)}",
+            market=market
+        )
+        return script
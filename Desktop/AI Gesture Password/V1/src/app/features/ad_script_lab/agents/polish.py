@@ -116,21 +116,27 @@ async def run_polish(
         return
     
     # Run all polish tasks in parallel for better performance
-    async def _safe_polish(concept):
-        """Wrapper to catch exceptions per-concept."""
-        try:
-            return await _polish_single_concept(brief, concept, config)
-        except Exception as e:
-            logger.error("Failed to polish concept '%s': %s", concept.title, str(e))
-            return _create_placeholder_script(brief, concept)
-    
-    tasks = [_safe_polish(concept) for concept in viable_concepts]
+    tasks = [polish_concept(brief, concept, config) for concept in viable_concepts]
     polished_scripts = await asyncio.gather(*tasks)
     
     run.artifacts.polished_3 = list(polished_scripts)
     logger.info("Polished %d scripts in parallel", len(polished_scripts))
 
 
+async def polish_concept(brief, concept, config: "CreativeModeConfig") -> PolishedScript:
+    """
+    Polish one concept into a full script.
+
+    Never raises: failures fall back to a placeholder script so one concept
+    cannot fail the whole run.
+    """
+    try:
+        return await _polish_single_concept(brief, concept, config)
+    except Exception as e:
+        logger.error("Failed to polish concept '%s': %s", concept.title, str(e))
+        return _create_placeholder_script(brief, concept)
+
+
 async def _polish_single_concept(brief, concept, config, retry_count: int = 0) -> PolishedScript:
     """Polish a single concept into a full script with validation and retry."""
     MAX_RETRIES = 2
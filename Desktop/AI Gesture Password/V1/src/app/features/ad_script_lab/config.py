@@ -139,6 +139,13 @@ AGENT_CONFIGS: Dict[str, Dict[str, Any]] = {
 }
 
 
+# Pipeline-wide scheduling limits
+PIPELINE_CONFIG: Dict[str, Any] = {
+    # Gemini calls in flight at once, shared by every run on the orchestrator
+    "max_concurrent_llm_calls": 8,
+}
+
+
 # Prompts configuration
 SYSTEM_PROMPTS = {
     "base": """You are a senior creative director at a top UK advertising agency, 
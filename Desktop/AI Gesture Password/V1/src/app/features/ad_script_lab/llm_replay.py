@@ -0,0 +1,425 @@
+"""
+Offline LLM replay for the Ad Script Lab pipeline.
+
+Swaps recorded (or synthetic) responses in for Gemini so the full pipeline
+can run without network access:
+
+    with replay_gemini(latency=LatencyModel(base_seconds=0.5)) as stats:
+        await orchestrator.execute_run(run)
+    stats.summary()
+
+Responses are looked up by prompt hash in an LLMRecording first, then by
+pipeline stage (round-robin over recorded responses for that stage), and
+finally fall back to built-in synthetic responses shaped like each agent's
+expected JSON. Use record_gemini() with a live key to capture a recording.
+"""
+
+import hashlib
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from app.core.gemini_utils import get_model_registry
+from .orchestrator import current_stage
+
+logger = logging.getLogger(__name__)
+
+# Stage used for calls made outside AdScriptOrchestrator._execute_stage
+UNKNOWN_STAGE = "unknown"
+
+
+def prompt_hash(prompt: Any) -> str:
+    """Stable key for a prompt (str or list of parts)."""
+    text = prompt if isinstance(prompt, str) else json.dumps(prompt, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# =============================================================================
+# Recordings
+# =============================================================================
+
+class LLMRecording:
+    """
+    Recorded prompt/response pairs, stored as JSON lines:
+
+        {"stage": "ideate", "model_type": "pro", "prompt_sha256": "...", "response": "..."}
+    """
+
+    def __init__(self, entries: Optional[List[Dict[str, Any]]] = None):
+        self._lock = threading.Lock()
+        self.entries: List[Dict[str, Any]] = []
+        self._by_hash: Dict[str, str] = {}
+        self._by_stage: Dict[str, List[str]] = {}
+        self._stage_cursors: Dict[str, Iterator[str]] = {}
+        for entry in entries or []:
+            self.add(entry)
+
+    @classmethod
+    def load(cls, path: Path) -> "LLMRecording":
+        entries = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+        logger.info("Loaded %d recorded LLM responses from %s", len(entries), path)
+        return cls(entries)
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self.entries.append(entry)
+            if entry.get("prompt_sha256"):
+                self._by_hash[entry["prompt_sha256"]] = entry["response"]
+            self._by_stage.setdefault(entry.get("stage") or UNKNOWN_STAGE, []).append(entry["response"])
+            self._stage_cursors.pop(entry.get("stage") or UNKNOWN_STAGE, None)
+
+    def lookup(self, prompt: Any, stage: str) -> Optional[str]:
+        """Exact prompt match, else the next recorded response for the stage."""
+        with self._lock:
+            response = self._by_hash.get(prompt_hash(prompt))
+            if response is not None:
+                return response
+            responses = self._by_stage.get(stage)
+            if not responses:
+                return None
+            cursor = self._stage_cursors.setdefault(stage, itertools.cycle(responses))
+            return next(cursor)
+
+    def save(self, path: Path) -> None:
+        with self._lock:
+            entries = list(self.entries)
+        with open(path, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+
+# =============================================================================
+# Latency and call statistics
+# =============================================================================
+
+@dataclass
+class LatencyModel:
+    """
+    Synthetic per-call latency: base + per_1k_chars * len(response)/1000, with
+    +/- jitter (fraction). stage_base_seconds overrides base for named stages.
+    """
+    base_seconds: float = 0.0
+    per_1k_chars: float = 0.0
+    jitter: float = 0.0
+    stage_base_seconds: Dict[str, float] = field(default_factory=dict)
+    seed: Optional[int] = 0
+
+    def __post_init__(self):
+        self._random = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def sample(self, stage: str, response: str) -> float:
+        delay = self.stage_base_seconds.get(stage, self.base_seconds)
+        delay += self.per_1k_chars * len(response) / 1000.0
+        if self.jitter:
+            with self._lock:
+                delay *= 1.0 + self._random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+
+@dataclass
+class LLMCall:
+    stage: str
+    model_type: str
+    started: float
+    finished: float
+    source: str  # "recording", "synthetic" or "live"
+
+    @property
+    def duration(self) -> float:
+        return self.finished - self.started
+
+
+class LLMCallStats:
+    """Thread-safe log of LLM calls with in-flight tracking."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: List[LLMCall] = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    def begin(self) -> float:
+        with self._lock:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return time.perf_counter()
+
+    def end(self, stage: str, model_type: str, started: float, source: str) -> None:
+        finished = time.perf_counter()
+        with self._lock:
+            self.in_flight -= 1
+            self.calls.append(LLMCall(stage, model_type, started, finished, source))
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = []
+            self.peak_in_flight = self.in_flight
+
+    def summary(self, wall_seconds: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Call counts and busy time per stage.
+
+        With wall_seconds, "utilization" is busy LLM time / wall time, i.e.
+        the average number of calls in flight.
+        """
+        with self._lock:
+            calls = list(self.calls)
+            peak = self.peak_in_flight
+        per_stage: Dict[str, Dict[str, float]] = {}
+        for call in calls:
+            stage = per_stage.setdefault(call.stage, {"calls": 0, "busy_seconds": 0.0})
+            stage["calls"] += 1
+            stage["busy_seconds"] += call.duration
+        busy = sum(call.duration for call in calls)
+        summary = {
+            "calls": len(calls),
+            "busy_seconds": round(busy, 4),
+            "peak_in_flight": peak,
+            "per_stage": {
+                name: {"calls": int(v["calls"]), "busy_seconds": round(v["busy_seconds"], 4)}
+                for name, v in per_stage.items()
+            },
+        }
+        if wall_seconds:
+            summary["utilization"] = round(busy / wall_seconds, 3)
+        return summary
+
+
+# =============================================================================
+# Models
+# =============================================================================
+
+def _response(text: str) -> SimpleNamespace:
+    """Minimal stand-in for a GenerateContentResponse (finish_reason 1 = STOP)."""
+    return SimpleNamespace(text=text, candidates=[SimpleNamespace(finish_reason=1)])
+
+
+class ReplayModel:
+    """GenerativeModel stand-in that replays responses with synthetic latency."""
+
+    def __init__(
+        self,
+        model_type: str,
+        recording: Optional[LLMRecording] = None,
+        latency: Optional[LatencyModel] = None,
+        stats: Optional[LLMCallStats] = None,
+    ):
+        self.model_type = model_type
+        self.model_name = f"replay-{model_type}"
+        self.recording = recording
+        self.latency = latency or LatencyModel()
+        self.stats = stats or LLMCallStats()
+
+    def generate_content(self, prompt, generation_config=None, safety_settings=None, **kwargs):
+        stage = current_stage.get() or UNKNOWN_STAGE
+        started = self.stats.begin()
+        source = "recording"
+        try:
+            text = self.recording.lookup(prompt, stage) if self.recording else None
+            if text is None:
+                source = "synthetic"
+                text = synthetic_response(stage)
+            delay = self.latency.sample(stage, text)
+            if delay:
+                # Blocking on purpose: callers run generate_content in a worker thread
+                time.sleep(delay)
+            return _response(text)
+        finally:
+            self.stats.end(stage, self.model_type, started, source)
+
+
+class RecordingModel:
+    """Wraps a live model and appends every prompt/response pair to a recording."""
+
+    def __init__(self, model, model_type: str, recording: LLMRecording, stats: Optional[LLMCallStats] = None):
+        self._model = model
+        self.model_type = model_type
+        self.recording = recording
+        self.stats = stats or LLMCallStats()
+
+    def generate_content(self, prompt, *args, **kwargs):
+        stage = current_stage.get() or UNKNOWN_STAGE
+        started = self.stats.begin()
+        try:
+            response = self._model.generate_content(prompt, *args, **kwargs)
+            try:
+                text = response.text
+            except Exception:
+                text = None
+            if text:
+                self.recording.add({
+                    "stage": stage,
+                    "model_type": self.model_type,
+                    "prompt_sha256": prompt_hash(prompt),
+                    "response": text,
+                })
+            return response
+        finally:
+            self.stats.end(stage, self.model_type, started, "live")
+
+
+@contextmanager
+def replay_gemini(
+    recording: Optional[LLMRecording] = None,
+    latency: Optional[LatencyModel] = None,
+    stats: Optional[LLMCallStats] = None,
+):
+    """Serve ReplayModels from create_gemini_model() for the duration of the block."""
+    stats = stats or LLMCallStats()
+    latency = latency or LatencyModel()
+    registry = get_model_registry()
+    previous = registry.override
+    registry.set_override(lambda model_type: ReplayModel(model_type, recording, latency, stats))
+    try:
+        yield stats
+    finally:
+        registry.set_override(previous)
+
+
+@contextmanager
+def record_gemini(path: Path, api_key: Optional[str] = None):
+    """Record live Gemini responses made inside the block to `path` (JSON lines)."""
+    registry = get_model_registry()
+    previous = registry.override
+    recording = LLMRecording()
+    stats = LLMCallStats()
+    live_models: Dict[str, Any] = {}
+
+    def factory(model_type: str):
+        if model_type not in live_models:
+            # Straight to the registry: the override stays in place for other callers
+            live_models[model_type] = registry.create_model(model_type, api_key)
+        model = live_models[model_type]
+        return RecordingModel(model, model_type, recording, stats) if model else None
+
+    registry.set_override(factory)
+    try:
+        yield stats
+    finally:
+        registry.set_override(previous)
+        recording.save(path)
+        logger.info("Recorded %d LLM responses to %s", len(recording.entries), path)
+
+
+# =============================================================================
+# Synthetic responses
+# =============================================================================
+
+_SCRIPT_SECTION = (
+    "A quiet kitchen at dawn, warm light spilling across the worktop as the family "
+    "begins another ordinary day. The camera drifts past half-finished homework, a "
+    "dog waiting by the door and a kettle beginning to steam, building a sense of "
+    "real life before the product ever appears on screen in a natural way."
+)
+
+
+def _synthetic_polish() -> Dict[str, Any]:
+    timed = " ".join(
+        f"[00:{second:02d}] {_SCRIPT_SECTION}" for second in range(0, 30, 5)
+    )
+    return {
+        "title": "Replay Script",
+        "opening": _SCRIPT_SECTION,
+        "development": _SCRIPT_SECTION,
+        "climax": _SCRIPT_SECTION,
+        "resolution": _SCRIPT_SECTION,
+        "full_script": timed,
+        "visual_style": "Naturalistic, handheld, warm grade",
+        "audio_notes": "Ambient room tone building to a gentle piano sting",
+        "talent_notes": "Real families, no heightened performances",
+        "production_considerations": "Single location, one shoot day",
+        "estimated_duration_seconds": 30,
+    }
+
+
+_SCORES = {
+    "overall_impact": 7.5, "hook_power": 7.0, "emotional_resonance": 8.0,
+    "clarity_score": 7.5, "distinctiveness": 7.0, "brand_integration": 7.5,
+    "pulse_score": 7.0, "echo_score": 7.0,
+    "reasoning": {"overall_impact": "Synthetic replay score"},
+}
+
+
+def synthetic_response(stage: str) -> str:
+    """Plausible response text for a pipeline stage, parseable by its agent."""
+    if stage == "amazon_start":
+        return (
+            "FOR IMMEDIATE RELEASE\n\nReplay Campaign wins hearts nationwide. "
+            "The enemy was indifference; the campaign made people stop and feel."
+        )
+    if stage == "ideate":
+        return json.dumps([
+            {
+                "title": f"Replay Concept {i + 1}",
+                "anchor": "An everyday ritual", "setup": "Life as usual",
+                "intervention": "The product changes the moment", "jumper": "A visual twist",
+                "hook": "A familiar moment, reframed", "narrative": _SCRIPT_SECTION,
+                "key_moments": ["Open", "Turn", "Payoff"], "cta": "Find out more",
+                "rationale": "Synthetic replay idea", "inspired_by": [],
+            }
+            for i in range(10)
+        ])
+    if stage == "selector":
+        return json.dumps({"selected_ids": [], "rationale": "Synthetic replay selection"})
+    if stage == "polish":
+        return json.dumps(_synthetic_polish())
+    if stage == "braintrust":
+        return json.dumps({
+            "strengths": ["Clear idea"], "weaknesses": ["Familiar setting"],
+            "suggestions": ["Sharpen the payoff"], "overall_rating": 7.0,
+            "would_approve": True, "summary": "Synthetic replay critique",
+        })
+    if stage == "compliance":
+        return json.dumps({
+            "passed": False, "risk_level": "low",
+            "issues": [{
+                "category": "BCAP 3.7", "severity": "low",
+                "description": "Claim may need substantiation",
+                "location": "[00:25]", "recommendation": "Soften the claim",
+            }],
+            "recommendations": ["Hold substantiation on file"],
+            "clearcast_notes": "Synthetic replay compliance check",
+        })
+    if stage == "compliance_fix":
+        return json.dumps({
+            "fixed_text": "Many families find it helps.",
+            "fix_explanation": "Softened absolute claim", "confidence": "high",
+        })
+    if stage == "finalize":
+        # Serves both the per-script scoring calls and the final selection call
+        return json.dumps({
+            **_SCORES,
+            "winning_script_id": "",
+            "selection_rationale": "Synthetic replay selection",
+            "production_notes": "Synthetic replay notes",
+            "citations": [],
+        })
+    return json.dumps({"success": True, "summary": "Synthetic replay response"})
+
+
+__all__ = [
+    "LLMRecording",
+    "LatencyModel",
+    "LLMCall",
+    "LLMCallStats",
+    "ReplayModel",
+    "RecordingModel",
+    "replay_gemini",
+    "record_gemini",
+    "synthetic_response",
+    "prompt_hash",
+]
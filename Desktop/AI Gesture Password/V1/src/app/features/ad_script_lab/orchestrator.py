@@ -9,12 +9,14 @@ into a structured Master Creative Brief.
 import logging
 import asyncio
 import json
+import weakref
+from contextvars import ContextVar
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Awaitable, Callable, List
 
 import google.generativeai as genai
-from app.core.gemini_utils import create_gemini_model, safe_get_response_text
+from app.core.gemini_utils import create_gemini_model, safe_get_response_text, llm_call_budget
 
 from .types import (
     AdScriptRun,
@@ -22,24 +24,34 @@ from .types import (
     AdScriptGenerateRequest,
     RunStatus,
     CreativeMode,
+    PolishedScript,
+    ComplianceCheck,
+    BraintrustCritique,
 )
-from .config import get_mode_config, AGENT_CONFIGS
+from .config import get_mode_config, AGENT_CONFIGS, PIPELINE_CONFIG
 from .rag_client import get_rag_client
+from .run_store import RunStore
+from .scheduler import StageGraph
 from .agents import (
     run_brand_discovery,
     run_retriever,
     run_amazon_start,
     run_ideate,
     run_selector,
-    run_polish,
-    run_braintrust,
-    run_compliance,
-    fix_all_scripts,
+    polish_concept,
+    critique_script,
+    check_script,
+    fix_script,
     run_finalize,
 )
 
 logger = logging.getLogger(__name__)
 
+# Name of the pipeline stage running in the current task. Propagates into
+# stage graph tasks, asyncio.gather tasks and asyncio.to_thread calls, so LLM
+# clients can attribute calls to stages (see llm_replay).
+current_stage: ContextVar[Optional[str]] = ContextVar("ad_script_stage", default=None)
+
 
 # =============================================================================
 # SYNTHESIZER - Master Creative Brief Generator
@@ -204,61 +216,39 @@ class AdScriptOrchestrator:
     6. Braintrust - Get creative director critiques
     7. Compliance - Check against UK broadcast regulations
     8. Finalize - Produce final script pack
+
+    Stages 5-7 run per script on a StageGraph, so each script moves on as
+    soon as its own previous step is done. All runs share one LLM
+    concurrency budget.
     """
     
-    def __init__(self):
-        self.rag_client = get_rag_client()
+    def __init__(
+        self,
+        storage_dir: Optional[Path] = None,
+        rag_client=None,
+        max_concurrent_llm_calls: Optional[int] = None,
+    ):
+        self.rag_client = rag_client or get_rag_client()
+        self.max_concurrent_llm_calls = max_concurrent_llm_calls or PIPELINE_CONFIG["max_concurrent_llm_calls"]
+        # asyncio semaphores belong to one event loop, so keep one per loop
+        self._llm_budgets: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+        # Runs loaded so far (and every run created by this process); the rest
+        # stay on disk until requested
         self._runs: Dict[str, AdScriptRun] = {}
-        self._storage_dir = AD_SCRIPT_STORAGE_DIR
-        self._storage_dir.mkdir(parents=True, exist_ok=True)
-        self._load_runs()
+        self._storage_dir = Path(storage_dir) if storage_dir else AD_SCRIPT_STORAGE_DIR
+        self._store = RunStore(self._storage_dir)
         logger.info("AdScriptOrchestrator initialized with persistent storage at %s", self._storage_dir)
     
-    def _get_run_file_path(self, run_id: str) -> Path:
-        """Get the file path for a run's JSON file."""
-        return self._storage_dir / f"{run_id}.json"
-    
-    def _load_runs(self) -> None:
-        """Load all runs from disk on startup."""
-        loaded_count = 0
-        error_count = 0
-        
-        for json_file in self._storage_dir.glob("*.json"):
-            try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                run = AdScriptRun(**data)
-                self._runs[run.run_id] = run
-                loaded_count += 1
-            except Exception as e:
-                logger.warning("Failed to load run from %s: %s", json_file, str(e))
-                error_count += 1
-        
-        logger.info("Loaded %d ad script runs from disk (%d errors)", loaded_count, error_count)
-    
     def _save_run(self, run: AdScriptRun) -> None:
-        """Save a run to disk."""
+        """Persist the changes made to a run since its last save."""
         try:
-            file_path = self._get_run_file_path(run.run_id)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(run.model_dump(mode='json'), f, indent=2, default=str)
+            self._store.save(run)
             logger.debug("Saved run %s to disk", run.run_id)
         except Exception as e:
             logger.error("Failed to save run %s: %s", run.run_id, str(e))
     
-    def _delete_run_file(self, run_id: str) -> bool:
-        """Delete a run's file from disk."""
-        try:
-            file_path = self._get_run_file_path(run_id)
-            if file_path.exists():
-                file_path.unlink()
-                logger.debug("Deleted run file for %s", run_id)
-                return True
-            return False
-        except Exception as e:
-            logger.error("Failed to delete run file %s: %s", run_id, str(e))
-            return False
-    
     def create_run(
         self, 
         request: AdScriptGenerateRequest, 
@@ -414,26 +404,31 @@ class AdScriptOrchestrator:
                 brief.research_insights = f"Target audience: {brief.target_audience}"
     
     def get_run(self, run_id: str) -> Optional[AdScriptRun]:
-        """Retrieve a run by ID."""
-        return self._runs.get(run_id)
+        """Retrieve a run by ID, loading it from disk on first access."""
+        run = self._runs.get(run_id)
+        if run is None and run_id in self._store:
+            run = self._store.load(run_id)
+            if run is not None:
+                self._runs[run_id] = run
+        return run
     
     def delete_run(self, run_id: str) -> bool:
         """Delete a run by ID."""
-        if run_id in self._runs:
-            del self._runs[run_id]
-            self._delete_run_file(run_id)
+        in_memory = self._runs.pop(run_id, None) is not None
+        try:
+            on_disk = self._store.delete(run_id)
+        except Exception as e:
+            logger.error("Failed to delete run file %s: %s", run_id, str(e))
+            on_disk = False
+        if in_memory or on_disk:
             logger.info("Deleted run %s", run_id)
             return True
         return False
     
     def list_runs(self, limit: int = 20) -> List[AdScriptRun]:
-        """List recent runs."""
-        runs = sorted(
-            self._runs.values(),
-            key=lambda r: r.created_at,
-            reverse=True
-        )
-        return runs[:limit]
+        """List recent runs (only the returned runs are read from disk)."""
+        runs = [self.get_run(run_id) for run_id in self._store.recent_ids(limit)]
+        return [run for run in runs if run is not None]
     
     def update_run(self, run: AdScriptRun) -> None:
         """Update a run in memory and persist to disk."""
@@ -441,6 +436,15 @@ class AdScriptOrchestrator:
         self._runs[run.run_id] = run
         self._save_run(run)
     
+    def _llm_budget(self) -> asyncio.Semaphore:
+        """The LLM concurrency budget shared by all runs on the current loop."""
+        loop = asyncio.get_running_loop()
+        budget = self._llm_budgets.get(loop)
+        if budget is None:
+            budget = asyncio.Semaphore(self.max_concurrent_llm_calls)
+            self._llm_budgets[loop] = budget
+        return budget
+
     async def execute_run(self, run: AdScriptRun) -> AdScriptRun:
         """
         Execute the full pipeline for a run.
@@ -448,6 +452,7 @@ class AdScriptOrchestrator:
         This is the main entry point for running the multi-agent protocol.
         """
         pipeline_start = datetime.utcnow()
+        budget_token = llm_call_budget.set(self._llm_budget())
         
         try:
             run.status = RunStatus.RUNNING
@@ -463,88 +468,7 @@ class AdScriptOrchestrator:
                 mode_config.ideas_count
             )
             
-            # Stage 1: Retrieve relevant ads
-            run.update_stage("retriever")
-            await self._execute_stage(
-                run, "retriever",
-                run_retriever, 
-                self.rag_client, 
-                mode_config
-            )
-            self._save_run(run)  # Persist after each stage
-            
-            # Stage 2: Amazon "Working Backwards" document
-            run.update_stage("amazon_start")
-            await self._execute_stage(
-                run, "amazon_start",
-                run_amazon_start,
-                mode_config
-            )
-            self._save_run(run)
-            
-            # Stage 3: Generate ideas
-            run.update_stage("ideate")
-            await self._execute_stage(
-                run, "ideate",
-                run_ideate,
-                mode_config
-            )
-            self._save_run(run)
-            
-            # Stage 4: Select top 3
-            run.update_stage("selector")
-            await self._execute_stage(
-                run, "selector",
-                run_selector,
-                mode_config
-            )
-            self._save_run(run)
-            
-            # Stage 5: Polish selected concepts
-            run.update_stage("polish")
-            await self._execute_stage(
-                run, "polish",
-                run_polish,
-                mode_config
-            )
-            self._save_run(run)
-            
-            # Stage 6: Braintrust critique (may run multiple loops)
-            for loop in range(mode_config.braintrust_loops):
-                run.update_stage(f"braintrust_loop_{loop + 1}")
-                await self._execute_stage(
-                    run, "braintrust",
-                    run_braintrust,
-                    mode_config,
-                    loop_number=loop + 1
-                )
-                self._save_run(run)
-            
-            # Stage 7: Compliance check
-            run.update_stage("compliance")
-            await self._execute_stage(
-                run, "compliance",
-                run_compliance,
-                mode_config
-            )
-            self._save_run(run)
-
-            # Stage 7.5: Auto-fix compliance issues
-            run.update_stage("compliance_fix")
-            await self._execute_stage(
-                run, "compliance_fix",
-                self._fix_compliance,
-                mode_config
-            )
-            self._save_run(run)
-
-            # Stage 8: Finalize
-            run.update_stage("finalize")
-            await self._execute_stage(
-                run, "finalize",
-                run_finalize,
-                mode_config
-            )
+            await self._build_graph(run, mode_config).run()
             
             run.status = RunStatus.COMPLETED
             run.update_stage("completed")
@@ -585,18 +509,166 @@ class AdScriptOrchestrator:
             run.update_stage("failed", {"error": str(e)})
             self._save_run(run)  # Save failure state
         
+        finally:
+            llm_call_budget.reset(budget_token)
+        
         return run
     
+    def _build_graph(self, run: AdScriptRun, mode_config) -> StageGraph:
+        """
+        Describe the pipeline as a stage graph.
+
+            retriever -> amazon_start -> ideate -> selector
+            selector -> polish[i]                          (one per selected concept)
+            polish[i] -> braintrust_loop_1[i] -> ... -> braintrust_loop_N[i]
+            polish[i] -> compliance[i]
+            braintrust_loop_N[i] + compliance[i] -> compliance_fix[i]
+            every compliance_fix[i] -> finalize
+
+        The per-script nodes are added by the selector node once the concepts
+        are known. A stage's artifacts are published on the run (and the run
+        is saved) when its last node finishes.
+        """
+        history_entries: Dict[str, Dict[str, Any]] = {}
+        publishers: Dict[str, Callable[[], None]] = {}
+
+        def on_stage_start(stage: str) -> None:
+            run.update_stage(stage)
+            history_entries[stage] = run.stage_history[-1]
+
+        def on_stage_done(stage: str, duration_s: float) -> None:
+            publish = publishers.get(stage)
+            if publish:
+                publish()
+            history_entries[stage]["details"]["duration_s"] = round(duration_s, 3)
+            logger.info("[%s] Stage '%s' COMPLETED in %.1fs", run.run_id[:8], stage, duration_s)
+            self._save_run(run)  # Persist after each stage
+
+        graph = StageGraph(on_stage_start=on_stage_start, on_stage_done=on_stage_done)
+
+        graph.add("retriever", lambda: self._execute_stage(
+            run, "retriever", run_retriever(run, self.rag_client, mode_config)
+        ))
+        graph.add("amazon_start", lambda: self._execute_stage(
+            run, "amazon_start", run_amazon_start(run, mode_config)
+        ), deps=["retriever"])
+        graph.add("ideate", lambda: self._execute_stage(
+            run, "ideate", run_ideate(run, mode_config)
+        ), deps=["amazon_start"])
+
+        async def select() -> None:
+            await self._execute_stage(run, "selector", run_selector(run, mode_config))
+            final_deps = self._add_script_nodes(graph, publishers, run, mode_config)
+            graph.add("finalize", lambda: self._execute_stage(
+                run, "finalize", run_finalize(run, mode_config)
+            ), deps=final_deps)
+
+        graph.add("selector", select, deps=["ideate"])
+        return graph
+
+    def _add_script_nodes(
+        self,
+        graph: StageGraph,
+        publishers: Dict[str, Callable[[], None]],
+        run: AdScriptRun,
+        mode_config,
+    ) -> List[str]:
+        """
+        Add polish -> braintrust / compliance -> compliance_fix nodes for each
+        selected concept. Returns the node names finalize must wait for.
+        """
+        brief = run.brief
+        concepts = list(run.artifacts.viable_3)
+        if not concepts:
+            logger.warning("No viable concepts to polish")
+            return ["selector"]
+
+        # Braintrust only annotates the script, so compliance can check it in
+        # parallel; the fixer copies the script and so waits for both.
+        market = getattr(brief, 'market', 'uk') or 'uk'
+        loops = range(1, mode_config.braintrust_loops + 1)
+        scripts: List[Optional[PolishedScript]] = [None] * len(concepts)
+        checks: List[Optional[ComplianceCheck]] = [None] * len(concepts)
+        critiques: Dict[int, List[List[BraintrustCritique]]] = {
+            loop: [[] for _ in concepts] for loop in loops
+        }
+
+        def publish_scripts() -> None:
+            run.artifacts.polished_3 = list(scripts)
+
+        def publish_checks() -> None:
+            run.artifacts.compliance_checks = list(checks)
+
+        def publish_critiques(loop: int) -> Callable[[], None]:
+            def publish() -> None:
+                run.artifacts.braintrust_feedback = [c for per_script in critiques[loop] for c in per_script]
+            return publish
+
+        publishers["polish"] = publish_scripts
+        publishers["compliance"] = publish_checks
+        publishers["compliance_fix"] = publish_scripts
+        for loop in loops:
+            publishers[f"braintrust_loop_{loop}"] = publish_critiques(loop)
+
+        final_deps = []
+        for i, concept in enumerate(concepts):
+            async def polish(i: int = i, concept=concept) -> None:
+                scripts[i] = await self._execute_stage(
+                    run, "polish", polish_concept(brief, concept, mode_config), node=f"polish[{i}]"
+                )
+
+            async def critique(loop: int, i: int = i) -> None:
+                critiques[loop][i] = await self._execute_stage(
+                    run, "braintrust", critique_script(brief, scripts[i], mode_config, loop),
+                    node=f"braintrust_loop_{loop}[{i}]"
+                )
+
+            async def check(i: int = i) -> None:
+                checks[i] = await self._execute_stage(
+                    run, "compliance", check_script(brief, scripts[i], mode_config), node=f"compliance[{i}]"
+                )
+
+            async def fix(i: int = i) -> None:
+                scripts[i] = await self._execute_stage(
+                    run, "compliance_fix", fix_script(scripts[i], checks[i], market), node=f"compliance_fix[{i}]"
+                )
+
+            polished = graph.add(f"polish[{i}]", polish, stage="polish", deps=["selector"])
+            reviewed = polished
+            for loop in loops:
+                reviewed = graph.add(
+                    f"braintrust_loop_{loop}[{i}]",
+                    lambda loop=loop, critique=critique: critique(loop),
+                    stage=f"braintrust_loop_{loop}",
+                    deps=[reviewed],
+                )
+            checked = graph.add(f"compliance[{i}]", check, stage="compliance", deps=[polished])
+            final_deps.append(
+                graph.add(f"compliance_fix[{i}]", fix, stage="compliance_fix", deps=[reviewed, checked])
+            )
+
+        logger.info(
+            "[%s] Scheduled %d scripts through polish, braintrust (%d loops), compliance and fixes",
+            run.run_id[:8], len(concepts), mode_config.braintrust_loops
+        )
+        return final_deps
+    
     async def _execute_stage(
         self,
         run: AdScriptRun,
         stage_name: str,
-        stage_func,
-        *args,
-        **kwargs
-    ) -> None:
-        """Execute a single pipeline stage with error handling and timing."""
+        work: Awaitable[Any],
+        node: Optional[str] = None,
+    ) -> Any:
+        """
+        Await one unit of stage work with error handling and timing.
+
+        `stage_name` is the agent (for timeouts and current_stage); `node` is
+        the stage graph node name used in logs, e.g. "polish[1]".
+        """
+        node = node or stage_name
         start_time = datetime.utcnow()
+        stage_token = current_stage.set(stage_name)
         
         # Get expected timeout for this stage (for logging)
         stage_config = AGENT_CONFIGS.get(stage_name, {})
@@ -605,78 +677,37 @@ class AdScriptOrchestrator:
         try:
             logger.info(
                 "[%s] Stage '%s' STARTED (timeout=%ss)",
-                run.run_id[:8], stage_name, expected_timeout
+                run.run_id[:8], node, expected_timeout
             )
-            await stage_func(run, *args, **kwargs)
+            result = await work
             
             duration_s = (datetime.utcnow() - start_time).total_seconds()
-            logger.info(
-                "[%s] Stage '%s' COMPLETED in %.1fs",
-                run.run_id[:8], stage_name, duration_s
+            logger.debug(
+                "[%s] Stage node '%s' finished in %.1fs",
+                run.run_id[:8], node, duration_s
             )
+            return result
             
         except asyncio.TimeoutError as e:
             duration_s = (datetime.utcnow() - start_time).total_seconds()
             logger.error(
                 "[%s] Stage '%s' TIMED OUT after %.1fs (limit=%ss)",
-                run.run_id[:8], stage_name, duration_s, expected_timeout
+                run.run_id[:8], node, duration_s, expected_timeout
             )
+            run.current_stage = node
             raise
             
         except Exception as e:
             duration_s = (datetime.utcnow() - start_time).total_seconds()
             logger.error(
                 "[%s] Stage '%s' FAILED after %.1fs: %s",
-                run.run_id[:8], stage_name, duration_s, str(e)
+                run.run_id[:8], node, duration_s, str(e)
             )
+            run.current_stage = node
             raise
-
-    async def _fix_compliance(
-        self,
-        run: AdScriptRun,
-        config
-    ) -> None:
-        """
-        Auto-fix compliance issues in polished scripts.
-
-        Takes the compliance checks from stage 7 and applies fixes to resolve
-        any flagged issues. Scripts arrive at finalize stage pre-cleared with
-        only solutions (not warnings) to display.
-        """
-        polished = run.artifacts.polished_3
-        compliance_checks = run.artifacts.compliance_checks
-
-        if not polished:
-            logger.warning("No polished scripts to fix")
-            return
-
-        if not compliance_checks:
-            logger.warning("No compliance checks to fix against")
-            return
-
-        # Get market from brief
-        market = getattr(run.brief, 'market', 'uk') or 'uk'
-
-        logger.info(
-            "Auto-fixing compliance issues for %d scripts (market=%s)",
-            len(polished), market
-        )
-
-        # Run the fixer on all scripts
-        fixed_scripts = await fix_all_scripts(polished, compliance_checks, market)
-
-        # Update the polished scripts with fixed versions
-        run.artifacts.polished_3 = fixed_scripts
-
-        # Log summary of fixes
-        total_fixes = sum(
-            len(s.compliance_result.solutions_applied) if s.compliance_result else 0
-            for s in fixed_scripts
-        )
-        logger.info(
-            "Applied %d compliance fixes across %d scripts",
-            total_fixes, len(fixed_scripts)
-        )
+        
+        finally:
+            current_stage.reset(stage_token)
 
 
 # Global orchestrator instance
@@ -0,0 +1,187 @@
+"""
+Latency benchmark for the Ad Script Lab pipeline.
+
+Runs the full multi-agent pipeline against replayed LLM responses (see
+llm_replay) and the stub RAG client, so stage scheduling and orchestration
+overhead can be measured offline and compared between changes:
+
+    python -m app.features.ad_script_lab.pipeline_benchmark --runs 5 --latency 0.2
+
+Reports, per creative mode, end-to-end p50/p95, mean per-stage durations,
+LLM calls per stage and LLM concurrency (average and peak calls in flight).
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .config import CREATIVE_MODE_CONFIGS
+from .llm_replay import LatencyModel, LLMCallStats, LLMRecording, replay_gemini
+from .orchestrator import AdScriptOrchestrator
+from .rag_client import StubTvAdsRagClient
+from .types import AdScriptGenerateRequest, RunStatus
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_REQUEST = {
+    "objective": "Drive awareness of a new family breakfast range",
+    "target_audience": "UK parents aged 28-45",
+    "single_minded_proposition": "Mornings that feel less rushed",
+    "tone_of_voice": "Warm, honest, lightly humorous",
+    "asset_name": "Pipeline Benchmark",
+    "brand_name": "Benchmark Foods",
+    "product_service": "Breakfast cereal",
+}
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile (pct in 0-100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _stage_durations(run) -> Dict[str, float]:
+    durations: Dict[str, float] = {}
+    for entry in run.stage_history:
+        duration = (entry.get("details") or {}).get("duration_s")
+        if duration is not None:
+            durations[entry["stage"]] = durations.get(entry["stage"], 0.0) + duration
+    return durations
+
+
+async def benchmark_mode(
+    orchestrator: AdScriptOrchestrator,
+    mode: str,
+    runs: int,
+    stats: LLMCallStats,
+) -> Dict[str, Any]:
+    """Execute `runs` pipelines in `mode` one after another and summarise them."""
+    totals: List[float] = []
+    stage_samples: Dict[str, List[float]] = {}
+    failures = 0
+    stats.reset()
+    wall_start = time.perf_counter()
+
+    for _ in range(runs):
+        request = AdScriptGenerateRequest(**BENCHMARK_REQUEST, creative_mode=mode)
+        run = orchestrator.create_run(request)
+        started = time.perf_counter()
+        run = await orchestrator.execute_run(run)
+        totals.append(time.perf_counter() - started)
+        if run.status != RunStatus.COMPLETED:
+            failures += 1
+            logger.warning("Benchmark run %s failed: %s", run.run_id[:8], run.error)
+        for stage, duration in _stage_durations(run).items():
+            stage_samples.setdefault(stage, []).append(duration)
+
+    wall_seconds = time.perf_counter() - wall_start
+    return {
+        "mode": mode,
+        "runs": runs,
+        "failures": failures,
+        "e2e_seconds": {
+            "p50": round(percentile(totals, 50), 4),
+            "p95": round(percentile(totals, 95), 4),
+            "mean": round(statistics.fmean(totals), 4) if totals else 0.0,
+        },
+        "stage_seconds": {
+            stage: round(statistics.fmean(samples), 4)
+            for stage, samples in stage_samples.items()
+        },
+        "llm": stats.summary(wall_seconds),
+    }
+
+
+async def run_benchmark(
+    modes: Optional[Sequence[str]] = None,
+    runs: int = 3,
+    latency: Optional[LatencyModel] = None,
+    recording: Optional[LLMRecording] = None,
+    storage_dir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """
+    Benchmark the pipeline for each creative mode.
+
+    Runs are persisted to `storage_dir` (a temporary directory by default) so
+    the benchmark never touches the real run store.
+    """
+    modes = list(modes or CREATIVE_MODE_CONFIGS.keys())
+    latency = latency or LatencyModel()
+    results: Dict[str, Any] = {"latency": {
+        "base_seconds": latency.base_seconds,
+        "per_1k_chars": latency.per_1k_chars,
+        "jitter": latency.jitter,
+    }, "modes": {}}
+
+    with tempfile.TemporaryDirectory(prefix="ad_script_bench_") as tmp:
+        orchestrator = AdScriptOrchestrator(
+            storage_dir=storage_dir or Path(tmp),
+            rag_client=StubTvAdsRagClient(),
+        )
+        with replay_gemini(recording=recording, latency=latency) as stats:
+            for mode in modes:
+                results["modes"][mode] = await benchmark_mode(orchestrator, mode, runs, stats)
+    return results
+
+
+def format_report(results: Dict[str, Any]) -> str:
+    """Plain-text table of a run_benchmark() result."""
+    lines = []
+    for mode, report in results["modes"].items():
+        e2e = report["e2e_seconds"]
+        llm = report["llm"]
+        lines.append(
+            f"{mode}: {report['runs']} runs ({report['failures']} failed)  "
+            f"p50={e2e['p50']:.3f}s p95={e2e['p95']:.3f}s mean={e2e['mean']:.3f}s"
+        )
+        lines.append(
+            f"  LLM: {llm['calls']} calls, utilization={llm.get('utilization', 0):.2f}, "
+            f"peak in flight={llm['peak_in_flight']}"
+        )
+        for stage, seconds in report["stage_seconds"].items():
+            lines.append(f"    {stage:<24} {seconds:8.3f}s")
+        calls = ", ".join(f"{stage}={v['calls']}" for stage, v in llm["per_stage"].items())
+        lines.append(f"  LLM calls by stage: {calls}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Ad Script Lab pipeline offline")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per creative mode")
+    parser.add_argument("--modes", nargs="*", choices=list(CREATIVE_MODE_CONFIGS.keys()),
+                        help="Creative modes to benchmark (default: all)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Synthetic seconds per LLM call")
+    parser.add_argument("--per-1k-chars", type=float, default=0.0,
+                        help="Extra synthetic seconds per 1000 response characters")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Latency jitter as a fraction")
+    parser.add_argument("--recording", type=Path, help="JSONL recording of LLM responses to replay")
+    parser.add_argument("--json", action="store_true", help="Print the raw JSON report")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    latency = LatencyModel(
+        base_seconds=args.latency,
+        per_1k_chars=args.per_1k_chars,
+        jitter=args.jitter,
+    )
+    recording = LLMRecording.load(args.recording) if args.recording else None
+    results = asyncio.run(run_benchmark(args.modes, args.runs, latency, recording))
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+    return 0
+
+
+__all__ = ["run_benchmark", "benchmark_mode", "format_report", "percentile", "main"]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
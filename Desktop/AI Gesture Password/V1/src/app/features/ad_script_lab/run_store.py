@@ -0,0 +1,323 @@
+"""
+Append-only persistence for Ad Script Lab runs.
+
+Each run is stored as a compacted snapshot plus a log of changes made since:
+
+    <run_id>.json           snapshot (the AdScriptRun as one JSON document)
+    <run_id>.events.jsonl   one line per save: changed fields and new stage_history entries
+    runs.index.jsonl        one summary line per run creation / status change / deletion
+
+A save appends only what changed since the previous save, so its cost does
+not depend on how large the run (or the run history) has grown. The event
+log is folded back into the snapshot every COMPACT_AFTER_EVENTS saves and
+when a run finishes. Startup reads the index only; runs are deserialized on
+first access.
+
+Snapshots written before the index existed are indexed once on first start.
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .types import AdScriptRun, RunStatus
+
+logger = logging.getLogger(__name__)
+
+# Run statuses after which a run is compacted into a single snapshot
+TERMINAL_STATUSES = {RunStatus.COMPLETED.value, RunStatus.FAILED.value}
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, default=str, separators=(",", ":"))
+
+
+class RunStore:
+    """File-backed store of AdScriptRuns with an append-only event log per run."""
+
+    INDEX_FILE = "runs.index.jsonl"
+    EVENTS_SUFFIX = ".events.jsonl"
+    COMPACT_AFTER_EVENTS = 50
+
+    def __init__(self, storage_dir: Path):
+        self._dir = Path(storage_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._index_path = self._dir / self.INDEX_FILE
+        self._lock = threading.RLock()
+        # run_id -> {"run_id", "created_at", "status"}
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._index_lines = 0
+        # What is on disk per run: serialized fields, stage_history entries, pending events
+        self._persisted_fields: Dict[str, Dict[str, str]] = {}
+        self._persisted_history: Dict[str, List[str]] = {}
+        self._event_counts: Dict[str, int] = {}
+        self._load_index()
+
+    # ------------------------------------------------------------------
+    # Paths
+
+    def _snapshot_path(self, run_id: str) -> Path:
+        return self._dir / f"{run_id}.json"
+
+    def _events_path(self, run_id: str) -> Path:
+        return self._dir / f"{run_id}{self.EVENTS_SUFFIX}"
+
+    # ------------------------------------------------------------------
+    # Index
+
+    def _load_index(self) -> None:
+        if not self._index_path.exists():
+            self._rebuild_index()
+            return
+
+        with open(self._index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping corrupt line in %s", self._index_path)
+                    continue
+                self._index_lines += 1
+                if entry.get("deleted"):
+                    self._index.pop(entry["run_id"], None)
+                else:
+                    self._index[entry["run_id"]] = entry
+        logger.info("Indexed %d ad script runs from %s", len(self._index), self._index_path.name)
+
+    def _rebuild_index(self) -> None:
+        """Index existing snapshots (one-off migration from the pre-index layout)."""
+        error_count = 0
+        for snapshot in self._dir.glob("*.json"):
+            try:
+                run = self._read_run(snapshot.stem)
+                self._index[run.run_id] = self._summary(run.model_dump(mode="json"))
+            except Exception as e:
+                logger.warning("Failed to index run from %s: %s", snapshot, str(e))
+                error_count += 1
+        self._write_index()
+        logger.info("Built run index for %d ad script runs (%d errors)", len(self._index), error_count)
+
+    @staticmethod
+    def _summary(data: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "run_id": data["run_id"],
+            "created_at": data["created_at"],
+            "status": data["status"],
+        }
+
+    def _write_index(self) -> None:
+        """Rewrite the index with one line per live run."""
+        tmp_path = self._index_path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for entry in self._index.values():
+                f.write(_dumps(entry) + "\n")
+        os.replace(tmp_path, self._index_path)
+        self._index_lines = len(self._index)
+
+    def _append_index(self, entry: Dict[str, Any]) -> None:
+        with open(self._index_path, "a", encoding="utf-8") as f:
+            f.write(_dumps(entry) + "\n")
+        self._index_lines += 1
+        # Superseded lines are dropped once they outnumber live ones
+        if self._index_lines > 2 * len(self._index) + 64:
+            self._write_index()
+
+    def _update_index(self, data: Dict[str, Any]) -> None:
+        summary = self._summary(data)
+        if self._index.get(summary["run_id"]) != summary:
+            self._index[summary["run_id"]] = summary
+            self._append_index(summary)
+
+    # ------------------------------------------------------------------
+    # Reads
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def recent_ids(self, limit: int) -> List[str]:
+        """Run ids, newest first, without deserializing any run."""
+        with self._lock:
+            entries = sorted(self._index.values(), key=lambda e: e["created_at"], reverse=True)
+        return [entry["run_id"] for entry in entries[:limit]]
+
+    def load(self, run_id: str) -> Optional[AdScriptRun]:
+        """Read a run (snapshot plus pending events), or None if it is not stored."""
+        with self._lock:
+            if not self._snapshot_path(run_id).exists():
+                return None
+            try:
+                return self._read_run(run_id, track=True)
+            except Exception as e:
+                logger.warning("Failed to load run %s: %s", run_id, str(e))
+                return None
+
+    def _read_run(self, run_id: str, track: bool = False) -> AdScriptRun:
+        with open(self._snapshot_path(run_id), "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        event_count = 0
+        events_path = self._events_path(run_id)
+        if events_path.exists():
+            good_offset = 0
+            torn = False
+            with open(events_path, "rb") as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except (json.JSONDecodeError, UnicodeDecodeError):
+                        # Torn final write: everything before it is intact
+                        logger.warning("Ignoring truncated event in %s", events_path.name)
+                        torn = True
+                        break
+                    self._apply_event(data, event)
+                    event_count += 1
+                    good_offset += len(line)
+            if track and (torn or not self._ends_with_newline(events_path, good_offset)):
+                # Cut the log back to whole lines so the next append starts a fresh line
+                with open(events_path, "r+b") as f:
+                    f.truncate(good_offset)
+                    if good_offset and not torn:
+                        # Last event is whole but its newline never landed
+                        f.seek(good_offset)
+                        f.write(b"\n")
+
+        if track:
+            self._remember(run_id, data, event_count)
+        return AdScriptRun(**data)
+
+    @staticmethod
+    def _ends_with_newline(path: Path, size: int) -> bool:
+        if not size:
+            return True
+        with open(path, "rb") as f:
+            f.seek(size - 1)
+            return f.read(1) == b"\n"
+
+    @staticmethod
+    def _apply_event(data: Dict[str, Any], event: Dict[str, Any]) -> None:
+        for key, value in event.get("set", {}).items():
+            target = data
+            *parents, leaf = key.split(".")
+            for parent in parents:
+                target = target.setdefault(parent, {})
+            target[leaf] = value
+        if "history_from" in event:
+            data["stage_history"] = data.get("stage_history", [])[:event["history_from"]] + event["history"]
+
+    # ------------------------------------------------------------------
+    # Writes
+
+    @staticmethod
+    def _fields(data: Dict[str, Any]) -> Dict[str, str]:
+        """Serialized top-level fields, with artifacts split per artifact."""
+        fields = {}
+        for key, value in data.items():
+            if key == "stage_history":
+                continue
+            if key == "artifacts" and isinstance(value, dict):
+                for name, artifact in value.items():
+                    fields[f"artifacts.{name}"] = _dumps(artifact)
+            else:
+                fields[key] = _dumps(value)
+        return fields
+
+    def _remember(self, run_id: str, data: Dict[str, Any], event_count: int) -> None:
+        self._persisted_fields[run_id] = self._fields(data)
+        self._persisted_history[run_id] = [_dumps(e) for e in data.get("stage_history", [])]
+        self._event_counts[run_id] = event_count
+
+    def save(self, run: AdScriptRun) -> None:
+        """Persist whatever changed on `run` since it was last saved or loaded."""
+        data = run.model_dump(mode="json")
+        with self._lock:
+            fields = self._persisted_fields.get(run.run_id)
+            if fields is None:
+                # New (or never loaded) run: start a fresh snapshot
+                self._write_snapshot(run.run_id, data)
+            else:
+                self._append_event(run.run_id, data)
+                if (
+                    data["status"] in TERMINAL_STATUSES
+                    or self._event_counts[run.run_id] >= self.COMPACT_AFTER_EVENTS
+                ):
+                    self.compact(run.run_id, data)
+            self._update_index(data)
+
+    def _append_event(self, run_id: str, data: Dict[str, Any]) -> None:
+        previous_fields = self._persisted_fields[run_id]
+        previous_history = self._persisted_history[run_id]
+
+        fields = self._fields(data)
+        changed = {key: value for key, value in fields.items() if previous_fields.get(key) != value}
+        history = [_dumps(e) for e in data.get("stage_history", [])]
+        first_diff = next(
+            (i for i, (old, new) in enumerate(zip(previous_history, history)) if old != new),
+            min(len(previous_history), len(history)),
+        )
+        if not changed and first_diff == len(history) == len(previous_history):
+            return
+
+        event: Dict[str, Any] = {"set": {}}
+        for key in changed:
+            value: Any = data
+            for part in key.split("."):
+                value = value[part]
+            event["set"][key] = value
+        if first_diff < len(history) or len(history) != len(previous_history):
+            event["history_from"] = first_diff
+            event["history"] = data["stage_history"][first_diff:]
+
+        with open(self._events_path(run_id), "a", encoding="utf-8") as f:
+            f.write(_dumps(event) + "\n")
+
+        previous_fields.update(changed)
+        self._persisted_history[run_id] = history
+        self._event_counts[run_id] += 1
+
+    def _write_snapshot(self, run_id: str, data: Dict[str, Any]) -> None:
+        snapshot_path = self._snapshot_path(run_id)
+        tmp_path = snapshot_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(_dumps(data))
+        os.replace(tmp_path, snapshot_path)
+        events_path = self._events_path(run_id)
+        if events_path.exists():
+            events_path.unlink()
+        self._remember(run_id, data, 0)
+
+    def compact(self, run_id: str, data: Optional[Dict[str, Any]] = None) -> None:
+        """Fold a run's event log into its snapshot."""
+        with self._lock:
+            if data is None:
+                run = self._read_run(run_id)
+                data = run.model_dump(mode="json")
+            self._write_snapshot(run_id, data)
+            logger.debug("Compacted run %s", run_id)
+
+    def delete(self, run_id: str) -> bool:
+        """Remove a run's files and index entry. Returns False if it was not stored."""
+        with self._lock:
+            existed = False
+            for path in (self._snapshot_path(run_id), self._events_path(run_id)):
+                if path.exists():
+                    path.unlink()
+                    existed = True
+            self._persisted_fields.pop(run_id, None)
+            self._persisted_history.pop(run_id, None)
+            self._event_counts.pop(run_id, None)
+            if self._index.pop(run_id, None) is not None:
+                self._append_index({"run_id": run_id, "deleted": True})
+                existed = True
+            return existed
+
+
+__all__ = ["RunStore"]
@@ -0,0 +1,121 @@
+"""
+Dependency-graph scheduler for the Ad Script Lab pipeline.
+
+Pipeline work is described as StageNodes with explicit dependencies. A node
+starts as soon as every node it depends on has finished, so independent work
+(e.g. braintrust critiques of script A while script B is still polishing)
+overlaps and a run takes roughly as long as its critical path rather than the
+sum of every stage's slowest member.
+
+Nodes belong to a stage (e.g. "polish" for polish[0..2]). The graph reports a
+stage as started when its first node starts and as finished when its last node
+finishes, which is what run.stage_history records.
+
+Nodes may add further nodes while the graph is running; the orchestrator uses
+this to fan out per-script nodes once the selector has picked the concepts.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Sequence, Set
+
+logger = logging.getLogger(__name__)
+
+StageCallback = Callable[[str], None]
+StageDoneCallback = Callable[[str, float], None]
+
+
+class StageGraphError(ValueError):
+    """Raised for graphs that cannot be scheduled (unknown deps, cycles)."""
+
+
+@dataclass
+class StageNode:
+    """One unit of pipeline work."""
+    name: str  # Unique node id, e.g. "polish[1]"
+    func: Callable[[], Awaitable[Any]]
+    stage: str  # Stage the node reports under, e.g. "polish"
+    deps: Sequence[str] = field(default_factory=tuple)
+
+
+class StageGraph:
+    """
+    A DAG of StageNodes executed with maximum overlap.
+
+    The first node failure cancels everything still running and is re-raised
+    from run(); nodes that never started are simply dropped.
+    """
+
+    def __init__(
+        self,
+        on_stage_start: Optional[StageCallback] = None,
+        on_stage_done: Optional[StageDoneCallback] = None,
+    ):
+        self._nodes: Dict[str, StageNode] = {}
+        self._on_stage_start = on_stage_start
+        self._on_stage_done = on_stage_done
+        self.results: Dict[str, Any] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[Any]],
+        stage: Optional[str] = None,
+        deps: Sequence[str] = (),
+    ) -> str:
+        """Add a node and return its name (handy for building dep lists)."""
+        if name in self._nodes:
+            raise StageGraphError(f"Duplicate stage node '{name}'")
+        for dep in deps:
+            if dep not in self._nodes:
+                # Deps must already exist, which also rules out cycles
+                raise StageGraphError(f"Stage node '{name}' depends on unknown node '{dep}'")
+        self._nodes[name] = StageNode(name=name, func=func, stage=stage or name, deps=tuple(deps))
+        return name
+
+    async def run(self) -> Dict[str, Any]:
+        """Run every node, respecting dependencies. Returns results by node name."""
+        done: Set[str] = set()
+        running: Dict[asyncio.Task, StageNode] = {}
+        stage_started: Dict[str, float] = {}
+
+        def _start_ready() -> None:
+            active = {node.name for node in running.values()}
+            for node in list(self._nodes.values()):
+                if node.name in done or node.name in active:
+                    continue
+                if all(dep in done for dep in node.deps):
+                    if node.stage not in stage_started:
+                        stage_started[node.stage] = time.perf_counter()
+                        if self._on_stage_start:
+                            self._on_stage_start(node.stage)
+                    logger.debug("Starting stage node '%s'", node.name)
+                    running[asyncio.create_task(node.func(), name=node.name)] = node
+
+        try:
+            _start_ready()
+            while running:
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    node = running.pop(task)
+                    self.results[node.name] = task.result()  # Re-raises node failures
+                    done.add(node.name)
+                    stage_pending = any(
+                        n.stage == node.stage and n.name not in done
+                        for n in self._nodes.values()
+                    )
+                    if not stage_pending and self._on_stage_done:
+                        self._on_stage_done(node.stage, time.perf_counter() - stage_started[node.stage])
+                _start_ready()
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return self.results
+
+
+__all__ = ["StageGraph", "StageGraphError", "StageNode"]
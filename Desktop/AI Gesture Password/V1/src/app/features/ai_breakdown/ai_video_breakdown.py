@@ -76,9 +76,9 @@ class AIVideoBreakdown:
         self.has_valid_key = False
         if self.api_key and self.api_key != "DEMO_KEY_GET_YOUR_OWN" and len(self.api_key.strip()) > 10:
             try:
-                genai.configure(api_key=self.api_key)
                 # Initialize the model using utility function with automatic fallback
-                from app.core.gemini_utils import create_gemini_model
+                from app.core.gemini_utils import configure_gemini, create_gemini_model
+                configure_gemini(self.api_key)
                 self.model = create_gemini_model('pro', self.api_key, fallback_to_pro=True)
                 if self.model:
                     self.has_valid_key = True
@@ -99,10 +99,10 @@ class AIVideoBreakdown:
     
     def extract_video_frames(self, video_path: str, max_frames: int = 60) -> List[str]:
         """
-        Extract key frames from video for analysis using seek-based extraction.
+        Extract key frames from video for analysis.
         
-        Uses direct frame seeking (cap.set + cap.read) instead of sequential reading
-        for much faster extraction on large MOV/ProRes files.
+        Frames come from the shared frame store, which decodes the video once
+        and is reused by the physics analysis that runs later in analyze_video.
         
         Args:
             video_path: Path to video file
@@ -122,9 +122,7 @@ class AIVideoBreakdown:
         else:
             logger.warning(f"Could not read video metadata for: {video_path}")
         
-        # Use extract_frames_with_timestamps which uses SEEK-BASED extraction
-        # (cap.set(CV2.CAP_PROP_POS_FRAMES) + cap.read) - much faster for large files
-        # This extracts evenly distributed frames across the entire video duration
+        # Evenly distributed frames across the entire video duration
         frames = extract_frames_with_timestamps(
             video_path,
             num_frames=max_frames,
@@ -133,7 +131,7 @@ class AIVideoBreakdown:
         )
         
         if frames:
-            logger.info(f"Extracted {len(frames)} frames using SEEK-based extraction (evenly distributed)")
+            logger.info(f"Extracted {len(frames)} frames from frame store (evenly distributed)")
         else:
             logger.warning(f"No frames extracted from video: {video_path}")
         
@@ -394,28 +392,27 @@ class AIVideoBreakdown:
             try:
                 from app.core.physics_analyzer import analyze_all_physics
                 from app.features.toxicity import ToxicityScorer
+                from app.features.toxicity.batch import build_toxicity_data
                 
                 # Get visual and audio physics metrics
                 visual_physics, audio_physics = await analyze_all_physics(video_path)
                 
-                # Build toxicity analysis data
-                toxicity_data = {
+                # Build toxicity analysis data (GARM risk and disclaimers come from compliance)
+                toxicity_features = {
                     "visual_physics": visual_physics.to_dict(),
                     "audio_physics": audio_physics.to_dict(),
-                    "transcript": script_text or "",
-                    "claims": result.get("claims", []),
                     "duration_seconds": video_duration,
-                    # Get GARM risk from compliance if available
-                    "garm_risk_level": result.get("compliance", {}).get("overall_risk", "low"),
-                    "required_disclaimers": result.get("compliance", {}).get("required_disclaimers", []),
-                    "present_disclaimers": result.get("content_indicators", {}).get("disclaimers_found", []),
                 }
+                toxicity_data = build_toxicity_data(result, script_text, toxicity_features)
                 
                 # Calculate toxicity score
                 scorer = ToxicityScorer(use_ai=True)
                 toxicity_report = scorer.calculate_toxicity(toxicity_data)
                 
                 result['toxicity'] = toxicity_report.to_dict()
+                # Keep the measured features so the report can be re-scored when
+                # thresholds change; the rest is rebuilt from the stored analysis
+                result['toxicity_inputs'] = toxicity_features
                 logger.info(f"Toxicity score calculated: {toxicity_report.toxic_score} ({toxicity_report.risk_level})")
                 
             except Exception as toxicity_error:
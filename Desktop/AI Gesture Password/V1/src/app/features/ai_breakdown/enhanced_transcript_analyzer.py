@@ -2,7 +2,6 @@
 
 import logging
 from typing import Dict, List, Optional, Tuple
-import google.generativeai as genai
 import re
 from datetime import timedelta
 
@@ -22,9 +21,9 @@ class EnhancedTranscriptAnalyzer:
             api_key = GOOGLE_API_KEY
         
         if api_key and api_key != "DEMO_KEY_GET_YOUR_OWN":
-            genai.configure(api_key=api_key)
             # Initialize model using utility function with automatic fallback
-            from app.core.gemini_utils import create_gemini_model
+            from app.core.gemini_utils import configure_gemini, create_gemini_model
+            configure_gemini(api_key)
             self.model = create_gemini_model('pro', api_key, fallback_to_pro=True)
             if self.model:
                 logger.info("Enhanced Transcript Analyzer initialized with Gemini model")
@@ -5,7 +5,7 @@ import numpy as np
 import logging
 import threading
 import time
-from typing import Optional, Callable, Dict, List, Tuple
+from typing import Optional, Callable, Dict, Iterator, List, Tuple
 from pathlib import Path
 try:
     import mediapipe as mp  # type: ignore
@@ -29,6 +29,15 @@ from io import BytesIO
 import tempfile
 from datetime import datetime
 
+from .reaction_inference import (
+    DeepFaceEmotionBackend,
+    FEREmotionBackend,
+    FrameObservation,
+    classify_faces,
+    crop_face,
+    detect_primary_face,
+)
+
 # Set up logger first
 logger = logging.getLogger(__name__)
 
@@ -171,16 +180,22 @@ class EnhancedEmotionTracker:
         # Face cascade for quality checks
         self.face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
         
-        # Initialize FER detector early to avoid first-run delay (optional backend)
+        # Initialize FER detector early to avoid first-run delay (optional backend).
+        # Only its classifier is used; faces are detected once in _observe_frame.
         if FER is not None:
             try:
-                self.fer_detector = FER(mtcnn=True)
+                self.fer_detector = FER()
                 logger.info("FER detector initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize FER detector: {e}")
                 self.fer_detector = None
         else:
             self.fer_detector = None
+
+        # Emotion classifiers fed with shared face crops (DeepFace model loads on first use)
+        self.deepface_enabled = DEEPFACE_AVAILABLE
+        self._deepface_backend = None
+        self._fer_backend = None
         
         # Initialize emotion optimizer if available
         if OPTIMIZATION_AVAILABLE:
@@ -816,6 +831,81 @@ class EnhancedEmotionTracker:
         
     def _analyze_frame(self, frame: np.ndarray, frame_number: int) -> Optional[Dict]:
         """Analyze a single frame for emotions using multiple methods"""
+        return next(self.analyze_frames([frame], [frame_number]))
+
+    def analyze_frames(self, frames: List[np.ndarray], frame_numbers: List[int]) -> Iterator[Optional[Dict]]:
+        """
+        Analyze a batch of frames, running each emotion model once over all face crops.
+
+        The face is detected and cropped once per frame; DeepFace and FER then
+        classify the stacked crops of the whole batch. Results are yielded in
+        frame order. Scoring reads emotion_history (smoothing, boredom, skipped
+        frames), so each frame is scored only when its result is requested and
+        callers can record the previous result first.
+        """
+        observations: List[Optional[FrameObservation]] = []
+        for frame, frame_number in zip(frames, frame_numbers):
+            # PHASE 2: Frame skip optimization
+            self.frame_skip_counter += 1
+            if self.frame_skip_counter % self.frame_skip_interval != 0:
+                observations.append(None)
+                continue
+            observations.append(self._observe_frame(frame, frame_number))
+
+        classify_faces(self._emotion_backends(), [obs for obs in observations if obs is not None])
+
+        for obs in observations:
+            if obs is None:
+                # Return last known emotion for skipped frames
+                yield self.emotion_history[-1] if self.emotion_history else None
+            else:
+                yield self._score_observation(obs)
+
+    def _emotion_backends(self) -> List:
+        """Emotion classifiers that take pre-cropped faces"""
+        backends = []
+        if DEEPFACE_AVAILABLE and self.deepface_enabled:
+            if self._deepface_backend is None:
+                self._deepface_backend = DeepFaceEmotionBackend(DeepFace)
+            backends.append(self._deepface_backend)
+        if self.fer_detector:
+            if self._fer_backend is None:
+                self._fer_backend = FEREmotionBackend(self.fer_detector)
+            backends.append(self._fer_backend)
+        return backends
+
+    def _observe_frame(self, frame: np.ndarray, frame_number: int) -> FrameObservation:
+        """Detect and crop the face once, and take the per-frame measurements that need the full frame"""
+        obs = FrameObservation(frame=frame, frame_number=frame_number)
+        try:
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            box, obs.detection_score = detect_primary_face(
+                frame, rgb_frame, face_detection=self.face_detection, face_cascade=self.face_cascade
+            )
+            if box:
+                obs.face_region = {'x': box[0], 'y': box[1], 'w': box[2], 'h': box[3]}
+
+            # PHASE 1: Check face quality first
+            obs.quality = self._check_face_quality(frame, obs.face_region)
+            if obs.quality['overall_score'] < 0.3:
+                return obs
+
+            if box:
+                obs.face = crop_face(frame, box)
+
+            # MediaPipe facial landmarks (micro-expressions, optimizer input)
+            if self.face_mesh:
+                results = self.face_mesh.process(rgb_frame)
+                if results.multi_face_landmarks:
+                    obs.landmarks = results.multi_face_landmarks[0]
+            else:
+                logger.debug("Skipping MediaPipe micro-expression analysis (mediapipe unavailable)")
+        except Exception as e:
+            obs.error = e
+        return obs
+
+    def _score_observation(self, obs: FrameObservation) -> Optional[Dict]:
+        """Combine model outputs for one observed frame into smoothed emotion scores"""
         emotion_scores = {
             'happy': 0.0, 'sad': 0.0, 'angry': 0.0, 'surprise': 0.0,
             'fear': 0.0, 'disgust': 0.0, 'neutral': 0.0, 'bored': 0.0,
@@ -823,21 +913,15 @@ class EnhancedEmotionTracker:
         }
         confidence = 0.0
         methods_used = 0
-        face_region = None
-        
-        # PHASE 2: Frame skip optimization
-        self.frame_skip_counter += 1
-        if self.frame_skip_counter % self.frame_skip_interval != 0:
-            # Return last known emotion for skipped frames
-            if self.emotion_history:
-                return self.emotion_history[-1]
-            else:
-                return None
-        
+        face_region = obs.face_region
+        frame = obs.frame
+        frame_number = obs.frame_number
+        quality_metrics = obs.quality
+
         try:
-            # PHASE 1: Check face quality first
-            quality_metrics = self._check_face_quality(frame)
-            
+            if obs.error is not None:
+                raise obs.error
+
             # Skip analysis if quality is too poor
             if quality_metrics['overall_score'] < 0.3:
                 logger.warning(f"Face quality too low: {quality_metrics['overall_score']:.2f}")
@@ -850,125 +934,74 @@ class EnhancedEmotionTracker:
                     'methods_used': 0,
                     'quality': quality_metrics['overall_score']
                 }
-            
+
             # Method 1: DeepFace emotion detection
             deepface_success = False
-            if DEEPFACE_AVAILABLE and self.deeFace_enabled:
-                try:
-                    results = DeepFace.analyze(
-                        frame, 
-                        actions=['emotion'], 
-                        enforce_detection=False,
-                        detector_backend='opencv'  # Faster than default retinaface
-                    )
-                    if results:
-                        if isinstance(results, list):
-                            results = results[0]
-                        
-                        deepface_emotions = results.get('emotion', {})
-                        for emotion, score in deepface_emotions.items():
-                            if emotion in emotion_scores:
-                                emotion_scores[emotion] += score / 100.0
-                        methods_used += 1
-                        deepface_success = True
-                        
-                        # Get face region for quality check
-                        if 'region' in results:
-                            face_region = results['region']
-                        
-                        # Get confidence from face detection
-                        if 'face_confidence' in results:
-                            confidence += results['face_confidence']
-                        elif 'region' in results:
-                            confidence += 0.7  # Default confidence if face detected
-                        else:
-                            confidence += 0.5
-                except Exception as e:
-                    logger.debug(f"DeepFace analysis failed: {e}")
-            else:
-                logger.debug("DeepFace unavailable; skipping emotion analysis via DeepFace")
-                
+            deepface_emotions = obs.model_scores.get('deepface')
+            if deepface_emotions:
+                for emotion, score in deepface_emotions.items():
+                    if emotion in emotion_scores:
+                        emotion_scores[emotion] += score
+                methods_used += 1
+                deepface_success = True
+
+                # Confidence from the shared face detection
+                confidence += obs.detection_score if obs.detection_score is not None else 0.7
+
             # PHASE 1: Method 2 - FER (Multi-model consensus)
             fer_success = False
-            try:
-                # Use pre-initialized FER detector
-                if self.fer_detector:
-                    fer_results = self.fer_detector.detect_emotions(frame)
-                    if fer_results:
-                        fer_emotions = fer_results[0]['emotions']
-                        # Map FER emotions to our emotion set
-                        fer_mapping = {
-                            'happy': 'happy',
-                            'sad': 'sad',
-                            'angry': 'angry',
-                            'surprise': 'surprise',
-                            'fear': 'fear',
-                            'disgust': 'disgust',
-                            'neutral': 'neutral'
-                        }
-                        
-                        for fer_emotion, score in fer_emotions.items():
-                            if fer_emotion in fer_mapping:
-                                mapped_emotion = fer_mapping[fer_emotion]
-                                emotion_scores[mapped_emotion] += score
-                                
-                        methods_used += 1
-                        fer_success = True
-                        confidence += 0.8
-                        
-                        # Update face region if not already set
-                        if not face_region and fer_results[0].get('box'):
-                            box = fer_results[0]['box']
-                            face_region = {'x': box[0], 'y': box[1], 'w': box[2], 'h': box[3]}
-                else:
-                    logger.debug("FER detector not available")
-                        
-            except Exception as e:
-                logger.debug(f"FER analysis failed: {e}")
-                
+            fer_emotions = obs.model_scores.get('fer')
+            if fer_emotions:
+                # Map FER emotions to our emotion set
+                fer_mapping = {
+                    'happy': 'happy',
+                    'sad': 'sad',
+                    'angry': 'angry',
+                    'surprise': 'surprise',
+                    'fear': 'fear',
+                    'disgust': 'disgust',
+                    'neutral': 'neutral'
+                }
+
+                for fer_emotion, score in fer_emotions.items():
+                    if fer_emotion in fer_mapping:
+                        mapped_emotion = fer_mapping[fer_emotion]
+                        emotion_scores[mapped_emotion] += score
+
+                methods_used += 1
+                fer_success = True
+                confidence += 0.8
+
             # Method 3: MediaPipe facial landmarks analysis
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            if self.face_mesh:
-                results = self.face_mesh.process(rgb_frame)
-                
-                if results.multi_face_landmarks:
-                    face_landmarks = results.multi_face_landmarks[0]
-                    
-                    # Analyze micro-expressions
-                    micro_scores = self._analyze_micro_expressions(face_landmarks)
-                    for emotion, score in micro_scores.items():
-                        emotion_scores[emotion] += score
-                    methods_used += 1
-                    confidence += 0.7
-            else:
-                logger.debug("Skipping MediaPipe micro-expression analysis (mediapipe unavailable)")
-                
+            if obs.landmarks is not None:
+                # Analyze micro-expressions
+                micro_scores = self._analyze_micro_expressions(obs.landmarks)
+                for emotion, score in micro_scores.items():
+                    emotion_scores[emotion] += score
+                methods_used += 1
+                confidence += 0.7
+
             # Method 4: Face detection confidence
-            if self.face_detection:
-                detection_results = self.face_detection.process(rgb_frame)
-                if detection_results.detections:
-                    detection = detection_results.detections[0]
-                    detection_confidence = detection.score[0]
-                    
-                    # High confidence detection suggests engagement
-                    if detection_confidence > 0.9:
-                        emotion_scores['happy'] += 0.1
-                        emotion_scores['neutral'] += 0.1
-                    elif detection_confidence < 0.6:
-                        emotion_scores['bored'] += 0.2
-                        
-                    confidence += detection_confidence
-                    methods_used += 1
-            else:
-                logger.debug("Skipping MediaPipe face detection confidence (mediapipe unavailable)")
-                
+            if obs.detection_score is not None:
+                detection_confidence = obs.detection_score
+
+                # High confidence detection suggests engagement
+                if detection_confidence > 0.9:
+                    emotion_scores['happy'] += 0.1
+                    emotion_scores['neutral'] += 0.1
+                elif detection_confidence < 0.6:
+                    emotion_scores['bored'] += 0.2
+
+                confidence += detection_confidence
+                methods_used += 1
+
             # PHASE 1: Multi-model consensus - require agreement
             if deepface_success and fer_success:
                 # Boost emotions that both models agree on
                 for emotion in emotion_scores:
                     if emotion_scores[emotion] > 0.5:  # Both models detected it
                         emotion_scores[emotion] *= 1.2
-                        
+
             # Normalize scores if we have data
             if methods_used > 0:
                 for emotion in emotion_scores:
@@ -979,39 +1012,39 @@ class EnhancedEmotionTracker:
                 emotion_scores['neutral'] = 0.7
                 emotion_scores['bored'] = 0.3
                 confidence = 0.1
-                
+
             # Detect boredom from lack of movement
             if frame_number > 30 and len(self.emotion_history) > 10:
                 recent_emotions = [h['emotion'] for h in self.emotion_history[-10:]]
                 if recent_emotions.count('neutral') > 7:
                     emotion_scores['bored'] += 0.3
                     emotion_scores['neutral'] -= 0.2
-                    
+
             # Ensure scores are non-negative
             for emotion in emotion_scores:
                 emotion_scores[emotion] = max(0, emotion_scores[emotion])
-                
+
             # Collect baseline or apply baseline adjustment
             timestamp = frame_number / self.video_fps if self.video_fps > 0 else 0
-            
+
             if not self.baseline_collected and timestamp < self.baseline_collection_duration:
                 # Still collecting baseline
                 self._collect_baseline_sample(emotion_scores)
-                
+
             # PHASE 1: Apply emotion smoothing
             smoothed_scores = self._smooth_emotions(emotion_scores)
-            
+
             # Apply baseline adjustment if baseline is ready
             if self.baseline_collected:
                 smoothed_scores = self._apply_baseline_adjustment(smoothed_scores)
-                
+
             # Apply optimization if available
             if OPTIMIZATION_AVAILABLE and self.emotion_optimizer:
                 # Get micro expressions for optimizer
                 micro_expressions = {}
-                if results.multi_face_landmarks:
-                    micro_expressions = self._extract_micro_expressions_for_optimizer(face_landmarks)
-                
+                if obs.landmarks is not None:
+                    micro_expressions = self._extract_micro_expressions_for_optimizer(obs.landmarks)
+
                 # Ensure the correct method name is used
                 optimized_scores = self.emotion_optimizer.optimize_emotion_scores(
                     raw_scores=smoothed_scores,
@@ -1019,37 +1052,37 @@ class EnhancedEmotionTracker:
                     face_quality=quality_metrics['overall_score'],
                     temporal_context=self.emotion_history[-10:] if self.emotion_history else None
                 )
-                
+
                 # Apply context if available
                 if self.context_detector:
                     # Get context adjustments
                     context_adjustments = self.context_detector.get_contextual_adjustment(
                         max(optimized_scores, key=optimized_scores.get)
                     )
-                    
+
                     # Apply context adjustments
                     for emotion in list(optimized_scores.keys()):
                         optimized_scores[emotion] *= context_adjustments.get(emotion, 1.0)
-                            
+
                     # Re-normalize
                     total = sum(optimized_scores.values())
                     if total > 0:
                         optimized_scores = {k: v/total for k, v in optimized_scores.items()}
-                
+
                 smoothed_scores = optimized_scores
             else:
                 # Normalize scores to sum to 1
                 total_score = sum(smoothed_scores.values())
                 if total_score > 0:
                     smoothed_scores = {k: v / total_score for k, v in smoothed_scores.items()}
-                    
+
             # Get dominant emotion
             dominant_emotion = max(smoothed_scores, key=smoothed_scores.get)
-            
+
             # Calculate engagement score (inverse of neutral + bored)
             engagement = 1.0 - (smoothed_scores['neutral'] + smoothed_scores['bored']) / 2.0
             engagement = max(0.1, min(1.0, engagement))  # Clamp between 0.1 and 1.0
-            
+
             return {
                 'emotion': dominant_emotion,
                 'scores': smoothed_scores,
@@ -1059,33 +1092,33 @@ class EnhancedEmotionTracker:
                 'quality': quality_metrics['overall_score'],
                 'face_region': face_region
             }
-            
+
             # Add physiological metrics if available
-            if PHYSIO_AVAILABLE and results.multi_face_landmarks:
-                landmarks = results.multi_face_landmarks[0]
+            if PHYSIO_AVAILABLE and obs.landmarks is not None:
+                landmarks = obs.landmarks
                 h, w, _ = frame.shape
-                
+
                 # Gaze
                 gaze_data = self.gaze_tracker.process(landmarks, (h, w))
                 result['gaze'] = gaze_data
-                
+
                 # Blink
                 blink_data = self.blink_detector.process(landmarks, (h, w))
                 result['blink'] = blink_data
-                
+
                 # Pulse
                 pulse_data = self.pulse_estimator.process(frame, landmarks)
                 result['pulse'] = pulse_data
-                
+
                 # Adjust engagement based on gaze and blink
                 # If looking away or fatigued, reduce engagement
                 if gaze_data['gaze_direction'] != 'Center':
                     result['engagement'] *= 0.7
                 if blink_data['fatigue_level'] != 'Normal':
                     result['engagement'] *= 0.8
-            
+
             return result
-            
+
         except Exception as e:
             logger.error(f"Error in frame analysis: {e}")
             # Return a default neutral result
@@ -1097,7 +1130,7 @@ class EnhancedEmotionTracker:
                 'methods_used': 0,
                 'quality': 0.5
             }
-        
+
     def _extract_micro_expressions_for_optimizer(self, landmarks) -> Dict[str, float]:
         """Extract micro-expression intensities for the optimizer"""
         micro_expressions = {}
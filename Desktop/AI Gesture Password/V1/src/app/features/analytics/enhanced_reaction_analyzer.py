@@ -3,7 +3,6 @@
 import logging
 import base64
 from typing import Dict, Optional, Tuple
-import google.generativeai as genai
 import cv2
 import numpy as np
 import re
@@ -24,9 +23,9 @@ class EnhancedReactionAnalyzer:
             api_key = GOOGLE_API_KEY
         
         if api_key and api_key != "DEMO_KEY_GET_YOUR_OWN":
-            genai.configure(api_key=api_key)
             # Initialize model using utility function with automatic fallback
-            from app.core.gemini_utils import create_gemini_model
+            from app.core.gemini_utils import configure_gemini, create_gemini_model
+            configure_gemini(api_key)
             self.model = create_gemini_model('pro', api_key, fallback_to_pro=True)
             if self.model:
                 logger.info("Enhanced Reaction Analyzer initialized with Gemini model")
@@ -0,0 +1,173 @@
+"""Frame sampler for recorded reaction videos.
+
+Reaction analysis only looks at every Nth frame, often at a reduced size.
+FrameSampler yields just those frames, so per-job work tracks the number of
+sampled frames rather than the length of the recording:
+
+- OpenCV: skipped frames are only grab()bed (demuxed and decoded, with no
+  colour conversion or copy), and kept frames are retrieve()d and resized.
+- FFmpeg (used when downscaling and ffmpeg is installed): the decoder pipe
+  selects every Nth frame and scales it before colour conversion, so Python
+  only receives the small frames it will analyze.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+from dataclasses import dataclass
+from typing import IO, Iterator, Optional, Tuple
+
+import cv2  # type: ignore
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# auto: ffmpeg when downscaling and available, otherwise OpenCV
+SAMPLER_BACKEND = os.environ.get("REACTION_SAMPLER_BACKEND", "auto").strip().lower()
+
+
+@dataclass
+class SampledFrame:
+    index: int  # Frame number in the source video
+    timestamp: float  # Seconds
+    image: np.ndarray  # BGR
+
+
+def scaled_size(width: int, height: int, max_edge: int) -> Tuple[int, int]:
+    """(width, height) with the longer edge capped at max_edge (0 = no limit)."""
+    if not max_edge or max(width, height) <= max_edge:
+        return width, height
+    scale = max_edge / max(width, height)
+    return int(width * scale), int(height * scale)
+
+
+def _read_ppm(stream: IO[bytes]) -> Optional[np.ndarray]:
+    """Read one binary PPM (P6, 8-bit) image from a stream; None at end of stream."""
+    fields = []
+    while len(fields) < 4:
+        line = stream.readline()
+        if not line:
+            return None
+        fields.extend(line.split(b"#", 1)[0].split())
+    if fields[0] != b"P6":
+        raise ValueError(f"Unexpected frame header from ffmpeg: {fields[0]!r}")
+    width, height = int(fields[1]), int(fields[2])
+    size = width * height * 3
+    data = stream.read(size)
+    if len(data) < size:
+        return None
+    rgb = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+    return cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+
+
+class FrameSampler:
+    """Iterate every `every_n`th frame of a video, decoding only the frames that are kept."""
+
+    def __init__(
+        self,
+        video_path: str,
+        every_n: int = 1,
+        max_edge: int = 0,
+        backend: Optional[str] = None,
+        ffmpeg_path: Optional[str] = None,
+    ):
+        self.video_path = str(video_path)
+        self.every_n = max(1, every_n)
+        self.max_edge = max(0, max_edge)
+        backend = backend or SAMPLER_BACKEND
+        self.ffmpeg_path = ffmpeg_path or shutil.which("ffmpeg")
+
+        cap = cv2.VideoCapture(self.video_path)
+        if not cap.isOpened():
+            raise RuntimeError(f"Failed to open reaction video: {video_path}")
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 24.0
+        self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        if backend == "ffmpeg" or (backend == "auto" and self.max_edge):
+            self.backend = "ffmpeg" if self.ffmpeg_path else "opencv"
+        else:
+            self.backend = "opencv"
+
+    def __iter__(self) -> Iterator[SampledFrame]:
+        if self.backend == "ffmpeg":
+            yielded = 0
+            try:
+                for sampled in self._iter_ffmpeg():
+                    yielded += 1
+                    yield sampled
+                return
+            except (OSError, ValueError, subprocess.CalledProcessError) as exc:
+                if yielded:
+                    raise
+                logger.warning(f"FFmpeg frame sampling failed for {self.video_path}, using OpenCV: {exc}")
+        yield from self._iter_opencv()
+
+    def _frame(self, index: int, image: np.ndarray) -> SampledFrame:
+        return SampledFrame(index=index, timestamp=index / self.fps, image=image)
+
+    def _iter_opencv(self) -> Iterator[SampledFrame]:
+        cap = cv2.VideoCapture(self.video_path)
+        try:
+            index = 0
+            while cap.grab():
+                if index % self.every_n == 0:
+                    ret, image = cap.retrieve()
+                    if not ret:
+                        break
+                    size = scaled_size(image.shape[1], image.shape[0], self.max_edge)
+                    if size != (image.shape[1], image.shape[0]):
+                        image = cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+                    yield self._frame(index, image)
+                index += 1
+        finally:
+            cap.release()
+
+    def _iter_ffmpeg(self) -> Iterator[SampledFrame]:
+        filters = []
+        if self.every_n > 1:
+            filters.append(f"select='not(mod(n\\,{self.every_n}))'")
+        if self.max_edge:
+            # Cap the longer edge; never upscale
+            edge = self.max_edge
+            filters.append(
+                f"scale='if(gte(iw,ih),min(iw,{edge}),-2)':'if(gte(iw,ih),-2,min(ih,{edge}))'"
+                ":flags=area"
+            )
+        cmd = [self.ffmpeg_path, "-nostdin", "-hide_banner", "-loglevel", "error", "-i", self.video_path]
+        if filters:
+            cmd += ["-vf", ",".join(filters)]
+        # PPM frames carry their own size, so rotation and odd dimensions need no probing
+        cmd += ["-an", "-vsync", "0", "-f", "image2pipe", "-c:v", "ppm", "pipe:1"]
+
+        # stderr goes to a file so a chatty ffmpeg cannot block on a full pipe
+        with tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file)
+            try:
+                sample = 0
+                while True:
+                    image = _read_ppm(process.stdout)
+                    if image is None:
+                        break
+                    yield self._frame(sample * self.every_n, image)
+                    sample += 1
+                process.stdout.close()
+                if process.wait() != 0:
+                    stderr_file.seek(0)
+                    raise subprocess.CalledProcessError(
+                        process.returncode, cmd, stderr=stderr_file.read().decode("utf-8", errors="replace")
+                    )
+            finally:
+                # Consumer stopped early (or failed): don't leave ffmpeg decoding the rest
+                if process.poll() is None:
+                    process.kill()
+                    process.wait()
+                if not process.stdout.closed:
+                    process.stdout.close()
+
+
+__all__ = ["FrameSampler", "SampledFrame", "scaled_size"]
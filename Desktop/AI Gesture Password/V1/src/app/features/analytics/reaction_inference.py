@@ -0,0 +1,193 @@
+"""
+Reaction Inference
+
+Shared face detection and batched emotion classification for reaction frames.
+
+The emotion libraries each bundle a face detector: DeepFace.analyze runs its
+own, and FER(mtcnn=True) runs a torch MTCNN per image. Calling them frame by
+frame therefore detects the same face several times and feeds every model a
+single image. Here the primary face is found once per frame, cropped once,
+and each emotion model's classifier is called once over the stacked crops of
+a whole batch of frames.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Output order of both the DeepFace and FER emotion classifiers
+EMOTION_LABELS = ("angry", "disgust", "fear", "happy", "sad", "surprise", "neutral")
+
+FACE_CROP_MARGIN = 0.1
+
+Box = Tuple[int, int, int, int]  # x, y, w, h in frame pixels
+
+
+@dataclass
+class FrameObservation:
+    """Everything measured on one frame before emotion scoring."""
+
+    frame: np.ndarray
+    frame_number: int
+    quality: Dict[str, float] = field(default_factory=dict)
+    face_region: Optional[Dict[str, int]] = None
+    detection_score: Optional[float] = None
+    face: Optional[np.ndarray] = None  # Square grayscale crop fed to the emotion models
+    landmarks: Any = None  # MediaPipe face mesh landmarks for the primary face
+    model_scores: Dict[str, Dict[str, float]] = field(default_factory=dict)
+    error: Optional[Exception] = None
+
+
+def detect_primary_face(
+    frame: np.ndarray,
+    rgb_frame: Optional[np.ndarray] = None,
+    face_detection=None,
+    face_cascade=None,
+) -> Tuple[Optional[Box], Optional[float]]:
+    """
+    Locate the most prominent face.
+
+    Uses MediaPipe face detection when available (which also yields a
+    confidence), otherwise the Haar cascade.
+
+    Returns:
+        (box, score); score is None for the Haar cascade, both are None if no face was found
+    """
+    height, width = frame.shape[:2]
+    if face_detection is not None:
+        if rgb_frame is None:
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        results = face_detection.process(rgb_frame)
+        if not results.detections:
+            return None, None
+        detection = results.detections[0]
+        rel = detection.location_data.relative_bounding_box
+        x = max(0, int(rel.xmin * width))
+        y = max(0, int(rel.ymin * height))
+        w = min(width - x, int(rel.width * width))
+        h = min(height - y, int(rel.height * height))
+        if w <= 0 or h <= 0:
+            return None, None
+        return (x, y, w, h), float(detection.score[0])
+
+    if face_cascade is not None:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(48, 48))
+        if len(faces):
+            x, y, w, h = max(faces, key=lambda f: f[2] * f[3])
+            return (int(x), int(y), int(w), int(h)), None
+    return None, None
+
+
+def crop_face(frame: np.ndarray, box: Box, margin: float = FACE_CROP_MARGIN) -> Optional[np.ndarray]:
+    """Square grayscale crop around a face box, padded by `margin` of its size on each side."""
+    x, y, w, h = box
+    side = int(max(w, h) * (1 + 2 * margin))
+    cx, cy = x + w / 2, y + h / 2
+    x1 = max(0, int(round(cx - side / 2)))
+    y1 = max(0, int(round(cy - side / 2)))
+    x2 = min(frame.shape[1], x1 + side)
+    y2 = min(frame.shape[0], y1 + side)
+    crop = frame[y1:y2, x1:x2]
+    if crop.size == 0:
+        return None
+    if crop.ndim == 3:
+        crop = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    return crop
+
+
+def stack_faces(faces: Sequence[np.ndarray], size: Tuple[int, int]) -> np.ndarray:
+    """Resize grayscale crops to `size` and stack them as float32 in [0, 1] (N x H x W)."""
+    batch = np.empty((len(faces), size[1], size[0]), dtype=np.float32)
+    for i, face in enumerate(faces):
+        batch[i] = cv2.resize(face, size, interpolation=cv2.INTER_AREA)
+    batch /= 255.0
+    return batch
+
+
+class DeepFaceEmotionBackend:
+    """DeepFace's emotion CNN, called directly on pre-cropped faces."""
+
+    name = "deepface"
+    input_size = (48, 48)
+
+    def __init__(self, deepface_module):
+        self._deepface = deepface_module
+        self._model = None
+
+    @property
+    def model(self):
+        if self._model is None:
+            try:
+                client = self._deepface.build_model(task="facial_attribute", model_name="Emotion")
+            except TypeError:
+                # deepface < 0.0.93 takes the model name only
+                client = self._deepface.build_model("Emotion")
+            # Newer releases wrap the Keras model in a client object
+            self._model = getattr(client, "model", client)
+        return self._model
+
+    def predict(self, faces: Sequence[np.ndarray]) -> List[Dict[str, float]]:
+        batch = stack_faces(faces, self.input_size)[..., np.newaxis]
+        predictions = np.asarray(self.model(batch, training=False))
+        totals = predictions.sum(axis=1, keepdims=True)
+        predictions = predictions / np.where(totals > 0, totals, 1.0)
+        return [dict(zip(EMOTION_LABELS, map(float, row))) for row in predictions]
+
+
+class FEREmotionBackend:
+    """FER's emotion classifier, called directly on pre-cropped faces."""
+
+    name = "fer"
+    input_size = (64, 64)
+
+    def __init__(self, detector):
+        self.detector = detector
+
+    def predict(self, faces: Sequence[np.ndarray]) -> List[Dict[str, float]]:
+        # FER's "v2" preprocessing: scale to [-1, 1]
+        batch = (stack_faces(faces, self.input_size) - 0.5) * 2.0
+        predictions = np.asarray(self.detector._classify_emotions(batch))
+        labels = self.detector._get_labels()
+        return [
+            {labels[idx]: round(float(score), 2) for idx, score in enumerate(row)}
+            for row in predictions
+        ]
+
+
+def classify_faces(backends: Sequence[Any], observations: Sequence[FrameObservation]) -> None:
+    """
+    Run every backend once over the faces of a batch of observations.
+
+    Fills in each observation's model_scores keyed by backend name. A backend
+    that fails is skipped for the whole batch.
+    """
+    with_faces = [obs for obs in observations if obs.face is not None]
+    if not with_faces:
+        return
+    faces = [obs.face for obs in with_faces]
+    for backend in backends:
+        try:
+            scores = backend.predict(faces)
+        except Exception as e:
+            logger.debug(f"{backend.name} emotion inference failed: {e}")
+            continue
+        for obs, backend_scores in zip(with_faces, scores):
+            obs.model_scores[backend.name] = backend_scores
+
+
+__all__ = [
+    "EMOTION_LABELS",
+    "DeepFaceEmotionBackend",
+    "FEREmotionBackend",
+    "FrameObservation",
+    "classify_faces",
+    "crop_face",
+    "detect_primary_face",
+    "stack_faces",
+]
@@ -7,12 +7,13 @@ import shutil
 import subprocess
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 import cv2  # type: ignore
 import numpy as np  # type: ignore
 
-from .reaction_video_analyzer import ReactionVideoAnalyzer
+from .frame_sampler import FrameSampler
+from .reaction_video_analyzer import FrameEmotion, ReactionVideoAnalyzer
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ except Exception as exc:  # pragma: no cover - optional dependency
 REACTION_ANALYZER_MODE = os.environ.get("REACTION_ANALYZER_MODE", "auto").strip().lower()
 REACTION_FRAME_SKIP = max(1, int(os.environ.get("REACTION_FRAME_SKIP", "2")))
 REACTION_MAX_FRAME_EDGE = int(os.environ.get("REACTION_MAX_FRAME_EDGE", "720"))
+REACTION_BATCH_SIZE = max(1, int(os.environ.get("REACTION_BATCH_SIZE", "16")))
 
 
 class ReactionProcessingPipeline:
@@ -48,6 +50,7 @@ class ReactionProcessingPipeline:
         self.fallback_analyzer = ReactionVideoAnalyzer()
         self.frame_skip_interval = REACTION_FRAME_SKIP
         self.max_frame_edge = max(0, REACTION_MAX_FRAME_EDGE)
+        self.batch_size = REACTION_BATCH_SIZE
         self.force_lightweight = REACTION_ANALYZER_MODE == "lightweight"
         self.use_enhanced = ENHANCED_TRACKER_AVAILABLE and not self.force_lightweight
         if self.force_lightweight:
@@ -56,9 +59,10 @@ class ReactionProcessingPipeline:
             logger.info("Enhanced tracker unavailable; falling back to heuristic analyzer.")
         else:
             logger.info(
-                "Reaction analyzer using EnhancedEmotionTracker (frame skip=%d, max edge=%d).",
+                "Reaction analyzer using EnhancedEmotionTracker (frame skip=%d, max edge=%d, batch=%d).",
                 self.frame_skip_interval,
                 self.max_frame_edge,
+                self.batch_size,
             )
 
     def analyze(self, video_path: str) -> Dict:
@@ -131,67 +135,31 @@ class ReactionProcessingPipeline:
         tracker.frame_skip_counter = 0
         tracker.emotion_history = []
         tracker.reaction_snapshots = []
-        # Guard typo attribute access in upstream class
-        if not hasattr(tracker, "deeFace_enabled"):
-            tracker.deeFace_enabled = False  # type: ignore[attr-defined]
 
-        cap = cv2.VideoCapture(video_path)
-        if not cap.isOpened():
-            raise RuntimeError(f"Failed to open reaction video: {video_path}")
-
-        fps = cap.get(cv2.CAP_PROP_FPS) or 24.0
+        sampler = FrameSampler(video_path, every_n=self.frame_skip_interval, max_edge=self.max_frame_edge)
+        fps = sampler.fps
 
         timeline: List[Dict] = []
         snapshots: List[Dict] = []
-        frame_idx = 0
-
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
+        batch: List[Tuple[int, np.ndarray]] = []
 
-            if self.max_frame_edge and max(frame.shape[0], frame.shape[1]) > self.max_frame_edge:
-                scale = self.max_frame_edge / max(frame.shape[0], frame.shape[1])
-                new_size = (int(frame.shape[1] * scale), int(frame.shape[0] * scale))
-                frame = cv2.resize(frame, new_size)
-
-            if frame_idx % self.frame_skip_interval != 0:
-                frame_idx += 1
-                continue
+        for sampled in sampler:
+            batch.append((sampled.index, sampled.image))
+            if len(batch) >= self.batch_size:
+                self._analyze_batch(tracker, batch, fps, timeline, snapshots)
+                batch = []
 
-            result = tracker._analyze_frame(frame, frame_idx)  # type: ignore[attr-defined]
-            if result:
-                event = {
-                    "timestamp": frame_idx / fps,
-                    "emotion": result.get("emotion", "neutral"),
-                    "engagement": float(result.get("engagement", 0.0)),
-                    "scores": result.get("scores", {}),
-                }
-                timeline.append(event)
-                tracker.emotion_history.append(event)
-
-                if len(snapshots) < self.fallback_analyzer.snapshot_limit:
-                    _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-                    snapshots.append(
-                        {
-                            "timestamp": event["timestamp"],
-                            "emotion": event["emotion"],
-                            "engagement": event["engagement"],
-                            "image_data": buffer.tobytes(),
-                        }
-                    )
-
-            frame_idx += 1
-
-        cap.release()
+        if batch:
+            self._analyze_batch(tracker, batch, fps, timeline, snapshots)
 
         if not timeline:
             logger.warning("Enhanced tracker produced no data; reverting to fallback analyzer")
             return self.fallback_analyzer.analyze(video_path)
 
         engagement_score = float(np.mean([entry["engagement"] for entry in timeline]))
-        emotion_summary = self.fallback_analyzer._summarize_emotions(timeline)
-        key_moments = self.fallback_analyzer._key_moments(timeline)
+        frame_emotions = [FrameEmotion(**event) for event in timeline]
+        emotion_summary = self.fallback_analyzer._summarize_emotions(frame_emotions)
+        key_moments = self.fallback_analyzer._key_moments(frame_emotions)
 
         return {
             "emotion_timeline": timeline,
@@ -201,3 +169,39 @@ class ReactionProcessingPipeline:
             "reaction_snapshots": snapshots,
         }
 
+    def _analyze_batch(
+        self,
+        tracker,
+        batch: List[Tuple[int, np.ndarray]],
+        fps: float,
+        timeline: List[Dict],
+        snapshots: List[Dict],
+    ) -> None:
+        """Run one batch of sampled frames through the tracker, appending events and snapshots."""
+        frame_numbers = [frame_idx for frame_idx, _ in batch]
+        frames = [frame for _, frame in batch]
+        results = tracker.analyze_frames(frames, frame_numbers)  # type: ignore[attr-defined]
+        for (frame_idx, frame), result in zip(batch, results):
+            if not result:
+                continue
+            event = {
+                "timestamp": frame_idx / fps,
+                "emotion": result.get("emotion", "neutral"),
+                "engagement": float(result.get("engagement", 0.0)),
+                "scores": result.get("scores", {}),
+            }
+            timeline.append(event)
+            # Recorded before the next result is scored (smoothing reads the history)
+            tracker.emotion_history.append(event)
+
+            if len(snapshots) < self.fallback_analyzer.snapshot_limit:
+                _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+                snapshots.append(
+                    {
+                        "timestamp": event["timestamp"],
+                        "emotion": event["emotion"],
+                        "engagement": event["engagement"],
+                        "image_data": buffer.tobytes(),
+                    }
+                )
+
@@ -16,6 +16,8 @@ from typing import Dict, List, Optional, Tuple
 import cv2  # type: ignore
 import numpy as np
 
+from .frame_sampler import FrameSampler
+
 logger = logging.getLogger(__name__)
 
 # Load OpenCV Haar cascades for face and feature detection
@@ -79,44 +81,33 @@ class ReactionVideoAnalyzer:
         if not path.exists():
             raise FileNotFoundError(f"Reaction video not found: {video_path}")
 
-        cap = cv2.VideoCapture(str(path))
-        if not cap.isOpened():
-            raise RuntimeError(f"Failed to open reaction video: {video_path}")
-
-        fps = cap.get(cv2.CAP_PROP_FPS) or 24.0
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        frame_count = 0
+        sampler = FrameSampler(str(path), every_n=self.sample_every_n_frames)
+        fps = sampler.fps
+        total_frames = sampler.total_frames
         timeline: List[FrameEmotion] = []
         snapshots: List[Dict] = []
         motion_ctx = MotionContext()
         faces_detected = 0
 
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-
-            if frame_count % self.sample_every_n_frames == 0:
-                timestamp = frame_count / fps
-                video_progress = frame_count / max(1, total_frames)
-                frame_result = self._score_frame(frame, timestamp, video_progress, motion_ctx)
-                timeline.append(frame_result)
-                if frame_result.face_detected:
-                    faces_detected += 1
-
-                if len(snapshots) < self.snapshot_limit:
-                    _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-                    snapshots.append(
-                        {
-                            "timestamp": timestamp,
-                            "emotion": frame_result.emotion,
-                            "engagement": frame_result.engagement,
-                            "image_data": buffer.tobytes(),
-                        }
-                    )
-            frame_count += 1
-
-        cap.release()
+        for sampled in sampler:
+            frame = sampled.image
+            timestamp = sampled.index / fps
+            video_progress = sampled.index / max(1, total_frames)
+            frame_result = self._score_frame(frame, timestamp, video_progress, motion_ctx)
+            timeline.append(frame_result)
+            if frame_result.face_detected:
+                faces_detected += 1
+
+            if len(snapshots) < self.snapshot_limit:
+                _, buffer = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+                snapshots.append(
+                    {
+                        "timestamp": timestamp,
+                        "emotion": frame_result.emotion,
+                        "engagement": frame_result.engagement,
+                        "image_data": buffer.tobytes(),
+                    }
+                )
 
         if not timeline:
             logger.warning("Reaction analyzer found no frames; returning neutral baseline")
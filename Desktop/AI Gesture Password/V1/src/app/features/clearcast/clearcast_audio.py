@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import subprocess
 from dataclasses import dataclass
 from typing import Dict, Optional
 
+from app.core.audio_analysis import analyze_audio
+
 logger = logging.getLogger(__name__)
 
 
@@ -95,42 +96,12 @@ class ClearcastAudioAnalyzer:
         )
 
     def _probe_loudness(self, video_path: str) -> Dict[str, Optional[float]]:
-        cmd = [
-            self.ffmpeg_path,
-            "-i",
-            video_path,
-            "-af",
-            "loudnorm=print_format=json",
-            "-f",
-            "null",
-            "-",
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        audio_info: Dict[str, Optional[float]] = {}
-
-        # FFmpeg prints the JSON to stderr; scan for block
-        collecting = False
-        buffer = []
-        for line in result.stderr.splitlines():
-            if line.strip().startswith("{"):
-                collecting = True
-            if collecting:
-                buffer.append(line)
-            if collecting and line.strip().endswith("}"):
-                break
-
-        if buffer:
-            try:
-                loudness_data = json.loads("\n".join(buffer))
-                audio_info["integrated_lufs"] = float(loudness_data.get("input_i", -99))
-                audio_info["true_peak"] = float(loudness_data.get("input_tp", 0))
-                audio_info["lra"] = float(loudness_data.get("input_lra", 0))
-            except json.JSONDecodeError as exc:
-                logger.warning(f"Failed to decode loudness data: {exc}")
-
-        return audio_info
+        analysis = analyze_audio(video_path, self.ffmpeg_path)
+        if analysis is None:
+            raise RuntimeError("FFmpeg audio analysis failed")
+        return analysis.loudness()
 
-    def check_silence_head_tail(self, video_path: str, duration_sec: float = 0.24, threshold_db: float = -60.0, is_slated_master: bool = False) -> Dict:
+    def check_silence_head_tail(self, video_path: str, duration_sec: float = 0.24, threshold_db: float = -60.0, is_slated_master: bool = False, container_duration: Optional[float] = None) -> Dict:
         """
         Check for silence at the head and tail of the video.
         
@@ -139,6 +110,9 @@ class ClearcastAudioAnalyzer:
             duration_sec: Duration to check (default 0.24s = 6 frames @ 25fps)
             threshold_db: Silence threshold in dB (default -60dB)
             is_slated_master: If True, enforces 10s silence at head
+            container_duration: File duration the tail is measured back from,
+                if the caller already knows it (otherwise the duration ffmpeg
+                reported while decoding the audio)
             
         Returns:
             Dict with pass/fail status and details
@@ -153,64 +127,31 @@ class ClearcastAudioAnalyzer:
         # Adjust head duration for slated masters
         head_duration = 10.0 if is_slated_master else duration_sec
         
-        if not self.ffmpeg_path or not self.ffprobe_path:
+        if not self.ffmpeg_path:
             results["passed"] = False
-            results["details"].append("FFmpeg/FFprobe not available for silence check")
+            results["details"].append("FFmpeg not available for silence check")
             return results
             
         try:
-            # Get video duration first
-            probe_cmd = [
-                self.ffprobe_path, '-i', video_path,
-                '-v', 'error',
-                '-show_entries', 'format=duration',
-                '-of', 'default=noprint_wrappers=1:nokey=1'
-            ]
-            duration_res = subprocess.run(probe_cmd, capture_output=True, text=True)
-            total_duration = float(duration_res.stdout.strip())
-            
-            # Check Head (0 to duration_sec)
-            # We use silencedetect filter. If it outputs nothing, it means NO silence detected (fail).
-            # Wait, silencedetect outputs when silence IS detected.
-            # So we want silence to BE detected for the entire duration.
-            # Actually, simpler approach: measure max volume in that segment.
+            # Head and tail levels come from the shared single-pass audio analysis
+            analysis = analyze_audio(video_path, self.ffmpeg_path)
+            if analysis is None:
+                raise RuntimeError("could not analyze audio")
             
             # Check Head
-            head_cmd = [
-                self.ffmpeg_path, '-i', video_path,
-                '-t', str(head_duration),
-                '-af', f'volumedetect',
-                '-f', 'null', '-'
-            ]
-            head_res = subprocess.run(head_cmd, capture_output=True, text=True)
-            
-            # Parse max_volume
-            import re
-            max_vol_match = re.search(r"max_volume: ([\-\d\.]+) dB", head_res.stderr)
-            if max_vol_match:
-                max_vol = float(max_vol_match.group(1))
-                if max_vol > threshold_db:
-                    results["head_silence"] = False
-                    results["passed"] = False
-                    results["details"].append(f"Head not silent ({head_duration}s check): Max level {max_vol}dB > {threshold_db}dB")
-            
-            # Check Tail
-            start_tail = total_duration - duration_sec
-            tail_cmd = [
-                self.ffmpeg_path, '-ss', str(start_tail),
-                '-i', video_path,
-                '-af', f'volumedetect',
-                '-f', 'null', '-'
-            ]
-            tail_res = subprocess.run(tail_cmd, capture_output=True, text=True)
+            max_vol = analysis.head_max_db(head_duration)
+            if max_vol is not None and max_vol > threshold_db:
+                results["head_silence"] = False
+                results["passed"] = False
+                results["details"].append(f"Head not silent ({head_duration}s check): Max level {max_vol:.1f}dB > {threshold_db}dB")
             
-            max_vol_match = re.search(r"max_volume: ([\-\d\.]+) dB", tail_res.stderr)
-            if max_vol_match:
-                max_vol = float(max_vol_match.group(1))
-                if max_vol > threshold_db:
-                    results["tail_silence"] = False
-                    results["passed"] = False
-                    results["details"].append(f"Tail not silent: Max level {max_vol}dB > {threshold_db}dB")
+            # Check Tail: measured back from the end of the file, which may
+            # outlast the audio stream
+            max_vol = analysis.tail_max_db(duration_sec, container_duration)
+            if max_vol is not None and max_vol > threshold_db:
+                results["tail_silence"] = False
+                results["passed"] = False
+                results["details"].append(f"Tail not silent: Max level {max_vol:.1f}dB > {threshold_db}dB")
                     
         except Exception as e:
             logger.error(f"Silence check failed: {e}")
@@ -6,7 +6,6 @@ import logging
 import base64
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
-import google.generativeai as genai
 import cv2
 import tempfile
 
@@ -23,7 +22,10 @@ from app.core.legal_geometry import LegalGeometryVerifier
 from app.features.ai_breakdown.substantiation_generator import SubstantiationGenerator
 from app.features.ai_breakdown.saliency_engine import SaliencyEngine
 from app.core.technical_qc import TechnicalVerifier
+from app.core.frame_analyzer import extract_frames_with_timestamps, frames_to_legacy_format
+from app.core.frame_store import SAMPLE_JPEG_QUALITY
 from app.core.metadata_verifier import MetadataVerifier
+from app.core.gemini_utils import configure_gemini
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -35,7 +37,7 @@ except ImportError:
     from app.core.config import GOOGLE_API_KEY
     
 if GOOGLE_API_KEY and GOOGLE_API_KEY != "DEMO_KEY_GET_YOUR_OWN":
-    genai.configure(api_key=GOOGLE_API_KEY)
+    configure_gemini(GOOGLE_API_KEY)
 else:
     logger.warning("Google API key not configured - Clearcast features will be limited")
 
@@ -589,7 +591,9 @@ CRITICAL INSTRUCTIONS:
                 is_slated = self.metadata_verifier.is_slated_master(video_duration, clock_dur_int)
 
             # Silence Check
-            silence_res = self.audio_analyzer.check_silence_head_tail(video_path, is_slated_master=is_slated)
+            silence_res = self.audio_analyzer.check_silence_head_tail(
+                video_path, is_slated_master=is_slated, container_duration=video_duration or None
+            )
             if not silence_res["passed"]:
                 for detail in silence_res["details"]:
                     result["blue_flags"].append({
@@ -675,41 +679,26 @@ CRITICAL INSTRUCTIONS:
         """
         Extract key frames from video for analysis with timestamps.
         
+        Served from the shared frame store so the safe-area/PSE checks that
+        follow reuse the same decode.
+        
         Returns:
             List of tuples (base64_image, timestamp_string MM:SS)
         """
-        frames = []
         try:
-            cap = cv2.VideoCapture(video_path)
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            
-            if total_frames <= 0 or fps <= 0:
-                logger.warning("Could not determine video properties for frame extraction")
-                return []
-            
-            # Extract frames at regular intervals
-            for i in range(num_frames):
-                frame_pos = int((i / (num_frames - 1)) * (total_frames - 1))
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_pos)
-                ret, frame = cap.read()
-                
-                if ret:
-                    # Calculate timestamp
-                    timestamp_sec = frame_pos / fps
-                    time_str = f"{int(timestamp_sec // 60):02d}:{int(timestamp_sec % 60):02d}"
-                    
-                    # Convert frame to base64
-                    _, buffer = cv2.imencode('.jpg', frame)
-                    frame_base64 = base64.b64encode(buffer).decode('utf-8')
-                    frames.append((frame_base64, time_str))
-            
-            cap.release()
-            
+            # Source resolution at the store's sample quality, as the compliance
+            # prompt has always been given
+            frames = extract_frames_with_timestamps(
+                video_path,
+                num_frames=num_frames,
+                max_width=None,
+                quality=SAMPLE_JPEG_QUALITY,
+                validate_quality=False
+            )
+            return frames_to_legacy_format(frames)
         except Exception as e:
             logger.error(f"Failed to extract frames: {e}")
-            
-        return frames
+            return []
     
     def _parse_compliance_response(self, response_text: str) -> Dict:
         """Parse the compliance check response"""
@@ -6,14 +6,22 @@ Features:
 - Keyword-based retrieval (always available)
 - Semantic search with embeddings (when sentence-transformers is installed)
 - Chunk-level retrieval for precise context
+
+Chunk embeddings are L2-normalized float32 and cached per PDF as a .npy file
+that is memory-mapped on load, so cosine similarity is a single matrix
+product. Top-k uses argpartition, or an HNSW index when hnswlib is installed
+and the PDF is large. Query embeddings are kept in a small LRU so repeated
+focus-area keywords skip the encoder.
 """
 
 import os
 import logging
 import hashlib
 import pickle
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Sequence, Tuple
 import pypdf
 import numpy as np
 
@@ -28,6 +36,31 @@ try:
 except ImportError:
     logger.info("Semantic search unavailable (sentence-transformers not installed). Using keyword-based retrieval.")
 
+# Optional approximate nearest-neighbour index for large guidance documents
+HNSW_AVAILABLE = False
+try:
+    import hnswlib
+    HNSW_AVAILABLE = True
+except ImportError:
+    pass
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
+QUERY_CACHE_SIZE = 256
+# Below this many chunks an exact matrix product is already sub-millisecond
+HNSW_MIN_CHUNKS = 5000
+HNSW_EF = 64
+
+# Minimum length of one _semantic_search entry ("[Page N] (relevance: x.xx)\n...---\n"),
+# which bounds how many chunks can fit within a character limit
+_MIN_ENTRY_CHARS = 32
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows as contiguous float32 (cosine similarity becomes a dot product)."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.ascontiguousarray(vectors / (norms + 1e-8), dtype=np.float32)
+
 
 class ClearcastKnowledgeBase:
     """
@@ -43,10 +76,13 @@ class ClearcastKnowledgeBase:
         self.pdf_path = pdf_path
         self.full_text = ""
         self.chunks: List[Dict] = []  # List of {text, page, start_idx}
-        self.embeddings: Optional[np.ndarray] = None
+        self.embeddings: Optional[np.ndarray] = None  # Normalized float32, one row per chunk
         self.model: Optional['SentenceTransformer'] = None
         self.use_semantic = use_semantic and SEMANTIC_AVAILABLE
         self.cache_dir = Path(__file__).parent / "_cache"
+        self._ann_index = None
+        self._query_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
         
         if self.pdf_path and os.path.exists(self.pdf_path):
             self.load_pdf(self.pdf_path)
@@ -157,13 +193,13 @@ class ClearcastKnowledgeBase:
         
         logger.info(f"Created {len(self.chunks)} chunks from PDF")
     
-    def _get_cache_path(self, pdf_path: str) -> Path:
+    def _get_cache_path(self, pdf_path: str, suffix: str = ".npy", prefix: str = "embeddings") -> Path:
         """Get cache file path based on PDF hash."""
         # Hash the PDF path and modification time
         pdf_stat = os.stat(pdf_path)
         cache_key = f"{pdf_path}_{pdf_stat.st_mtime}_{pdf_stat.st_size}"
         hash_key = hashlib.md5(cache_key.encode()).hexdigest()[:12]
-        return self.cache_dir / f"embeddings_{hash_key}.pkl"
+        return self.cache_dir / f"{prefix}_{hash_key}{suffix}"
     
     def _load_or_create_embeddings(self, pdf_path: str):
         """Load embeddings from cache or create new ones."""
@@ -174,47 +210,149 @@ class ClearcastKnowledgeBase:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         cache_path = self._get_cache_path(pdf_path)
         
-        # Try to load from cache
+        # Try to load from cache (memory-mapped: no copy until pages are touched)
         if cache_path.exists():
             try:
-                with open(cache_path, 'rb') as f:
-                    cached = pickle.load(f)
-                    if len(cached.get('embeddings', [])) == len(self.chunks):
-                        self.embeddings = cached['embeddings']
-                        logger.info(f"Loaded {len(self.embeddings)} embeddings from cache")
-                        return
+                embeddings = np.load(cache_path, mmap_mode="r")
+                if len(embeddings) == len(self.chunks):
+                    self._set_embeddings(embeddings, pdf_path)
+                    logger.info(f"Loaded {len(self.embeddings)} embeddings from cache")
+                    return
             except Exception as e:
                 logger.warning(f"Failed to load embeddings cache: {e}")
         
-        # Create new embeddings
-        self._create_embeddings()
+        embeddings = self._load_legacy_embeddings(pdf_path)
+        if embeddings is None:
+            # Create new embeddings
+            embeddings = self._create_embeddings()
+        if embeddings is None:
+            return
         
+        embeddings = _normalize_rows(embeddings)
         # Save to cache
-        if self.embeddings is not None:
-            try:
-                with open(cache_path, 'wb') as f:
-                    pickle.dump({'embeddings': self.embeddings}, f)
-                logger.info(f"Saved embeddings to cache: {cache_path}")
-            except Exception as e:
-                logger.warning(f"Failed to save embeddings cache: {e}")
+        try:
+            tmp_path = cache_path.with_suffix(".npy.tmp")
+            with open(tmp_path, 'wb') as f:
+                np.save(f, embeddings)
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Saved embeddings to cache: {cache_path}")
+        except Exception as e:
+            logger.warning(f"Failed to save embeddings cache: {e}")
+        self._set_embeddings(embeddings, pdf_path)
     
-    def _create_embeddings(self):
+    def _load_legacy_embeddings(self, pdf_path: str) -> Optional[np.ndarray]:
+        """Read a pickled embeddings cache written by earlier versions (removed once migrated)."""
+        legacy_path = self._get_cache_path(pdf_path, suffix=".pkl")
+        if not legacy_path.exists():
+            return None
+        try:
+            with open(legacy_path, 'rb') as f:
+                cached = pickle.load(f)
+            legacy_path.unlink()
+            if len(cached.get('embeddings', [])) == len(self.chunks):
+                logger.info(f"Migrating pickled embeddings cache {legacy_path.name}")
+                return np.asarray(cached['embeddings'])
+        except Exception as e:
+            logger.warning(f"Failed to load legacy embeddings cache: {e}")
+        return None
+    
+    def _set_embeddings(self, embeddings: np.ndarray, pdf_path: Optional[str] = None):
+        """Install normalized chunk embeddings and (for large documents) the HNSW index."""
+        self.embeddings = embeddings
+        self._ann_index = None
+        if HNSW_AVAILABLE and len(embeddings) >= HNSW_MIN_CHUNKS:
+            self._ann_index = self._load_or_build_hnsw(embeddings, pdf_path)
+    
+    def _load_or_build_hnsw(self, embeddings: np.ndarray, pdf_path: Optional[str]):
+        index = hnswlib.Index(space='ip', dim=embeddings.shape[1])
+        index_path = self._get_cache_path(pdf_path, suffix=".bin", prefix="hnsw") if pdf_path else None
+        try:
+            if index_path and index_path.exists():
+                index.load_index(str(index_path), max_elements=len(embeddings))
+            else:
+                index.init_index(max_elements=len(embeddings), ef_construction=200, M=16)
+                index.add_items(np.asarray(embeddings), np.arange(len(embeddings)))
+                if index_path:
+                    index.save_index(str(index_path))
+            index.set_ef(HNSW_EF)
+            logger.info(f"HNSW index ready for {len(embeddings)} chunks")
+            return index
+        except Exception as e:
+            logger.warning(f"Failed to build HNSW index, using exact search: {e}")
+            return None
+    
+    def _get_model(self) -> Optional['SentenceTransformer']:
+        """The embedding model, loaded on first use (cached embeddings do not need it)."""
+        if self.model is None and SEMANTIC_AVAILABLE:
+            with self._lock:
+                if self.model is None:
+                    # Use a lightweight model suitable for regulatory text
+                    self.model = SentenceTransformer(EMBEDDING_MODEL_NAME)
+        return self.model
+    
+    def warm_up(self):
+        """Load the query encoder ahead of the first semantic search."""
+        if self.use_semantic and self.embeddings is not None:
+            self._get_model()
+    
+    def _create_embeddings(self) -> Optional[np.ndarray]:
         """Create embeddings for all chunks using sentence-transformers."""
         if not SEMANTIC_AVAILABLE or not self.chunks:
-            return
+            return None
         
         try:
-            # Use a lightweight model suitable for regulatory text
-            if self.model is None:
-                self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            
             chunk_texts = [c['text'] for c in self.chunks]
-            self.embeddings = self.model.encode(chunk_texts, show_progress_bar=False)
-            logger.info(f"Created {len(self.embeddings)} embeddings")
+            embeddings = self._get_model().encode(chunk_texts, show_progress_bar=False)
+            logger.info(f"Created {len(embeddings)} embeddings")
+            return embeddings
             
         except Exception as e:
             logger.error(f"Failed to create embeddings: {e}")
-            self.embeddings = None
+            return None
+
+    def _encode_queries(self, queries: Sequence[str]) -> np.ndarray:
+        """Normalized query embeddings; cache misses are encoded in a single batch."""
+        with self._lock:
+            cached = {q: self._query_cache[q] for q in queries if q in self._query_cache}
+            for query in cached:
+                self._query_cache.move_to_end(query)
+        
+        missing = list(dict.fromkeys(q for q in queries if q not in cached))
+        if missing:
+            model = self.model or self._get_model()
+            encoded = _normalize_rows(model.encode(missing, show_progress_bar=False))
+            with self._lock:
+                for query, vector in zip(missing, encoded):
+                    cached[query] = vector
+                    self._query_cache[query] = vector
+                while len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        
+        return np.stack([cached[q] for q in queries])
+    
+    def _top_k(self, query_vectors: np.ndarray, k: int) -> List[List[Tuple[int, float]]]:
+        """Best k (chunk index, cosine similarity) pairs per query, most similar first."""
+        k = min(k, len(self.embeddings))
+        if k <= 0:
+            return [[] for _ in query_vectors]
+        
+        if self._ann_index is not None:
+            labels, distances = self._ann_index.knn_query(query_vectors, k=k)
+            return [
+                [(int(idx), float(1.0 - dist)) for idx, dist in zip(row_labels, row_distances)]
+                for row_labels, row_distances in zip(labels, distances)
+            ]
+        
+        similarities = query_vectors @ np.asarray(self.embeddings).T
+        if k < similarities.shape[1]:
+            top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        else:
+            top = np.broadcast_to(np.arange(similarities.shape[1]), similarities.shape)
+        results = []
+        for row, candidates in zip(similarities, top):
+            ordered = candidates[np.argsort(-row[candidates], kind="stable")]
+            results.append([(int(idx), float(row[idx])) for idx in ordered])
+        return results
 
     def get_relevant_rules(
         self, 
@@ -252,7 +390,7 @@ class ClearcastKnowledgeBase:
         """
         Retrieve relevant chunks using semantic similarity.
         """
-        if not self.model or self.embeddings is None or not self.chunks:
+        if self.embeddings is None or not self.chunks:
             return self._keyword_search(keywords, limit)
         
         try:
@@ -266,25 +404,16 @@ class ClearcastKnowledgeBase:
             if keywords and query_text:
                 query = f"{query_text}. Keywords: {', '.join(keywords)}"
             
-            # Encode query
-            query_embedding = self.model.encode([query])[0]
-            
-            # Calculate cosine similarity with all chunks
-            similarities = np.dot(self.embeddings, query_embedding) / (
-                np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding) + 1e-8
-            )
-            
-            # Get top chunks by similarity
-            top_indices = np.argsort(similarities)[::-1]
+            # Only as many chunks as could fit within the limit can be returned
+            top_chunks = self._top_k(self._encode_queries([query]), limit // _MIN_ENTRY_CHARS + 1)[0]
             
             # Collect chunks until limit
             result_text = "RELEVANT CLEARCAST GUIDANCE (Semantic Search):\n\n"
             current_len = 0
             seen_pages = set()
             
-            for idx in top_indices:
+            for idx, similarity in top_chunks:
                 chunk = self.chunks[idx]
-                similarity = similarities[idx]
                 
                 # Skip low-similarity chunks
                 if similarity < 0.2:
@@ -369,45 +498,58 @@ class ClearcastKnowledgeBase:
         Returns:
             List of dicts with text, page, and similarity score
         """
-        results = []
+        return self.search_many([query], top_k=top_k, min_similarity=min_similarity)[0]
+    
+    def search_many(
+        self,
+        queries: Sequence[str],
+        top_k: int = 5,
+        min_similarity: float = 0.25
+    ) -> List[List[Dict]]:
+        """
+        Batched search(): one result list per query, in order.
+        
+        All queries not already in the query cache are encoded in one model
+        call and scored with one matrix product.
+        """
+        results: List[List[Dict]] = [[] for _ in queries]
         
-        if self.use_semantic and self.embeddings is not None and self.model:
+        if self.use_semantic and self.embeddings is not None and queries:
             try:
-                query_embedding = self.model.encode([query])[0]
-                similarities = np.dot(self.embeddings, query_embedding) / (
-                    np.linalg.norm(self.embeddings, axis=1) * np.linalg.norm(query_embedding) + 1e-8
-                )
-                
-                top_indices = np.argsort(similarities)[::-1][:top_k]
-                
-                for idx in top_indices:
-                    sim = similarities[idx]
-                    if sim < min_similarity:
-                        continue
-                    chunk = self.chunks[idx]
-                    results.append({
-                        "text": chunk["text"],
-                        "page": chunk["page"],
-                        "similarity": float(sim)
-                    })
-                    
+                top_chunks = self._top_k(self._encode_queries(list(queries)), top_k)
+                for query_results, matches in zip(results, top_chunks):
+                    for idx, sim in matches:
+                        if sim < min_similarity:
+                            continue
+                        chunk = self.chunks[idx]
+                        query_results.append({
+                            "text": chunk["text"],
+                            "page": chunk["page"],
+                            "similarity": sim
+                        })
+                        
             except Exception as e:
                 logger.warning(f"Semantic search failed: {e}")
         
         # Fall back to keyword if no results
-        if not results:
-            keywords = query.lower().split()
-            for chunk in self.chunks[:top_k * 3]:  # Check more chunks
-                score = sum(1 for kw in keywords if kw in chunk["text"].lower())
-                if score > 0:
-                    results.append({
-                        "text": chunk["text"],
-                        "page": chunk["page"],
-                        "similarity": score / len(keywords) if keywords else 0
-                    })
-            results = sorted(results, key=lambda x: x["similarity"], reverse=True)[:top_k]
+        for i, query in enumerate(queries):
+            if not results[i]:
+                results[i] = self._keyword_chunk_search(query, top_k)
         
         return results
+    
+    def _keyword_chunk_search(self, query: str, top_k: int) -> List[Dict]:
+        results = []
+        keywords = query.lower().split()
+        for chunk in self.chunks[:top_k * 3]:  # Check more chunks
+            score = sum(1 for kw in keywords if kw in chunk["text"].lower())
+            if score > 0:
+                results.append({
+                    "text": chunk["text"],
+                    "page": chunk["page"],
+                    "similarity": score / len(keywords) if keywords else 0
+                })
+        return sorted(results, key=lambda x: x["similarity"], reverse=True)[:top_k]
 
 # Singleton instance
 _kb_instance = None
@@ -9,8 +9,6 @@ from typing import Any, Dict, List, Optional
 import threading
 import time
 
-import google.generativeai as genai
-
 from .clearcast_rules import ClearcastRulesSnapshot
 
 logger = logging.getLogger(__name__)
@@ -78,9 +76,9 @@ class ClearcastUpdater:
     def __init__(self, api_key: str, updates_path: Optional[Path] = None):
         """Initialize the updater"""
         self.api_key = api_key
-        genai.configure(api_key=api_key)
         # Initialize Gemini model using utility function with automatic fallback
-        from app.core.gemini_utils import create_gemini_model
+        from app.core.gemini_utils import configure_gemini, create_gemini_model
+        configure_gemini(api_key)
         self.model = create_gemini_model('flash', api_key, fallback_to_pro=True)
         
         if not self.model:
@@ -33,6 +33,18 @@ class SafetyChecks:
             self._verifier = TechnicalVerifier()
         return self._verifier
 
+    def _run_check(self, check: str, video_path: str, **options) -> Dict[str, Any]:
+        """Run a frame-based TechnicalVerifier check, in a worker process when a pool is configured."""
+        from .....core.process_pool import get_default_backend
+
+        backend = get_default_backend()
+        if backend is None:
+            return getattr(self.verifier, check)(video_path, **options)
+        from .....core.cpu_tasks import technical_qc_task
+
+        job_context = {"payload": {"video_path": video_path, "check": check, "options": options}}
+        return backend.submit(technical_qc_task, job_context).result()
+
     def run_all(
         self,
         video_path: str,
@@ -71,7 +83,8 @@ class SafetyChecks:
         margin_title = config.custom_params.get("margin_title", 0.9)
 
         try:
-            result = self.verifier.check_safe_areas(
+            result = self._run_check(
+                "check_safe_areas",
                 video_path,
                 margin_title=margin_title,
                 num_analysis_frames=num_analysis_frames
@@ -145,7 +158,8 @@ class SafetyChecks:
         flash_threshold = config.custom_params.get("flash_threshold", 3)
 
         try:
-            result = self.verifier.check_pse_risk(
+            result = self._run_check(
+                "check_pse_risk",
                 video_path,
                 num_analysis_frames=num_analysis_frames
             )
@@ -7,7 +7,9 @@ Orchestrates all validation checks with configurable modes.
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .config import (
     ValidationMode,
@@ -29,6 +31,10 @@ from .checks import (
 
 logger = logging.getLogger(__name__)
 
+# Check categories are mostly ffprobe/ffmpeg subprocesses and OpenCV passes
+# that release the GIL, so a small thread pool runs them side by side.
+DEFAULT_MAX_WORKERS = 5
+
 
 # Keywords that indicate subjective/advisory issues (for auto-downgrade)
 SUBJECTIVE_KEYWORDS = [
@@ -69,7 +75,8 @@ class SharedValidationEngine:
     def __init__(
         self,
         mode: ValidationMode = ValidationMode.WEB_COMPLIANCE,
-        config_overrides: Optional[Dict[str, CheckConfig]] = None
+        config_overrides: Optional[Dict[str, CheckConfig]] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
     ):
         """
         Initialize the validation engine.
@@ -77,8 +84,10 @@ class SharedValidationEngine:
         Args:
             mode: Validation mode (WEB_COMPLIANCE or PURE_CLEARCAST)
             config_overrides: Optional check config overrides
+            max_workers: Check categories run concurrently (1 = sequential)
         """
         self.mode = mode
+        self.max_workers = max(1, int(max_workers))
         self.config = get_preset(mode)
 
         # Apply overrides
@@ -105,6 +114,10 @@ class SharedValidationEngine:
         """
         Run all enabled checks against the video.
 
+        Check categories run concurrently; flags are still reported in
+        category order (format, video, audio, metadata, safety, legal) and
+        per-category wall times are recorded in result.metadata["check_timings"].
+
         Args:
             video_path: Path to the video file
             delivery_metadata: Metadata including clock_number, etc.
@@ -117,53 +130,55 @@ class SharedValidationEngine:
         result = ValidationResult(mode=self.mode.value)
         delivery_metadata = delivery_metadata or {}
 
-        # Determine if this is a slated master
         clock_number = delivery_metadata.get("clock_number")
-        is_slated_master = False
-        if clock_number:
-            is_slated_master = self.metadata_checks.is_slated_master(video_path, clock_number)
-            result.metadata["is_slated_master"] = is_slated_master
-
-        # Run check categories
-        try:
-            self._run_format_checks(video_path, result)
-        except Exception as e:
-            logger.error(f"Format checks failed: {e}")
-            result.errors.append(f"Format checks failed: {str(e)}")
-
-        try:
-            video_metadata = self._run_video_checks(video_path, result)
-        except Exception as e:
-            logger.error(f"Video checks failed: {e}")
-            result.errors.append(f"Video checks failed: {str(e)}")
-            video_metadata = {}
-
-        try:
-            self._run_audio_checks(video_path, is_slated_master, result)
-        except Exception as e:
-            logger.error(f"Audio checks failed: {e}")
-            result.errors.append(f"Audio checks failed: {str(e)}")
-
-        try:
-            self._run_metadata_checks(video_path, delivery_metadata, result)
-        except Exception as e:
-            logger.error(f"Metadata checks failed: {e}")
-            result.errors.append(f"Metadata checks failed: {str(e)}")
-
-        try:
-            self._run_safety_checks(video_path, num_analysis_frames, result)
-        except Exception as e:
-            logger.error(f"Safety checks failed: {e}")
-            result.errors.append(f"Safety checks failed: {str(e)}")
+        slate_state: Dict[str, bool] = {}
+
+        def run_audio() -> List[CheckResult]:
+            # Slate detection only feeds the audio checks, so it runs in their task
+            is_slated_master = False
+            if clock_number:
+                is_slated_master = self.metadata_checks.is_slated_master(video_path, clock_number)
+                slate_state["is_slated_master"] = is_slated_master
+            return self._run_audio_checks(video_path, is_slated_master)
+
+        # Independent check categories, in the order their flags are reported
+        categories: List[Tuple[str, Callable[[], Any]]] = [
+            ("format", lambda: self._run_format_checks(video_path)),
+            ("video", lambda: self._run_video_checks(video_path)),
+            ("audio", run_audio),
+            ("metadata", lambda: self._run_metadata_checks(video_path, delivery_metadata)),
+            ("safety", lambda: self._run_safety_checks(video_path, num_analysis_frames)),
+        ]
+        outcomes, timings = self._run_categories(categories)
+
+        if "is_slated_master" in slate_state:
+            result.metadata["is_slated_master"] = slate_state["is_slated_master"]
+
+        video_metadata: Dict[str, Any] = {}
+        for name, _ in categories:
+            value, error = outcomes[name]
+            if error is not None:
+                logger.error(f"{name.capitalize()} checks failed: {error}")
+                result.errors.append(f"{name.capitalize()} checks failed: {str(error)}")
+                continue
+            if name == "video":
+                value, video_metadata = value
+            for check_result in value:
+                result.add_check_result(check_result)
 
         # Legal checks require pre-extracted legal text data
         if legal_text_data:
+            started = time.perf_counter()
             try:
                 video_height = video_metadata.get("height", 1080)
-                self._run_legal_checks(legal_text_data, video_height, result)
+                for check_result in self._run_legal_checks(legal_text_data, video_height):
+                    result.add_check_result(check_result)
             except Exception as e:
                 logger.error(f"Legal checks failed: {e}")
                 result.errors.append(f"Legal checks failed: {str(e)}")
+            timings["legal"] = round(time.perf_counter() - started, 4)
+
+        result.metadata["check_timings"] = timings
 
         # Apply auto-downgrade if allowed
         if self.config.allow_auto_downgrade:
@@ -174,94 +189,110 @@ class SharedValidationEngine:
 
         return result
 
-    def _run_format_checks(
+    def _run_categories(
         self,
-        video_path: str,
-        result: ValidationResult
-    ) -> None:
+        categories: List[Tuple[str, Callable[[], Any]]]
+    ) -> Tuple[Dict[str, Tuple[Any, Optional[Exception]]], Dict[str, float]]:
+        """
+        Run check categories on a bounded thread pool.
+
+        Returns:
+            (outcomes, timings): category name to (return value, exception or
+            None), and category name to wall time in seconds plus "total"
+        """
+        timings: Dict[str, float] = {}
+
+        def timed(name: str, func: Callable[[], Any]) -> Tuple[Any, Optional[Exception]]:
+            started = time.perf_counter()
+            try:
+                return func(), None
+            except Exception as e:
+                return None, e
+            finally:
+                timings[name] = round(time.perf_counter() - started, 4)
+
+        started = time.perf_counter()
+        workers = min(self.max_workers, len(categories))
+        if workers <= 1:
+            outcomes = {name: timed(name, func) for name, func in categories}
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="clearcast-check") as pool:
+                futures = {name: pool.submit(timed, name, func) for name, func in categories}
+                outcomes = {name: future.result() for name, future in futures.items()}
+
+        # Keep category order stable regardless of completion order
+        ordered = {name: timings[name] for name, _ in categories}
+        ordered["total"] = round(time.perf_counter() - started, 4)
+        return outcomes, ordered
+
+    def _run_format_checks(self, video_path: str) -> List[CheckResult]:
         """Run container format checks."""
-        check_results = self.format_checks.run_all(
+        return self.format_checks.run_all(
             video_path,
             self.config.checks
         )
-        for check_result in check_results:
-            result.add_check_result(check_result)
 
-    def _run_video_checks(
-        self,
-        video_path: str,
-        result: ValidationResult
-    ) -> Dict[str, Any]:
-        """Run video format checks and return metadata."""
+    def _run_video_checks(self, video_path: str) -> Tuple[List[CheckResult], Dict[str, Any]]:
+        """Run video format checks and return them with the video metadata."""
         check_results = self.video_checks.run_all(
             video_path,
             self.config.checks
         )
-        for check_result in check_results:
-            result.add_check_result(check_result)
-
-        # Get metadata for other checks
-        return self.video_checks.get_metadata(video_path)
+        # Get metadata for other checks; the check results stand on their own
+        try:
+            metadata = self.video_checks.get_metadata(video_path)
+        except Exception as e:
+            logger.error(f"Failed to get video metadata: {e}")
+            metadata = {}
+        return check_results, metadata
 
     def _run_audio_checks(
         self,
         video_path: str,
-        is_slated_master: bool,
-        result: ValidationResult
-    ) -> None:
+        is_slated_master: bool
+    ) -> List[CheckResult]:
         """Run audio checks."""
-        check_results = self.audio_checks.run_all(
+        return self.audio_checks.run_all(
             video_path,
             self.config.checks,
             is_slated_master=is_slated_master
         )
-        for check_result in check_results:
-            result.add_check_result(check_result)
 
     def _run_metadata_checks(
         self,
         video_path: str,
-        delivery_metadata: Dict[str, Any],
-        result: ValidationResult
-    ) -> None:
+        delivery_metadata: Dict[str, Any]
+    ) -> List[CheckResult]:
         """Run metadata checks."""
-        check_results = self.metadata_checks.run_all(
+        return self.metadata_checks.run_all(
             video_path,
             self.config.checks,
             delivery_metadata
         )
-        for check_result in check_results:
-            result.add_check_result(check_result)
 
     def _run_safety_checks(
         self,
         video_path: str,
-        num_analysis_frames: int,
-        result: ValidationResult
-    ) -> None:
+        num_analysis_frames: int
+    ) -> List[CheckResult]:
         """Run safety checks (safe areas, PSE)."""
-        check_results = self.safety_checks.run_all(
+        return self.safety_checks.run_all(
             video_path,
             self.config.checks,
             num_analysis_frames=num_analysis_frames
         )
-        for check_result in check_results:
-            result.add_check_result(check_result)
 
     def _run_legal_checks(
         self,
         legal_text_data: List[Dict[str, Any]],
-        video_height: int,
-        result: ValidationResult
-    ) -> None:
+        video_height: int
+    ) -> List[CheckResult]:
         """Run legal text checks."""
-        check_results = self.legal_checks.run_all(
+        return self.legal_checks.run_all(
             legal_text_data,
             self.config.checks,
             video_height=video_height
         )
-        for check_result in check_results:
-            result.add_check_result(check_result)
 
     def _apply_subjective_downgrade(self, result: ValidationResult) -> None:
         """
@@ -0,0 +1,96 @@
+"""
+Frame Asset Cache
+
+Reports embed the same base64 frames several times (the frames grid, cited
+frames next to findings, the header thumbnail) and at a fraction of their
+captured resolution. Handing reportlab the raw bytes each time means every
+placement re-opens the image, decodes it to RGB to fingerprint it, and embeds
+the full-size original.
+
+FrameAssetCache decodes each frame once, downsamples it to the pixels its
+placement needs at the target DPI, and re-encodes it as JPEG (which reportlab
+embeds as-is, without a second compression pass). The resulting ImageReader is
+shared by every flowable that shows that frame at that size, so the RGB decode
+and fingerprint happen once per variant and the PDF carries a single copy.
+"""
+
+import base64
+import logging
+import math
+from io import BytesIO
+from typing import Dict, Tuple
+
+from PIL import Image as PILImage
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DPI = 150
+DEFAULT_JPEG_QUALITY = 85
+
+
+class _SharedImage(Image):
+    """Image flowable backed by an already-open ImageReader."""
+
+    def __init__(self, reader: ImageReader, width: float, height: float):
+        # Image resolves `_img` lazily from the file; supplying it up front skips the re-open
+        self._img = reader
+        super().__init__(reader.fp, width=width, height=height)
+
+
+class FrameAssetCache:
+    """Decoded, placement-sized frame images for one report render."""
+
+    def __init__(self, dpi: int = DEFAULT_DPI, jpeg_quality: int = DEFAULT_JPEG_QUALITY):
+        self.dpi = dpi
+        self.jpeg_quality = jpeg_quality
+        self._decoded: Dict[str, PILImage.Image] = {}
+        self._readers: Dict[Tuple[str, int, int], ImageReader] = {}
+        self.decode_count = 0
+
+    def image(self, data_base64: str, width: float, height: float) -> Image:
+        """
+        Image flowable for a base64 frame drawn at width x height points.
+
+        Raises:
+            Exception: If the data is not a decodable image
+        """
+        target = (self._pixels(width), self._pixels(height))
+        key = (data_base64, *target)
+        reader = self._readers.get(key)
+        if reader is None:
+            reader = ImageReader(BytesIO(self._encode(data_base64, target)))
+            self._readers[key] = reader
+        return _SharedImage(reader, width, height)
+
+    def _pixels(self, points: float) -> int:
+        return max(1, math.ceil(points / 72.0 * self.dpi))
+
+    def _source(self, data_base64: str) -> PILImage.Image:
+        source = self._decoded.get(data_base64)
+        if source is None:
+            source = PILImage.open(BytesIO(base64.b64decode(data_base64)))
+            source.load()
+            self._decoded[data_base64] = source
+            self.decode_count += 1
+        return source
+
+    def _encode(self, data_base64: str, target: Tuple[int, int]) -> bytes:
+        source = self._source(data_base64)
+        width = min(target[0], source.width)
+        height = min(target[1], source.height)
+        if (width, height) == source.size and source.format == "JPEG":
+            # Already small enough; the original stream embeds without re-encoding
+            return base64.b64decode(data_base64)
+
+        image = source if source.mode == "RGB" else source.convert("RGB")
+        if (width, height) != source.size:
+            image = image.resize((width, height), PILImage.LANCZOS)
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=self.jpeg_quality, optimize=True)
+        logger.debug(f"Frame asset {source.size} -> {image.size} ({buffer.tell()} bytes)")
+        return buffer.getvalue()
+
+
+__all__ = ["FrameAssetCache", "DEFAULT_DPI", "DEFAULT_JPEG_QUALITY"]
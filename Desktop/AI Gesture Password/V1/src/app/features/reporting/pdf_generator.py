@@ -13,14 +13,13 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak,
 from reportlab.platypus.flowables import HRFlowable, KeepTogether
 from reportlab.lib.enums import TA_LEFT
 from reportlab.pdfgen import canvas
-from io import BytesIO
-import base64
 from xml.sax.saxutils import escape as xml_escape
 from app.features.ai_breakdown.effectiveness_benchmarks import (
     get_tier, get_tier_color, get_tier_definition, format_score_with_tier,
     get_all_tiers, TIER_DEFINITIONS
 )
 from app.core.video_storage import VideoAnalysisStorage
+from app.features.reporting.frame_assets import FrameAssetCache
 
 logger = logging.getLogger(__name__)
 
@@ -142,7 +141,7 @@ class PDFGenerator:
     CARD_SPACER = 0.10 * inch
     SMALL_SPACER = 0.06 * inch
     
-    def __init__(self):
+    def __init__(self, settings: Optional[Dict] = None):
         # Page geometry
         self.page_width, self.page_height = self.PAGE_SIZE
         self.content_width = self.page_width - self.MARGIN_LEFT - self.MARGIN_RIGHT
@@ -150,10 +149,12 @@ class PDFGenerator:
         # Base stylesheet and custom styles
         self.styles = getSampleStyleSheet()
         
-        # Load settings
+        # Load settings (callers that already hold them skip opening the store)
         try:
-            storage = VideoAnalysisStorage(str(Path(__file__).parent.parent.parent.parent / "video_analyses"))
-            self.settings = storage.get_settings()
+            if settings is None:
+                storage = VideoAnalysisStorage(str(Path(__file__).parent.parent.parent.parent / "video_analyses"))
+                settings = storage.get_settings()
+            self.settings = settings
             self.corporation_name = self.settings.get("corporation_name", "AdForege")
             self.accent_color = self.settings.get("accent_color", "#3B82F6")
         except Exception as e:
@@ -167,6 +168,9 @@ class PDFGenerator:
         except Exception:
             PDF_COLORS['accent'] = HexColor('#3B82F6')
 
+        # Frames are decoded once and downsampled per placement size
+        self.frame_assets = FrameAssetCache()
+
         self._setup_custom_styles()
     
     def _setup_custom_styles(self):
@@ -557,9 +561,7 @@ class PDFGenerator:
         """Add video thumbnail to PDF if available"""
         if thumbnail_base64:
             try:
-                # Decode base64 image
-                image_data = base64.b64decode(thumbnail_base64)
-                img = Image(BytesIO(image_data), width=width, height=width * 9/16)  # 16:9 aspect
+                img = self.frame_assets.image(thumbnail_base64, width, width * 9/16)  # 16:9 aspect
                 story.append(img)
                 story.append(Spacer(1, 0.2*inch))
             except Exception as e:
@@ -763,9 +765,8 @@ class ClearcastPDFGenerator(PDFGenerator):
 
                 if thumbnail_base64:
                     try:
-                        image_data = base64.b64decode(thumbnail_base64)
                         thumb_width = min(right_width, 2.2 * inch)
-                        img = Image(BytesIO(image_data), width=thumb_width, height=thumb_width * 9 / 16)
+                        img = self.frame_assets.image(thumbnail_base64, thumb_width, thumb_width * 9 / 16)
                     except Exception as e:
                         logger.warning(f"Failed to add thumbnail to PDF: {e}")
                         img = None
@@ -1312,10 +1313,9 @@ class AIBreakdownPDFGenerator(PDFGenerator):
                     try:
                         frame_idx = int(match.group(1)) - 1  # 1-based to 0-based
                         if 0 <= frame_idx < len(frames):
-                            frame_data = base64.b64decode(frames[frame_idx])
                             # Create image with reasonable width (e.g. 2.5 inches)
                             img_width = 2.5 * inch
-                            img = Image(BytesIO(frame_data), width=img_width, height=img_width * 9/16)
+                            img = self.frame_assets.image(frames[frame_idx], img_width, img_width * 9/16)
                             return img
                     except Exception as e:
                         logger.warning(f"Failed to load cited frame image: {e}")
@@ -1368,9 +1368,8 @@ class AIBreakdownPDFGenerator(PDFGenerator):
 
                 if thumbnail_base64:
                     try:
-                        image_data = base64.b64decode(thumbnail_base64)
                         thumb_width = min(right_width, 2.2 * inch)
-                        img = Image(BytesIO(image_data), width=thumb_width, height=thumb_width * 9 / 16)
+                        img = self.frame_assets.image(thumbnail_base64, thumb_width, thumb_width * 9 / 16)
                     except Exception as e:
                         logger.warning(f"Failed to add thumbnail to PDF: {e}")
                         img = None
@@ -2010,10 +2009,9 @@ class AIBreakdownPDFGenerator(PDFGenerator):
                 
                 for i, frame_base64 in enumerate(frames):
                     try:
-                        img_data = base64.b64decode(frame_base64)
                         # Target width: ~3 inches
                         target_width = 3 * inch
-                        img = Image(BytesIO(img_data), width=target_width, height=target_width * 9/16)
+                        img = self.frame_assets.image(frame_base64, target_width, target_width * 9/16)
                         
                         # Caption
                         caption = Paragraph(f"Frame {i+1}", self.styles['SmallText'])
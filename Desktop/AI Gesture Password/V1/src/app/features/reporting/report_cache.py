@@ -0,0 +1,157 @@
+"""
+Rendered Report Cache
+
+PDF reports are rendered off the event loop (in the process pool when one is
+configured, otherwise on a worker thread) and cached under the storage's
+reports/ directory. A render is keyed by a hash of everything that shows up
+in the PDF: the breakdown or Clearcast result, video name and duration,
+thumbnail, and the branding settings (corporation name, accent colour).
+Repeat downloads are served straight from disk; new results get a new key,
+and VideoAnalysisStorage also deletes stale renders when it saves them.
+
+Concurrent requests for the same report share one render.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+# Bump when the PDF layout changes so existing renders are not reused
+RENDERER_VERSION = 2
+
+# kind -> (analysis field holding the results, generator class name)
+REPORT_KINDS = {
+    "breakdown": ("ai_breakdown", "AIBreakdownPDFGenerator"),
+    "clearcast": ("clearcast_check", "ClearcastPDFGenerator"),
+}
+
+BRANDING_KEYS = ("corporation_name", "accent_color")
+
+
+class ReportRenderError(RuntimeError):
+    """The PDF generator reported failure."""
+
+
+def report_inputs(kind: str, analysis: Dict, settings: Dict) -> Dict[str, Any]:
+    """Everything a `kind` report is rendered from."""
+    field_name, _ = REPORT_KINDS[kind]
+    return {
+        "results": analysis.get(field_name),
+        "video_name": analysis.get("video_name", ""),
+        "video_duration": analysis.get("video_duration", 0.0),
+        "thumbnail_base64": analysis.get("thumbnail"),
+        "settings": {key: settings[key] for key in BRANDING_KEYS if key in settings},
+    }
+
+
+def content_key(kind: str, inputs: Dict[str, Any]) -> str:
+    """Stable hash of a report's inputs (short enough for a file name)."""
+    payload = json.dumps(
+        {"kind": kind, "version": RENDERER_VERSION, **inputs},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+def render_report(kind: str, inputs: Dict[str, Any], output_path: str) -> str:
+    """
+    Render a report synchronously.
+
+    Writes to a temporary name and renames it into place, so readers never
+    see a half-written PDF.
+
+    Returns:
+        output_path
+    """
+    from app.features.reporting import pdf_generator
+
+    _, generator_name = REPORT_KINDS[kind]
+    generator = getattr(pdf_generator, generator_name)(settings=inputs["settings"])
+    partial_path = f"{output_path}.{uuid.uuid4().hex}.part"
+    try:
+        success = generator.generate_pdf(
+            results=inputs["results"],
+            video_name=inputs["video_name"],
+            video_duration=inputs["video_duration"],
+            thumbnail_base64=inputs["thumbnail_base64"],
+            output_path=partial_path,
+        )
+        if not success or not os.path.exists(partial_path):
+            raise ReportRenderError(f"Failed to generate {kind} PDF")
+        os.replace(partial_path, output_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+    return output_path
+
+
+class ReportCache:
+    """Serves cached report PDFs, rendering misses without blocking the event loop."""
+
+    def __init__(self, process_backend=None):
+        self.process_backend = process_backend
+        self._inflight: Dict[Path, asyncio.Future] = {}
+
+    async def get_or_render(self, storage, kind: str, analysis_id: str, analysis: Dict) -> Path:
+        """
+        Path of the up-to-date `kind` report for an analysis, rendering it if needed.
+
+        Raises:
+            ReportRenderError: If rendering failed
+        """
+        inputs = report_inputs(kind, analysis, storage.get_settings())
+        key = await asyncio.to_thread(content_key, kind, inputs)
+        path = storage.report_path(kind, analysis_id, key)
+        if path.exists():
+            logger.debug(f"Serving cached {kind} report for {analysis_id}")
+            return path
+
+        pending = self._inflight.get(path)
+        if pending is None:
+            pending = asyncio.ensure_future(self._render(kind, analysis_id, inputs, path))
+            self._inflight[path] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(path, None))
+        # shield: one client disconnecting must not cancel a render others are waiting on
+        return await asyncio.shield(pending)
+
+    async def _render(self, kind: str, analysis_id: str, inputs: Dict[str, Any], path: Path) -> Path:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        if self.process_backend is not None:
+            from app.core.cpu_tasks import render_report_task
+
+            await self.process_backend.run(
+                render_report_task,
+                {"analysis_id": analysis_id, "payload": {"kind": kind, "inputs": inputs, "output_path": str(path)}},
+            )
+        else:
+            await asyncio.to_thread(render_report, kind, inputs, str(path))
+
+        # Older renders of this report (previous results or branding) are dead weight now
+        for stale in path.parent.glob(f"{kind}_{analysis_id}_*.pdf"):
+            if stale != path:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+        logger.info(f"Rendered {kind} report for {analysis_id} in {loop.time() - started:.2f}s")
+        return path
+
+
+__all__ = [
+    "ReportCache",
+    "ReportRenderError",
+    "REPORT_KINDS",
+    "content_key",
+    "render_report",
+    "report_inputs",
+]
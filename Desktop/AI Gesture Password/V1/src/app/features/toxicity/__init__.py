@@ -7,13 +7,23 @@ Evaluates ads across three pillars:
 3. Regulatory Risk (20%) - Compliance violations
 """
 
-from .dark_patterns import detect_dark_patterns, DarkPatternMatch
+from .dark_patterns import (
+    detect_dark_patterns,
+    detect_dark_patterns_batch,
+    DarkPatternMatch,
+    DarkPatternMatcher,
+)
 from .toxicity_scorer import ToxicityScorer, ToxicityReport
+from .batch import RescoreSummary, rescore_stored_analyses
 
 __all__ = [
     "detect_dark_patterns",
-    "DarkPatternMatch", 
+    "detect_dark_patterns_batch",
+    "DarkPatternMatch",
+    "DarkPatternMatcher",
     "ToxicityScorer",
     "ToxicityReport",
+    "RescoreSummary",
+    "rescore_stored_analyses",
 ]
 
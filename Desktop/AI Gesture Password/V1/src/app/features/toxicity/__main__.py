@@ -0,0 +1,9 @@
+"""
+Re-score the toxicity reports of stored analyses, e.g. after ToxicityThresholds change:
+
+    python -m app.features.toxicity --storage-dir video_analyses --backend process
+"""
+
+from .batch import main
+
+raise SystemExit(main())
@@ -0,0 +1,240 @@
+"""
+Batch re-scoring of stored analyses.
+
+The AI breakdown keeps the measured scorer features (visual/audio physics
+and duration) under ai_breakdown["toxicity_inputs"]. The rest of the scorer
+input (transcript, claims, GARM risk, disclaimers) is already part of the
+stored analysis, so a ToxicityReport can be recomputed without re-running
+physics or transcription, e.g. after ToxicityThresholds change:
+
+    python -m app.features.toxicity --backend process --workers 4
+
+Analyses are scored in chunks (ToxicityScorer.score_batch) and each chunk is
+written back as soon as it is scored, so an interrupted run keeps the work it
+finished. Older analyses without stored features are skipped and counted.
+"""
+
+import argparse
+import concurrent.futures
+import logging
+import os
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .toxicity_scorer import ToxicityScorer, ToxicityReport
+
+logger = logging.getLogger(__name__)
+
+TOXICITY_INPUTS_KEY = "toxicity_inputs"
+
+# Scorer inputs measured from the video; stored with the breakdown
+TOXICITY_FEATURE_KEYS = ("visual_physics", "audio_physics", "duration_seconds")
+
+RescoreProgress = Callable[[int, int], None]
+
+
+@dataclass
+class RescoreSummary:
+    """Outcome of a rescore_stored_analyses() run."""
+    scored: int = 0
+    skipped: int = 0  # No stored toxicity inputs
+    failed: int = 0  # Chunks that raised, counted per analysis
+
+    def to_dict(self):
+        return asdict(self)
+
+
+def build_toxicity_data(
+    breakdown: Dict[str, Any],
+    transcript: Optional[str],
+    features: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Scorer input (analysis_data) from a breakdown result, its transcript and the measured features."""
+    compliance = breakdown.get("compliance") or {}
+    data = {key: features[key] for key in TOXICITY_FEATURE_KEYS if key in features}
+    data.update({
+        "transcript": transcript or "",
+        "claims": breakdown.get("claims", []),
+        "garm_risk_level": compliance.get("overall_risk", "low"),
+        "required_disclaimers": compliance.get("required_disclaimers", []),
+        "present_disclaimers": (breakdown.get("content_indicators") or {}).get("disclaimers_found", []),
+    })
+    return data
+
+
+def stored_transcript(analysis: Dict[str, Any]) -> str:
+    """Transcript text of a stored analysis (the script the breakdown was given)."""
+    transcription = analysis.get("transcription")
+    if not isinstance(transcription, dict):
+        return ""
+    text = transcription.get("full_text")
+    if not text:
+        segments = transcription.get("segments") or []
+        text = " ".join(seg.get("text", "") for seg in segments if seg.get("text")).strip()
+    return text or ""
+
+
+def toxicity_inputs(analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Rebuild the analysis_data the stored report was computed from, if its features were kept."""
+    breakdown = analysis.get("ai_breakdown")
+    if not isinstance(breakdown, dict):
+        return None
+    features = breakdown.get(TOXICITY_INPUTS_KEY)
+    if not isinstance(features, dict):
+        return None
+    return build_toxicity_data(breakdown, stored_transcript(analysis), features)
+
+
+def score_analyses(
+    analyses: Iterable[Dict[str, Any]],
+    use_ai: bool = True,
+    batch_size: int = 256,
+) -> Iterator[Tuple[str, ToxicityReport]]:
+    """Yield (analysis_id, report) for every stored analysis that can be re-scored."""
+    scorer = ToxicityScorer(use_ai=use_ai)
+    ids: List[str] = []
+
+    def _inputs() -> Iterator[Dict[str, Any]]:
+        for analysis in analyses:
+            inputs = toxicity_inputs(analysis)
+            if inputs is not None:
+                ids.append(analysis["id"])
+                yield inputs
+
+    for index, report in enumerate(scorer.score_batch(_inputs(), batch_size=batch_size)):
+        yield ids[index], report
+
+
+def rescore_toxicity_chunk_task(job_context: Dict[str, Any], report_progress) -> List[Tuple[str, Dict[str, Any]]]:
+    """ProcessPoolBackend task: score one chunk of [analysis_id, inputs] pairs."""
+    items = job_context["items"]
+    scorer = ToxicityScorer(use_ai=job_context.get("use_ai", True))
+    reports = scorer.score_batch((inputs for _, inputs in items), batch_size=max(len(items), 1))
+    return [(analysis_id, report.to_dict()) for (analysis_id, _), report in zip(items, reports)]
+
+
+def _chunks(
+    analyses: Iterable[Dict[str, Any]],
+    chunk_size: int,
+    summary: RescoreSummary,
+) -> Iterator[List[Tuple[str, Dict[str, Any]]]]:
+    chunk: List[Tuple[str, Dict[str, Any]]] = []
+    for analysis in analyses:
+        inputs = toxicity_inputs(analysis)
+        if inputs is None:
+            summary.skipped += 1
+            continue
+        chunk.append((analysis["id"], inputs))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def rescore_stored_analyses(
+    storage,
+    *,
+    backend=None,
+    use_ai: bool = True,
+    chunk_size: int = 256,
+    max_in_flight: Optional[int] = None,
+    on_progress: Optional[RescoreProgress] = None,
+) -> RescoreSummary:
+    """
+    Recompute and save the toxicity report of every stored analysis.
+
+    Args:
+        storage: VideoAnalysisStorage to read analyses from and write reports to
+        backend: Optional ProcessPoolBackend; chunks are scored in-process without one
+        use_ai: Passed to ToxicityScorer
+        chunk_size: Analyses per scoring chunk (and per storage write)
+        max_in_flight: Chunks submitted to the backend ahead of write-back
+            (defaults to twice the worker count)
+        on_progress: Called with (analyses written so far, analyses skipped)
+
+    Returns:
+        RescoreSummary with scored/skipped/failed counts
+    """
+    summary = RescoreSummary()
+    analyses = storage.get_all_analyses()
+
+    def _write(results: List[Tuple[str, Dict[str, Any]]]) -> None:
+        summary.scored += storage.save_toxicity_reports(dict(results))
+        if on_progress:
+            on_progress(summary.scored, summary.skipped)
+
+    if backend is None:
+        for chunk in _chunks(analyses, chunk_size, summary):
+            _write(rescore_toxicity_chunk_task({"items": chunk, "use_ai": use_ai}, lambda *_: None))
+    else:
+        limit = max_in_flight or 2 * (backend.max_workers or os.cpu_count() or 1)
+        pending: Dict[concurrent.futures.Future, int] = {}
+
+        def _drain(return_when: str) -> None:
+            finished, _ = concurrent.futures.wait(pending, return_when=return_when)
+            for future in finished:
+                size = pending.pop(future)
+                try:
+                    _write(future.result())
+                except Exception as e:
+                    logger.error(f"Toxicity rescoring chunk failed: {e}")
+                    summary.failed += size
+
+        for chunk in _chunks(analyses, chunk_size, summary):
+            future = backend.submit(rescore_toxicity_chunk_task, {"items": chunk, "use_ai": use_ai})
+            pending[future] = len(chunk)
+            if len(pending) >= limit:
+                _drain(concurrent.futures.FIRST_COMPLETED)
+        while pending:
+            _drain(concurrent.futures.ALL_COMPLETED)
+
+    logger.info(
+        f"Toxicity rescoring finished: scored={summary.scored}, "
+        f"skipped={summary.skipped}, failed={summary.failed}"
+    )
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command-line entry point (python -m app.features.toxicity)."""
+    parser = argparse.ArgumentParser(description="Re-score the toxicity reports of stored analyses")
+    parser.add_argument("--storage-dir", default="video_analyses", help="VideoAnalysisStorage directory")
+    parser.add_argument("--backend", choices=["inline", "process"], default="inline",
+                        help="Score chunks in this process or on a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Analyses per chunk and storage write")
+    parser.add_argument("--no-ai", action="store_true", help="Score without the AI toxicity blend")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    from app.core.process_pool import ProcessPoolBackend
+    from app.core.video_storage import VideoAnalysisStorage
+
+    storage = VideoAnalysisStorage(args.storage_dir)
+    backend = ProcessPoolBackend(max_workers=args.workers) if args.backend == "process" else None
+    try:
+        summary = rescore_stored_analyses(
+            storage,
+            backend=backend,
+            use_ai=not args.no_ai,
+            chunk_size=args.chunk_size,
+            on_progress=lambda scored, skipped: logger.info(f"Re-scored {scored} analyses ({skipped} skipped)"),
+        )
+    finally:
+        if backend is not None:
+            backend.shutdown()
+    print(f"scored={summary.scored} skipped={summary.skipped} failed={summary.failed}")
+    return 1 if summary.failed else 0
+
+
+__all__ = [
+    "RescoreSummary",
+    "TOXICITY_FEATURE_KEYS",
+    "build_toxicity_data",
+    "rescore_stored_analyses",
+    "rescore_toxicity_chunk_task",
+    "score_analyses",
+    "stored_transcript",
+    "toxicity_inputs",
+]
@@ -6,12 +6,18 @@ Detects manipulative language patterns in ad transcripts using:
 2. Categories: False Scarcity, Shaming, Forced Continuity
 
 Each category adds points to the psychological manipulation score.
+
+Patterns are compiled once into a DarkPatternMatcher. Every pattern starts
+with a literal word ("only", "hurry", "don", ...), so one pass of a combined
+literal alternation finds the candidate positions and only the patterns whose
+literal occurs there are verified. Results are identical to running each
+pattern's finditer() over the transcript.
 """
 
 import re
 import logging
 from dataclasses import dataclass, field
-from typing import List, Set, Tuple, Dict, Optional
+from typing import Iterable, Iterator, List, Set, Tuple, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +31,7 @@ class DarkPatternMatch:
     confidence: float = 1.0
     source: str = "regex"  # "regex" or "ai"
     reasoning: Optional[str] = None
+    span: Optional[Tuple[int, int]] = None  # (start, end) in the transcript, regex matches only
 
 
 # Pattern categories and their regex patterns
@@ -109,10 +116,185 @@ POINTS_PER_CATEGORY = 10
 MAX_CATEGORY_POINTS = 30
 
 
+DarkPatternResult = Tuple[List[DarkPatternMatch], Set[str], int]
+
+# Characters that can appear in a pattern's leading literal
+_LITERAL_CHARS = set("abcdefghijklmnopqrstuvwxyz0123456789'-")
+
+
+def _literal_prefix(pattern: str) -> str:
+    """
+    The literal text every match of `pattern` starts with ("" if none).
+
+    Stops at the first regex metacharacter; a character followed by an
+    optional quantifier (?, *, {) is not required, so it is dropped.
+    Patterns with a top-level alternation have no common literal.
+    """
+    depth = 0
+    for i, char in enumerate(pattern):
+        if char == "\\" or (i and pattern[i - 1] == "\\"):
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "|" and depth == 0:
+            return ""
+
+    end = 0
+    while end < len(pattern) and pattern[end] in _LITERAL_CHARS:
+        end += 1
+    if end < len(pattern) and pattern[end] in "?*{":
+        end -= 1
+    return pattern[:max(end, 0)]
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Regex matching any of `words`, factored on common prefixes (faster than a flat alternation)."""
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class DarkPatternMatcher:
+    """
+    Precompiled dark-pattern rules.
+
+    Scans a transcript once for the leading literals of all patterns, then
+    verifies each pattern only where its literal occurs. Patterns without a
+    usable literal fall back to their own finditer().
+    """
+
+    def __init__(self, categories: Optional[Dict[str, List[Tuple[str, str]]]] = None):
+        categories = DARK_PATTERN_CATEGORIES if categories is None else categories
+        self.categories: List[str] = list(categories)
+        # (category, pattern name, compiled regex, literal), in rule order
+        self._rules: List[Tuple[str, str, "re.Pattern", str]] = []
+        self._by_literal: Dict[str, List[int]] = {}
+        self._unanchored: List[int] = []
+
+        for category, patterns in categories.items():
+            for pattern_regex, pattern_name in patterns:
+                try:
+                    compiled = re.compile(pattern_regex, re.IGNORECASE)
+                except re.error as e:
+                    logger.warning(f"Invalid regex pattern '{pattern_regex}': {e}")
+                    continue
+                literal = _literal_prefix(pattern_regex.lower())
+                index = len(self._rules)
+                self._rules.append((category, pattern_name, compiled, literal))
+                if literal:
+                    self._by_literal.setdefault(literal, []).append(index)
+                else:
+                    self._unanchored.append(index)
+
+        # Zero-width trigger: hits every position where at least one literal
+        # starts; which literals (e.g. both "auto" and "automatically") is
+        # then checked with startswith()
+        literals = list(self._by_literal)
+        self._trigger = re.compile(f"(?={_trie_pattern(literals)})") if literals else None
+        self._literals_by_initial: Dict[str, List[str]] = {}
+        for literal in literals:
+            self._literals_by_initial.setdefault(literal[0], []).append(literal)
+
+    def find_all(self, text: str) -> List[List[Tuple[int, int]]]:
+        """Spans of every match of every rule, per rule (rule order)."""
+        spans: List[List[Tuple[int, int]]] = [[] for _ in self._rules]
+        # Position each rule may match from next (finditer never overlaps)
+        resume_at = [0] * len(self._rules)
+
+        if self._trigger is not None:
+            for hit in self._trigger.finditer(text):
+                pos = hit.start()
+                for literal in self._literals_by_initial[text[pos]]:
+                    if not text.startswith(literal, pos):
+                        continue
+                    for index in self._by_literal[literal]:
+                        if pos < resume_at[index]:
+                            continue
+                        match = self._rules[index][2].match(text, pos)
+                        if match:
+                            spans[index].append(match.span())
+                            resume_at[index] = match.end()
+
+        for index in self._unanchored:
+            spans[index] = [m.span() for m in self._rules[index][2].finditer(text)]
+        return spans
+
+    def detect(self, transcript: str, include_all_matches: bool = False) -> DarkPatternResult:
+        """Match one transcript. Same contract as detect_dark_patterns()."""
+        if not transcript:
+            return [], set(), 0
+
+        # Normalize text for matching
+        text = transcript.lower()
+        spans = self.find_all(text)
+
+        by_category: Dict[str, List[DarkPatternMatch]] = {}
+        for (category, pattern_name, _, _), rule_spans in zip(self._rules, spans):
+            for start, end in rule_spans:
+                by_category.setdefault(category, []).append(DarkPatternMatch(
+                    category=category,
+                    pattern_name=pattern_name,
+                    matched_text=text[start:end].strip(),
+                    confidence=1.0,
+                    source="regex",
+                    span=(start, end),
+                ))
+
+        matches: List[DarkPatternMatch] = []
+        for category in self.categories:
+            category_matches = by_category.get(category)
+            if not category_matches:
+                continue
+            if include_all_matches:
+                matches.extend(category_matches)
+            else:
+                # Just include first match per category
+                matches.append(category_matches[0])
+
+        categories_found = set(by_category)
+        # Calculate score (capped at 3 categories)
+        score = min(len(categories_found) * POINTS_PER_CATEGORY, MAX_CATEGORY_POINTS)
+        return matches, categories_found, score
+
+    def detect_batch(
+        self,
+        transcripts: Iterable[str],
+        include_all_matches: bool = False
+    ) -> Iterator[DarkPatternResult]:
+        """Match many transcripts lazily, in input order."""
+        for transcript in transcripts:
+            yield self.detect(transcript, include_all_matches)
+
+
+_default_matcher: Optional[DarkPatternMatcher] = None
+
+
+def get_dark_pattern_matcher() -> DarkPatternMatcher:
+    """The shared matcher for DARK_PATTERN_CATEGORIES (compiled on first use)."""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = DarkPatternMatcher()
+    return _default_matcher
+
+
 def detect_dark_patterns(
     transcript: str,
     include_all_matches: bool = False
-) -> Tuple[List[DarkPatternMatch], Set[str], int]:
+) -> DarkPatternResult:
     """
     Detect dark patterns in a transcript using regex matching.
     
@@ -126,55 +308,35 @@ def detect_dark_patterns(
         - Set of unique categories detected
         - Score contribution (points)
     """
-    if not transcript:
-        return [], set(), 0
+    matches, categories_found, score = get_dark_pattern_matcher().detect(transcript, include_all_matches)
     
-    # Normalize text for matching
-    text = transcript.lower()
-    
-    matches: List[DarkPatternMatch] = []
-    categories_found: Set[str] = set()
-    
-    for category, patterns in DARK_PATTERN_CATEGORIES.items():
-        category_matches = []
-        
-        for pattern_regex, pattern_name in patterns:
-            try:
-                regex_matches = re.finditer(pattern_regex, text, re.IGNORECASE)
-                
-                for match in regex_matches:
-                    matched_text = match.group().strip()
-                    
-                    category_matches.append(DarkPatternMatch(
-                        category=category,
-                        pattern_name=pattern_name,
-                        matched_text=matched_text,
-                        confidence=1.0,
-                        source="regex",
-                    ))
-                    categories_found.add(category)
-                    
-            except re.error as e:
-                logger.warning(f"Invalid regex pattern '{pattern_regex}': {e}")
-        
-        if include_all_matches:
-            matches.extend(category_matches)
-        elif category_matches:
-            # Just include first match per category
-            matches.append(category_matches[0])
-    
-    # Calculate score (capped at 3 categories)
-    num_categories = len(categories_found)
-    score = min(num_categories * POINTS_PER_CATEGORY, MAX_CATEGORY_POINTS)
-    
-    logger.info(
-        f"Dark pattern detection: {len(matches)} matches, "
-        f"{num_categories} categories, score={score}"
-    )
+    if transcript:
+        logger.info(
+            f"Dark pattern detection: {len(matches)} matches, "
+            f"{len(categories_found)} categories, score={score}"
+        )
     
     return matches, categories_found, score
 
 
+def detect_dark_patterns_batch(
+    transcripts: Iterable[str],
+    include_all_matches: bool = False,
+    matcher: Optional[DarkPatternMatcher] = None
+) -> List[DarkPatternResult]:
+    """
+    Detect dark patterns in many transcripts with one shared matcher.
+
+    Returns one (matches, categories, score) tuple per transcript, in order.
+    Pass `matcher` to score against rules other than DARK_PATTERN_CATEGORIES.
+    """
+    matcher = matcher or get_dark_pattern_matcher()
+    results = list(matcher.detect_batch(transcripts, include_all_matches))
+    flagged = sum(1 for _, categories, _ in results if categories)
+    logger.info(f"Dark pattern batch detection: {flagged}/{len(results)} transcripts flagged")
+    return results
+
+
 def get_category_display_name(category: str) -> str:
     """Get human-readable display name for a category."""
     display_names = {
@@ -7,16 +7,27 @@ Calculates a 0-100 toxicity score across three pillars:
 3. Regulatory Risk (20% weight) - Compliance violations
 
 Formula: Toxicity Score = (Physiological × 0.40) + (Psychological × 0.40) + (Regulatory × 0.20)
+
+Weights, risk bands and per-metric thresholds and points come from
+app.core.thresholds.ToxicityThresholds.
+ToxicityScorer.score_batch() scores many analyses at once (see batch.py for
+re-scoring stored analyses).
 """
 
 import logging
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Any, Optional, Tuple
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.thresholds import ToxicityThresholds
 
 from .dark_patterns import (
     detect_dark_patterns,
     format_dark_pattern_flags,
+    get_dark_pattern_matcher,
     DarkPatternMatch,
+    DarkPatternResult,
 )
 
 logger = logging.getLogger(__name__)
@@ -27,41 +38,41 @@ logger = logging.getLogger(__name__)
 # =============================================================================
 
 # Weights (must sum to 1.0)
-WEIGHT_PHYSIOLOGICAL = 0.40
-WEIGHT_PSYCHOLOGICAL = 0.40
-WEIGHT_REGULATORY = 0.20
+WEIGHT_PHYSIOLOGICAL = ToxicityThresholds.PHYSIOLOGICAL_WEIGHT
+WEIGHT_PSYCHOLOGICAL = ToxicityThresholds.PSYCHOLOGICAL_WEIGHT
+WEIGHT_REGULATORY = ToxicityThresholds.REGULATORY_WEIGHT
 
 # AI blending weights
-HEURISTIC_WEIGHT = 0.40  # 40% heuristic-based scoring
-AI_WEIGHT = 0.60  # 60% AI-based scoring (when available)
+HEURISTIC_WEIGHT = ToxicityThresholds.HEURISTIC_WEIGHT  # heuristic-based scoring
+AI_WEIGHT = ToxicityThresholds.AI_WEIGHT  # AI-based scoring (when available)
 
 # Risk level thresholds
-RISK_LOW_MAX = 30
-RISK_MEDIUM_MAX = 60
+RISK_LOW_MAX = ToxicityThresholds.LOW_MAX
+RISK_MEDIUM_MAX = ToxicityThresholds.MEDIUM_MAX
 
 # Physiological thresholds and points
-CUTS_PER_MINUTE_THRESHOLD = 80
-LOUDNESS_LU_THRESHOLD = -10  # LUFS, anything louder (less negative) is extreme
-BRIGHTNESS_VARIANCE_THRESHOLD = 0.8
-MOTION_ENERGY_THRESHOLD = 0.9
+CUTS_PER_MINUTE_THRESHOLD = ToxicityThresholds.CUTS_PER_MINUTE
+LOUDNESS_LU_THRESHOLD = ToxicityThresholds.LOUDNESS_LU  # LUFS, anything louder (less negative) is extreme
+BRIGHTNESS_VARIANCE_THRESHOLD = ToxicityThresholds.BRIGHTNESS_VARIANCE
+MOTION_ENERGY_THRESHOLD = ToxicityThresholds.MOTION_ENERGY
 
-POINTS_HIGH_CUTS = 20
-POINTS_LOUD_AUDIO = 30
-POINTS_PHOTOSENSITIVITY = 50
-POINTS_BRIGHTNESS_VARIANCE = 25
-POINTS_MOTION_ENERGY = 10
+POINTS_HIGH_CUTS = ToxicityThresholds.POINTS_HIGH_CUTS
+POINTS_LOUD_AUDIO = ToxicityThresholds.POINTS_LOUD_AUDIO
+POINTS_PHOTOSENSITIVITY = ToxicityThresholds.POINTS_PHOTOSENSITIVITY
+POINTS_BRIGHTNESS_VARIANCE = ToxicityThresholds.POINTS_BRIGHTNESS_VARIANCE
+POINTS_MOTION_ENERGY = ToxicityThresholds.POINTS_MOTION_ENERGY
 
 # Psychological thresholds and points
-CLAIM_DENSITY_THRESHOLD = 6  # claims per minute
-POINTS_CLAIM_OVERLOAD = 20
-POINTS_AI_MANIPULATION = 15  # max from AI analysis
-POINTS_SUBTLE_PATTERN = 5  # per subtle pattern
+CLAIM_DENSITY_THRESHOLD = ToxicityThresholds.CLAIM_DENSITY  # claims per minute
+POINTS_CLAIM_OVERLOAD = ToxicityThresholds.POINTS_CLAIM_OVERLOAD
+POINTS_AI_MANIPULATION = ToxicityThresholds.POINTS_AI_MANIPULATION  # max from AI analysis
+POINTS_SUBTLE_PATTERN = ToxicityThresholds.POINTS_SUBTLE_PATTERN  # per subtle pattern
 
 # Regulatory thresholds and points
-POINTS_GARM_HIGH_RISK = 50
-POINTS_GARM_MEDIUM_RISK = 25
-POINTS_MISSING_DISCLAIMER = 50
-POINTS_CATEGORY_DISCLAIMER = 15
+POINTS_GARM_HIGH_RISK = ToxicityThresholds.POINTS_GARM_HIGH_RISK
+POINTS_GARM_MEDIUM_RISK = ToxicityThresholds.POINTS_GARM_MEDIUM_RISK
+POINTS_MISSING_DISCLAIMER = ToxicityThresholds.POINTS_MISSING_DISCLAIMER
+POINTS_CATEGORY_DISCLAIMER = ToxicityThresholds.POINTS_CATEGORY_DISCLAIMER
 
 # Regulated category keywords
 REGULATED_CATEGORIES = {
@@ -177,19 +188,84 @@ class ToxicityScorer:
         Returns:
             ToxicityReport with complete breakdown
         """
+        physio_score, physio_flags = self._score_physiological(
+            analysis_data.get("visual_physics", {}),
+            analysis_data.get("audio_physics", {}),
+        )
+        dark_patterns = detect_dark_patterns(
+            analysis_data.get("transcript", ""), include_all_matches=True
+        )
+        report = self._build_report(analysis_data, physio_score, physio_flags, dark_patterns, ai_toxicity)
+
+        logger.info(
+            f"Toxicity calculated: score={report.toxic_score}, risk={report.risk_level}, "
+            f"physio={report.breakdown['physiological']['score']}, "
+            f"psycho={report.breakdown['psychological']['score']}, "
+            f"regulatory={report.breakdown['regulatory']['score']}"
+        )
+
+        return report
+
+    def score_batch(
+        self,
+        analyses: Iterable[Dict[str, Any]],
+        batch_size: int = 256,
+    ) -> Iterator[ToxicityReport]:
+        """
+        Score many analyses, yielding one ToxicityReport per input in order.
+
+        Reports are identical to calculate_toxicity() without AI blending.
+        Inputs are consumed batch_size at a time: the physiological pillar is
+        computed with array operations over the whole batch and transcripts go
+        through the shared precompiled dark-pattern matcher.
+
+        Args:
+            analyses: Iterable of analysis_data dicts (see calculate_toxicity)
+            batch_size: Number of analyses scored per vectorized step
+        """
+        batch: List[Dict[str, Any]] = []
+        for analysis_data in analyses:
+            batch.append(analysis_data)
+            if len(batch) >= batch_size:
+                yield from self._score_chunk(batch)
+                batch = []
+        if batch:
+            yield from self._score_chunk(batch)
+
+    def _score_chunk(self, batch: List[Dict[str, Any]]) -> Iterator[ToxicityReport]:
+        physio = score_physiological_batch(
+            [a.get("visual_physics", {}) for a in batch],
+            [a.get("audio_physics", {}) for a in batch],
+        )
+        dark_patterns = get_dark_pattern_matcher().detect_batch(
+            (a.get("transcript", "") for a in batch), include_all_matches=True
+        )
+        for analysis_data, (physio_score, physio_flags), patterns in zip(batch, physio, dark_patterns):
+            yield self._build_report(analysis_data, physio_score, physio_flags, patterns)
+
+    def _build_report(
+        self,
+        analysis_data: Dict[str, Any],
+        physio_score: int,
+        physio_flags: List[str],
+        dark_patterns: DarkPatternResult,
+        ai_toxicity: Optional[Dict[str, Any]] = None,
+    ) -> ToxicityReport:
+        """Score the remaining pillars and assemble the report."""
         # Extract data with defaults
-        visual = analysis_data.get("visual_physics", {})
-        audio = analysis_data.get("audio_physics", {})
         transcript = analysis_data.get("transcript", "")
         claims = analysis_data.get("claims", [])
         duration = analysis_data.get("duration_seconds", 0.0)
         garm_level = analysis_data.get("garm_risk_level", "low")
         required_disclaimers = analysis_data.get("required_disclaimers", [])
         present_disclaimers = analysis_data.get("present_disclaimers", [])
+        all_matches, categories, pattern_score = dark_patterns
 
         # Calculate heuristic pillar scores
-        physio_score, physio_flags = self._score_physiological(visual, audio)
-        psycho_breakdown = self._score_psychological(transcript, claims, duration)
+        psycho_breakdown = self._score_psychological(
+            transcript, claims, duration,
+            dark_patterns=(_first_match_per_category(all_matches), categories, pattern_score),
+        )
         regulatory_score, regulatory_flags = self._score_regulatory(
             transcript, garm_level, required_disclaimers, present_disclaimers
         )
@@ -270,7 +346,7 @@ class ToxicityScorer:
                     "flags": regulatory_flags,
                 },
             },
-            dark_patterns_detected=self._extract_dark_pattern_texts(transcript),
+            dark_patterns_detected=list(set(m.matched_text for m in all_matches)),
             recommendation=recommendation,
             metadata={
                 "weights": {
@@ -283,12 +359,7 @@ class ToxicityScorer:
                 "ai_enabled": self.use_ai,
             },
         )
-        
-        logger.info(
-            f"Toxicity calculated: score={total_score}, risk={risk_level}, "
-            f"physio={physio_score}, psycho={psycho_breakdown.score}, regulatory={regulatory_score}"
-        )
-        
+
         return report
     
     def _score_physiological(
@@ -353,7 +424,8 @@ class ToxicityScorer:
         self,
         transcript: str,
         claims: List[Any],
-        duration_seconds: float
+        duration_seconds: float,
+        dark_patterns: Optional[DarkPatternResult] = None,
     ) -> PsychologicalBreakdown:
         """
         Score psychological manipulation pillar.
@@ -363,13 +435,17 @@ class ToxicityScorer:
         - Claim density (>6/min = +20 points)
         - AI subtle patterns (+5 each, max 15)
         - AI manipulation score (up to +15)
+
+        dark_patterns: Precomputed detect_dark_patterns(transcript) result
         """
         score = 0
         flags: List[str] = []
         ai_analysis = None
         
         # Dark pattern detection
-        matches, categories, pattern_score = detect_dark_patterns(transcript)
+        if dark_patterns is None:
+            dark_patterns = detect_dark_patterns(transcript)
+        matches, categories, pattern_score = dark_patterns
         score += pattern_score
         
         # Add flags for each category
@@ -479,11 +555,6 @@ class ToxicityScorer:
         
         return score, flags
     
-    def _extract_dark_pattern_texts(self, transcript: str) -> List[str]:
-        """Extract matched text from all dark patterns."""
-        matches, _, _ = detect_dark_patterns(transcript, include_all_matches=True)
-        return list(set(m.matched_text for m in matches))
-    
     def _generate_recommendation(
         self,
         risk_level: str,
@@ -517,6 +588,68 @@ class ToxicityScorer:
             return f"HIGH RISK. {num_issues} significant concern(s) require immediate attention. This ad may face regulatory challenges or audience backlash. Consider major revisions."
 
 
+def _first_match_per_category(matches: List[DarkPatternMatch]) -> List[DarkPatternMatch]:
+    """Reduce an include_all_matches result to what the default mode returns."""
+    first: Dict[str, DarkPatternMatch] = {}
+    for match in matches:
+        first.setdefault(match.category, match)
+    return list(first.values())
+
+
+def _physics_column(rows: Sequence[Dict[str, Any]], key: str, default: float) -> np.ndarray:
+    return np.array([row.get(key, default) for row in rows], dtype=float)
+
+
+def score_physiological_batch(
+    visuals: Sequence[Any],
+    audios: Sequence[Any],
+) -> List[Tuple[int, List[str]]]:
+    """
+    Vectorized ToxicityScorer._score_physiological over many analyses.
+
+    Each threshold is compared across the whole batch at once; flag strings
+    are only built for the rows that tripped a threshold.
+    """
+    visuals = [v.to_dict() if hasattr(v, "to_dict") else v for v in visuals]
+    audios = [a.to_dict() if hasattr(a, "to_dict") else a for a in audios]
+
+    cuts_pm = _physics_column(visuals, "cuts_per_minute", 0)
+    loudness = _physics_column(audios, "loudness_lu", -24)
+    photosensitive = np.array([bool(v.get("photosensitivity_fail", False)) for v in visuals], dtype=bool)
+    brightness_var = _physics_column(visuals, "brightness_variance", 0)
+    motion = _physics_column(visuals, "motion_energy_score", 0)
+
+    high_cuts = cuts_pm > CUTS_PER_MINUTE_THRESHOLD
+    loud = loudness > LOUDNESS_LU_THRESHOLD
+    flashing = brightness_var > BRIGHTNESS_VARIANCE_THRESHOLD
+    hyper = motion > MOTION_ENERGY_THRESHOLD
+
+    scores = np.minimum(
+        high_cuts * POINTS_HIGH_CUTS
+        + loud * POINTS_LOUD_AUDIO
+        + photosensitive * POINTS_PHOTOSENSITIVITY
+        + flashing * POINTS_BRIGHTNESS_VARIANCE
+        + hyper * POINTS_MOTION_ENERGY,
+        100,
+    )
+
+    results: List[Tuple[int, List[str]]] = [(int(score), []) for score in scores]
+    flagged = high_cuts | loud | photosensitive | flashing | hyper
+    for i in np.flatnonzero(flagged):
+        flags = results[i][1]
+        if high_cuts[i]:
+            flags.append(f"Rapid Cuts ({cuts_pm[i]:.0f}/min exceeds {CUTS_PER_MINUTE_THRESHOLD})")
+        if loud[i]:
+            flags.append(f"Extreme Loudness ({loudness[i]:.1f} LUFS exceeds {LOUDNESS_LU_THRESHOLD})")
+        if photosensitive[i]:
+            flags.append("Seizure Risk (Photosensitivity test failed)")
+        if flashing[i]:
+            flags.append(f"Flash Warning (Brightness variance {brightness_var[i]:.2f})")
+        if hyper[i]:
+            flags.append(f"Hyper-Stimulation (Motion score {motion[i]:.2f})")
+    return results
+
+
 def calculate_toxicity_score(
     analysis_data: Dict[str, Any],
     use_ai: bool = True,
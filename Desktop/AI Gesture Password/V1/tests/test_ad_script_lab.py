@@ -280,16 +280,20 @@ class TestRagClient:
 class TestOrchestrator:
     """Test orchestrator functionality."""
     
-    def test_orchestrator_singleton(self):
+    def test_orchestrator_singleton(self, tmp_path, monkeypatch):
         """Test get_orchestrator returns singleton."""
+        from app.features.ad_script_lab import orchestrator as orchestrator_module
+        
+        monkeypatch.setattr(orchestrator_module, "AD_SCRIPT_STORAGE_DIR", tmp_path)
+        monkeypatch.setattr(orchestrator_module, "_orchestrator", None)
         orch1 = get_orchestrator()
         orch2 = get_orchestrator()
         
         assert orch1 is orch2
     
-    def test_create_run_from_request(self):
+    def test_create_run_from_request(self, tmp_path):
         """Test creating a run from an API request."""
-        orchestrator = AdScriptOrchestrator()
+        orchestrator = AdScriptOrchestrator(storage_dir=tmp_path)
         
         request = AdScriptGenerateRequest(
             objective="Test objective",
@@ -306,9 +310,9 @@ class TestOrchestrator:
         assert run.brief.brand_name == "TestBrand"
         assert run.status == RunStatus.PENDING
     
-    def test_create_run_builds_context(self):
+    def test_create_run_builds_context(self, tmp_path):
         """Test that create_run builds brief context."""
-        orchestrator = AdScriptOrchestrator()
+        orchestrator = AdScriptOrchestrator(storage_dir=tmp_path)
         
         request = AdScriptGenerateRequest(
             objective="Test",
@@ -327,9 +331,9 @@ class TestOrchestrator:
         assert "TestProduct" in run.brief.brand_context
         assert "alcohol" in run.brief.compliance_requirements.lower()
     
-    def test_get_run(self):
+    def test_get_run(self, tmp_path):
         """Test retrieving a run by ID."""
-        orchestrator = AdScriptOrchestrator()
+        orchestrator = AdScriptOrchestrator(storage_dir=tmp_path)
         
         request = AdScriptGenerateRequest(
             objective="Test",
@@ -345,17 +349,17 @@ class TestOrchestrator:
         assert retrieved is not None
         assert retrieved.run_id == run.run_id
     
-    def test_get_run_not_found(self):
+    def test_get_run_not_found(self, tmp_path):
         """Test get_run returns None for unknown ID."""
-        orchestrator = AdScriptOrchestrator()
+        orchestrator = AdScriptOrchestrator(storage_dir=tmp_path)
         
         retrieved = orchestrator.get_run("nonexistent-id")
         
         assert retrieved is None
     
-    def test_list_runs(self):
+    def test_list_runs(self, tmp_path):
         """Test listing runs."""
-        orchestrator = AdScriptOrchestrator()
+        orchestrator = AdScriptOrchestrator(storage_dir=tmp_path)
         
         # Create a few runs
         for i in range(3):
@@ -373,9 +377,9 @@ class TestOrchestrator:
         assert len(runs) >= 3
     
     @pytest.mark.asyncio
-    async def test_execute_run_updates_status(self):
+    async def test_execute_run_updates_status(self, tmp_path):
         """Test that execute_run updates run status."""
-        orchestrator = AdScriptOrchestrator()
+        orchestrator = AdScriptOrchestrator(storage_dir=tmp_path)
         
         request = AdScriptGenerateRequest(
             objective="Test",
@@ -393,9 +397,10 @@ class TestOrchestrator:
              patch('app.features.ad_script_lab.orchestrator.run_amazon_start', new_callable=AsyncMock), \
              patch('app.features.ad_script_lab.orchestrator.run_ideate', new_callable=AsyncMock), \
              patch('app.features.ad_script_lab.orchestrator.run_selector', new_callable=AsyncMock), \
-             patch('app.features.ad_script_lab.orchestrator.run_polish', new_callable=AsyncMock), \
-             patch('app.features.ad_script_lab.orchestrator.run_braintrust', new_callable=AsyncMock), \
-             patch('app.features.ad_script_lab.orchestrator.run_compliance', new_callable=AsyncMock), \
+             patch('app.features.ad_script_lab.orchestrator.polish_concept', new_callable=AsyncMock), \
+             patch('app.features.ad_script_lab.orchestrator.critique_script', new_callable=AsyncMock), \
+             patch('app.features.ad_script_lab.orchestrator.check_script', new_callable=AsyncMock), \
+             patch('app.features.ad_script_lab.orchestrator.fix_script', new_callable=AsyncMock), \
              patch('app.features.ad_script_lab.orchestrator.run_finalize', new_callable=AsyncMock):
             
             result = await orchestrator.execute_run(run)
@@ -404,9 +409,9 @@ class TestOrchestrator:
         assert result.current_stage == "completed"
     
     @pytest.mark.asyncio
-    async def test_execute_run_handles_errors(self):
+    async def test_execute_run_handles_errors(self, tmp_path):
         """Test that execute_run handles agent errors gracefully."""
-        orchestrator = AdScriptOrchestrator()
+        orchestrator = AdScriptOrchestrator(storage_dir=tmp_path)
         
         request = AdScriptGenerateRequest(
             objective="Test",
@@ -467,10 +472,14 @@ class TestIntegration:
     """Integration tests with mocked LLM."""
     
     @pytest.mark.asyncio
-    async def test_full_pipeline_mocked(self):
+    async def test_full_pipeline_mocked(self, tmp_path, monkeypatch):
         """Test full pipeline with mocked Gemini responses."""
+        from app.features.ad_script_lab import orchestrator as orchestrator_module
         from app.features.ad_script_lab.orchestrator import run_ad_script_protocol
         
+        # Keep the run out of the real storage directory
+        monkeypatch.setattr(orchestrator_module, "_orchestrator", AdScriptOrchestrator(storage_dir=tmp_path))
+        
         # Mock all LLM calls
         with patch('app.features.ad_script_lab.agents.amazon_start.create_gemini_model') as mock_gemini, \
              patch('app.features.ad_script_lab.agents.ideate.create_gemini_model') as mock_ideate, \
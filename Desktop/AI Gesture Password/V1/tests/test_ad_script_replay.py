@@ -0,0 +1,124 @@
+"""
+Tests for the Ad Script Lab LLM replay client and pipeline benchmark.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.core.gemini_utils import create_gemini_model, get_model_registry
+from app.features.ad_script_lab.llm_replay import (
+    LatencyModel,
+    LLMRecording,
+    ReplayModel,
+    prompt_hash,
+    record_gemini,
+    replay_gemini,
+    synthetic_response,
+)
+from app.features.ad_script_lab.orchestrator import current_stage
+from app.features.ad_script_lab.pipeline_benchmark import (
+    format_report,
+    percentile,
+    run_benchmark,
+)
+
+
+def test_replay_override_is_scoped():
+    with replay_gemini() as stats:
+        model = create_gemini_model("pro")
+        assert isinstance(model, ReplayModel)
+        model.generate_content("hello")
+    assert get_model_registry().override is None
+    assert stats.summary()["calls"] == 1
+
+
+def test_recording_leaves_the_override_in_place(tmp_path, monkeypatch):
+    registry = get_model_registry()
+    seen = []
+
+    class LiveModel:
+        def generate_content(self, prompt, **kwargs):
+            seen.append(registry.override)
+            return type("Response", (), {"text": "live"})()
+
+    def create_model(model_type, api_key=None, fallback_to_pro=True):
+        seen.append(registry.override)
+        return LiveModel()
+
+    monkeypatch.setattr(registry, "create_model", create_model)
+    outer = registry.override
+    with record_gemini(tmp_path / "recording.jsonl"):
+        recorder = registry.override
+        assert create_gemini_model("pro").generate_content("hello").text == "live"
+
+    # Never cleared while the live model was built or called
+    assert seen == [recorder, recorder]
+    assert registry.override is outer
+    assert LLMRecording.load(tmp_path / "recording.jsonl").entries[0]["response"] == "live"
+
+
+def test_recording_prefers_prompt_hash_then_stage():
+    recording = LLMRecording([
+        {"stage": "ideate", "prompt_sha256": prompt_hash("exact"), "response": "exact match"},
+        {"stage": "ideate", "response": "first"},
+    ])
+    model = ReplayModel("pro", recording=recording)
+    token = current_stage.set("ideate")
+    try:
+        assert model.generate_content("exact").text == "exact match"
+        texts = [model.generate_content("other").text for _ in range(3)]
+    finally:
+        current_stage.reset(token)
+    # Round-robin over everything recorded for the stage
+    assert texts == ["exact match", "first", "exact match"]
+
+    # Unknown stages fall back to synthetic responses
+    assert json.loads(model.generate_content("anything").text)
+
+
+def test_recording_round_trip(tmp_path):
+    recording = LLMRecording([{"stage": "polish", "prompt_sha256": "abc", "response": "text"}])
+    path = tmp_path / "recording.jsonl"
+    recording.save(path)
+    assert LLMRecording.load(path).entries == recording.entries
+
+
+def test_latency_model_stage_override_and_jitter():
+    latency = LatencyModel(base_seconds=1.0, jitter=0.1, stage_base_seconds={"polish": 2.0})
+    assert latency.sample("polish", "") == pytest.approx(2.0, rel=0.1)
+    for _ in range(20):
+        assert 0.9 <= latency.sample("ideate", "") <= 1.1
+
+
+@pytest.mark.parametrize("stage", ["ideate", "selector", "polish", "braintrust", "compliance", "finalize"])
+def test_synthetic_responses_are_json(stage):
+    assert json.loads(synthetic_response(stage))
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 21)]
+    assert percentile(values, 50) == 10.0
+    assert percentile(values, 95) == 19.0
+    assert percentile([], 95) == 0.0
+
+
+def test_benchmark_runs_every_mode(tmp_path):
+    results = asyncio.run(run_benchmark(
+        runs=1,
+        latency=LatencyModel(base_seconds=0.001),
+        storage_dir=tmp_path,
+    ))
+
+    assert set(results["modes"]) == {"light_think", "standard_think", "deep_think"}
+    for report in results["modes"].values():
+        assert report["failures"] == 0
+        assert report["e2e_seconds"]["p95"] >= report["e2e_seconds"]["p50"] > 0
+        assert {"ideate", "polish", "finalize"} <= set(report["stage_seconds"])
+        assert report["llm"]["calls"] > 0
+        assert report["llm"]["peak_in_flight"] >= 1
+        assert report["llm"]["utilization"] > 0
+    # deep_think runs a second braintrust loop
+    assert "braintrust_loop_2" in results["modes"]["deep_think"]["stage_seconds"]
+    assert "deep_think" in format_report(results)
@@ -0,0 +1,170 @@
+"""
+Tests for Ad Script Lab run persistence (snapshot + append-only event log + index).
+"""
+
+import json
+
+from app.features.ad_script_lab.orchestrator import AdScriptOrchestrator
+from app.features.ad_script_lab.rag_client import StubTvAdsRagClient
+from app.features.ad_script_lab.run_store import RunStore
+from app.features.ad_script_lab.types import (
+    AdScriptBrief,
+    AdScriptGenerateRequest,
+    AdScriptRun,
+    RunStatus,
+)
+
+
+def _run(name="Test") -> AdScriptRun:
+    return AdScriptRun(brief=AdScriptBrief(
+        objective="Test",
+        target_audience="Test",
+        single_minded_proposition="Test",
+        tone_of_voice="Test",
+        asset_name=name,
+    ))
+
+
+def _events(tmp_path, run_id):
+    path = tmp_path / f"{run_id}{RunStore.EVENTS_SUFFIX}"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_saves_append_only_changes(tmp_path):
+    store = RunStore(tmp_path)
+    run = _run()
+    store.save(run)
+    snapshot = (tmp_path / f"{run.run_id}.json").read_text()
+
+    run.status = RunStatus.RUNNING
+    run.update_stage("ideate")
+    store.save(run)
+    run.artifacts.press_release = "Vision"
+    run.stage_history[-1]["details"]["duration_s"] = 1.5
+    store.save(run)
+
+    # The snapshot is untouched; each save appended only its own changes
+    assert (tmp_path / f"{run.run_id}.json").read_text() == snapshot
+    events = _events(tmp_path, run.run_id)
+    assert len(events) == 2
+    assert "brief" not in events[1]["set"]
+    assert events[1]["set"]["artifacts.press_release"] == "Vision"
+    assert events[1]["history_from"] == 0
+
+    loaded = RunStore(tmp_path).load(run.run_id)
+    assert loaded.artifacts.press_release == "Vision"
+    assert loaded.stage_history[-1]["details"]["duration_s"] == 1.5
+    assert loaded.status == RunStatus.RUNNING.value
+
+
+def test_finished_runs_are_compacted(tmp_path):
+    store = RunStore(tmp_path)
+    run = _run()
+    store.save(run)
+    run.update_stage("finalize")
+    store.save(run)
+    assert _events(tmp_path, run.run_id)
+
+    run.status = RunStatus.COMPLETED
+    store.save(run)
+
+    assert not _events(tmp_path, run.run_id)
+    data = json.loads((tmp_path / f"{run.run_id}.json").read_text())
+    assert data["status"] == "completed"
+    assert data["stage_history"][-1]["stage"] == "finalize"
+
+
+def test_truncated_event_is_ignored(tmp_path):
+    store = RunStore(tmp_path)
+    run = _run()
+    store.save(run)
+    run.current_stage = "polish"
+    store.save(run)
+    with open(tmp_path / f"{run.run_id}{RunStore.EVENTS_SUFFIX}", "a") as f:
+        f.write('{"set": {"current_stage": "fin')
+
+    assert RunStore(tmp_path).load(run.run_id).current_stage == "polish"
+
+
+def test_appends_after_a_torn_event_survive_reload(tmp_path):
+    store = RunStore(tmp_path)
+    run = _run()
+    store.save(run)
+    run.current_stage = "polish"
+    store.save(run)
+    events_path = tmp_path / f"{run.run_id}{RunStore.EVENTS_SUFFIX}"
+    with open(events_path, "a") as f:
+        f.write('{"set": {"current_stage": "fin')
+
+    reopened = RunStore(tmp_path)
+    resumed = reopened.load(run.run_id)
+    resumed.current_stage = "finalize"
+    reopened.save(resumed)
+    resumed.artifacts.press_release = "Vision"
+    reopened.save(resumed)
+
+    assert len(_events(tmp_path, run.run_id)) == 3
+    loaded = RunStore(tmp_path).load(run.run_id)
+    assert loaded.current_stage == "finalize"
+    assert loaded.artifacts.press_release == "Vision"
+
+
+def test_event_missing_its_newline_is_kept(tmp_path):
+    store = RunStore(tmp_path)
+    run = _run()
+    store.save(run)
+    run.current_stage = "polish"
+    store.save(run)
+    events_path = tmp_path / f"{run.run_id}{RunStore.EVENTS_SUFFIX}"
+    events_path.write_text(events_path.read_text().rstrip("\n"))
+
+    reopened = RunStore(tmp_path)
+    resumed = reopened.load(run.run_id)
+    resumed.current_stage = "finalize"
+    reopened.save(resumed)
+
+    assert [event["set"]["current_stage"] for event in _events(tmp_path, run.run_id)] == ["polish", "finalize"]
+
+
+def test_legacy_snapshots_are_indexed_once(tmp_path):
+    runs = [_run(f"Asset {i}") for i in range(3)]
+    for run in runs:
+        (tmp_path / f"{run.run_id}.json").write_text(json.dumps(run.model_dump(mode="json"), indent=2))
+
+    store = RunStore(tmp_path)
+    assert len(store) == 3
+    assert (tmp_path / RunStore.INDEX_FILE).exists()
+    assert store.recent_ids(1) == [runs[-1].run_id]
+
+
+def test_orchestrator_starts_from_index_and_loads_lazily(tmp_path, monkeypatch):
+    orchestrator = AdScriptOrchestrator(storage_dir=tmp_path, rag_client=StubTvAdsRagClient())
+    created = []
+    for i in range(5):
+        created.append(orchestrator.create_run(AdScriptGenerateRequest(
+            objective=f"Test {i}",
+            target_audience="Test",
+            single_minded_proposition="Test",
+            tone_of_voice="Test",
+            asset_name=f"Asset {i}",
+        )))
+    orchestrator.delete_run(created[0].run_id)
+
+    loads = []
+    original_load = RunStore.load
+
+    def counting_load(self, run_id):
+        loads.append(run_id)
+        return original_load(self, run_id)
+
+    monkeypatch.setattr(RunStore, "load", counting_load)
+    reopened = AdScriptOrchestrator(storage_dir=tmp_path, rag_client=StubTvAdsRagClient())
+    assert loads == []
+
+    recent = reopened.list_runs(limit=2)
+    assert [r.run_id for r in recent] == [created[4].run_id, created[3].run_id]
+    assert len(loads) == 2
+    assert reopened.get_run(created[0].run_id) is None
+    assert len(reopened.list_runs(limit=10)) == 4
@@ -0,0 +1,122 @@
+"""
+Tests for the Ad Script Lab stage graph and the orchestrator's per-script scheduling.
+"""
+
+import asyncio
+
+import pytest
+
+from app.features.ad_script_lab.llm_replay import LatencyModel, replay_gemini
+from app.features.ad_script_lab.orchestrator import AdScriptOrchestrator
+from app.features.ad_script_lab.rag_client import StubTvAdsRagClient
+from app.features.ad_script_lab.scheduler import StageGraph, StageGraphError
+from app.features.ad_script_lab.types import AdScriptGenerateRequest, RunStatus
+
+
+def _recorder(events, name, delay=0.0, result=None):
+    async def work():
+        events.append(("start", name))
+        await asyncio.sleep(delay)
+        events.append(("end", name))
+        return result
+    return work
+
+
+def test_independent_nodes_overlap():
+    events = []
+    graph = StageGraph()
+    graph.add("a", _recorder(events, "a", 0.05))
+    graph.add("b", _recorder(events, "b", 0.01), deps=["a"])
+    graph.add("c", _recorder(events, "c", 0.02), deps=["a"])
+    graph.add("d", _recorder(events, "d", result=42), deps=["b", "c"])
+
+    results = asyncio.run(graph.run())
+
+    assert results["d"] == 42
+    # b and c both start before either finishes; d waits for both
+    assert events.index(("start", "c")) < events.index(("end", "b"))
+    assert events.index(("start", "d")) > events.index(("end", "c"))
+
+
+def test_stage_callbacks_span_all_nodes_of_a_stage():
+    events = []
+    started, finished = [], {}
+    graph = StageGraph(
+        on_stage_start=started.append,
+        on_stage_done=lambda stage, duration: finished.setdefault(stage, duration),
+    )
+    graph.add("polish[0]", _recorder(events, "p0", 0.01), stage="polish")
+    graph.add("polish[1]", _recorder(events, "p1", 0.05), stage="polish")
+    graph.add("finalize", _recorder(events, "f"), deps=["polish[0]", "polish[1]"])
+
+    asyncio.run(graph.run())
+
+    assert started == ["polish", "finalize"]
+    assert finished["polish"] >= 0.05
+
+
+def test_nodes_can_extend_the_graph_while_running():
+    events = []
+    graph = StageGraph()
+
+    async def expand():
+        graph.add("child", _recorder(events, "child"), deps=["parent"])
+
+    graph.add("parent", expand)
+    asyncio.run(graph.run())
+
+    assert ("end", "child") in events
+
+
+def test_failure_cancels_running_nodes():
+    events = []
+    graph = StageGraph()
+
+    async def boom():
+        raise RuntimeError("boom")
+
+    graph.add("slow", _recorder(events, "slow", 1.0))
+    graph.add("boom", boom)
+    graph.add("after", _recorder(events, "after"), deps=["boom"])
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(graph.run())
+    assert ("end", "slow") not in events
+    assert ("start", "after") not in events
+
+
+def test_unknown_dependency_is_rejected():
+    graph = StageGraph()
+    with pytest.raises(StageGraphError):
+        graph.add("b", _recorder([], "b"), deps=["a"])
+
+
+def test_orchestrator_streams_scripts_under_llm_budget(tmp_path):
+    orchestrator = AdScriptOrchestrator(
+        storage_dir=tmp_path,
+        rag_client=StubTvAdsRagClient(),
+        max_concurrent_llm_calls=2,
+    )
+    request = AdScriptGenerateRequest(
+        objective="Test",
+        target_audience="Test",
+        single_minded_proposition="Test",
+        tone_of_voice="Test",
+        asset_name="Test",
+        creative_mode="deep_think",
+    )
+    run = orchestrator.create_run(request)
+
+    with replay_gemini(latency=LatencyModel(base_seconds=0.01)) as stats:
+        run = asyncio.run(orchestrator.execute_run(run))
+
+    assert run.status == RunStatus.COMPLETED
+    assert stats.summary()["peak_in_flight"] <= 2
+    assert len(run.artifacts.polished_3) == len(run.artifacts.compliance_checks) == 3
+    assert all(script.braintrust_feedback for script in run.artifacts.polished_3)
+    assert all(script.compliance_result for script in run.artifacts.polished_3)
+    stages = [entry["stage"] for entry in run.stage_history]
+    for stage in ("polish", "braintrust_loop_1", "braintrust_loop_2", "compliance", "compliance_fix", "finalize"):
+        assert stages.count(stage) == 1
+        entry = next(e for e in run.stage_history if e["stage"] == stage)
+        assert "duration_s" in entry["details"]
@@ -0,0 +1,125 @@
+import os
+
+import pytest
+
+from app.core import analysis_cache
+from app.core.analysis_cache import AnalysisCache, CacheConfig, hash_file
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(CacheConfig(db_path=str(tmp_path / "cache.db")))
+
+
+def _write(path, middle: bytes):
+    # Same size, same first/last 1MB, different middle
+    path.write_bytes(b"a" * (1024 * 1024) + middle + b"z" * (1024 * 1024))
+    return str(path)
+
+
+def test_full_hash_distinguishes_changed_middle(tmp_path, cache):
+    first = _write(tmp_path / "cut_a.mp4", b"1" * 4096)
+    second = _write(tmp_path / "cut_b.mp4", b"2" * 4096)
+
+    cache.set(first, "clearcast", {"score": 1})
+
+    assert cache.get(first, "clearcast") == {"score": 1}
+    assert cache.get(second, "clearcast") is None
+
+
+def test_upload_hash_is_reused_without_reading_file(tmp_path, cache, monkeypatch):
+    dest = tmp_path / "upload.mp4"
+    dest.write_bytes(b"video-bytes" * 1000)
+    digest = hash_file(str(dest))
+
+    cache.register_file_hash(str(dest), digest)
+
+    def _no_read(*args, **kwargs):
+        raise AssertionError("file re-hashed")
+
+    monkeypatch.setattr(analysis_cache, "hash_file", _no_read)
+    cache.set(str(dest), "ai_breakdown", {"ok": True})
+    assert cache.get(str(dest), "ai_breakdown") == {"ok": True}
+
+    # A fresh instance loads the persisted index entry
+    reopened = AnalysisCache(CacheConfig(db_path=cache.config.db_path))
+    assert reopened.get(str(dest), "ai_breakdown") == {"ok": True}
+
+
+def test_modified_file_is_rehashed(tmp_path, cache):
+    video = tmp_path / "ad.mp4"
+    video.write_bytes(b"original")
+    cache.set(str(video), "clearcast", {"version": 1})
+
+    video.write_bytes(b"re-export")
+    stat = video.stat()
+    os.utime(video, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(str(video), "clearcast") is None
+
+
+def test_repeated_gets_served_from_memory_with_stats(tmp_path, cache, monkeypatch):
+    video = tmp_path / "ad.mp4"
+    video.write_bytes(b"frames")
+    cache.set(str(video), "clearcast", {"verdict": "pass"})
+
+    reopened = AnalysisCache(CacheConfig(db_path=cache.config.db_path))
+    assert reopened.get(str(video), "clearcast") == {"verdict": "pass"}  # disk hit
+
+    def _no_sql(*args, **kwargs):
+        raise AssertionError("SQLite queried on a warm hit")
+
+    monkeypatch.setattr(reopened, "_get_connection", _no_sql)
+    assert reopened.get(str(video), "clearcast") == {"verdict": "pass"}
+    monkeypatch.undo()
+
+    assert reopened.get(str(tmp_path / "missing.mp4"), "clearcast") is None
+    stats = reopened.get_stats()
+    assert stats["disk_hits"] == 1
+    assert stats["memory_hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["memory_entries"] == 1
+
+
+def test_memory_hits_are_independent_copies(tmp_path, cache):
+    video = tmp_path / "ad.mp4"
+    video.write_bytes(b"frames")
+    result = {"verdict": "pass", "flags": [{"issue": "logo"}]}
+    cache.set(str(video), "clearcast", result)
+
+    # Neither the stored result nor an earlier hit aliases the cached entry
+    result["flags"].append({"issue": "late edit"})
+    first = cache.get(str(video), "clearcast")
+    first["flags"][0]["issue"] = "mutated"
+
+    assert cache.get(str(video), "clearcast") == {"verdict": "pass", "flags": [{"issue": "logo"}]}
+    assert cache.get_stats()["memory_hits"] == 2
+
+
+def test_memory_hits_do_not_decode_json(tmp_path, cache, monkeypatch):
+    video = tmp_path / "ad.mp4"
+    video.write_bytes(b"frames")
+    cache.set(str(video), "clearcast", {"verdict": "pass"})
+
+    def no_decoding(*args, **kwargs):
+        raise AssertionError("memory hit decoded JSON")
+
+    monkeypatch.setattr(analysis_cache.json, "loads", no_decoding)
+
+    assert cache.get(str(video), "clearcast") == {"verdict": "pass"}
+
+
+def test_memory_tier_evicts_by_size(tmp_path):
+    cache = AnalysisCache(CacheConfig(db_path=str(tmp_path / "cache.db"), memory_max_bytes=300))
+    for i in range(4):
+        video = tmp_path / f"ad_{i}.mp4"
+        video.write_bytes(f"video {i}".encode())
+        cache.set(str(video), "clearcast", {"payload": "x" * 100})
+
+    stats = cache.get_stats()
+    assert stats["memory_bytes"] <= 300
+    assert stats["evictions"] >= 2
+    # Evicted entries are still served from SQLite
+    assert cache.get(str(tmp_path / "ad_0.mp4"), "clearcast") == {"payload": "x" * 100}
+    cache.invalidate(str(tmp_path / "ad_0.mp4"))
+    assert cache.get(str(tmp_path / "ad_0.mp4"), "clearcast") is None
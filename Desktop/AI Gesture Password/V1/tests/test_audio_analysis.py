@@ -0,0 +1,104 @@
+import re
+import subprocess
+
+import pytest
+
+from app.core import audio_analysis
+from app.core.audio_analysis import analyze_audio
+from app.features.clearcast.clearcast_audio import ClearcastAudioAnalyzer
+
+
+def _ffmpeg(*args):
+    subprocess.run(["ffmpeg", "-y", "-loglevel", "error", *args], check=True, capture_output=True)
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    audio_analysis.clear_audio_cache()
+    yield
+    audio_analysis.clear_audio_cache()
+
+
+@pytest.fixture
+def tone_with_silent_head(tmp_path):
+    """1s silence then 2s stereo tone, muxed with a black video track."""
+    path = tmp_path / "tone.mp4"
+    _ffmpeg(
+        "-f", "lavfi", "-i", "color=c=black:s=64x64:d=3",
+        "-f", "lavfi", "-i", "sine=f=440:d=2",
+        "-filter_complex", "[1:a]adelay=1000:all=1,apad=whole_dur=3,aformat=channel_layouts=stereo[a]",
+        "-map", "0:v", "-map", "[a]", "-t", "3", "-c:v", "libx264", "-c:a", "pcm_s16le",
+        str(path).replace(".mp4", ".mov"),
+    )
+    return str(path).replace(".mp4", ".mov")
+
+
+def _volumedetect(path, *input_args):
+    res = subprocess.run(
+        ["ffmpeg", *input_args, "-i", path, "-af", "volumedetect", "-f", "null", "-"],
+        capture_output=True, text=True,
+    )
+    return float(re.search(r"max_volume: ([\-\d\.]+) dB", res.stderr).group(1))
+
+
+def test_single_pass_matches_separate_probes(tone_with_silent_head):
+    analysis = analyze_audio(tone_with_silent_head)
+
+    assert analysis.has_audio
+    assert analysis.duration == pytest.approx(3.0, abs=0.05)
+    assert analysis.integrated_lufs is not None and analysis.true_peak is not None
+    assert analysis.max_volume_db() == pytest.approx(_volumedetect(tone_with_silent_head), abs=0.1)
+    # Head is digital silence, tail is tone
+    assert analysis.head_max_db(0.5) < -90
+    assert analysis.tail_max_db(0.24) == pytest.approx(_volumedetect(tone_with_silent_head, "-ss", "2.76"), abs=0.1)
+
+
+def test_results_are_cached_per_file(tone_with_silent_head, monkeypatch):
+    first = analyze_audio(tone_with_silent_head)
+    monkeypatch.setattr(audio_analysis, "_decode", lambda *a: pytest.fail("decoded twice"))
+
+    analyzer = ClearcastAudioAnalyzer()
+    report = analyzer.analyze(tone_with_silent_head)
+    silence = analyzer.check_silence_head_tail(tone_with_silent_head, duration_sec=0.5)
+
+    assert analyze_audio(tone_with_silent_head) is first
+    assert report.integrated_lufs == first.integrated_lufs
+    assert silence["head_silence"] is True
+    assert silence["tail_silence"] is False
+
+
+def test_tail_is_measured_from_the_container_end(tmp_path):
+    """Audio stops at 2s while the video runs to 3s: the last 0.24s of the file is silent."""
+    path = str(tmp_path / "short_audio.mov")
+    _ffmpeg(
+        "-f", "lavfi", "-i", "color=c=black:s=64x64:d=3",
+        "-f", "lavfi", "-i", "sine=f=440:d=2",
+        "-map", "0:v", "-map", "1:a", "-c:v", "libx264", "-c:a", "pcm_s16le", path,
+    )
+
+    analysis = analyze_audio(path)
+    silence = ClearcastAudioAnalyzer().check_silence_head_tail(path, duration_sec=0.24)
+
+    assert analysis.duration == pytest.approx(2.0, abs=0.05)
+    assert analysis.container_duration == pytest.approx(3.0, abs=0.05)
+    assert analysis.tail_max_db(0.24, total_duration=2.0) > -20
+    assert analysis.tail_max_db(0.24) == audio_analysis.SILENCE_FLOOR_DB
+    assert analysis.tail_max_db(0.24, total_duration=3.0) == audio_analysis.SILENCE_FLOOR_DB
+    # A window straddling the end of the audio sees only the audio part
+    assert analysis.tail_max_db(1.5, total_duration=3.0) == pytest.approx(analysis.tail_max_db(0.5, total_duration=2.0), abs=0.01)
+    assert silence["tail_silence"] is True
+
+
+def test_video_without_audio(tmp_path):
+    path = str(tmp_path / "silent.mp4")
+    _ffmpeg("-f", "lavfi", "-i", "color=c=black:s=64x64:d=1", "-c:v", "libx264", path)
+
+    analysis = analyze_audio(path)
+
+    assert analysis is not None and not analysis.has_audio
+    assert analysis.loudness() == {}
+    assert analysis.head_max_db(0.24) is None
+
+
+def test_missing_file_returns_none(tmp_path):
+    assert analyze_audio(str(tmp_path / "missing.mp4")) is None
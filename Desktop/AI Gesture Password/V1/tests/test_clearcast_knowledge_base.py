@@ -0,0 +1,118 @@
+"""
+Tests for ClearcastKnowledgeBase semantic retrieval (cached embeddings, top-k, query cache).
+"""
+
+import pickle
+import zlib
+
+import numpy as np
+import pytest
+
+from app.features.clearcast import clearcast_knowledge_base as kb_module
+from app.features.clearcast.clearcast_knowledge_base import ClearcastKnowledgeBase
+
+WORDS = ["alcohol", "children", "gambling", "price", "free", "health", "claim", "food"]
+
+
+class FakeModel:
+    """Bag-of-words embeddings over WORDS (plus per-text jitter so there are no ties), counting encode calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.calls.append(list(texts))
+        return np.array([
+            [text.lower().count(word) + 0.01 * i for i, word in enumerate(WORDS)]
+            + [zlib.crc32(text.encode()) / 2**32]
+            for text in texts
+        ], dtype=np.float64)
+
+
+@pytest.fixture
+def kb(tmp_path, monkeypatch):
+    monkeypatch.setattr(ClearcastKnowledgeBase, "_find_and_load_default_pdf", lambda self: None)
+    monkeypatch.setattr(kb_module, "SEMANTIC_AVAILABLE", True)
+    kb = ClearcastKnowledgeBase(use_semantic=True)
+    kb.cache_dir = tmp_path
+    kb.model = FakeModel()
+    kb.full_text = "loaded"
+    kb.chunks = [
+        {"text": f"Rule {i}: " + " ".join(WORDS[j % len(WORDS)] for j in range(i, i + 1 + i % 3)), "page": i}
+        for i in range(40)
+    ]
+    pdf = tmp_path / "guidance.pdf"
+    pdf.write_bytes(b"%PDF")
+    kb._load_or_create_embeddings(str(pdf))
+    kb.pdf = pdf
+    return kb
+
+
+def _reference(kb, query, top_k, min_similarity):
+    """The original full-argsort search over unnormalized embeddings."""
+    chunk_embeddings = FakeModel().encode([c["text"] for c in kb.chunks])
+    query_embedding = FakeModel().encode([query])[0]
+    similarities = np.dot(chunk_embeddings, query_embedding) / (
+        np.linalg.norm(chunk_embeddings, axis=1) * np.linalg.norm(query_embedding) + 1e-8
+    )
+    top = np.argsort(similarities)[::-1][:top_k]
+    return [(kb.chunks[i]["page"], float(similarities[i])) for i in top if similarities[i] >= min_similarity]
+
+
+def test_search_matches_full_sort(kb):
+    for query in ["alcohol and children", "free price claim", "health food"]:
+        results = kb.search(query, top_k=5, min_similarity=0.25)
+        expected = _reference(kb, query, 5, 0.25)
+        assert [r["page"] for r in results] == [page for page, _ in expected]
+        assert [r["similarity"] for r in results] == pytest.approx([sim for _, sim in expected], abs=1e-5)
+
+
+def test_embeddings_cached_as_normalized_memmap(kb):
+    cache_files = list(kb.cache_dir.glob("embeddings_*.npy"))
+    assert len(cache_files) == 1
+
+    reopened = ClearcastKnowledgeBase(use_semantic=True)
+    reopened.cache_dir = kb.cache_dir
+    reopened.chunks = kb.chunks
+    reopened._load_or_create_embeddings(str(kb.pdf))
+
+    assert isinstance(reopened.embeddings, np.memmap)
+    assert reopened.embeddings.dtype == np.float32
+    assert np.linalg.norm(reopened.embeddings, axis=1) == pytest.approx(1.0, abs=1e-5)
+    assert reopened.model is None  # Cached embeddings do not need the encoder
+
+
+def test_legacy_pickle_cache_is_migrated(kb, tmp_path):
+    kb.embeddings = None
+    for path in kb.cache_dir.glob("embeddings_*.npy"):
+        path.unlink()
+    legacy = kb._get_cache_path(str(kb.pdf), suffix=".pkl")
+    with open(legacy, "wb") as f:
+        pickle.dump({"embeddings": FakeModel().encode([c["text"] for c in kb.chunks])}, f)
+    kb.model = FakeModel()
+
+    kb._load_or_create_embeddings(str(kb.pdf))
+
+    assert kb.model.calls == []
+    assert not legacy.exists()
+    assert kb._get_cache_path(str(kb.pdf)).exists()
+
+
+def test_search_many_batches_and_caches_queries(kb):
+    kb.model.calls.clear()
+
+    batched = kb.search_many(["alcohol", "gambling odds", "alcohol"], top_k=3)
+    assert kb.model.calls == [["alcohol", "gambling odds"]]
+    single = kb.search("alcohol", top_k=3)
+    assert batched[0] == batched[2]
+    assert [r["page"] for r in batched[0]] == [r["page"] for r in single]
+
+    kb.get_relevant_rules(["alcohol"])
+    assert kb.model.calls == [["alcohol", "gambling odds"]]
+
+
+def test_relevant_rules_respects_limit(kb):
+    text = kb.get_relevant_rules(["alcohol", "children"], limit=200)
+
+    assert text.startswith("RELEVANT CLEARCAST GUIDANCE (Semantic Search)")
+    assert len(text) - len("RELEVANT CLEARCAST GUIDANCE (Semantic Search):\n\n") <= 200
@@ -0,0 +1,82 @@
+"""
+Tests for the precompiled dark-pattern matcher.
+"""
+
+import re
+
+import pytest
+
+from app.features.toxicity.dark_patterns import (
+    DARK_PATTERN_CATEGORIES,
+    DarkPatternMatcher,
+    _literal_prefix,
+    detect_dark_patterns,
+    detect_dark_patterns_batch,
+)
+
+TRANSCRIPTS = [
+    "",
+    "Our cereal is crunchy and tasty.",
+    "Hurry up! Only 3 left. Act now before it's too late.",
+    "Start your FREE TRIAL* today - automatically renews, cancel anytime. Auto-ship included.",
+    "Don't let them down. Your kids deserve this. Treat yourself, because you're worth it.",
+    "Don't miss out, don't miss this: limited time offer for a limited time only, selling out fast.",
+    "The threat is real and dangerous; you're at risk. What if something happens?",
+]
+
+
+def _reference(transcript, include_all_matches):
+    """The original one-finditer-per-pattern implementation."""
+    text = transcript.lower()
+    matches, categories = [], set()
+    for category, patterns in DARK_PATTERN_CATEGORIES.items():
+        found = [
+            (category, name, m.group().strip(), m.span())
+            for regex, name in patterns
+            for m in re.finditer(regex, text, re.IGNORECASE)
+        ]
+        if found:
+            categories.add(category)
+            matches.extend(found if include_all_matches else found[:1])
+    return matches, categories
+
+
+@pytest.mark.parametrize("include_all_matches", [True, False])
+@pytest.mark.parametrize("transcript", TRANSCRIPTS)
+def test_matches_reference_implementation(transcript, include_all_matches):
+    matches, categories, score = detect_dark_patterns(transcript, include_all_matches)
+    expected_matches, expected_categories = _reference(transcript, include_all_matches)
+
+    assert [(m.category, m.pattern_name, m.matched_text, m.span) for m in matches] == expected_matches
+    assert categories == expected_categories
+    assert score == min(len(expected_categories) * 10, 30)
+
+
+def test_literal_prefix():
+    assert _literal_prefix(r"only\s+\d+\s+left") == "only"
+    assert _literal_prefix(r"expires?\s+soon") == "expire"
+    assert _literal_prefix(r"don'?t\s+be") == "don"
+    assert _literal_prefix(r"auto[-\s]?ship") == "auto"
+    assert _literal_prefix(r"deadly") == "deadly"
+    assert _literal_prefix(r"(a|b)c") == ""
+    assert _literal_prefix(r"act|hurry") == ""
+
+
+def test_unanchored_and_custom_rules():
+    matcher = DarkPatternMatcher({
+        "custom": [(r"(buy|order)\s+now", "imperative"), (r"act|hurry", "urgency")],
+    })
+    matches, categories, score = matcher.detect("Order now, hurry, BUY NOW", include_all_matches=True)
+
+    assert [(m.matched_text, m.span) for m in matches] == [
+        ("order now", (0, 9)), ("buy now", (18, 25)), ("hurry", (11, 16)),
+    ]
+    assert categories == {"custom"} and score == 10
+
+
+def test_batch_preserves_order():
+    results = detect_dark_patterns_batch(TRANSCRIPTS, include_all_matches=True)
+
+    assert len(results) == len(TRANSCRIPTS)
+    for transcript, (matches, categories, score) in zip(TRANSCRIPTS, results):
+        assert (matches, categories, score) == detect_dark_patterns(transcript, include_all_matches=True)
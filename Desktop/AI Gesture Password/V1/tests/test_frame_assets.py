@@ -0,0 +1,70 @@
+"""
+Tests for the report frame asset cache (decode once, downsample per placement).
+"""
+
+import base64
+import random
+from io import BytesIO
+
+import pytest
+
+pytest.importorskip("reportlab")
+PILImage = pytest.importorskip("PIL.Image")
+
+from reportlab.lib.units import inch
+
+from app.features.reporting.frame_assets import FrameAssetCache
+from app.features.reporting.pdf_generator import AIBreakdownPDFGenerator
+
+
+def _frame(seed: int, size=(1920, 1080)) -> str:
+    """Noisy JPEG frame, so encoded size tracks pixel count."""
+    rng = random.Random(seed)
+    image = PILImage.frombytes("RGB", size, rng.randbytes(size[0] * size[1] * 3))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def test_frames_are_decoded_once_and_downsampled_per_placement():
+    frame = _frame(1)
+    assets = FrameAssetCache(dpi=150)
+
+    grid = assets.image(frame, 3 * inch, 3 * inch * 9 / 16)
+    cited = [assets.image(frame, 2.5 * inch, 2.5 * inch * 9 / 16) for _ in range(3)]
+
+    assert assets.decode_count == 1
+    assert grid._img.getSize() == (450, 254)
+    assert cited[0]._img.getSize() == (375, 211)
+    # Placements at the same size share one reader (and so one RGB decode / PDF XObject)
+    assert all(image._img is cited[0]._img for image in cited)
+    assert (grid.drawWidth, grid.drawHeight) == (3 * inch, 3 * inch * 9 / 16)
+
+
+def test_small_jpeg_frames_keep_their_original_stream():
+    frame = _frame(2, size=(320, 180))
+    assets = FrameAssetCache(dpi=150)
+
+    image = assets.image(frame, 3 * inch, 3 * inch * 9 / 16)
+
+    assert image._img.getSize() == (320, 180)
+    assert image._img.fp.getvalue() == base64.b64decode(frame)
+
+
+def test_breakdown_report_embeds_downsampled_frames(tmp_path):
+    frames = [_frame(seed) for seed in range(4)]
+    results = {
+        "frames": frames,
+        "breakdown": {"what_is_advertised": "Widget", "brand_name": "Acme"},
+        "green_highlights": [
+            {"aspect": "Branding", "explanation": "Logo visible.", "evidence_text": "Logo shown [Frame 1]."}
+        ],
+    }
+    generator = AIBreakdownPDFGenerator(settings={"corporation_name": "Acme", "accent_color": "#3B82F6"})
+    output = tmp_path / "breakdown.pdf"
+
+    assert generator.generate_pdf(results, video_name="ad.mp4", video_duration=30.0, output_path=str(output))
+
+    assert generator.frame_assets.decode_count == len(frames)
+    source_bytes = sum(len(base64.b64decode(frame)) for frame in frames)
+    assert output.stat().st_size < source_bytes / 4
@@ -0,0 +1,84 @@
+"""
+Tests for the decode-skipping reaction frame sampler.
+"""
+
+import io
+import shutil
+
+import cv2
+import numpy as np
+import pytest
+
+from app.features.analytics import frame_sampler
+from app.features.analytics.frame_sampler import FrameSampler, _read_ppm, scaled_size
+
+
+@pytest.fixture
+def video(tmp_path):
+    path = tmp_path / "reaction.mp4"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (160, 120))
+    for i in range(20):
+        writer.write(np.full((120, 160, 3), i * 12, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def test_opencv_backend_retrieves_only_sampled_frames(video, monkeypatch):
+    retrieved = []
+    real_capture = cv2.VideoCapture
+
+    class CountingCapture:
+        def __init__(self, path):
+            self._cap = real_capture(path)
+
+        def __getattr__(self, name):
+            return getattr(self._cap, name)
+
+        def retrieve(self):
+            retrieved.append(True)
+            return self._cap.retrieve()
+
+    monkeypatch.setattr(frame_sampler.cv2, "VideoCapture", CountingCapture)
+    sampler = FrameSampler(str(video), every_n=3, max_edge=80, backend="opencv")
+
+    frames = list(sampler)
+
+    assert [f.index for f in frames] == [0, 3, 6, 9, 12, 15, 18]
+    assert len(retrieved) == len(frames)
+    assert frames[1].timestamp == pytest.approx(0.3)
+    assert frames[0].image.shape == (60, 80, 3)
+
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg not installed")
+def test_ffmpeg_backend_matches_opencv_sampling(video):
+    piped = list(FrameSampler(str(video), every_n=4, max_edge=80, backend="ffmpeg"))
+    decoded = list(FrameSampler(str(video), every_n=4, max_edge=80, backend="opencv"))
+
+    assert [f.index for f in piped] == [f.index for f in decoded] == [0, 4, 8, 12, 16]
+    assert piped[0].image.shape == decoded[0].image.shape == (60, 80, 3)
+    # Same frames, give or take codec/scaler rounding
+    for a, b in zip(piped, decoded):
+        assert abs(int(a.image.mean()) - int(b.image.mean())) <= 3
+
+
+def test_auto_backend_pipes_only_when_downscaling(video):
+    assert FrameSampler(str(video), every_n=2, backend="auto", ffmpeg_path="ffmpeg").backend == "opencv"
+    assert FrameSampler(str(video), max_edge=80, backend="auto", ffmpeg_path="ffmpeg").backend == "ffmpeg"
+
+
+def test_broken_ffmpeg_falls_back_to_opencv(video, tmp_path):
+    sampler = FrameSampler(str(video), every_n=5, max_edge=80, backend="ffmpeg", ffmpeg_path=str(tmp_path / "nope"))
+
+    assert [f.index for f in sampler] == [0, 5, 10, 15]
+
+
+def test_read_ppm_stream():
+    pixels = bytes([255, 0, 0, 0, 255, 0])
+    stream = io.BytesIO(b"P6\n2 1\n255\n" + pixels + b"P6 2 1 255\n" + pixels)
+
+    first = _read_ppm(stream)
+    second = _read_ppm(stream)
+
+    assert first.shape == (1, 2, 3) and first[0, 0].tolist() == [0, 0, 255]  # RGB -> BGR
+    assert second is not None and _read_ppm(stream) is None
+    assert scaled_size(1920, 1080, 720) == (720, 405) and scaled_size(640, 480, 0) == (640, 480)
@@ -0,0 +1,91 @@
+import base64
+
+import cv2
+import numpy as np
+import pytest
+
+from app.core import frame_store
+from app.core.frame_analyzer import extract_frames_with_timestamps
+from app.core.frame_store import evenly_spaced_indices, get_frame_store, peek_frame_store
+
+
+def _write_video(path, frames=50, fps=25, width=320, height=180):
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    for i in range(frames):
+        frame = np.full((height, width, 3), 40 + (i * 4) % 200, dtype=np.uint8)
+        cv2.putText(frame, str(i), (40, 120), cv2.FONT_HERSHEY_SIMPLEX, 3, (255, 255, 255), 6)
+        writer.write(frame)
+    writer.release()
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def _clear_store_cache():
+    frame_store._store_cache.clear()
+    yield
+    frame_store._store_cache.clear()
+
+
+def test_evenly_spaced_indices_matches_legacy_positions():
+    assert evenly_spaced_indices(100, 1) == [0]
+    assert evenly_spaced_indices(100, 3) == [0, 49, 99]
+    assert evenly_spaced_indices(0, 5) == []
+
+
+def test_store_decodes_once_and_exposes_stats(tmp_path):
+    video = _write_video(tmp_path / "clip.mp4")
+
+    store = get_frame_store(video)
+    assert store is not None
+    assert store.frame_count == 50
+    assert store.luma.shape[0] == 50
+    assert store.luma.shape[2] == 160
+    assert store.mean_luma.shape == (50,)
+    assert store.histograms.shape == (50, 256)
+    # One detail plane per second of video
+    assert [idx for idx, _ in store.detail_planes()] == [0, 25]
+
+    # Second lookup reuses the cached, already decoded store
+    assert get_frame_store(video) is store
+    assert peek_frame_store(video) is store
+
+
+def test_extract_frames_served_from_store(tmp_path, monkeypatch):
+    video = _write_video(tmp_path / "clip.mp4")
+    store = get_frame_store(video)
+
+    def _no_decode(*args, **kwargs):
+        raise AssertionError("video decoded a second time")
+
+    monkeypatch.setattr(store, "_decode", _no_decode)
+
+    frames = extract_frames_with_timestamps(video, num_frames=8, validate_quality=False)
+    assert [f.index for f in frames] == evenly_spaced_indices(50, 8)
+    assert all(f.base64_image for f in frames)
+
+
+def test_missing_video_returns_none(tmp_path):
+    assert get_frame_store(str(tmp_path / "missing.mp4")) is None
+
+
+def test_unplanned_counts_are_read_on_demand(tmp_path):
+    video = _write_video(tmp_path / "clip.mp4")
+    store = get_frame_store(video)
+    assert 16 not in store.samples
+
+    samples = store.sampled_frames(4)
+
+    assert [s.index for s in samples] == evenly_spaced_indices(50, 4) == [0, 16, 32, 49]
+    assert len({s.frame_hash for s in samples}) == 4
+    # Kept for the next caller
+    assert store.samples[16] is samples[1]
+
+
+def test_samples_keep_source_resolution(tmp_path):
+    video = _write_video(tmp_path / "wide.mp4", frames=10, width=1280, height=720)
+
+    sample = get_frame_store(video).sampled_frames(8)[0]
+    small = extract_frames_with_timestamps(video, num_frames=8, max_width=640, validate_quality=False)
+
+    assert sample.decode().shape == (720, 1280, 3)
+    assert cv2.imdecode(np.frombuffer(base64.b64decode(small[0].base64_image), np.uint8), 1).shape == (360, 640, 3)
@@ -0,0 +1,85 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.core import gemini_utils
+from app.core.gemini_utils import ModelRegistry
+
+
+class _FakeGenai:
+    """Records list_models/configure calls made by the registry."""
+
+    def __init__(self, names):
+        self.names = names
+        self.list_calls = 0
+        self.configure_calls = 0
+        self.listed = threading.Event()
+
+    def list_models(self):
+        self.list_calls += 1
+        self.listed.set()
+        return [SimpleNamespace(name=f"models/{n}", supported_generation_methods=["generateContent"]) for n in self.names]
+
+    def configure(self, api_key=None):
+        self.configure_calls += 1
+
+    def GenerativeModel(self, name):
+        return SimpleNamespace(model_name=name)
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    fake = _FakeGenai(["gemini-2.5-pro", "gemini-2.5-flash"])
+    monkeypatch.setattr(gemini_utils, "genai", fake)
+    registry = ModelRegistry()
+    monkeypatch.setattr(gemini_utils, "_model_registry", registry)
+    return fake
+
+
+def test_models_resolve_once_and_instances_are_shared(fake_genai):
+    first = gemini_utils.create_gemini_model("pro", "key-1")
+    second = gemini_utils.create_gemini_model("pro", "key-1")
+    flash = gemini_utils.create_gemini_model("flash", "key-1")
+
+    assert first is second
+    assert first.model_name == "gemini-2.5-pro"
+    assert flash.model_name == "gemini-2.5-flash"
+    assert fake_genai.list_calls == 2  # once per model type
+    assert fake_genai.configure_calls == 1
+
+
+def test_stale_entry_is_served_while_refreshing(fake_genai):
+    registry = gemini_utils.get_model_registry()
+    registry.ttl = 0.0
+    assert registry.resolve("pro", "key-1") == "gemini-2.5-pro"
+
+    fake_genai.names = ["gemini-3-pro-preview"]
+    fake_genai.listed.clear()
+    # Stale: old name is returned immediately, refresh happens in the background
+    assert registry.resolve("pro", "key-1") == "gemini-2.5-pro"
+    assert fake_genai.listed.wait(2)
+    for _ in range(100):
+        if registry.snapshot()["resolved"]["pro"]["model"] == "gemini-3-pro-preview":
+            break
+        time.sleep(0.01)
+    assert registry.snapshot()["resolved"]["pro"]["model"] == "gemini-3-pro-preview"
+
+
+def test_invalidate_forces_resolution(fake_genai):
+    gemini_utils.get_available_model("pro")
+    gemini_utils.invalidate_model_registry("pro")
+    gemini_utils.get_available_model("pro")
+
+    assert fake_genai.list_calls == 2
+
+
+def test_configure_goes_through_the_registry(fake_genai):
+    gemini_utils.configure_gemini("key-1")
+    gemini_utils.create_gemini_model("pro", "key-1")
+    gemini_utils.configure_gemini("key-2")
+    gemini_utils.configure_gemini("key-1")
+
+    # Configured once per key change, never for a key that is already active
+    assert fake_genai.configure_calls == 3
@@ -0,0 +1,98 @@
+"""
+Import-time budget for the API module.
+
+Runs `python -X importtime -c "import api.main"` in a fresh interpreter and
+checks that heavy feature dependencies stay out of sys.modules (they load on
+first use or on the warm-up thread) and that the cumulative import time of
+api.main fits the budget. On failure the slowest imports are listed.
+
+The budget is deliberately generous; override it with API_IMPORT_BUDGET_S.
+"""
+
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+IMPORT_BUDGET_S = float(os.environ.get("API_IMPORT_BUDGET_S", "5.0"))
+
+# Must not be imported just by importing api.main
+HEAVY_MODULES = [
+    "google.generativeai",
+    "openai",
+    "cv2",
+    "reportlab",
+    "tensorflow",
+    "mediapipe",
+    "pygame",
+    "speech_recognition",
+    "sentence_transformers",
+    "torch",
+]
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_report(module: str = "api.main"):
+    """
+    Cold-import `module` under -X importtime.
+
+    Returns:
+        ({module: (self_us, cumulative_us)}, names in sys.modules afterwards)
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC_DIR), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))",
+        ],
+        cwd=SRC_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            timings[match.group(4)] = (int(match.group(1)), int(match.group(2)))
+    return timings, set(json.loads(result.stdout.strip().splitlines()[-1]))
+
+
+def _slowest(timings, count=15):
+    rows = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:count]
+    return "\n".join(f"{self_us / 1000:8.1f} ms  {name}" for name, (self_us, _) in rows)
+
+
+@pytest.fixture(scope="module")
+def api_import():
+    return import_report()
+
+
+def test_api_main_does_not_import_heavy_modules(api_import):
+    timings, modules = api_import
+
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert not loaded, f"api.main imports heavy modules at startup: {loaded}\n{_slowest(timings)}"
+
+
+def test_api_main_import_budget(api_import):
+    timings, _ = api_import
+
+    total_s = timings["api.main"][1] / 1_000_000
+    assert total_s < IMPORT_BUDGET_S, (
+        f"import api.main took {total_s:.2f}s (budget {IMPORT_BUDGET_S}s); slowest imports:\n{_slowest(timings)}"
+    )
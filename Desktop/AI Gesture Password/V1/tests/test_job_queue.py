@@ -166,3 +166,60 @@ def test_list_queue_jobs_filters_by_analysis(tmp_path):
     assert len(filtered) == 1
     assert filtered[0]["analysis_id"] == "analysis-a"
 
+
+
+@pytest.mark.asyncio
+async def test_job_types_run_concurrently_within_limits(tmp_path):
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    queue = JobQueue(storage, num_workers=4, concurrency_limits={"slow": 1, "fast": 2})
+    running = {"slow": 0, "fast": 0}
+    peak = {"slow": 0, "fast": 0}
+    finished: list[str] = []
+
+    def make_handler(job_type: str, delay: float):
+        async def handler(job_context):
+            running[job_type] += 1
+            peak[job_type] = max(peak[job_type], running[job_type])
+            await asyncio.sleep(delay)
+            running[job_type] -= 1
+            finished.append(job_context["payload"]["label"])
+        return handler
+
+    queue.register_handler("slow", make_handler("slow", 0.05))
+    queue.register_handler("fast", make_handler("fast", 0.01))
+
+    queue.enqueue("slow", analysis_id="a", payload={"label": "slow-1"})
+    queue.enqueue("slow", analysis_id="a", payload={"label": "slow-2"})
+    for i in range(4):
+        queue.enqueue("fast", analysis_id="b", payload={"label": f"fast-{i}"})
+
+    queue.ensure_worker()
+    await queue.wait_for_all(timeout=2.0)
+    await queue.shutdown()
+
+    assert peak == {"slow": 1, "fast": 2}
+    # Fast jobs are not stuck behind the slow job type
+    assert finished.index("fast-3") < finished.index("slow-2")
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_jobs_start_first(tmp_path):
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    queue = JobQueue(storage, num_workers=1)
+    order: list[str] = []
+
+    async def handler(job_context):
+        order.append(job_context["payload"]["label"])
+
+    queue.register_handler("unit_test", handler)
+    queue.enqueue("unit_test", analysis_id="a", payload={"label": "low"})
+    queue.enqueue("unit_test", analysis_id="a", payload={"label": "urgent"}, priority=10)
+
+    queue.ensure_worker()
+    await queue.wait_for_all(timeout=2.0)
+    health = queue.worker_health()
+    await queue.shutdown()
+
+    assert order == ["urgent", "low"]
+    assert health["num_workers"] == 1
+    assert health["workers"][0]["jobs_processed"] == 2
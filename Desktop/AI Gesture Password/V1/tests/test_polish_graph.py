@@ -0,0 +1,107 @@
+"""
+Tests for the single-pass polish filtergraph compiler.
+"""
+
+import pytest
+
+pytest.importorskip("cv2")
+
+from app.core import video_processor as video_processor_module
+from app.core.polish_graph import SLATE_DURATION, compile_polish_plan
+from app.core.video_processor import ClearcastVideoProcessor
+
+STANDARDS = ClearcastVideoProcessor.BROADCAST_STANDARDS
+
+ANALYSIS = {
+    "video": {"fps": 30.0, "width": 1280, "height": 720, "frame_count": 900, "avg_brightness": 40.0},
+    "audio": {"integrated_lufs": -18.5, "true_peak": -0.5, "lra": 6.0, "has_audio": True},
+    "issues": [],
+}
+
+
+def _outputs(cmd):
+    return [arg for arg in cmd if arg.endswith((".mov", ".mp4"))]
+
+
+def test_bright_copy_shares_one_decode():
+    plan = compile_polish_plan(
+        "master.mov",
+        "out/polished.mov",
+        ANALYSIS,
+        {"export_bright": True},
+        STANDARDS["UK_CLEARCAST"],
+        bright_output_path="out/polished_bright.mp4",
+        bright_standard=STANDARDS["WEB_BRIGHT"],
+    )
+    cmd = plan.command("ffmpeg")
+
+    assert cmd.count("-i") == 1
+    assert _outputs(cmd) == ["master.mov", "out/polished.mov", "out/polished_bright.mp4"]
+    graph = plan.filter_complex
+    assert "split=2[vfixed][vbright]" in graph
+    assert "[0:a]asplit=2" in graph
+    assert graph.count("eq=brightness=0.2") == 1  # Picture fixes run once for both outputs
+    assert "loudnorm=I=-23.0" in graph and "loudnorm=I=-16.0" in graph
+    assert plan.fixes_applied[0] == "Increased brightness"
+    assert plan.fixes_applied[-1] == "Created Bright/Web copy"
+
+
+def test_slate_and_padding_are_part_of_the_graph():
+    plan = compile_polish_plan(
+        "master.mov",
+        "out/polished.mov",
+        ANALYSIS,
+        {"add_slate": True, "add_padding": True, "slate_info": {"clock_number": "ABC/XYZ123/030"}},
+        STANDARDS["UK_CLEARCAST"],
+    )
+    graph = plan.filter_complex
+
+    assert "color=c=#1a1a1a:s=1920x1080:r=25" in graph
+    assert "ABC/XYZ123/030" in graph and "Duration\\: 030" in graph
+    assert "[slatev][slatea][vprog][aprog]concat=n=2:v=1:a=1" in graph
+    assert "tpad=start_duration=0.24:stop_duration=0.24" in graph
+    assert "adelay=delays=240:all=1,apad=pad_dur=0.24" in graph
+    # Head/tail mutes apply to the programme, not the slate tone
+    assert "between(t,29.76,30.0)" in graph
+    assert plan.duration == pytest.approx(30 + SLATE_DURATION + 0.48)
+    assert plan.outputs[0].audio_label == "apadded"
+
+
+def test_silent_source_gets_an_audio_track():
+    analysis = dict(ANALYSIS, audio={"has_audio": False})
+    plan = compile_polish_plan("master.mov", "out.mov", analysis, {}, STANDARDS["UK_CLEARCAST"])
+
+    assert "anullsrc=r=48000:cl=stereo:d=30.000[asilent]" in plan.filter_complex
+    assert "[0:a]" not in plan.filter_complex
+    assert "loudnorm" not in plan.filter_complex  # Would turn digital silence into NaNs
+
+
+def test_process_video_runs_a_single_encode(tmp_path, monkeypatch):
+    calls = []
+
+    class FakePopen:
+        def __init__(self, cmd, **kwargs):
+            calls.append(cmd)
+            self.stdout = iter(["out_time_us=15000000\n", "out_time_us=30000000\n", "progress=end\n"])
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(video_processor_module.subprocess, "Popen", FakePopen)
+    monkeypatch.setattr(ClearcastVideoProcessor, "_find_ffmpeg", lambda self: "ffmpeg")
+    monkeypatch.setattr(ClearcastVideoProcessor, "_analyze_video", lambda self, path: ANALYSIS)
+    processor = ClearcastVideoProcessor()
+    progress = []
+
+    output = tmp_path / "polished.mov"
+    results = processor.process_video(
+        "master.mov",
+        str(output),
+        progress_callback=lambda fraction, message: progress.append(fraction),
+        options={"export_bright": True, "add_padding": True},
+    )
+
+    assert results["success"], results["error"]
+    assert len(calls) == 1
+    assert results["secondary_output_path"] == str(tmp_path / "polished_bright.mp4")
+    assert progress == sorted(progress) and progress[-1] == 1.0
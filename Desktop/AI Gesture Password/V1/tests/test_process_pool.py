@@ -0,0 +1,122 @@
+import threading
+
+import pytest
+
+from app.core import process_pool
+from app.core.job_queue import JobQueue
+from app.core.process_pool import ProcessPoolBackend
+from app.core.video_storage import VideoAnalysisStorage
+
+
+def square_task(job_context, report_progress):
+    import os
+
+    report_progress(0.5, "halfway")
+    return {"value": job_context["payload"]["value"] ** 2, "pid": os.getpid()}
+
+
+def failing_task(job_context, report_progress):
+    raise ValueError("analysis failed in worker")
+
+
+@pytest.fixture
+def backend():
+    pool = ProcessPoolBackend(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+def test_backend_runs_task_in_worker_process_with_progress(backend):
+    import os
+
+    seen = []
+    done = threading.Event()
+
+    def on_progress(fraction, message):
+        seen.append((fraction, message))
+        done.set()
+
+    future = backend.submit(square_task, {"payload": {"value": 7}}, on_progress=on_progress)
+    result = future.result(timeout=60)
+
+    assert result["value"] == 49
+    assert result["pid"] != os.getpid()
+    # The result only resolves once the task's progress has been delivered
+    assert done.is_set()
+    assert seen == [(0.5, "halfway")]
+
+
+@pytest.mark.asyncio
+async def test_process_handler_marshals_result_and_progress_to_storage(tmp_path, backend):
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    queue = JobQueue(storage, process_backend=backend)
+    queue.register_process_handler("square", square_task)
+    queue.register_process_handler("broken", failing_task)
+
+    ok_id = queue.enqueue("square", analysis_id="a", payload={"value": 3})
+    bad_id = queue.enqueue("broken", analysis_id="a", payload={})
+
+    queue.ensure_worker()
+    await queue.wait_for_all(timeout=60)
+    await queue.shutdown()
+
+    ok = storage.get_queue_job(ok_id)
+    assert ok["status"] == "completed"
+    assert ok["result"]["value"] == 9
+    assert ok["progress"] == 0.5
+
+    bad = storage.get_queue_job(bad_id)
+    assert bad["status"] == "failed"
+    assert "analysis failed in worker" in bad["error"]
+
+
+@pytest.mark.asyncio
+async def test_process_handler_falls_back_to_thread_without_backend(tmp_path):
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    queue = JobQueue(storage)
+    received = {}
+
+    def on_result(job, result):
+        received[job["job_id"]] = result["value"]
+
+    queue.register_process_handler("square", square_task, on_result=on_result)
+    job_id = queue.enqueue("square", analysis_id="a", payload={"value": 4})
+
+    queue.ensure_worker()
+    await queue.wait_for_all(timeout=5)
+    await queue.shutdown()
+
+    assert received == {job_id: 16}
+    assert storage.get_queue_job(job_id)["progress"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_physics_and_technical_qc_run_on_the_default_backend(tmp_path, backend, monkeypatch):
+    cv2 = pytest.importorskip("cv2")
+    import numpy as np
+
+    from app.core.physics_analyzer import analyze_visual_physics, analyze_visual_physics_sync
+    from app.features.clearcast.validation.checks.safety_checks import SafetyChecks
+
+    video = tmp_path / "ad.mp4"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (64, 48))
+    for i in range(30):
+        writer.write(np.full((48, 64, 3), (i % 2) * 255, dtype=np.uint8))
+    writer.release()
+
+    submitted = []
+    real_submit = backend.submit
+
+    def recording_submit(task, job_context, on_progress=None):
+        submitted.append(task.__name__)
+        return real_submit(task, job_context, on_progress)
+
+    monkeypatch.setattr(backend, "submit", recording_submit)
+    monkeypatch.setattr(process_pool, "_default_backend", backend)
+
+    physics = await analyze_visual_physics(str(video), sample_rate=2)
+    pse = SafetyChecks()._run_check("check_pse_risk", str(video), num_analysis_frames=10)
+
+    assert submitted == ["visual_physics_task", "technical_qc_task"]
+    assert physics == analyze_visual_physics_sync(str(video), 2)
+    assert pse["risk_level"] == SafetyChecks().verifier.check_pse_risk(str(video), num_analysis_frames=10)["risk_level"]
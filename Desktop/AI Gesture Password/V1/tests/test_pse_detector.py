@@ -0,0 +1,48 @@
+import numpy as np
+
+from app.core.pse_detector import analyze_flash_series
+
+
+def _legacy_counts(values, fps, delta=40, window=1.0):
+    """Reference implementation: the original per-frame list-based loop."""
+    window_frames = round(window * fps)
+    prev = 0
+    flashes = []
+    counts = []
+    for idx, value in enumerate(values):
+        if abs(value - prev) > delta:
+            flashes.append(idx)
+        prev = value
+        flashes = [f for f in flashes if idx - f <= window_frames]
+        counts.append(len(flashes))
+    return counts
+
+
+def test_flash_counts_match_legacy_loop():
+    rng = np.random.default_rng(7)
+    values = rng.choice([20.0, 60.0, 200.0, 230.0], size=300)
+    series = analyze_flash_series(values, fps=25)
+
+    assert series.flash_counts.tolist() == _legacy_counts(values.tolist(), 25)
+    assert series.risk_curve.shape == (300,)
+    assert 0.0 <= series.risk_curve.min() and series.risk_curve.max() <= 1.0
+
+
+def test_static_series_has_no_risk():
+    series = analyze_flash_series(np.full(100, 128.0), fps=25)
+    # Only the jump from black into the first frame counts as a transition
+    assert series.transitions.sum() == 1
+    assert series.risk_frames() == []
+
+
+def test_strobe_is_flagged():
+    values = np.tile([0.0, 255.0], 50)
+    series = analyze_flash_series(values, fps=25)
+    assert series.at_risk.any()
+    assert series.risk_curve.max() == 1.0
+
+
+def test_empty_series():
+    series = analyze_flash_series([], fps=25)
+    assert series.risk_frames() == []
+    assert series.risk_curve.size == 0
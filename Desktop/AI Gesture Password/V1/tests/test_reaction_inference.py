@@ -0,0 +1,153 @@
+"""
+Tests for shared face cropping and batched emotion inference on reaction frames.
+"""
+
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+import pytest
+
+from app.features.analytics import reaction_processing
+from app.features.analytics.reaction_inference import (
+    EMOTION_LABELS,
+    DeepFaceEmotionBackend,
+    FEREmotionBackend,
+    FrameObservation,
+    classify_faces,
+    crop_face,
+    detect_primary_face,
+)
+
+
+class RecordingBackend:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.calls = []
+
+    def predict(self, faces):
+        self.calls.append(len(faces))
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return [{"happy": float(face.mean())} for face in faces]
+
+
+def _observation(frame_number, face_value=None):
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    face = None if face_value is None else np.full((40, 40), face_value, dtype=np.uint8)
+    return FrameObservation(frame=frame, frame_number=frame_number, face=face)
+
+
+def test_each_backend_sees_the_batch_once():
+    observations = [_observation(0, 10), _observation(2), _observation(4, 30)]
+    deepface, fer = RecordingBackend("deepface"), RecordingBackend("fer", fail=True)
+
+    classify_faces([deepface, fer], observations)
+
+    assert deepface.calls == [2] and fer.calls == [2]
+    assert observations[0].model_scores == {"deepface": {"happy": 10.0}}
+    assert observations[1].model_scores == {}  # No face, no model input
+    assert observations[2].model_scores == {"deepface": {"happy": 30.0}}
+
+
+def test_crop_face_is_square_gray_and_clipped():
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+    frame[20:60, 150:190] = 255
+
+    crop = crop_face(frame, (150, 20, 40, 40))
+    edge_crop = crop_face(frame, (180, 0, 20, 30))
+
+    assert crop.shape == (48, 48) and crop.ndim == 2
+    assert crop[24, 24] == 255
+    assert edge_crop.shape == (36, 28)  # Clipped at the frame edges
+
+
+def test_detect_primary_face_uses_mediapipe_box_and_score():
+    box = SimpleNamespace(xmin=0.25, ymin=0.1, width=0.5, height=0.6)
+    detection = SimpleNamespace(score=[0.93], location_data=SimpleNamespace(relative_bounding_box=box))
+    face_detection = SimpleNamespace(process=lambda rgb: SimpleNamespace(detections=[detection]))
+    frame = np.zeros((100, 200, 3), dtype=np.uint8)
+
+    assert detect_primary_face(frame, face_detection=face_detection) == ((50, 10, 100, 60), pytest.approx(0.93))
+
+    no_faces = SimpleNamespace(process=lambda rgb: SimpleNamespace(detections=None))
+    assert detect_primary_face(frame, face_detection=no_faces) == (None, None)
+
+
+def test_fer_backend_batches_preprocessed_crops():
+    batches = []
+
+    class FakeFER:
+        def _classify_emotions(self, gray_faces):
+            batches.append(gray_faces)
+            return np.tile(np.eye(7)[3], (len(gray_faces), 1))
+
+        @staticmethod
+        def _get_labels():
+            return dict(enumerate(EMOTION_LABELS))
+
+    faces = [np.full((80, 80), 255, dtype=np.uint8), np.zeros((30, 30), dtype=np.uint8)]
+    scores = FEREmotionBackend(FakeFER()).predict(faces)
+
+    assert batches[0].shape == (2, 64, 64)
+    assert batches[0][0].max() == pytest.approx(1.0) and batches[0][1].min() == pytest.approx(-1.0)
+    assert scores[0]["happy"] == 1.0 and scores[1]["neutral"] == 0.0
+
+
+def test_deepface_backend_builds_model_once_and_normalizes():
+    inputs = []
+
+    def model(batch, training=False):
+        inputs.append(batch)
+        return np.tile([1.0, 0, 0, 1.0, 0, 0, 2.0], (len(batch), 1))
+
+    builds = []
+
+    def build_model(*args, **kwargs):
+        if kwargs:
+            raise TypeError("older deepface takes the model name only")
+        builds.append(args)
+        return model
+
+    backend = DeepFaceEmotionBackend(SimpleNamespace(build_model=build_model))
+    faces = [np.full((60, 60), 128, dtype=np.uint8)] * 3
+
+    scores = backend.predict(faces)
+    backend.predict(faces[:1])
+
+    assert builds == [("Emotion",)]
+    assert inputs[0].shape == (3, 48, 48, 1) and inputs[0].max() <= 1.0
+    assert scores[0]["neutral"] == pytest.approx(0.5) and scores[0]["angry"] == pytest.approx(0.25)
+
+
+def test_pipeline_batches_sampled_frames(tmp_path, monkeypatch):
+    video = tmp_path / "reaction.mp4"
+    writer = cv2.VideoWriter(str(video), cv2.VideoWriter_fourcc(*"mp4v"), 10.0, (64, 64))
+    for i in range(20):
+        writer.write(np.full((64, 64, 3), i * 10, dtype=np.uint8))
+    writer.release()
+
+    class FakeTracker:
+        batches = []
+
+        def reset(self):
+            pass
+
+        def analyze_frames(self, frames, frame_numbers):
+            self.batches.append(list(frame_numbers))
+            for number in frame_numbers:
+                # Each result is scored after the previous one was recorded
+                assert len(self.emotion_history) == sum(map(len, self.batches[:-1])) + frame_numbers.index(number)
+                yield {"emotion": "happy", "engagement": 0.8, "scores": {"happy": 1.0}}
+
+    monkeypatch.setattr(reaction_processing, "EnhancedEmotionTracker", FakeTracker)
+    pipeline = reaction_processing.ReactionProcessingPipeline()
+    pipeline.frame_skip_interval = 2
+    pipeline.batch_size = 4
+
+    result = pipeline._analyze_with_enhanced_tracker(str(video))
+
+    assert FakeTracker.batches == [[0, 2, 4, 6], [8, 10, 12, 14], [16, 18]]
+    assert [event["timestamp"] for event in result["emotion_timeline"]][:3] == [0.0, 0.2, 0.4]
+    assert result["engagement_score"] == pytest.approx(0.8)
@@ -0,0 +1,139 @@
+"""
+Tests for cached, off-event-loop PDF report rendering.
+"""
+
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from app.core.video_storage import VideoAnalysisStorage
+from app.features.reporting import report_cache as report_cache_module
+from app.features.reporting.report_cache import ReportCache, ReportRenderError
+
+CLEARCAST_RESULTS = {
+    "summary": "Clear to air.",
+    "compliance_status": "PASS",
+    "red_flags": [],
+    "yellow_flags": [],
+    "blue_flags": [],
+    "compliant_elements": ["Price claims substantiated"],
+    "recommendations": [],
+}
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    monkeypatch.setattr(VideoAnalysisStorage, "_generate_video_thumbnail", lambda self, path: None)
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    video = tmp_path / "ad.mp4"
+    video.write_bytes(b"video")
+    analysis_id = storage.create_analysis(str(video), defer_transcription=True)
+    storage.save_clearcast_check(analysis_id, CLEARCAST_RESULTS)
+    storage.test_analysis_id = analysis_id
+    return storage
+
+
+class RenderCalls(list):
+    gate: threading.Event
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    """Replace the reportlab render with one that records calls and waits on a gate."""
+    calls = RenderCalls()
+    gate = threading.Event()
+    gate.set()
+
+    def fake_render(kind, inputs, output_path):
+        calls.append((kind, inputs["settings"]["corporation_name"]))
+        gate.wait(5)
+        Path(output_path).write_bytes(b"%PDF-" + inputs["settings"]["corporation_name"].encode())
+        return output_path
+
+    monkeypatch.setattr(report_cache_module, "render_report", fake_render)
+    calls.gate = gate
+    return calls
+
+
+def _get(cache, storage, kind="clearcast"):
+    analysis_id = storage.test_analysis_id
+    return cache.get_or_render(storage, kind, analysis_id, storage.get_analysis(analysis_id))
+
+
+def test_repeat_downloads_are_served_from_cache(storage, renders):
+    cache = ReportCache()
+
+    first = asyncio.run(_get(cache, storage))
+    second = asyncio.run(_get(cache, storage))
+
+    assert first == second and first.parent == storage.reports_dir
+    assert renders == [("clearcast", "AdForege")]
+
+
+def test_concurrent_requests_share_one_render_without_blocking_the_loop(storage, renders):
+    cache = ReportCache()
+    renders.gate.clear()
+
+    async def scenario():
+        downloads = [asyncio.create_task(_get(cache, storage)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert not any(task.done() for task in downloads)  # Loop keeps running while the render waits
+        renders.gate.set()
+        return await asyncio.gather(*downloads)
+
+    paths = asyncio.run(scenario())
+    assert len(set(paths)) == 1
+    assert len(renders) == 1
+
+
+def test_branding_change_rerenders_and_drops_stale_pdf(storage, renders):
+    cache = ReportCache()
+    old_path = asyncio.run(_get(cache, storage))
+
+    storage.update_settings({"corporation_name": "Northwind"})
+    new_path = asyncio.run(_get(cache, storage))
+
+    assert new_path != old_path and not old_path.exists()
+    assert new_path.read_bytes() == b"%PDF-Northwind"
+    assert renders == [("clearcast", "AdForege"), ("clearcast", "Northwind")]
+
+
+def test_saving_new_results_invalidates_cached_reports(storage, renders):
+    cache = ReportCache()
+    path = asyncio.run(_get(cache, storage))
+
+    storage.save_clearcast_check(storage.test_analysis_id, dict(CLEARCAST_RESULTS, compliance_status="FAIL"))
+
+    assert not path.exists()
+    asyncio.run(_get(cache, storage))
+    assert len(renders) == 2
+
+
+def test_render_report_writes_pdf_atomically(tmp_path, monkeypatch):
+    pytest.importorskip("reportlab")
+    inputs = report_cache_module.report_inputs(
+        "clearcast",
+        {"clearcast_check": CLEARCAST_RESULTS, "video_name": "ad.mp4", "video_duration": 30.0},
+        {"corporation_name": "Northwind", "accent_color": "#FF0000"},
+    )
+    output = tmp_path / "clearcast.pdf"
+
+    report_cache_module.render_report("clearcast", inputs, str(output))
+
+    assert output.read_bytes().startswith(b"%PDF")
+    assert list(tmp_path.iterdir()) == [output]
+
+    from app.features.reporting import pdf_generator
+
+    monkeypatch.setattr(pdf_generator.ClearcastPDFGenerator, "generate_pdf", lambda self, **kwargs: False)
+    with pytest.raises(ReportRenderError):
+        report_cache_module.render_report("clearcast", inputs, str(tmp_path / "failed.pdf"))
+    assert list(tmp_path.iterdir()) == [output]
+
+
+def test_report_inputs_leave_unset_branding_to_generator_defaults():
+    inputs = report_cache_module.report_inputs("clearcast", {}, {"corporation_name": "Northwind"})
+
+    assert inputs["settings"] == {"corporation_name": "Northwind"}
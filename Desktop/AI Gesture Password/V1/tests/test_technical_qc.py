@@ -14,7 +14,7 @@ from pathlib import Path
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent / "src"))
 
-from app.core.technical_qc import TechnicalVerifier
+from app.core.technical_qc import TechnicalVerifier, unsafe_area_mask, unsafe_violation_ratios
 from app.features.clearcast.clearcast_audio import ClearcastAudioAnalyzer
 
 class TestTechnicalQC(unittest.TestCase):
@@ -136,6 +136,26 @@ class TestTechnicalQC(unittest.TestCase):
         res = self.verifier.check_safe_areas(clean_path)
         self.assertTrue(res["passed"])
 
+    def test_unsafe_violation_ratios_match_per_frame_mask(self):
+        rng = np.random.default_rng(3)
+        planes = rng.integers(0, 256, size=(6, 90, 160), dtype=np.uint8)
+        ratios = unsafe_violation_ratios(planes, 0.9)
+        
+        # Reference: the original per-frame cv2 mask/threshold computation
+        for plane, ratio in zip(planes, ratios):
+            height, width = plane.shape
+            x_start, x_end = int(width * (1 - 0.9) / 2), int(width * (1 + 0.9) / 2)
+            y_start, y_end = int(height * (1 - 0.9) / 2), int(height * (1 + 0.9) / 2)
+            mask = np.ones_like(plane) * 255
+            mask[y_start:y_end, x_start:x_end] = 0
+            unsafe = cv2.bitwise_and(plane, plane, mask=mask)
+            _, thresh = cv2.threshold(unsafe, 50, 255, cv2.THRESH_BINARY)
+            total = (width * height) - ((x_end - x_start) * (y_end - y_start))
+            self.assertAlmostEqual(ratio, cv2.countNonZero(thresh) / total)
+        
+        # Masks are built once per resolution
+        self.assertIs(unsafe_area_mask(90, 160, 0.9), unsafe_area_mask(90, 160, 0.9))
+
     def test_pse_risk(self):
         # Test flashing
         flash_path = self.create_dummy_video("flash.mp4", flashing=True)
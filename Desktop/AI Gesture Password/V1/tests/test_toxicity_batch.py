@@ -0,0 +1,125 @@
+"""
+Tests for batch toxicity scoring and re-scoring of stored analyses.
+"""
+
+import pytest
+
+from app.core.process_pool import ProcessPoolBackend
+from app.core.video_storage import VideoAnalysisStorage
+from app.features.toxicity import ToxicityScorer, rescore_stored_analyses
+from app.features.toxicity import batch
+from app.features.toxicity.batch import TOXICITY_FEATURE_KEYS, score_analyses, toxicity_inputs
+
+ANALYSES = [
+    {},
+    {"transcript": "Our cereal is crunchy and tasty.", "duration_seconds": 30.0, "claims": []},
+    {
+        "visual_physics": {
+            "cuts_per_minute": 95.4,
+            "photosensitivity_fail": True,
+            "brightness_variance": 0.85,
+            "motion_energy_score": 0.95,
+        },
+        "audio_physics": {"loudness_lu": -8.25},
+        "transcript": "Hurry! Only 3 left. Don't miss out. The threat is real, you're at risk.",
+        "claims": ["a"] * 8,
+        "duration_seconds": 60.0,
+        "garm_risk_level": "high",
+        "required_disclaimers": ["Terms apply"],
+        "present_disclaimers": [],
+    },
+    {
+        "visual_physics": {"cuts_per_minute": 40, "brightness_variance": 0.2},
+        "audio_physics": {"loudness_lu": -12},
+        "transcript": "Start your free trial - automatically renews. Ask your doctor about this medication.",
+        "duration_seconds": 20.0,
+        "garm_risk_level": "medium",
+    },
+]
+
+
+@pytest.mark.parametrize("use_ai", [True, False])
+def test_batch_matches_single_scoring(use_ai):
+    scorer = ToxicityScorer(use_ai=use_ai)
+
+    batch = list(scorer.score_batch(ANALYSES, batch_size=3))
+
+    assert [r.to_dict() for r in batch] == [scorer.calculate_toxicity(a).to_dict() for a in ANALYSES]
+    assert batch[2].risk_level == "HIGH"
+
+
+def _stored_analysis(analysis_id, data):
+    """An analysis record as the AI breakdown leaves it for the scorer input `data`."""
+    breakdown = {
+        "toxicity": {"toxic_score": -1},
+        "toxicity_inputs": {key: data[key] for key in TOXICITY_FEATURE_KEYS if key in data},
+        "claims": data.get("claims", []),
+        "compliance": {
+            "overall_risk": data.get("garm_risk_level", "low"),
+            "required_disclaimers": data.get("required_disclaimers", []),
+        },
+        "content_indicators": {"disclaimers_found": data.get("present_disclaimers", [])},
+    }
+    return {"id": analysis_id, "transcription": {"full_text": data.get("transcript", "")}, "ai_breakdown": breakdown}
+
+
+def _storage_with_analyses(tmp_path):
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    for i, data in enumerate(ANALYSES):
+        storage.db["analyses"][f"a{i}"] = _stored_analysis(f"a{i}", data)
+    # Analysed before toxicity inputs were kept
+    storage.db["analyses"]["legacy"] = {"id": "legacy", "ai_breakdown": {"toxicity": {"toxic_score": 5}}}
+    storage._save_database()
+    return storage
+
+
+def test_rescore_writes_reports_back_per_chunk(tmp_path):
+    storage = _storage_with_analyses(tmp_path)
+    progress = []
+
+    summary = rescore_stored_analyses(storage, chunk_size=2, on_progress=lambda *p: progress.append(p))
+
+    assert summary.to_dict() == {"scored": 4, "skipped": 1, "failed": 0}
+    assert progress == [(2, 0), (4, 0)]
+    expected = dict(
+        (analysis_id, report.to_dict())
+        for analysis_id, report in score_analyses(storage.get_all_analyses())
+    )
+    scorer = ToxicityScorer()
+    assert expected == {f"a{i}": scorer.calculate_toxicity(data).to_dict() for i, data in enumerate(ANALYSES)}
+    reopened = VideoAnalysisStorage(str(tmp_path / "storage"))
+    for analysis_id, report in expected.items():
+        assert reopened.get_analysis(analysis_id)["ai_breakdown"]["toxicity"] == report
+        assert reopened.get_analysis(analysis_id)["toxicity_rescored_at"]
+    assert reopened.get_analysis("legacy")["ai_breakdown"]["toxicity"] == {"toxic_score": 5}
+
+
+def test_rescore_on_process_pool(tmp_path):
+    storage = _storage_with_analyses(tmp_path)
+    backend = ProcessPoolBackend(max_workers=1)
+    try:
+        summary = rescore_stored_analyses(storage, backend=backend, chunk_size=3)
+    finally:
+        backend.shutdown()
+
+    assert summary.scored == 4
+    assert storage.get_analysis("a2")["ai_breakdown"]["toxicity"]["risk_level"] == "HIGH"
+
+
+def test_stored_inputs_are_features_only_and_rebuild_from_the_record():
+    record = _stored_analysis("a2", ANALYSES[2])
+
+    assert set(record["ai_breakdown"]["toxicity_inputs"]) == set(TOXICITY_FEATURE_KEYS)
+    assert toxicity_inputs(record) == ANALYSES[2]
+
+    del record["transcription"]["full_text"]
+    record["transcription"]["segments"] = [{"text": "Hurry!"}, {"text": "Only 3 left."}]
+    assert toxicity_inputs(record)["transcript"] == "Hurry! Only 3 left."
+
+
+def test_command_line_rescores_storage(tmp_path, capsys):
+    _storage_with_analyses(tmp_path)
+
+    assert batch.main(["--storage-dir", str(tmp_path / "storage"), "--chunk-size", "2"]) == 0
+
+    assert capsys.readouterr().out.strip() == "scored=4 skipped=1 failed=0"
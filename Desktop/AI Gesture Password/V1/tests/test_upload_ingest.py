@@ -0,0 +1,138 @@
+"""
+Tests for the streaming upload ingest (chunked write, inline hashing, header probe).
+"""
+
+import asyncio
+import hashlib
+
+import pytest
+
+from app.core import upload_ingest
+from app.core.upload_ingest import MediaInfo, StreamingIngest, ingest_upload, parse_ffprobe_output
+from app.core.video_storage import VideoAnalysisStorage
+
+FFPROBE_JSON = {
+    "streams": [
+        {"codec_type": "audio", "codec_name": "pcm_s24le"},
+        {
+            "codec_type": "video",
+            "codec_name": "prores",
+            "width": 1920,
+            "height": 1080,
+            "avg_frame_rate": "25/1",
+            "r_frame_rate": "25/1",
+        },
+    ],
+    "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2", "duration": "30.040000"},
+}
+
+
+class FakeUpload:
+    """Async read(n) over an in-memory payload, recording requested sizes."""
+
+    def __init__(self, data: bytes, fail_after: int = None):
+        self.data = data
+        self.offset = 0
+        self.reads = []
+        self.fail_after = fail_after
+
+    async def read(self, size: int) -> bytes:
+        self.reads.append(size)
+        if self.fail_after is not None and self.offset >= self.fail_after:
+            raise ConnectionError("client disconnected")
+        chunk = self.data[self.offset:self.offset + size]
+        self.offset += len(chunk)
+        return chunk
+
+
+def test_parse_ffprobe_output():
+    media = parse_ffprobe_output(FFPROBE_JSON)
+
+    assert media == MediaInfo(
+        duration=30.04, fps=25.0, width=1920, height=1080, codec="prores", total_frames=751, container="mov"
+    )
+    assert parse_ffprobe_output({"streams": [{"codec_type": "audio"}], "format": {"duration": "3"}}) is None
+    # A truncated header that names the stream but not its length is not conclusive
+    assert parse_ffprobe_output({"streams": FFPROBE_JSON["streams"], "format": {}}) is None
+
+
+def test_ingest_streams_in_chunks_and_hashes(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_ingest, "find_ffprobe", lambda: None)
+    data = bytes(range(256)) * 1000
+    upload = FakeUpload(data)
+
+    result = asyncio.run(ingest_upload(upload, tmp_path / "clip.mp4", chunk_size=4096))
+
+    assert set(upload.reads) == {4096}
+    assert result.size_bytes == len(data)
+    assert result.content_hash == hashlib.sha256(data).hexdigest()
+    assert (tmp_path / "clip.mp4").read_bytes() == data
+    assert result.media is None
+
+
+def test_header_probe_avoids_reading_finished_file(tmp_path, monkeypatch):
+    probed = []
+
+    def fake_probe(source, ffprobe=None):
+        probed.append(source)
+        return parse_ffprobe_output(FFPROBE_JSON) if isinstance(source, bytes) else None
+
+    monkeypatch.setattr(upload_ingest, "find_ffprobe", lambda: "ffprobe")
+    monkeypatch.setattr(upload_ingest, "probe_media", fake_probe)
+    ingest = StreamingIngest(tmp_path / "master.mov", header_bytes=10)
+    for chunk in (b"abcdef", b"ghijkl", b"mnop"):
+        ingest.write(chunk)
+    result = ingest.finish()
+
+    assert probed == [b"abcdefghij"]
+    assert result.media.codec == "prores"
+
+
+def test_inconclusive_header_falls_back_to_file_probe(tmp_path, monkeypatch):
+    probed = []
+
+    def fake_probe(source, ffprobe=None):
+        probed.append(source)
+        return None if isinstance(source, bytes) else parse_ffprobe_output(FFPROBE_JSON)
+
+    monkeypatch.setattr(upload_ingest, "find_ffprobe", lambda: "ffprobe")
+    monkeypatch.setattr(upload_ingest, "probe_media", fake_probe)
+    dest = tmp_path / "master.mov"
+    ingest = StreamingIngest(dest, header_bytes=4)
+    ingest.write(b"moov-at-the-end")
+    result = ingest.finish()
+
+    assert probed == [b"moov", str(dest)]
+    assert result.media.width == 1920
+
+
+def test_failed_upload_leaves_no_partial_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(upload_ingest, "find_ffprobe", lambda: None)
+    upload = FakeUpload(b"x" * 10000, fail_after=4096)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(ingest_upload(upload, tmp_path / "clip.mp4", chunk_size=4096))
+
+    assert not (tmp_path / "clip.mp4").exists()
+
+
+def test_create_analysis_adopts_staged_upload(tmp_path, monkeypatch):
+    monkeypatch.setattr(VideoAnalysisStorage, "_generate_video_thumbnail", lambda self, path: None)
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    staged = storage.uploads_dir / "staged.mov"
+    staged.write_bytes(b"master")
+
+    analysis_id = storage.create_analysis(
+        str(staged),
+        defer_transcription=True,
+        content_hash="abc",
+        video_name="Spring Campaign.mov",
+        video_metadata=parse_ffprobe_output(FFPROBE_JSON).to_dict(),
+        move_source=True,
+    )
+
+    analysis = storage.get_analysis(analysis_id)
+    assert not staged.exists()
+    assert open(analysis["video_path"], "rb").read() == b"master"
+    assert analysis["video_name"] == "Spring Campaign.mov"
+    assert analysis["video_metadata"]["fps"] == 25.0
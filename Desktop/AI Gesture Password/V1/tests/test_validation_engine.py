@@ -0,0 +1,87 @@
+import threading
+import time
+
+from app.features.clearcast.validation import CheckResult, SharedValidationEngine, ValidationMode
+
+
+class _SlowChecks:
+    """Check module double that sleeps, then returns one failing check."""
+
+    def __init__(self, check_id, delay, fail=False):
+        self.check_id = check_id
+        self.delay = delay
+        self.fail = fail
+        self.threads = set()
+
+    def run_all(self, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError(f"{self.check_id} exploded")
+        return [CheckResult(check_id=self.check_id, passed=False, severity="red", message=self.check_id)]
+
+    def get_metadata(self, video_path):
+        return {"height": 720}
+
+    def is_slated_master(self, video_path, clock_number):
+        return True
+
+
+def _engine(max_workers, delays, failing=()):
+    engine = SharedValidationEngine(mode=ValidationMode.PURE_CLEARCAST, max_workers=max_workers)
+    for name in ("format", "video", "audio", "metadata", "safety"):
+        setattr(engine, f"{name}_checks", _SlowChecks(name, delays[name], fail=name in failing))
+    return engine
+
+
+def test_checks_run_concurrently_in_stable_order():
+    # Slowest categories first so completion order differs from report order
+    delays = {"format": 0.3, "video": 0.25, "audio": 0.2, "metadata": 0.1, "safety": 0.05}
+    engine = _engine(5, delays)
+
+    started = time.perf_counter()
+    result = engine.validate("clip.mp4", delivery_metadata={"clock_number": "ABC/PROD001/030"})
+    elapsed = time.perf_counter() - started
+
+    assert [flag["check_id"] for flag in result.red_flags] == ["format", "video", "audio", "metadata", "safety"]
+    assert elapsed < sum(delays.values())
+    assert result.metadata["is_slated_master"] is True
+
+    timings = result.metadata["check_timings"]
+    assert list(timings) == ["format", "video", "audio", "metadata", "safety", "total"]
+    assert timings["format"] >= 0.3
+    assert timings["total"] < sum(delays.values())
+
+
+def test_failed_category_is_reported_without_losing_others():
+    delays = {name: 0.0 for name in ("format", "video", "audio", "metadata", "safety")}
+    engine = _engine(5, delays, failing=("audio",))
+
+    result = engine.validate("clip.mp4")
+
+    assert result.errors == ["Audio checks failed: audio exploded"]
+    assert [flag["check_id"] for flag in result.red_flags] == ["format", "video", "metadata", "safety"]
+
+
+def test_single_worker_runs_sequentially_on_caller_thread():
+    delays = {name: 0.0 for name in ("format", "video", "audio", "metadata", "safety")}
+    engine = _engine(1, delays)
+
+    engine.validate("clip.mp4")
+
+    assert engine.format_checks.threads == {threading.get_ident()}
+
+
+def test_video_checks_survive_a_metadata_failure():
+    delays = {name: 0.0 for name in ("format", "video", "audio", "metadata", "safety")}
+    engine = _engine(5, delays)
+
+    def broken_metadata(video_path):
+        raise RuntimeError("ffprobe missing")
+
+    engine.video_checks.get_metadata = broken_metadata
+
+    result = engine.validate("clip.mp4")
+
+    assert result.errors == []
+    assert [flag["check_id"] for flag in result.red_flags] == ["format", "video", "audio", "metadata", "safety"]
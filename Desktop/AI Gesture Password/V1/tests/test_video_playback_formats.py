@@ -244,33 +244,23 @@ def test_head_video_returns_202_when_pending(tmp_path, monkeypatch):
 
 
 def test_storage_reloads_on_external_update(tmp_path):
-    """Test that storage reloads database when file is modified externally."""
+    """Test that storage reloads when another connection modifies the database."""
     storage_dir = tmp_path / "video_analyses"
     storage = VideoAnalysisStorage(storage_dir=str(storage_dir))
     
     # Create an analysis
     video_path = tmp_path / "test.mov"  # Use .mov so playback_ready starts as False
     video_path.write_bytes(b"test")
-    analysis_id = storage.create_analysis(str(video_path))
+    analysis_id = storage.create_analysis(str(video_path), defer_transcription=True)
     
     # Verify initial state
     initial = storage.get_analysis(analysis_id, check_stale=False)
     assert initial is not None
     assert initial.get("playback_ready") is False
     
-    # Manually modify the database file externally (simulating backfill script)
-    import json
-    import time
-    time.sleep(0.1)  # Ensure mtime difference from create_analysis
-    
-    db_data = json.loads(storage.db_file.read_text())
-    db_data["analyses"][analysis_id]["playback_ready"] = True
-    db_data["analyses"][analysis_id]["playback_video_path"] = "updated_path.mp4"
-    storage.db_file.write_text(json.dumps(db_data, indent=2))
-    
-    # Force mtime update by touching the file
-    storage.db_file.touch()
-    time.sleep(0.1)  # Ensure mtime difference
+    # Modify the database from a second instance (simulating backfill script)
+    external = VideoAnalysisStorage(storage_dir=str(storage_dir))
+    assert external.mark_playback_ready(analysis_id, "updated_path.mp4") is True
     
     # Get analysis with stale check - should reload and see updated data
     updated = storage.get_analysis(analysis_id, check_stale=True)
@@ -279,12 +269,9 @@ def test_storage_reloads_on_external_update(tmp_path):
     assert updated["playback_video_path"] == "updated_path.mp4"
     
     # Verify reload_database() also works
-    db_data["analyses"][analysis_id]["playback_ready"] = False
-    storage.db_file.write_text(json.dumps(db_data, indent=2))
-    storage.db_file.touch()
-    time.sleep(0.1)
+    external.db["analyses"][analysis_id]["playback_ready"] = False
+    external._save_database()
     
     storage.reload_database()
     reloaded = storage.get_analysis(analysis_id, check_stale=False)
     assert reloaded["playback_ready"] is False
-
@@ -0,0 +1,96 @@
+import json
+import threading
+
+from app.core.video_storage import VideoAnalysisStorage
+
+
+def _legacy_db(analyses=None, queue_jobs=None):
+    return {
+        "analyses": analyses or {},
+        "reactions": {},
+        "reaction_jobs": {},
+        "queue_jobs": queue_jobs or {},
+        "settings": {"corporation_name": "Legacy Co", "accent_color": "#000000"},
+    }
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    storage_dir = tmp_path / "storage"
+    storage_dir.mkdir()
+    legacy = _legacy_db(
+        analyses={"a1": {"id": "a1", "video_name": "ad.mp4", "video_path": "ad.mp4", "created_at": "2025-01-01"}},
+        queue_jobs={"queue_1": {"job_id": "queue_1", "status": "queued", "created_at": "2025-01-01"}},
+    )
+    (storage_dir / "analyses.json").write_text(json.dumps(legacy))
+
+    storage = VideoAnalysisStorage(str(storage_dir))
+
+    assert storage.get_analysis("a1")["video_name"] == "ad.mp4"
+    assert storage.get_queue_job("queue_1")["status"] == "queued"
+    assert storage.get_settings()["corporation_name"] == "Legacy Co"
+    assert not (storage_dir / "analyses.json").exists()
+    assert (storage_dir / "analyses.json.migrated").exists()
+
+    # A fresh instance reads from SQLite, not the legacy file
+    reopened = VideoAnalysisStorage(str(storage_dir))
+    assert reopened.get_analysis("a1") is not None
+
+
+def test_update_writes_only_the_touched_record(tmp_path, monkeypatch):
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    job = storage.create_queue_job("video_analysis", "analysis-1", payload={})
+    storage.create_queue_job("reaction", "analysis-2", payload={})
+
+    writes = []
+    original_put = storage._backend.put
+
+    def recording_put(section, key, data):
+        writes.append((section, key))
+        original_put(section, key, data)
+
+    monkeypatch.setattr(storage._backend, "put", recording_put)
+
+    storage.update_queue_job(job["job_id"], status="processing")
+
+    assert writes == [("queue_jobs", job["job_id"])]
+    reopened = VideoAnalysisStorage(str(tmp_path / "storage"))
+    assert reopened.get_queue_job(job["job_id"])["status"] == "processing"
+
+
+def test_delete_and_settings_persist(tmp_path):
+    storage_dir = tmp_path / "storage"
+    storage = VideoAnalysisStorage(str(storage_dir))
+    storage.db["analyses"]["a1"] = {
+        "id": "a1",
+        "video_name": "ad.mp4",
+        "video_path": str(tmp_path / "ad.mp4"),
+        "created_at": "2025-01-01",
+        "reactions": [],
+    }
+    storage._save_database()
+    storage.update_settings({"accent_color": "#FF0000"})
+
+    storage.delete_analysis("a1")
+
+    reopened = VideoAnalysisStorage(str(storage_dir))
+    assert reopened.get_analysis("a1") is None
+    assert reopened.get_settings()["accent_color"] == "#FF0000"
+
+
+
+def test_writes_from_other_threads_wait_for_the_storage_lock(tmp_path):
+    storage = VideoAnalysisStorage(str(tmp_path / "storage"))
+    job_id = storage.create_queue_job("video_analysis", "analysis-1", payload={})["job_id"]
+    updater = threading.Thread(target=storage.update_queue_job, args=(job_id,), kwargs={"progress": 0.5})
+
+    # Holding the lock (as serialization does) keeps the record stable
+    with storage._lock:
+        updater.start()
+        updater.join(timeout=0.2)
+        assert updater.is_alive()
+        assert "progress" not in storage.get_queue_job(job_id)
+        storage._save_database()
+
+    updater.join(timeout=5)
+    reopened = VideoAnalysisStorage(str(tmp_path / "storage"))
+    assert reopened.get_queue_job(job_id)["progress"] == 0.5
@@ -0,0 +1,81 @@
+"""
+Tests for background warm-up of heavyweight components.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.core.warmup import FAILED, PENDING, READY, WarmupError, WarmupRegistry
+
+
+def test_start_loads_components_in_background():
+    release = threading.Event()
+    loads = []
+
+    def slow():
+        loads.append("slow")
+        release.wait(5)
+        return "model"
+
+    warmup = WarmupRegistry()
+    warmup.register("slow", slow)
+    assert warmup.status()["slow"]["state"] == PENDING
+
+    assert warmup.start() is True
+    assert warmup.start() is False
+
+    async def request():
+        waiter = asyncio.create_task(warmup.wait_for("slow"))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()  # Awaiting readiness does not block the loop
+        release.set()
+        return await waiter
+
+    assert asyncio.run(request()) == "model"
+    assert loads == ["slow"]  # The request waited for the warm-up load instead of loading again
+    assert warmup.is_ready()
+    assert warmup.status()["slow"]["state"] == READY
+
+
+def test_get_loads_inline_when_warmup_not_started():
+    warmup = WarmupRegistry()
+    warmup.register("checker", lambda: object())
+
+    first = warmup.get("checker")
+    assert warmup.get("checker") is first
+
+
+def test_failed_component_is_reported_and_retried():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("no GPU")
+        return "ok"
+
+    warmup = WarmupRegistry()
+    warmup.register("flaky", flaky)
+    with pytest.raises(WarmupError, match="no GPU"):
+        warmup.get("flaky")
+    assert warmup.status()["flaky"] == {"state": FAILED, "duration_s": pytest.approx(0, abs=1), "error": "no GPU"}
+
+    assert warmup.get("flaky") == "ok"
+    assert warmup.status()["flaky"]["error"] is None
+
+
+def test_wait_times_out_while_another_thread_loads():
+    release = threading.Event()
+    warmup = WarmupRegistry()
+    warmup.register("slow", lambda: release.wait(5))
+    warmup.start()
+
+    try:
+        with pytest.raises(WarmupError, match="Timed out"):
+            # The background thread holds the component while it loads
+            threading.Event().wait(0.05)
+            warmup.get("slow", timeout=0.05)
+    finally:
+        release.set()